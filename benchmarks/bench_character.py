@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+角色内存与吞吐量基准测试
+对比原先基于 __dict__ 的角色类、__slots__ 角色类和按列存储的角色名册
+"""
+
+import argparse
+import sys
+import os
+import time
+import tracemalloc
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.combat.character import Character
+from src.combat.roster import CharacterRoster
+
+
+class DictCharacter:
+    """改用 __slots__ 之前的角色类布局（仅用于对比），属性与 Character 保持一致"""
+
+    def __init__(self, name, max_hp, max_mp, attack, defense, speed):
+        self.name = name
+        self.max_hp = max_hp
+        self.max_mp = max_mp
+        self.attack = attack
+        self.defense = defense
+        self.speed = speed
+        self.current_hp = max_hp
+        self.current_mp = max_mp
+        self.attack_cooldown = 0
+        self.gcd = 0
+        self.status = None
+        self.skills = None
+
+    take_damage = Character.take_damage
+
+
+def _build_objects(cls, count):
+    """创建一批角色对象"""
+    return [cls("单位", 100, 50, 10, 5, i % 10) for i in range(count)]
+
+
+def _build_roster(count):
+    """创建角色名册及其视图"""
+    roster = CharacterRoster()
+    for i in range(count):
+        roster.add("单位", 100, 50, 10, 5, i % 10)
+    return roster
+
+
+def _measure(builder, count):
+    """测量创建耗时和内存占用
+
+    Returns:
+        tuple: (创建结果, 耗时秒数, 占用字节数)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = builder(count)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, size
+
+
+def _access_time(units):
+    """测量读取与修改属性的耗时（读取生命值、受到一次伤害）"""
+    start = time.perf_counter()
+    total = 0
+    for unit in units:
+        total += unit.current_hp
+        unit.take_damage(8)
+    return time.perf_counter() - start
+
+
+def run(count):
+    """运行基准测试
+
+    Args:
+        count: 角色数量
+
+    Returns:
+        dict: 各实现的创建耗时、内存和访问耗时
+    """
+    results = {}
+    for label, builder in (
+        ("dict", lambda n: _build_objects(DictCharacter, n)),
+        ("slots", lambda n: _build_objects(Character, n)),
+        ("roster", _build_roster),
+    ):
+        units, build_time, memory = _measure(builder, count)
+        if label == "roster":
+            # 视图在访问时按需创建，不常驻内存
+            units = list(units)
+        results[label] = {
+            "build_seconds": build_time,
+            "memory_bytes": memory,
+            "bytes_per_unit": memory / count,
+            "access_seconds": _access_time(units),
+        }
+    return results
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="角色内存与吞吐量基准测试")
+    parser.add_argument("--units", type=int, default=100000, help="角色数量")
+    args = parser.parse_args(argv)
+
+    results = run(args.units)
+    print(f"{'实现':<8}{'创建(ms)':>10}{'内存(KB)':>12}{'每单位(B)':>12}{'访问(ms)':>10}")
+    for label, row in results.items():
+        print(f"{label:<8}{row['build_seconds'] * 1000:>10.1f}{row['memory_bytes'] / 1024:>12.0f}"
+              f"{row['bytes_per_unit']:>12.0f}{row['access_seconds'] * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+基准测试套件
+测量战斗更新、无界面战斗吞吐量、界面组件绘制和场景切换的耗时，
+结果可以保存为JSON，并与本机保存的基准结果比较，变慢超过阈值时以非零状态退出；
+比较时每个用例的耗时先除以同一次运行中校准循环的耗时，抵消机器整体快慢的差异
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 无窗口环境下使用虚拟显示驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from src.combat.battle_manager import BattleManager
+from src.combat.character import Character
+from src.combat.rng import make_rng
+from src.combat.simulator import BattleSimulator
+from src.game_state import GameState
+from src.resource_manager import ResourceManager
+from src.scene_manager import SceneManager
+from src.ui.battle_log import BattleLog
+from src.ui.hp_bar import HPBar
+from src.ui.text_box import TextBox
+
+# 结果格式版本
+FORMAT_VERSION = 2
+
+# 默认的基准结果文件（与机器有关，不纳入版本库，用 --save-baseline 在本机生成）
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# 默认允许的变慢比例
+DEFAULT_THRESHOLD = 0.3
+
+FRAME_TIME = 1 / 60
+
+
+def _battle_tick(units):
+    """每方 units 个单位的战斗，每次推进一帧
+
+    Args:
+        units: 每方单位数
+
+    Returns:
+        callable: 执行一次的函数
+    """
+    def unit(name, i):
+        # 生命值足够高，战斗在测量期间不会结束
+        return Character(f"{name}{i}", 10 ** 9, 0, 10, 4, i % 10)
+
+    player = unit("玩家", 0)
+    battle = BattleManager(player, [unit("敌人", i) for i in range(units)], seed=1)
+    for i in range(1, units):
+        battle.add_ally(unit("盟友", i))
+    return lambda: battle.update(FRAME_TIME)
+
+
+def _battle_effects(units):
+    """每方 units 个单位、每个敌人都带持续伤害和增益的战斗，每帧刷新一个单位的效果
+
+    Args:
+        units: 每方单位数
+
+    Returns:
+        callable: 执行一次的函数
+    """
+    def unit(name, i):
+        return Character(f"{name}{i}", 10 ** 9, 0, 10, 4, i % 10)
+
+    player = unit("玩家", 0)
+    enemies = [unit("敌人", i) for i in range(units)]
+    battle = BattleManager(player, enemies, seed=1)
+    for i in range(1, units):
+        battle.add_ally(unit("盟友", i))
+    for enemy in enemies:
+        battle.apply_effect(enemy, "poison", player)
+        battle.apply_effect(enemy, "slow")
+    counter = iter(range(10 ** 9))
+
+    def op():
+        # 轮流刷新，效果的持续时间内每个单位都会被刷新，不会结束
+        battle.apply_effect(enemies[next(counter) % units], "poison", player)
+        battle.update(FRAME_TIME)
+    return op
+
+
+def _headless_battle():
+    """一场完整的无界面战斗（事件驱动，带盟友和技能）
+
+    所有战斗共用一个随机数流，与 BattleSimulator.run 相同。
+
+    Returns:
+        callable: 执行一次的函数
+    """
+    simulator = BattleSimulator(summon=True, use_skill=True, seed=1)
+    rng = make_rng(1)
+    return lambda: simulator.run_battle(rng)
+
+
+def _rng_draws():
+    """战斗中的随机数用法：一次伤害浮动和一次随机选择目标
+
+    Returns:
+        callable: 执行一次的函数
+    """
+    rng = make_rng(1)
+    targets = ["敌人1", "敌人2", "敌人3"]
+
+    def op():
+        rng.uniform(0.8, 1.2)
+        rng.choice(targets)
+    return op
+
+
+def _battle_log_draw(screen):
+    """每帧添加一条消息并重新合成战斗日志"""
+    battle_log = BattleLog(50, 350, 700, 200)
+    counter = iter(range(10 ** 9))
+
+    def op():
+        battle_log.add_message(f"玩家对敌人造成了 {next(counter) % 20} 点伤害")
+        battle_log.draw(screen)
+    return op
+
+
+def _battle_log_idle(screen):
+    """战斗日志没有变化时的绘制（使用合成好的表面）"""
+    battle_log = BattleLog(50, 350, 700, 200)
+    for i in range(20):
+        battle_log.add_message(f"玩家对敌人造成了 {i} 点伤害")
+    return lambda: battle_log.draw(screen)
+
+
+def _hp_bar_draw(screen):
+    """生命值每帧变化时绘制HP条"""
+    character = Character("玩家", 10 ** 6, 50, 10, 5, 5)
+    hp_bar = HPBar(50, 50, 200, 30, character)
+
+    def op():
+        character.current_hp -= 1
+        hp_bar.draw(screen)
+    return op
+
+
+def _text_box_render():
+    """重新排版并渲染文本框的文本"""
+    text = "这是一个测试剧情。你是一名勇敢的冒险者，正在探索一座古老的遗迹。突然，你遇到了一个神秘的生物..." * 2
+    text_box = TextBox(50, 400, 700, 150, text)
+    return text_box._render_text
+
+
+def _scene_switch(screen):
+    """在主菜单、叙事和战斗场景之间切换并绘制第一帧"""
+    scene_manager = SceneManager(screen)
+    states = [GameState.MAIN_MENU, GameState.NARRATIVE, GameState.COMBAT]
+    counter = iter(range(10 ** 9))
+
+    def op():
+        scene_manager.change_state(states[next(counter) % len(states)])
+        scene_manager.draw()
+    return op
+
+
+def _calibration_loop():
+    """校准循环：固定的纯Python工作量（属性访问、方法调用、列表和字典操作）
+
+    与被测代码依赖相同的解释器开销，两次运行的耗时之比反映机器和解释器整体的快慢。
+    """
+    class Point:
+        __slots__ = ("x", "y")
+
+        def __init__(self, x, y):
+            self.x = x
+            self.y = y
+
+        def length2(self):
+            return self.x * self.x + self.y * self.y
+
+    def op():
+        counts = {}
+        points = [Point(i, i % 7) for i in range(200)]
+        for point in points:
+            key = point.length2() % 13
+            counts[key] = counts.get(key, 0) + 1
+        return max(counts.values())
+    return op
+
+
+def benchmark_cases(screen):
+    """所有基准测试用例
+
+    Args:
+        screen: Pygame显示表面
+
+    Returns:
+        list: (名称, 创建测量函数的函数) 列表
+    """
+    cases = [
+        ("combat.tick.1", lambda: _battle_tick(1)),
+        ("combat.tick.10", lambda: _battle_tick(10)),
+        ("combat.tick.100", lambda: _battle_tick(100)),
+        ("combat.effects.100", lambda: _battle_effects(100)),
+        ("combat.headless_battle", _headless_battle),
+        ("ui.battle_log.draw", lambda: _battle_log_draw(screen)),
+        ("ui.battle_log.draw_idle", lambda: _battle_log_idle(screen)),
+        ("ui.hp_bar.draw", lambda: _hp_bar_draw(screen)),
+        ("ui.text_box.render_text", _text_box_render),
+        ("scene.change_state", lambda: _scene_switch(screen)),
+        ("rng.standard", _rng_draws),
+    ]
+    return cases
+
+
+def measure(op, min_time=0.05, repeat=5):
+    """测量函数的单次耗时
+
+    先确定每轮的执行次数（每轮至少 min_time 秒），再重复测量若干轮。
+
+    Args:
+        op: 无参数的函数
+        min_time: 每轮的最短时间（秒）
+        repeat: 轮数
+
+    Returns:
+        dict: best_us（最快一轮的单次耗时，用于比较）、median_us、number、repeat
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            op()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            op()
+        timings.append((time.perf_counter() - start) / number)
+
+    return {
+        "best_us": min(timings) * 1e6,
+        "median_us": statistics.median(timings) * 1e6,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run(pattern=None, min_time=0.05, repeat=5):
+    """运行基准测试
+
+    Args:
+        pattern: 只运行名称包含该字符串的用例，为None时运行全部
+        min_time: 每轮的最短时间（秒）
+        repeat: 轮数
+
+    Returns:
+        dict: 包含环境信息和每个用例结果的报告
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    resource_manager = ResourceManager()
+
+    results = {}
+    for name, setup in benchmark_cases(screen):
+        if pattern and pattern not in name:
+            continue
+        results[name] = measure(setup(), min_time, repeat)
+    calibration = measure(_calibration_loop(), min_time, repeat)
+
+    resource_manager.shutdown()
+    return {
+        "version": FORMAT_VERSION,
+        "calibration": calibration,
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """与基准结果比较
+
+    比值按两次运行的校准循环耗时换算：(本次耗时 / 本次校准) / (基准耗时 / 基准校准)。
+
+    Args:
+        report: 本次的报告
+        baseline: 基准报告
+        threshold: 允许的变慢比例（0.3 表示慢30%以内不算退化）
+
+    Returns:
+        list: (名称, 基准耗时, 本次耗时, 换算后的比值, 是否退化) 列表，只包含两边都有的用例
+
+    Raises:
+        ValueError: 基准结果的格式版本不同
+    """
+    if baseline.get("version") != report["version"]:
+        raise ValueError("基准结果的格式版本不同，请用 --save-baseline 重新生成")
+    scale = baseline["calibration"]["best_us"] / report["calibration"]["best_us"]
+
+    rows = []
+    for name, result in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        ratio = result["best_us"] / base["best_us"] * scale
+        rows.append((name, base["best_us"], result["best_us"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None):
+    """命令行入口
+
+    Args:
+        argv: 命令行参数列表，为None时读取sys.argv
+
+    Returns:
+        int: 退出状态，有退化时为1
+    """
+    parser = argparse.ArgumentParser(description="运行基准测试并与基准结果比较")
+    parser.add_argument("-k", "--filter", help="只运行名称包含该字符串的用例")
+    parser.add_argument("--json", metavar="PATH", help="把结果保存为JSON")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="基准结果文件")
+    parser.add_argument("--save-baseline", action="store_true", help="把本次结果保存为基准结果")
+    parser.add_argument("--no-compare", action="store_true", help="不与基准结果比较")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="允许的变慢比例，默认0.3（慢30%%）")
+    parser.add_argument("--quick", action="store_true",
+                        help="快速运行（测量时间更短，结果波动更大，只能与 --no-compare 一起使用）")
+    args = parser.parse_args(argv)
+
+    # 快速运行的结果波动太大，不能作为基准，也不能与基准比较
+    if args.quick and (args.save_baseline or not args.no_compare):
+        parser.error("--quick 只能与 --no-compare 一起使用，且不能保存为基准结果")
+
+    if args.quick:
+        report = run(args.filter, min_time=0.01, repeat=3)
+    else:
+        report = run(args.filter)
+
+    print(f"{'用例':<28}{'最快(us)':>12}{'中位(us)':>12}{'次数':>10}")
+    for name, result in report["results"].items():
+        print(f"{name:<28}{result['best_us']:>12.2f}{result['median_us']:>12.2f}{result['number']:>10}")
+    calibration = report["calibration"]
+    print(f"{'(校准循环)':<28}{calibration['best_us']:>12.2f}{calibration['median_us']:>12.2f}"
+          f"{calibration['number']:>10}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"已保存基准结果到 {args.baseline}")
+        return 0
+
+    if args.no_compare:
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\n没有基准结果 {args.baseline}，请先在本机干净的代码上运行 --save-baseline")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    try:
+        rows = compare(report, baseline, args.threshold)
+    except ValueError as e:
+        print(f"\n{e}")
+        return 1
+
+    print(f"\n与基准结果比较（{args.baseline}，按校准循环换算，阈值 +{args.threshold:.0%}）")
+    regressions = [row for row in rows if row[4]]
+    for name, base, current, ratio, regressed in rows:
+        mark = "  <-- 变慢" if regressed else ""
+        print(f"{name:<28}{base:>12.2f}{current:>12.2f}{ratio:>8.2f}x{mark}")
+
+    if regressions:
+        print(f"\n{len(regressions)} 个用例变慢超过 {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,30 +6,93 @@
 主程序入口
 """
 
+import argparse
+import os
 import pygame
 import sys
-from src.game_state import GameState
+from src.resource_manager import ResourceManager
+from src.save_system import SaveSystem
 from src.scene_manager import SceneManager
-
-# 初始化Pygame
-pygame.init()
+from src.startup import StartupTrace, init_pygame
 
 # 游戏窗口设置
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("奇幻小说TRPG游戏原型")
+
+# 帧率设置
+FPS = 60             # 场景需要持续更新时的帧率
+IDLE_TIMEOUT = 1000  # 空闲时最长等待输入的时间（毫秒）
+
+# 资源目录和磁盘缓存目录
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSET_DIR = os.path.join(BASE_DIR, "assets")
+CACHE_DIR = os.path.join(BASE_DIR, "cache")
+SAVE_PATH = os.path.join(BASE_DIR, "saves", "autosave.sav")
+
+# 命令行参数
+parser = argparse.ArgumentParser(description="奇幻小说TRPG游戏原型")
+parser.add_argument("--fast-boot", action="store_true",
+                    help="只初始化显示和字体模块，跳过其他子系统")
+parser.add_argument("--trace-startup", action="store_true", help="打印启动各阶段的耗时")
+parser.add_argument("--trace-json", help="把启动各阶段的耗时写入JSON文件")
+parser.add_argument("--profile", action="store_true",
+                    help="记录每帧各阶段的耗时并显示浮层（运行中按F3切换浮层）")
+parser.add_argument("--profile-trace", help="退出时把每帧各阶段的耗时导出为Chrome跟踪事件JSON")
+args = parser.parse_args()
+
+trace = StartupTrace()
+
+# 初始化Pygame
+with trace.phase("pygame_init"):
+    init_pygame(args.fast_boot)
+
+with trace.phase("display"):
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("奇幻小说TRPG游戏原型")
+
+# 加载资源
+with trace.phase("resources"):
+    resource_manager = ResourceManager(cache_dir=CACHE_DIR, asset_dir=ASSET_DIR)
+
+with trace.phase("fonts"):
+    for size in (16, 18, 24, 48):
+        resource_manager.get_font("simhei", size)
 
 # 初始化场景管理器
-scene_manager = SceneManager(screen)
+with trace.phase("scene_manager"):
+    save_system = SaveSystem(SAVE_PATH)
+    scene_manager = SceneManager(screen, resource_manager=resource_manager, save_system=save_system)
+    if args.profile or args.profile_trace:
+        scene_manager.enable_profiling()
+    if args.profile:
+        scene_manager.set_overlay_visible(True)
+
+# 绘制第一帧
+with trace.phase("first_frame"):
+    pygame.display.update(scene_manager.draw())
+
+if args.trace_startup:
+    print(trace.report())
+if args.trace_json:
+    trace.save(args.trace_json)
 
 # 游戏主循环
 clock = pygame.time.Clock()
 running = True
 
 while running:
+    continuous = scene_manager.needs_continuous_update()
+
+    # 获取事件：静止场景阻塞等待输入，不再以固定帧率空转
+    if continuous:
+        events = pygame.event.get()
+    else:
+        event = pygame.event.wait(IDLE_TIMEOUT)
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get())
+
     # 处理事件
-    for event in pygame.event.get():
+    for event in events:
         if event.type == pygame.QUIT:
             running = False
         scene_manager.handle_event(event)
@@ -37,14 +100,21 @@ while running:
     # 更新游戏状态
     scene_manager.update()
     
-    # 绘制画面
-    screen.fill((0, 0, 0))  # 清空屏幕，使用黑色背景
-    scene_manager.draw()
-    pygame.display.flip()  # 更新屏幕显示
+    # 绘制画面：只重绘并更新发生变化的区域，画面静止时不做任何绘制
+    dirty_rects = scene_manager.draw()
+    if dirty_rects:
+        pygame.display.update(dirty_rects)
     
-    # 控制帧率
-    clock.tick(60)
+    # 控制帧率（空闲等待已经限制了循环速度）
+    if continuous:
+        clock.tick(FPS)
 
 # 退出游戏
+if args.profile_trace:
+    scene_manager.profiler.save_chrome_trace(args.profile_trace)
+save_system.save(scene_manager)
+save_system.shutdown()
+scene_manager.shutdown()
+resource_manager.shutdown()
 pygame.quit()
 sys.exit()
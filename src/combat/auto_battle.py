@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+自动战斗
+在克隆的战斗状态上做前瞻模拟（rollout），为玩家选择释放技能和召唤盟友的时机；
+可以在战斗场景中按每帧的时间预算逐步搜索，也可以无界面地测量最优操作下的胜率
+"""
+
+import argparse
+import random
+import time
+
+from src.combat.battle_manager import BattleManager
+from src.combat.events import discard_event
+from src.combat.rng import make_rng
+from src.combat.simulator import BattleSimulator
+from src.combat.skills import CAST_OK, SUMMON_SKILL
+
+# 玩家的行动
+ACTION_SUMMON = "summon"  # 召唤盟友
+ACTION_SKILL = "skill"    # 释放主技能（技能栏的第一个技能）
+ACTION_WAIT = "wait"      # 暂不行动
+
+def summon_slot(unit):
+    """召唤技能在技能栏中的栏位
+
+    Args:
+        unit: 角色
+
+    Returns:
+        int: 栏位下标，技能栏中没有召唤技能时返回None
+    """
+    if not unit.skills:
+        return None
+    try:
+        return unit.skills.slot(SUMMON_SKILL)
+    except KeyError:
+        return None
+
+def available_actions(battle):
+    """当前可以执行的行动
+
+    Args:
+        battle: 战斗管理器
+
+    Returns:
+        list: 行动列表（召唤在前），不包括 ACTION_WAIT
+    """
+    # 技能可能已经结束了战斗，但 battle_active 要到下一次推进时才更新
+    if not battle.battle_active or battle.is_battle_over() or not battle.player.is_alive():
+        return []
+    actions = []
+    player = battle.player
+    slot = summon_slot(player)
+    if slot is not None and battle.check_cast(player, slot) == CAST_OK:
+        actions.append(ACTION_SUMMON)
+    if player.skills and battle.check_cast(player, 0) == CAST_OK:
+        actions.append(ACTION_SKILL)
+    return actions
+
+
+def evaluate(battle):
+    """评估战斗局面（从玩家方的角度）
+
+    Args:
+        battle: 战斗管理器
+
+    Returns:
+        float: 胜利加1、失败减1，再加上双方剩余生命值比例之差
+    """
+    ours = [battle.player] + battle.allies
+    ours_hp = sum(unit.current_hp for unit in ours) / sum(unit.max_hp for unit in ours)
+    theirs_hp = (sum(unit.current_hp for unit in battle.enemies)
+                 / sum(unit.max_hp for unit in battle.enemies))
+    score = ours_hp - theirs_hp
+    if not battle.enemy_side.alive:
+        score += 1.0
+    elif not battle.player_side.alive:
+        score -= 1.0
+    return score
+
+
+class AutoBattle:
+    """自动战斗控制器类
+
+    每当技能就绪或可以召唤时，把当前战斗保存为状态元组，对每个候选行动（包括暂不行动）
+    做若干次前瞻模拟：从状态元组克隆出独立的战斗，换用各自的随机数流，
+    先执行候选行动，之后按“能召唤就召唤、技能就绪就释放”的默认策略推进到战斗结束或前瞻时长，
+    取平均评估最高的行动。各候选行动使用相同的一组随机种子，比较更稳定。
+
+    think 每次调用只在时间预算内做模拟，没做完的部分留到下一帧继续；
+    play 不受预算限制，用于无界面地推进整场战斗。
+    """
+
+    def __init__(self, rollouts=8, horizon=20.0, wait_time=1.0,
+                 time_weight=0.1, wait_margin=0.05, budget=0.002, seed=None, clock=time.perf_counter):
+        """初始化自动战斗控制器
+
+        Args:
+            rollouts: 每个候选行动的模拟次数
+            horizon: 每次模拟最多推进的虚拟时间（秒）
+            wait_time: 选择暂不行动后，到下一次决策之间的虚拟时间（秒）
+            time_weight: 模拟用时的惩罚权重（用满前瞻时长时扣除的评估），使结果相同时倾向更快结束战斗
+            wait_margin: 暂不行动的平均评估至少要高出最好的行动这么多才会被选择，
+                避免模拟的随机误差让控制器无谓地拖延
+            budget: think 每次调用的时间预算（秒），为None时不限制
+            seed: 前瞻模拟的随机种子
+            clock: 计时函数（秒）
+        """
+        self.rollouts = rollouts
+        self.horizon = horizon
+        self.wait_time = wait_time
+        self.time_weight = time_weight
+        self.wait_margin = wait_margin
+        self.budget = budget
+        self.clock = clock
+        self.rng = random.Random(seed)
+
+        self.hold_until = None  # 选择暂不行动时，到这个虚拟时间之前不再决策
+        self.decisions = 0      # 完成的决策次数
+        self.simulations = 0    # 累计的模拟次数
+        self._reset_search()
+
+    def _reset_search(self):
+        """丢弃进行中的搜索"""
+        self._battle = None     # 搜索对应的战斗
+        self._snapshot = None   # 搜索开始时的战斗状态
+        self._work = []         # 尚未模拟的 (行动, 种子)
+        self._scores = {}       # 行动 -> 评估之和
+
+    def apply(self, battle, action):
+        """在战斗中执行行动
+
+        Args:
+            battle: 战斗管理器
+            action: 行动
+
+        Returns:
+            bool: 行动是否成功
+        """
+        if action == ACTION_SUMMON:
+            slot = summon_slot(battle.player)
+            return slot is not None and battle.cast(battle.player, slot) is not None
+        if action == ACTION_SKILL:
+            # 增益、治疗等技能成功释放时也不造成伤害，按 cast 是否释放判断
+            return battle.cast(battle.player, 0) is not None
+        return False
+
+    def think(self, battle, budget=None):
+        """在时间预算内推进决策
+
+        Args:
+            battle: 战斗管理器（只读取状态，不会修改）
+            budget: 本次的时间预算（秒），为None时使用控制器的预算
+
+        Returns:
+            str: 现在应该执行的行动，还没有决定或不需要行动时返回None
+        """
+        actions = available_actions(battle)
+        if not actions or (self.hold_until is not None and battle.time < self.hold_until):
+            self._reset_search()
+            return None
+
+        # 开始新的搜索（战斗被替换或可选行动变化时重新开始）
+        candidates = actions + [ACTION_WAIT]
+        if self._battle is not battle or set(self._scores) != set(candidates):
+            self._battle = battle
+            self._snapshot = battle.get_state()
+            seeds = [self.rng.getrandbits(32) for _ in range(self.rollouts)]
+            self._work = [(action, seed) for seed in seeds for action in candidates]
+            self._scores = dict.fromkeys(candidates, 0.0)
+
+        if budget is None:
+            budget = self.budget
+        deadline = None if budget is None else self.clock() + budget
+        while self._work:
+            action, seed = self._work.pop()
+            self._scores[action] += self.rollout(self._snapshot, action, seed)
+            if deadline is not None and self.clock() >= deadline:
+                break
+        if self._work:
+            return None
+
+        # 评估相同时按候选顺序优先行动；暂不行动需要明显更好
+        scores = self._scores
+        best = max(actions, key=lambda action: scores[action])
+        if scores[ACTION_WAIT] > scores[best] + self.wait_margin * self.rollouts:
+            best = ACTION_WAIT
+        self._reset_search()
+        self.decisions += 1
+        if best == ACTION_WAIT:
+            self.hold_until = battle.time + self.wait_time
+            return None
+        self.hold_until = None
+        return best
+
+    def rollout(self, snapshot, action, seed):
+        """从战斗状态出发模拟一次
+
+        Args:
+            snapshot: BattleManager.get_state 返回的状态
+            action: 先执行的行动
+            seed: 这次模拟的随机种子
+
+        Returns:
+            float: 模拟结束时的局面评估（扣除用时惩罚）
+        """
+        self.simulations += 1
+        battle = BattleManager.from_state(snapshot, event_sink=discard_event)
+        battle.rng = make_rng(seed, battle.rng.KIND)
+        start_time = battle.time
+        end_time = start_time + self.horizon
+
+        hold_until = battle.time
+        if action == ACTION_WAIT:
+            hold_until += self.wait_time
+        else:
+            self.apply(battle, action)
+
+        while battle.battle_active and battle.time < end_time:
+            stop_time = end_time
+            if battle.time >= hold_until:
+                for default_action in available_actions(battle):
+                    self.apply(battle, default_action)
+                ready_time = self._next_decision_time(battle)
+                if ready_time is not None and battle.time < ready_time < stop_time:
+                    stop_time = ready_time
+            else:
+                stop_time = min(stop_time, hold_until)
+            battle.advance_to(stop_time)
+        return evaluate(battle) - self.time_weight * (battle.time - start_time) / self.horizon
+
+    def _next_ready_time(self, battle):
+        """下一次可能有行动可选的虚拟时间
+
+        Args:
+            battle: 战斗管理器
+
+        Returns:
+            float: 虚拟时间，魔法值不足以再行动时返回None
+        """
+        player = battle.player
+        skills = player.skills
+        if not skills:
+            return None
+        mp = player.current_mp
+        times = []
+        slot = summon_slot(player)
+        if slot is not None:
+            skill = skills.skills[slot]
+            if (skill.max_allies is None or len(battle.allies) < skill.max_allies) and mp >= skill.mp_cost:
+                times.append(max(battle.time, skills.ready_time(slot)))
+        if mp >= skills.skills[0].mp_cost:
+            times.append(skills.ready_time(0))
+        return min(times) if times else None
+
+    def _next_decision_time(self, battle):
+        """下一次需要重新决策的虚拟时间
+
+        技能已经就绪却不能释放时（如被眩晕或暂时没有目标），推进到下一次单位行动，
+        最多推进 wait_time，状态变化后能及时重新决策，不会直接跳到战斗的最长时间。
+
+        Args:
+            battle: 战斗管理器
+
+        Returns:
+            float: 晚于当前时间的虚拟时间，魔法值不足以再行动时返回None
+        """
+        ready_time = self._next_ready_time(battle)
+        if ready_time is None or ready_time > battle.time:
+            return ready_time
+        ready_time = battle.time + self.wait_time
+        next_action = battle.scheduler.peek_time()
+        if next_action is not None and battle.time < next_action < ready_time:
+            ready_time = next_action
+        return ready_time
+
+    def play(self, battle, max_time=300.0):
+        """无界面地由控制器操作整场战斗
+
+        Args:
+            battle: 战斗管理器
+            max_time: 最长虚拟时间（秒）
+
+        Returns:
+            float: 战斗用时（虚拟秒）
+        """
+        self._reset_search()
+        self.hold_until = None
+        while battle.battle_active and battle.time < max_time:
+            action = self.think(battle, budget=None)
+            if action is not None and self.apply(battle, action):
+                continue
+
+            # 跳到下一次决策的时间
+            stop_time = max_time
+            ready_time = self._next_decision_time(battle)
+            if ready_time is not None:
+                if self.hold_until is not None:
+                    ready_time = max(ready_time, self.hold_until)
+                if battle.time < ready_time < stop_time:
+                    stop_time = ready_time
+            battle.advance_to(stop_time)
+        return battle.time
+
+
+def main(argv=None):
+    """命令行入口：比较自动战斗与简单策略的胜率
+
+    Args:
+        argv: 命令行参数列表，为None时读取sys.argv
+    """
+    parser = argparse.ArgumentParser(description="测量自动战斗（前瞻搜索）下的胜率")
+    parser.add_argument("-n", "--battles", type=int, default=200, help="战斗场数")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子")
+    parser.add_argument("--rollouts", type=int, default=8, help="每个候选行动的模拟次数")
+    parser.add_argument("--horizon", type=float, default=20.0, help="每次模拟的前瞻时长（秒）")
+    args = parser.parse_args(argv)
+
+    controller = AutoBattle(rollouts=args.rollouts, horizon=args.horizon, budget=None, seed=args.seed)
+    runs = (
+        ("不操作", BattleSimulator(seed=args.seed)),
+        ("开场召唤+自动技能", BattleSimulator(summon=True, use_skill=True, seed=args.seed)),
+        ("自动战斗", BattleSimulator(seed=args.seed, auto_battle=controller)),
+    )
+    for name, simulator in runs:
+        summary = simulator.run(args.battles).summary()
+        print(f"{name}: 胜率 {summary['win_rate']:.2%}  击杀时间 p50 {summary['time_to_kill']['p50']:.2f}s  "
+              f"{summary['battles_per_second']:.0f} 场/秒")
+    print(f"自动战斗: 平均每场决策 {controller.decisions / args.battles:.1f} 次, "
+          f"模拟 {controller.simulations / args.battles:.0f} 次")
+
+
+if __name__ == "__main__":
+    main()
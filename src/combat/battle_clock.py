@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+战斗时钟
+把真实经过的时间按倍速换算为战斗虚拟时间，以固定步长推进战斗；
+支持瞬间结算以及战斗中途的检查点保存与恢复
+"""
+
+from src.combat.battle_manager import BattleManager
+
+# 瞬间结算：不经过中间帧，直接算出战斗结果
+SPEED_INSTANT = 0
+
+# 可选的速度（按顺序切换）
+SPEEDS = (1, 2, 4, SPEED_INSTANT)
+
+# 瞬间结算最多推进的虚拟时间（秒），避免双方都无法造成伤害时无限推进
+RESOLVE_LIMIT = 3600.0
+
+
+def speed_label(speed):
+    """速度的显示文字
+
+    Args:
+        speed: 速度倍数或 SPEED_INSTANT
+
+    Returns:
+        str: 显示文字
+    """
+    return "瞬间" if speed == SPEED_INSTANT else f"{speed}×"
+
+
+class BattleClock:
+    """战斗时钟类
+
+    战斗只在虚拟时间上推进，与渲染帧率和真实时间无关：每帧把经过的真实时间乘以倍速
+    累加起来，凑够整数个步长后一次推进；BattleManager 会按时间顺序补齐这段时间内的所有攻击，
+    卡顿的一帧不会丢失攻击。检查点只保存数值元组，保存和恢复都与战斗进行了多久无关。
+    """
+
+    def __init__(self, battle, step=1 / 60, speed=1, resolve_limit=RESOLVE_LIMIT):
+        """初始化战斗时钟
+
+        Args:
+            battle: 战斗管理器
+            step: 推进战斗的固定步长（秒）
+            speed: 初始速度
+            resolve_limit: 瞬间结算最多推进的虚拟时间（秒）
+        """
+        self.battle = battle
+        self.step = step
+        self.speed = speed
+        self.resolve_limit = resolve_limit
+        self.accumulator = 0.0  # 尚未推进到战斗中的虚拟时间
+
+    def reset(self):
+        """丢弃尚未推进的时间（例如重新进入场景时）"""
+        self.accumulator = 0.0
+
+    def set_speed(self, speed):
+        """设置速度
+
+        Args:
+            speed: SPEEDS 中的一个值
+
+        Raises:
+            ValueError: 不支持的速度
+        """
+        if speed not in SPEEDS:
+            raise ValueError(f"不支持的战斗速度: {speed}")
+        self.speed = speed
+
+    def cycle_speed(self):
+        """切换到下一档速度
+
+        Returns:
+            int: 新的速度
+        """
+        self.speed = SPEEDS[(SPEEDS.index(self.speed) + 1) % len(SPEEDS)]
+        return self.speed
+
+    def tick(self, real_elapsed):
+        """按经过的真实时间推进战斗
+
+        Args:
+            real_elapsed: 经过的真实时间（秒）
+
+        Returns:
+            list: 战斗事件列表
+        """
+        if self.speed == SPEED_INSTANT:
+            return self.resolve()
+
+        self.accumulator += real_elapsed * self.speed
+        steps = int(self.accumulator / self.step)
+        if steps == 0:
+            return []
+        self.accumulator -= steps * self.step
+        return self.battle.update(steps * self.step)
+
+    def resolve(self):
+        """瞬间结算：直接推进到战斗结束（最多 resolve_limit 秒）
+
+        调度器直接跳到每个单位的下一次行动时间，不经过中间的步长和帧。
+
+        Returns:
+            list: 战斗事件列表
+        """
+        self.accumulator = 0.0
+        return self.battle.advance_to(self.battle.time + self.resolve_limit)
+
+    def checkpoint(self):
+        """保存检查点
+
+        Returns:
+            tuple: (战斗状态, 尚未推进的时间)
+        """
+        return (self.battle.get_state(), self.accumulator)
+
+    def restore(self, checkpoint):
+        """恢复检查点
+
+        战斗管理器和角色都会重新创建，调用方需要改用返回的战斗管理器。
+
+        Args:
+            checkpoint: checkpoint 返回的检查点
+
+        Returns:
+            BattleManager: 恢复的战斗管理器
+        """
+        state, self.accumulator = checkpoint
+        self.battle = BattleManager.from_state(state)
+        return self.battle
@@ -6,82 +6,326 @@
 管理战斗流程和逻辑
 """
 
-import random
+from src.combat.character import Character
+from src.combat.events import (
+    BattleEvent, EVENT_ATTACK, EVENT_SKILL, EVENT_SUMMON, EVENT_DEATH, EVENT_EFFECT, EVENT_EXPIRE, EVENT_DOT,
+    EVENT_CAST
+)
+from src.combat.rng import BattleRNG, make_rng
+from src.combat.scheduler import ActionScheduler
+from src.combat.skills import (
+    CAST_OK, CAST_COOLDOWN, CAST_STUNNED, CAST_NO_TARGET, CAST_LIMIT, CAST_NO_MP,
+    TARGET_ENEMY, TARGET_ALL_ENEMIES, TARGET_SELF, TARGET_ALLIES, SkillBook, get_loadout
+)
+from src.combat.status_effects import UnitStatus, get_effect
+from src.combat.targeting import BattleSide, FrontTarget, LeaderTarget, UnitSet, make_policy, policy_name
+from src.combat.timer_wheel import TimerWheel
+
+# 输入记录类型
+INPUT_SKILL = 1   # 玩家释放技能（记录技能栏位）
+INPUT_SUMMON = 2  # 盟友加入战斗
+
+# 时间轮中的定时器类型
+_TIMER_EXPIRE = 0  # 状态效果结束
+_TIMER_TICK = 1    # 持续伤害跳一次
 
 class BattleManager:
-    """战斗管理器类"""
+    """战斗管理器类
+
+    玩家和盟友为一方，一个或多个敌人为另一方。每一方维护存活单位集合和计数，
+    单位阵亡时增量更新，判断战斗结束只需检查计数。
+    状态效果的结束和持续伤害由时间轮触发，与单位的行动按时间顺序交替结算。
+    """
     
-    def __init__(self, player, enemy):
+    def __init__(self, player, enemy, rng=None, seed=None, event_sink=None,
+                 player_policy=None, enemy_policy=None, player_skills=None):
         """初始化战斗管理器
         
         Args:
             player: 玩家角色
-            enemy: 敌人角色
+            enemy: 敌人角色，或多个敌人的列表（第一个为首领）
+            rng: 随机数生成器（需提供 random/uniform/choice），为None时按种子创建 BattleRNG
+            seed: 随机种子，仅在未提供 rng 时使用
+            event_sink: 事件接收函数，参数为 (kind, time, source, target, value)；
+                为None时事件缓存为 BattleEvent，由 update 返回
+            player_policy: 玩家方的目标选择策略（对象或名称），默认攻击最前排的敌人
+            enemy_policy: 敌方的目标选择策略（对象或名称），默认按一半几率攻击盟友，否则攻击玩家
+            player_skills: 玩家的技能列表（技能或技能名称），默认使用技能数据中的 player 技能栏；
+                第一个技能为主技能（player_use_skill 释放的技能）
         """
         self.player = player
-        self.enemy = enemy
+        self.enemies = list(enemy) if isinstance(enemy, (list, tuple)) else [enemy]
+        self.enemy = self.enemies[0]  # 首领敌人
         self.allies = []  # 盟友列表
         
+        # 双方的存活集合与目标选择策略
+        self.player_side = BattleSide([player])
+        self.enemy_side = BattleSide(self.enemies)
+        self.player_side.engage(self.enemy_side, make_policy(player_policy) or FrontTarget())
+        self.enemy_side.engage(self.player_side, make_policy(enemy_policy) or LeaderTarget())
+        self._side_of = {player: self.player_side}
+        for unit in self.enemies:
+            self._side_of[unit] = self.enemy_side
+        
+        # 每场战斗独立的随机数流
+        self.rng = rng if rng is not None else BattleRNG(seed)
+        
+        # 玩家输入记录，配合初始状态和种子可以逐位重现整场战斗
+        self.input_log = []
+        self.opening_inputs = None  # 第一次推进时间之前的输入条数
+        
+        # 战斗事件：默认缓存到下一次 update 返回，也可以直接交给接收器聚合
+        self._pending_events = []
+        self._emit = self._buffer_event if event_sink is None else event_sink
+        
         # 战斗状态
         self.battle_active = True
+        self.time = 0.0  # 战斗虚拟时间（秒）
         
         # 冷却时间常量
-        self.SKILL_COOLDOWN = 5.0  # 技能冷却时间（秒）
         self.GCD = 1.5             # 公共冷却时间（秒）
+        
+        # 玩家的技能栏，每场战斗重新开始计算冷却
+        if player_skills is None:
+            player_skills = get_loadout("player")
+        player.skills = SkillBook(player_skills)
+        
+        # 按下一次攻击时间调度所有单位
+        self.scheduler = ActionScheduler()
+        self.scheduler.schedule(player, player.attack_cooldown)
+        for unit in self.enemies:
+            self.scheduler.schedule(unit, unit.attack_cooldown)
+        
+        # 状态效果的定时器
+        self.timers = TimerWheel()
     
-    def update(self, elapsed_time):
-        """更新战斗状态
+    def get_state(self):
+        """获取战斗的完整状态（用于存档）
+        
+        状态只包含当前的单位、行动时间和随机数状态，与战斗已经进行了多久无关；
+        玩家输入记录不包括在内。
+        
+        Returns:
+            tuple: (虚拟时间, 技能栏 (单位下标, 技能栏状态), 是否进行中, 随机数类型, 随机数状态,
+                单位状态元组, 盟友数, 按出队顺序的 (单位下标, 行动时间),
+                状态效果 (单位下标, 效果名称, 施加者下标, 层数, 结束时间, 下一跳时间, 剩余护盾),
+                目标选择 (玩家方, 敌方)，每方为 (策略名称, 策略状态, 存活单位下标)；
+                自定义的策略类没有名称，恢复时使用默认策略)
+        """
+        units = [self.player] + self.enemies + self.allies
+        index = {unit: i for i, unit in enumerate(units)}
+        scheduled = tuple((index[unit], time) for unit, time in self.scheduler.ordered_items())
+        effects = tuple(
+            (i, name, index.get(active.source, -1), active.stacks,
+             active.expire_time, active.next_tick, active.shield)
+            for i, unit in enumerate(units) if unit.status is not None
+            for name, active in unit.status.effects.items()
+        )
+        skills = tuple((i, unit.skills.get_state()) for i, unit in enumerate(units) if unit.skills is not None)
+        targeting = tuple(
+            (policy_name(side.policy), side.policy.get_state(index), tuple(index[unit] for unit in side.alive.items))
+            for side in (self.player_side, self.enemy_side)
+        )
+        return (self.time, skills, self.battle_active,
+                self.rng.KIND, self.rng.getstate(), tuple(unit.get_state() for unit in units),
+                len(self.allies), scheduled, effects, targeting)
+    
+    @classmethod
+    def from_state(cls, state, event_sink=None):
+        """根据 get_state 返回的状态恢复战斗
         
         Args:
-            elapsed_time: 经过的时间（秒）
+            state: 战斗状态元组
+            event_sink: 事件接收函数，含义与构造函数相同
             
         Returns:
-            list: 战斗事件消息列表
+            BattleManager: 恢复的战斗管理器
         """
-        if not self.battle_active:
-            return []
+        (time, skills, battle_active,
+         rng_kind, rng_state, unit_states, ally_count, scheduled, effects, targeting) = state
+        units = [Character.from_state(unit_state) for unit_state in unit_states]
+        enemy_end = len(units) - ally_count
+        
+        rng = make_rng(0, rng_kind)
+        rng.setstate(rng_state)
+        rng.initial_seed = None  # 恢复的随机数流无法从种子重现
         
-        events = []
+        (player_policy, player_policy_state, player_alive), (enemy_policy, enemy_policy_state, enemy_alive) = targeting
+        battle = cls(units[0], units[1:enemy_end], rng=rng, event_sink=event_sink, player_skills=(),
+                     player_policy=player_policy, enemy_policy=enemy_policy)
+        for ally in units[enemy_end:]:
+            battle._join_ally(ally)
         
-        # 更新玩家冷却时间
-        self._update_cooldowns(self.player, elapsed_time)
+        # 存活集合和策略的内部顺序决定随机选择的结果，按原样恢复
+        sides = ((battle.player_side, player_policy, player_policy_state, player_alive),
+                 (battle.enemy_side, enemy_policy, enemy_policy_state, enemy_alive))
+        for side, _, _, alive in sides:
+            side.alive = UnitSet()
+            for index in alive:
+                side.alive.add(units[index])
+        for side, name, policy_state, _ in sides:
+            side.policy.rebuild(side.opponents)
+            if name is not None:
+                side.policy.set_state(policy_state, units)
         
-        # 更新敌人冷却时间
-        self._update_cooldowns(self.enemy, elapsed_time)
+        # 按原来的出队顺序重新调度
+        battle.scheduler = ActionScheduler()
+        for index, action_time in scheduled:
+            battle.scheduler.schedule(units[index], action_time)
         
-        # 更新盟友冷却时间
-        for ally in self.allies:
-            self._update_cooldowns(ally, elapsed_time)
+        battle.time = time
+        for index, book_state in skills:
+            units[index].skills = SkillBook.from_state(book_state)
+        battle.battle_active = battle_active
+        battle.opening_inputs = 0
+        
+        # 状态效果按原来的施加顺序恢复，定时器按原来的时间重新加入时间轮
+        battle.timers = TimerWheel(start_time=time)
+        for index, name, source_index, stacks, expire_time, next_tick, shield in effects:
+            unit = units[index]
+            if unit.status is None:
+                unit.status = UnitStatus(unit)
+            source = units[source_index] if source_index >= 0 else None
+            active = unit.status.restore(get_effect(name), unit, source, stacks, shield)
+            if expire_time is not None:
+                battle._set_expiry(active, expire_time)
+            if next_tick is not None:
+                battle._schedule_tick(active, next_tick)
+        
+        battle.sync_cooldowns()
+        return battle
+    
+    def update(self, elapsed_time):
+        """更新战斗状态
+
+        只处理行动时间已到的单位；一次更新跨越多个攻击间隔时，
+        会按时间顺序补齐期间的所有攻击。
+
+        Args:
+            elapsed_time: 经过的时间（秒）
+            
+        Returns:
+            list: 战斗事件列表（BattleEvent）
+        """
+        return self.advance_to(self.time + elapsed_time)
+    
+    def advance_to(self, end_time):
+        """将战斗推进到指定的虚拟时间
+        
+        攻击时间只取决于各单位的攻击间隔，与推进的步长无关，
+        因此回放时直接推进到每条输入的时间即可重现原战斗。
+        
+        Args:
+            end_time: 目标虚拟时间（秒）
+            
+        Returns:
+            list: 战斗事件列表（BattleEvent），包括上次更新以来技能和召唤产生的事件
+        """
+        if self.opening_inputs is None:
+            self.opening_inputs = len(self.input_log)
         
-        # 处理自动攻击
-        if self.player.is_alive() and self.player.attack_cooldown <= 0:
-            events.append(self._process_attack(self.player, self.enemy))
+        # 技能等输入可能已经在两次更新之间结束了战斗
+        if self.battle_active and self.is_battle_over():
+            self.battle_active = False
+        if not self.battle_active:
+            return self._flush_events()
         
-        if self.enemy.is_alive() and self.enemy.attack_cooldown <= 0:
-            target = self._get_enemy_target()
-            if target:
-                events.append(self._process_attack(self.enemy, target))
+        # 循环每次攻击执行一次，常用的属性和方法先绑定为局部变量
+        pop_due = self.scheduler.pop_due
+        schedule = self.scheduler.schedule
+        side_of = self._side_of
+        timers = self.timers
+        rng = self.rng
         
-        for ally in self.allies:
-            if ally.is_alive() and ally.attack_cooldown <= 0:
-                events.append(self._process_attack(ally, self.enemy))
+        while True:
+            due = pop_due(end_time)
+            if due is None:
+                break
+            action_time, unit = due
+            
+            # 先结算这次行动之前到期的状态效果（持续伤害可能结束战斗）
+            if timers.count and self._fire_timers(action_time):
+                break
+            
+            # 阵亡单位不再行动，也不再调度
+            if not unit.is_alive():
+                side_of[unit].mark_dead(unit)
+                continue
+            
+            # 眩晕的单位跳过这次行动
+            status = unit.status
+            if status is not None and status.stunned:
+                schedule(unit, action_time + unit.get_attack_interval())
+                continue
+            
+            self.time = action_time
+            target = side_of[unit].policy.select(rng)
+            if target is None:
+                # 暂时没有目标，下一个攻击间隔再尝试
+                schedule(unit, action_time + unit.get_attack_interval())
+                continue
+            
+            self._process_attack(unit, target)
+            schedule(unit, action_time + unit.attack_cooldown)
+            
+            # 攻击只改变目标的生命值，目标存活时战斗不会因这次攻击结束
+            if not target.is_alive() and self.is_battle_over():
+                break
         
-        # 检查战斗是否结束
-        if self.is_battle_over():
+        # 检查战斗是否结束；结束时虚拟时间停在最后一次行动的时刻
+        over = self.is_battle_over()
+        if not over and timers.count:
+            over = self._fire_timers(end_time) or self.is_battle_over()
+        if over:
             self.battle_active = False
+        else:
+            self.time = end_time
+        self._sync_player_cooldowns()
+        
+        return self._flush_events()
+    
+    def _buffer_event(self, kind, time, source, target, value):
+        """缓存一条战斗事件（默认的事件接收器）"""
+        self._pending_events.append(BattleEvent(kind, time, source, target, value))
+    
+    def _flush_events(self):
+        """取出缓存的战斗事件
         
+        Returns:
+            list: 战斗事件列表
+        """
+        events = self._pending_events
+        if events:
+            self._pending_events = []
         return events
     
-    def _update_cooldowns(self, character, elapsed_time):
-        """更新角色的冷却时间
+    def time_until_next_action(self):
+        """获取距离下一次自动攻击的时间
         
-        Args:
-            character: 角色对象
-            elapsed_time: 经过的时间（秒）
+        Returns:
+            float: 距离下一次自动攻击的时间（秒），没有待行动单位时返回None
         """
-        character.attack_cooldown = max(0, character.attack_cooldown - elapsed_time)
-        character.skill_cooldown = max(0, character.skill_cooldown - elapsed_time)
-        character.gcd = max(0, character.gcd - elapsed_time)
+        next_time = self.scheduler.peek_time()
+        if next_time is None:
+            return None
+        return max(0.0, next_time - self.time)
+    
+    def sync_cooldowns(self):
+        """将调度器中的行动时间同步到所有角色的冷却字段
+        
+        update 只会刷新玩家和刚行动过的单位，需要读取其他单位的冷却时调用。
+        """
+        for unit, action_time in self.scheduler.items():
+            unit.attack_cooldown = max(0, action_time - self.time)
+        self._sync_player_cooldowns()
+    
+    def _sync_player_cooldowns(self):
+        """刷新玩家的冷却字段（供界面和技能判断读取）"""
+        player = self.player
+        attack_time = self.scheduler.time_of(player)
+        if attack_time is not None:
+            player.attack_cooldown = max(0, attack_time - self.time)
+        player.gcd = max(0, player.skills.gcd_ready - self.time)
     
     def _process_attack(self, attacker, target):
         """处理攻击
@@ -91,85 +335,370 @@ class BattleManager:
             target: 目标
             
         Returns:
-            str: 攻击事件消息
+            int: 实际造成的伤害
         """
         # 计算伤害
         base_damage = attacker.attack
-        variation = random.uniform(0.8, 1.2)  # 伤害浮动
+        variation = self.rng.uniform(0.8, 1.2)  # 伤害浮动
         damage = int(base_damage * variation)
         
         # 目标受到伤害
-        actual_damage = target.take_damage(damage)
+        actual_damage = self._deal_damage(attacker, target, damage)
         
         # 重置攻击冷却
         attacker.attack_cooldown = attacker.get_attack_interval()
         
-        return f"{attacker.name}攻击了{target.name}，造成{actual_damage}点伤害！"
+        self._emit(EVENT_ATTACK, self.time, attacker, target, actual_damage)
+        if not target.is_alive():
+            self._emit(EVENT_DEATH, self.time, attacker, target, 0)
+        
+        return actual_damage
     
-    def _get_enemy_target(self):
-        """获取敌人的攻击目标
+    def _deal_damage(self, attacker, target, damage):
+        """结算伤害并通知双方阵营（更新存活集合和目标选择策略）
         
+        Args:
+            attacker: 攻击者
+            target: 目标
+            damage: 伤害值（减防御前）
+            
         Returns:
-            Character: 目标角色
+            int: 实际造成的伤害
         """
-        # 如果有盟友，有50%几率攻击盟友
-        if self.allies and random.random() < 0.5:
-            # 选择一个存活的盟友
-            alive_allies = [ally for ally in self.allies if ally.is_alive()]
-            if alive_allies:
-                return random.choice(alive_allies)
-        
-        # 否则攻击玩家
-        if self.player.is_alive():
-            return self.player
-        
-        return None
+        actual_damage = target.take_damage(damage)
+        target_side = self._side_of[target]
+        target_side.hp_changed(target)
+        if attacker is not None:
+            self._side_of[attacker].dealt(attacker, actual_damage)
+        if not target.is_alive():
+            target_side.mark_dead(target)
+            if target.status is not None:
+                self._clear_effects(target)
+        return actual_damage
     
     def player_use_skill(self):
-        """玩家使用技能
+        """玩家释放主技能（技能栏的第一个技能）
         
         Returns:
-            int: 造成的伤害
+            int: 造成的伤害，没有释放时返回0
         """
-        # 检查冷却和魔法值
-        if self.player.skill_cooldown > 0 or self.player.gcd > 0:
-            return 0
+        return self.cast(self.player, 0) or 0
+    
+    def check_cast(self, unit, slot):
+        """检查单位现在能否释放技能（不消耗随机数）
         
-        if not self.player.use_mp(10):
-            return 0
+        Args:
+            unit: 施法者
+            slot: 技能栏位
+            
+        Returns:
+            int: CAST_OK 或不能释放的原因（CAST_*）
+        """
+        book = unit.skills
+        skill = book.skills[slot]
+        time = self.time
+        if time < book.ready[slot] or (skill.gcd and time < book.gcd_ready):
+            return CAST_COOLDOWN
+        if unit.status is not None and unit.status.stunned:
+            return CAST_STUNNED
+        target = skill.target
+        if (target == TARGET_ENEMY or target == TARGET_ALL_ENEMIES) and not self._side_of[unit].opponents.alive.items:
+            return CAST_NO_TARGET
+        if skill.max_allies is not None and len(self.allies) >= skill.max_allies:
+            return CAST_LIMIT
+        if unit.current_mp < skill.mp_cost:
+            return CAST_NO_MP
+        return CAST_OK
+    
+    def cast(self, unit, slot):
+        """释放技能
         
-        # 计算技能伤害
-        base_damage = self.player.attack * 2
-        variation = random.uniform(0.9, 1.1)
-        damage = int(base_damage * variation)
+        选定目标后扣除魔法值、设置冷却，再对每个目标依次执行技能编译好的操作。
+        
+        Args:
+            unit: 施法者
+            slot: 技能栏位
+            
+        Returns:
+            int: 造成的总伤害，不能释放时返回None
+        """
+        if self.check_cast(unit, slot) != CAST_OK:
+            return None
+        book = unit.skills
+        skill = book.skills[slot]
+        side = self._side_of[unit]
+        
+        # 单体技能的目标与自动攻击的目标相同
+        target = skill.target
+        if target == TARGET_ENEMY:
+            enemy = side.policy.select(self.rng)
+            if enemy is None:
+                return None
+            targets = (enemy,)
+        elif target == TARGET_ALL_ENEMIES:
+            targets = [enemy for enemy in side.opponents.units if enemy.is_alive()]
+        elif target == TARGET_SELF:
+            targets = (unit,)
+        elif target == TARGET_ALLIES:
+            targets = [ally for ally in side.units if ally.is_alive()]
+        else:
+            targets = (None,)
+        if not targets:
+            # 存活集合中的单位可能已在外部阵亡，没有存活目标时不释放，也不消耗魔法值和冷却
+            return None
         
-        # 敌人受到伤害
-        actual_damage = self.enemy.take_damage(damage)
+        unit.use_mp(skill.mp_cost)
+        book.ready[slot] = self.time + skill.cooldown
+        if skill.gcd:
+            book.gcd_ready = self.time + self.GCD
+            unit.gcd = self.GCD
+        if unit is self.player:
+            self.input_log.append((self.time, INPUT_SKILL, slot))
+        self._emit(EVENT_CAST, self.time, unit, targets[0], skill)
         
-        # 设置冷却
-        self.player.skill_cooldown = self.SKILL_COOLDOWN
-        self.player.gcd = self.GCD
+        damage = 0
+        for target in targets:
+            for op in skill.ops:
+                damage += op(self, unit, target)
+        return damage
+    
+    def skill_hit(self, caster, target, damage):
+        """技能命中目标（供技能的伤害操作调用）
         
+        Args:
+            caster: 施法者
+            target: 目标
+            damage: 伤害值（减防御前）
+            
+        Returns:
+            int: 实际造成的伤害
+        """
+        actual_damage = self._deal_damage(caster, target, damage)
+        self._emit(EVENT_SKILL, self.time, caster, target, actual_damage)
+        if not target.is_alive():
+            self._emit(EVENT_DEATH, self.time, caster, target, 0)
         return actual_damage
     
+    def skill_summon(self, caster, ally):
+        """技能召唤的盟友加入战斗（供技能的召唤操作调用，不单独记录输入）
+        
+        Args:
+            caster: 施法者
+            ally: 盟友角色
+        """
+        self._join_ally(ally)
+        self._emit(EVENT_SUMMON, self.time, caster, ally, 0)
+    
     def add_ally(self, ally):
         """添加盟友
         
+        Args:
+            ally: 盟友角色
+        """
+        self.input_log.append((self.time, INPUT_SUMMON, ally.get_state(), 0))
+        self._join_ally(ally)
+        self._emit(EVENT_SUMMON, self.time, None, ally, 0)
+    
+    def summon_ally(self, ally, mp_cost):
+        """玩家消耗魔法值召唤盟友
+        
+        Args:
+            ally: 盟友角色
+            mp_cost: 消耗的魔法值
+            
+        Returns:
+            bool: 是否召唤成功
+        """
+        if not self.player.use_mp(mp_cost):
+            return False
+        
+        self.input_log.append((self.time, INPUT_SUMMON, ally.get_state(), mp_cost))
+        self._join_ally(ally)
+        self._emit(EVENT_SUMMON, self.time, self.player, ally, mp_cost)
+        return True
+    
+    def _join_ally(self, ally):
+        """让盟友加入战斗并开始调度
+        
         Args:
             ally: 盟友角色
         """
         self.allies.append(ally)
+        self._side_of[ally] = self.player_side
+        self.player_side.join(ally)
+        self.scheduler.schedule(ally, self.time + ally.attack_cooldown)
+    
+    def apply_effect(self, target, effect, source=None):
+        """对角色施加状态效果
+        
+        已有同名效果时叠加一层并刷新持续时间。
+        
+        Args:
+            target: 目标角色
+            effect: 效果定义或已登记的效果名称
+            source: 施加者（持续伤害计入施加者造成的伤害）
+            
+        Returns:
+            ActiveEffect: 生效中的效果，目标已阵亡时返回None
+        """
+        if not target.is_alive():
+            return None
+        effect = get_effect(effect)
+        if target.status is None:
+            target.status = UnitStatus(target)
+        active = target.status.add(effect, target, source)
+        active.source = source
+        
+        if effect.duration is not None:
+            self._set_expiry(active, self.time + effect.duration)
+        if effect.tick_interval and active.tick_timer is None:
+            self._schedule_tick(active, self.time + effect.tick_interval)
+        
+        self._emit(EVENT_EFFECT, self.time, source, target, effect)
+        return active
+    
+    def remove_effect(self, target, name):
+        """移除角色身上的状态效果
+        
+        Args:
+            target: 角色
+            name: 效果名称
+            
+        Returns:
+            ActiveEffect: 移除的效果，没有该效果时返回None
+        """
+        status = target.status
+        if status is None:
+            return None
+        active = status.remove(name, target)
+        if active is None:
+            return None
+        self._cancel_timers(active)
+        if not status.effects:
+            status.restore_base(target)
+            target.status = None
+        self._emit(EVENT_EXPIRE, self.time, None, target, active.effect)
+        return active
+    
+    def _clear_effects(self, unit):
+        """清除阵亡单位身上的所有效果（不产生事件）
+        
+        Args:
+            unit: 角色
+        """
+        for active in unit.status.effects.values():
+            self._cancel_timers(active)
+        unit.status.restore_base(unit)
+        unit.status = None
+    
+    def _set_expiry(self, active, expire_time):
+        """设置（或刷新）效果的结束时间
+        
+        Args:
+            active: 生效中的效果
+            expire_time: 结束时间（虚拟秒）
+        """
+        if active.expire_timer is not None:
+            self.timers.cancel(active.expire_timer)
+        active.expire_time = expire_time
+        active.expire_timer = self.timers.schedule(expire_time, (_TIMER_EXPIRE, active), self.time)
+    
+    def _schedule_tick(self, active, tick_time):
+        """调度持续伤害的下一跳
+        
+        Args:
+            active: 生效中的效果
+            tick_time: 下一跳的时间（虚拟秒）
+        """
+        active.next_tick = tick_time
+        active.tick_timer = self.timers.schedule(tick_time, (_TIMER_TICK, active), self.time)
+    
+    def _cancel_timers(self, active):
+        """取消效果的所有定时器
+        
+        Args:
+            active: 生效中的效果
+        """
+        if active.expire_timer is not None:
+            self.timers.cancel(active.expire_timer)
+            active.expire_timer = None
+        if active.tick_timer is not None:
+            self.timers.cancel(active.tick_timer)
+            active.tick_timer = None
+    
+    def _fire_timers(self, now):
+        """按时间顺序结算到期的状态效果定时器
+        
+        Args:
+            now: 当前虚拟时间（秒）
+            
+        Returns:
+            bool: 持续伤害结束了战斗时返回True
+        """
+        timers = self.timers
+        while timers.count:
+            due = timers.pop_due(now)
+            if due is None:
+                break
+            fire_time, (kind, active) = due
+            if fire_time > self.time:
+                self.time = fire_time
+            
+            if kind == _TIMER_EXPIRE:
+                active.expire_timer = None
+                # 与结束同一时刻到期的最后一跳先结算，跳数与时间轮中的顺序无关
+                if active.tick_timer is not None and active.next_tick <= active.expire_time + 1e-9:
+                    self.timers.cancel(active.tick_timer)
+                    active.tick_timer = None
+                    if self._dot_tick(active):
+                        return True
+                self.remove_effect(active.unit, active.effect.name)
+                continue
+            
+            active.tick_timer = None
+            if self._dot_tick(active):
+                return True
+        return False
+    
+    def _dot_tick(self, active):
+        """结算一跳持续伤害并调度下一跳
+        
+        Args:
+            active: 生效中的效果
+            
+        Returns:
+            bool: 这一跳结束了战斗时返回True
+        """
+        # 施加者已阵亡时不再计入其伤害
+        unit = active.unit
+        source = active.source
+        if source is not None and not source.is_alive():
+            source = None
+        damage = self._deal_damage(source, unit, active.effect.tick_damage * active.stacks)
+        self._emit(EVENT_DOT, self.time, source, unit, damage)
+        if not unit.is_alive():
+            self._emit(EVENT_DEATH, self.time, source, unit, 0)
+            return self.is_battle_over()
+        # 从这一跳的原定时间起算，间隔不会因时间轮的量化而累积漂移
+        self._schedule_tick(active, active.next_tick + active.effect.tick_interval)
+        return False
     
     def is_battle_over(self):
         """检查战斗是否结束
         
+        通常只检查双方存活集合中的一个单位；在战斗管理器之外直接修改的生命值也会被发现。
+        
         Returns:
             bool: 战斗是否结束
         """
-        # 如果玩家和所有盟友都阵亡，战斗失败
-        player_side_alive = self.player.is_alive() or any(ally.is_alive() for ally in self.allies)
-        
-        # 如果敌人阵亡，战斗胜利
-        enemy_side_alive = self.enemy.is_alive()
+        # 玩家和所有盟友都阵亡为失败，所有敌人阵亡为胜利
+        return not self.player_side.has_alive() or not self.enemy_side.has_alive()
+    
+    def refresh_alive(self):
+        """按当前生命值重建双方的存活集合
         
-        return not player_side_alive or not enemy_side_alive
+        战斗中的伤害会自动更新存活集合，is_battle_over 也会发现外部修改的生命值；
+        在战斗管理器之外复活了单位、希望目标选择马上把它计入时调用此方法。
+        """
+        self.player_side.refresh()
+        self.enemy_side.refresh()
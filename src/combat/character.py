@@ -9,6 +9,14 @@
 class Character:
     """角色类"""
     
+    # 固定属性槽：不为每个实例创建 __dict__，减少内存并加快属性访问
+    __slots__ = (
+        "name", "max_hp", "max_mp", "attack", "defense", "speed",
+        "current_hp", "current_mp",
+        "attack_cooldown", "gcd",
+        "status", "skills",
+    )
+    
     def __init__(self, name, max_hp, max_mp, attack, defense, speed):
         """初始化角色
         
@@ -33,8 +41,44 @@ class Character:
         
         # 战斗相关
         self.attack_cooldown = 0  # 攻击冷却时间
-        self.skill_cooldown = 0   # 技能冷却时间
         self.gcd = 0              # 公共冷却时间
+        
+        # 状态效果（src/combat/status_effects.py 的 UnitStatus），没有效果时为None；
+        # 有效果时 attack / defense / speed 为计入效果后的实际属性
+        self.status = None
+        
+        # 技能栏（src/combat/skills.py 的 SkillBook，各技能的冷却保存在其中），没有技能时为None
+        self.skills = None
+    
+    @classmethod
+    def from_state(cls, state):
+        """根据状态元组创建角色
+        
+        Args:
+            state: get_state 返回的状态元组
+            
+        Returns:
+            Character: 新的角色对象
+        """
+        name, max_hp, max_mp, attack, defense, speed, current_hp, current_mp = state
+        character = cls(name, max_hp, max_mp, attack, defense, speed)
+        character.current_hp = current_hp
+        character.current_mp = current_mp
+        return character
+    
+    def get_state(self):
+        """获取角色的属性和当前状态
+        
+        Returns:
+            tuple: (name, max_hp, max_mp, attack, defense, speed, current_hp, current_mp)，
+                属性为不计状态效果的基础属性
+        """
+        if self.status is not None:
+            attack, defense, speed = self.status.base
+        else:
+            attack, defense, speed = self.attack, self.defense, self.speed
+        return (self.name, self.max_hp, self.max_mp, attack, defense,
+                speed, self.current_hp, self.current_mp)
     
     def is_alive(self):
         """检查角色是否存活
@@ -56,6 +100,11 @@ class Character:
         # 计算实际伤害（考虑防御）
         actual_damage = max(1, damage - self.defense // 2)
         
+        # 护盾先吸收伤害
+        status = self.status
+        if status is not None and status.shield:
+            actual_damage = status.absorb(actual_damage)
+        
         # 减少生命值
         self.current_hp = max(0, self.current_hp - actual_damage)
         
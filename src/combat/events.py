@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+战斗事件
+战斗管理器产生的结构化事件记录，文本格式化交给界面层
+"""
+
+from collections import namedtuple
+
+# 事件类型
+EVENT_ATTACK = 1  # 自动攻击，value 为实际伤害
+EVENT_SKILL = 2   # 技能造成伤害，value 为实际伤害
+EVENT_SUMMON = 3  # 盟友加入战斗，source 为召唤者（可能为None），value 为消耗的魔法值
+EVENT_DEATH = 4   # 单位阵亡，source 为击杀者
+EVENT_EFFECT = 5  # 获得状态效果（或叠加一层），source 为施加者（可能为None），value 为效果定义
+EVENT_EXPIRE = 6  # 状态效果结束，value 为效果定义
+EVENT_DOT = 7     # 持续伤害，source 为施加者（可能为None），value 为实际伤害
+EVENT_CAST = 8    # 释放技能，target 为第一个目标（可能为None），value 为技能；技能伤害另记为 EVENT_SKILL
+
+EVENT_NAMES = {
+    EVENT_ATTACK: "attack",
+    EVENT_SKILL: "skill",
+    EVENT_SUMMON: "summon",
+    EVENT_DEATH: "death",
+    EVENT_EFFECT: "effect",
+    EVENT_EXPIRE: "expire",
+    EVENT_DOT: "dot",
+    EVENT_CAST: "cast",
+}
+
+# 战斗事件记录：类型, 虚拟时间, 来源单位, 目标单位, 数值
+BattleEvent = namedtuple("BattleEvent", ("kind", "time", "source", "target", "value"))
+
+
+def discard_event(kind, time, source, target, value):
+    """丢弃事件的接收器，用于完全不需要事件的无界面模拟"""
+
+
+class EventCounter:
+    """事件计数器类
+
+    作为 BattleManager 的事件接收器使用，直接累加计数，不创建事件对象。
+    """
+
+    def __init__(self):
+        """初始化计数器"""
+        self.counts = dict.fromkeys(EVENT_NAMES, 0)
+        self.damage = dict.fromkeys(EVENT_NAMES, 0)
+        self.hit_damage = {}  # 单次自动攻击伤害 -> 次数
+
+    def __call__(self, kind, time, source, target, value):
+        """接收一条事件
+
+        Args:
+            kind: 事件类型
+            time: 虚拟时间（秒）
+            source: 来源单位
+            target: 目标单位
+            value: 数值
+        """
+        self.counts[kind] += 1
+        if kind == EVENT_ATTACK:
+            self.damage[kind] += value
+            self.hit_damage[value] = self.hit_damage.get(value, 0) + 1
+        elif kind == EVENT_SKILL or kind == EVENT_DOT:
+            self.damage[kind] += value
+
+    def summary(self):
+        """生成计数摘要
+
+        Returns:
+            dict: 各类事件的次数、伤害总量和单次攻击伤害分布
+        """
+        return {
+            "counts": {EVENT_NAMES[kind]: count for kind, count in self.counts.items()},
+            "damage": {EVENT_NAMES[kind]: self.damage[kind] for kind in (EVENT_ATTACK, EVENT_SKILL, EVENT_DOT)},
+            "hit_damage": dict(sorted(self.hit_damage.items())),
+        }
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+战斗回放
+记录战斗的初始状态、随机种子和玩家输入，并逐位重现整场战斗
+"""
+
+import struct
+
+from src.combat.battle_manager import BattleManager, INPUT_SKILL, INPUT_SUMMON
+from src.combat.character import Character
+from src.combat.rng import make_rng
+
+# 二进制格式
+MAGIC = b"BREC"
+VERSION = 2
+_HEADER = struct.Struct("<4sBBqdBIIB")  # 标识, 版本, 随机数类型, 种子, 结束时间, 单位数, 输入数, 开场输入数, 技能数
+_UNIT_VALUES = struct.Struct("<7d")    # max_hp, max_mp, attack, defense, speed, current_hp, current_mp
+_INPUT = struct.Struct("<dB")          # 时间, 输入类型
+_SUMMON_COST = struct.Struct("<i")
+_SKILL_SLOT = struct.Struct("<B")
+
+
+class BattleRecording:
+    """战斗记录类"""
+
+    def __init__(self, seed, rng_kind, units, inputs=None, end_time=0.0, opening_inputs=0, skills=None):
+        """初始化战斗记录
+
+        Args:
+            seed: 随机种子
+            rng_kind: 随机数生成器类型
+            units: 开场单位的状态元组列表（玩家、所有敌人）
+            inputs: 玩家输入记录
+            end_time: 战斗结束时的虚拟时间（秒）
+            opening_inputs: 战斗时间第一次推进之前的输入条数（这些输入先于开场攻击结算）
+            skills: 玩家技能栏的技能名称列表，为None时使用默认技能栏
+        """
+        self.seed = seed
+        self.rng_kind = rng_kind
+        self.units = list(units)
+        self.inputs = list(inputs or [])
+        self.end_time = end_time
+        self.opening_inputs = opening_inputs
+        self.skills = None if skills is None else tuple(skills)
+
+    @classmethod
+    def start(cls, battle):
+        """在战斗开始前创建记录
+
+        必须在战斗第一次更新之前调用，且战斗的随机数生成器需由种子创建。
+
+        Args:
+            battle: 战斗管理器
+
+        Returns:
+            BattleRecording: 战斗记录
+        """
+        seed = getattr(battle.rng, "initial_seed", None)
+        if seed is None:
+            raise ValueError("战斗的随机数生成器没有记录种子，无法回放")
+
+        units = [battle.player] + battle.enemies
+        skills = [skill.name for skill in battle.player.skills.skills]
+        return cls(seed, battle.rng.KIND, [unit.get_state() for unit in units], skills=skills)
+
+    def finish(self, battle):
+        """在战斗结束（或需要保存）时补全输入记录
+
+        Args:
+            battle: 战斗管理器
+        """
+        self.inputs = list(battle.input_log)
+        self.end_time = battle.time
+        self.opening_inputs = battle.opening_inputs
+        if self.opening_inputs is None:
+            self.opening_inputs = len(self.inputs)
+
+    def to_bytes(self):
+        """编码为紧凑的二进制格式
+
+        Returns:
+            bytes: 编码后的数据
+        """
+        skills = self.skills or ()
+        parts = [_HEADER.pack(MAGIC, VERSION, self.rng_kind, self.seed, self.end_time,
+                              len(self.units), len(self.inputs), self.opening_inputs, len(skills))]
+        for state in self.units:
+            parts.append(_pack_unit(state))
+        for name in skills:
+            parts.append(_pack_name(name))
+        for entry in self.inputs:
+            parts.append(_INPUT.pack(entry[0], entry[1]))
+            if entry[1] == INPUT_SKILL:
+                parts.append(_SKILL_SLOT.pack(entry[2]))
+            elif entry[1] == INPUT_SUMMON:
+                parts.append(_pack_unit(entry[2]))
+                parts.append(_SUMMON_COST.pack(entry[3]))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """从二进制数据解码
+
+        Args:
+            data: to_bytes 生成的数据
+
+        Returns:
+            BattleRecording: 战斗记录
+        """
+        (magic, version, rng_kind, seed, end_time,
+         unit_count, input_count, opening_inputs, skill_count) = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("不支持的战斗记录格式")
+
+        offset = _HEADER.size
+        units = []
+        for _ in range(unit_count):
+            state, offset = _unpack_unit(data, offset)
+            units.append(state)
+
+        skills = []
+        for _ in range(skill_count):
+            name, offset = _unpack_name(data, offset)
+            skills.append(name)
+
+        inputs = []
+        for _ in range(input_count):
+            time, kind = _INPUT.unpack_from(data, offset)
+            offset += _INPUT.size
+            if kind == INPUT_SKILL:
+                slot, = _SKILL_SLOT.unpack_from(data, offset)
+                offset += _SKILL_SLOT.size
+                inputs.append((time, kind, slot))
+            elif kind == INPUT_SUMMON:
+                state, offset = _unpack_unit(data, offset)
+                cost, = _SUMMON_COST.unpack_from(data, offset)
+                offset += _SUMMON_COST.size
+                inputs.append((time, kind, state, cost))
+            else:
+                inputs.append((time, kind))
+
+        return cls(seed, rng_kind, units, inputs, end_time, opening_inputs, skills)
+
+
+def _pack_name(name):
+    """编码名称
+
+    Args:
+        name: 名称
+
+    Returns:
+        bytes: 长度前缀加UTF-8字节
+    """
+    raw = name.encode("utf-8")
+    return struct.pack("<B", len(raw)) + raw
+
+
+def _unpack_name(data, offset):
+    """解码名称
+
+    Args:
+        data: 二进制数据
+        offset: 起始偏移
+
+    Returns:
+        tuple: (名称, 新的偏移)
+    """
+    length = data[offset]
+    offset += 1
+    return data[offset:offset + length].decode("utf-8"), offset + length
+
+
+def _pack_unit(state):
+    """编码单位状态
+
+    Args:
+        state: 单位状态元组
+
+    Returns:
+        bytes: 编码后的数据
+    """
+    return _pack_name(state[0]) + _UNIT_VALUES.pack(*state[1:])
+
+
+def _unpack_unit(data, offset):
+    """解码单位状态
+
+    Args:
+        data: 二进制数据
+        offset: 起始偏移
+
+    Returns:
+        tuple: (单位状态元组, 新的偏移)
+    """
+    name, offset = _unpack_name(data, offset)
+    values = _UNIT_VALUES.unpack_from(data, offset)
+    offset += _UNIT_VALUES.size
+    # 整数属性还原为 int
+    values = tuple(int(value) if value.is_integer() else value for value in values)
+    return (name,) + values, offset
+
+
+def replay_battle(recording):
+    """根据记录重现战斗
+
+    Args:
+        recording: 战斗记录
+
+    Returns:
+        BattleManager: 重现到记录结束时间的战斗管理器
+    """
+    player = Character.from_state(recording.units[0])
+    enemies = [Character.from_state(state) for state in recording.units[1:]]
+    battle = BattleManager(player, enemies, rng=make_rng(recording.seed, recording.rng_kind),
+                           player_skills=recording.skills)
+
+    for i, entry in enumerate(recording.inputs):
+        # 开场输入发生在任何攻击结算之前；之后的输入发生时，该时刻及之前的攻击都已结算
+        if i >= recording.opening_inputs:
+            battle.advance_to(entry[0])
+        if entry[1] == INPUT_SKILL:
+            battle.cast(battle.player, entry[2])
+        elif entry[1] == INPUT_SUMMON:
+            ally = Character.from_state(entry[2])
+            if entry[3]:
+                battle.summon_ally(ally, entry[3])
+            else:
+                battle.add_ally(ally)
+
+    battle.advance_to(recording.end_time)
+    return battle
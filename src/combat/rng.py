@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+战斗随机数
+每场战斗独立、可设置种子的随机数流
+"""
+
+import random
+
+# 随机数生成器类型（写入回放记录）
+RNG_STANDARD = 0  # 基于 random.Random
+
+
+class BattleRNG(random.Random):
+    """标准战斗随机数类
+
+    与 random.Random 相同，额外记录初始种子以便回放。
+    """
+
+    KIND = RNG_STANDARD
+
+    def __init__(self, seed=None):
+        """初始化随机数生成器
+
+        Args:
+            seed: 随机种子，为None时随机生成一个
+        """
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.initial_seed = seed
+        super().__init__(seed)
+
+
+def make_rng(seed=None, kind=RNG_STANDARD):
+    """创建战斗随机数生成器
+
+    Args:
+        seed: 随机种子
+        kind: 生成器类型（回放记录中的 RNG_STANDARD）
+
+    Returns:
+        BattleRNG: 随机数生成器
+    """
+    if kind == RNG_STANDARD:
+        return BattleRNG(seed)
+    raise ValueError(f"未知的随机数生成器类型: {kind}")
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+角色名册
+按列（结构数组）保存大量角色的属性，并提供与 Character 接口一致的轻量视图
+"""
+
+from array import array
+
+from src.combat.character import Character
+
+# 列名与数组类型：整数属性用 'q'，速度和冷却用 'd'
+COLUMNS = (
+    ("max_hp", "q"),
+    ("max_mp", "q"),
+    ("attack", "q"),
+    ("defense", "q"),
+    ("speed", "d"),
+    ("current_hp", "q"),
+    ("current_mp", "q"),
+    ("attack_cooldown", "d"),
+    ("gcd", "d"),
+)
+
+
+def _column_property(name):
+    """生成读写名册某一列的属性
+
+    Args:
+        name: 列名
+
+    Returns:
+        property: 视图属性
+    """
+    def getter(self):
+        return getattr(self._roster, name)[self._index]
+
+    def setter(self, value):
+        getattr(self._roster, name)[self._index] = value
+
+    return property(getter, setter)
+
+
+class CharacterView(Character):
+    """名册中单个角色的视图类
+
+    不保存任何属性，读写都直接映射到名册的列上；
+    is_alive、take_damage 等方法继承自 Character，行为完全一致。
+    """
+
+    __slots__ = ("_roster", "_index")
+
+    def __init__(self, roster, index):
+        """初始化视图
+
+        Args:
+            roster: 所属名册
+            index: 在名册中的下标
+        """
+        self._roster = roster
+        self._index = index
+
+    @property
+    def name(self):
+        """角色名称"""
+        return self._roster.names[self._index]
+
+    @name.setter
+    def name(self, value):
+        self._roster.names[self._index] = value
+
+    @property
+    def status(self):
+        """状态效果集合（没有效果时为None）"""
+        return self._roster.statuses[self._index]
+
+    @status.setter
+    def status(self, value):
+        self._roster.statuses[self._index] = value
+
+    @property
+    def skills(self):
+        """技能栏（没有技能时为None）"""
+        return self._roster.skillbooks[self._index]
+
+    @skills.setter
+    def skills(self, value):
+        self._roster.skillbooks[self._index] = value
+
+    def __eq__(self, other):
+        """同一名册同一下标的视图视为同一角色"""
+        if isinstance(other, CharacterView):
+            return self._roster is other._roster and self._index == other._index
+        return NotImplemented
+
+    def __hash__(self):
+        """与 __eq__ 一致的哈希"""
+        return hash((id(self._roster), self._index))
+
+
+for _name, _typecode in COLUMNS:
+    setattr(CharacterView, _name, _column_property(_name))
+
+
+class CharacterRoster:
+    """角色名册类"""
+
+    def __init__(self):
+        """初始化名册"""
+        self.names = []
+        self.statuses = []  # 状态效果集合（Python对象，不放在数值列中）
+        self.skillbooks = []  # 技能栏（同上）
+        for name, typecode in COLUMNS:
+            setattr(self, name, array(typecode))
+
+    def __len__(self):
+        """角色数量"""
+        return len(self.names)
+
+    def __getitem__(self, index):
+        """获取角色视图
+
+        Args:
+            index: 下标
+
+        Returns:
+            CharacterView: 角色视图
+        """
+        if not -len(self.names) <= index < len(self.names):
+            raise IndexError("名册下标越界")
+        return CharacterView(self, index % len(self.names))
+
+    def __iter__(self):
+        """遍历所有角色视图"""
+        for index in range(len(self.names)):
+            yield CharacterView(self, index)
+
+    def add(self, name, max_hp, max_mp, attack, defense, speed):
+        """添加角色，参数与 Character 的构造函数一致
+
+        Args:
+            name: 角色名称
+            max_hp: 最大生命值
+            max_mp: 最大魔法值
+            attack: 攻击力
+            defense: 防御力
+            speed: 速度
+
+        Returns:
+            CharacterView: 新角色的视图
+        """
+        index = len(self.names)
+        self.names.append(name)
+        self.statuses.append(None)
+        self.skillbooks.append(None)
+        self.max_hp.append(max_hp)
+        self.max_mp.append(max_mp)
+        self.attack.append(attack)
+        self.defense.append(defense)
+        self.speed.append(speed)
+        self.current_hp.append(max_hp)
+        self.current_mp.append(max_mp)
+        self.attack_cooldown.append(0)
+        self.gcd.append(0)
+        return CharacterView(self, index)
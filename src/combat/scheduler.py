@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+行动调度器
+按下一次行动时间排序的优先队列，只处理到期的行动
+"""
+
+import heapq
+
+class ActionScheduler:
+    """行动调度器类
+
+    每个键（通常是角色对象）最多有一个有效的行动时间。
+    重新调度或取消时不会从堆中删除旧条目，而是在弹出时惰性丢弃。
+    """
+
+    def __init__(self):
+        """初始化调度器"""
+        self._heap = []      # (行动时间, 序号, 键)
+        self._entries = {}   # 键 -> (序号, 行动时间)
+        self._counter = 0    # 序号，保证同一时间按调度顺序出队
+
+    def __len__(self):
+        """有效条目数量"""
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """键是否已被调度"""
+        return key in self._entries
+
+    def schedule(self, key, time):
+        """调度（或重新调度）一次行动
+
+        Args:
+            key: 行动所属的键
+            time: 行动时间（秒）
+        """
+        seq = self._counter
+        self._counter += 1
+        self._entries[key] = (seq, time)
+        heapq.heappush(self._heap, (time, seq, key))
+
+        # 失效条目过多时重建堆，避免频繁重新调度导致堆无限增长
+        if len(self._heap) > 2 * len(self._entries) + 32:
+            self._heap = [(entry[1], entry[0], k) for k, entry in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def cancel(self, key):
+        """取消一个键的行动
+
+        Args:
+            key: 行动所属的键
+        """
+        self._entries.pop(key, None)
+
+    def time_of(self, key):
+        """获取一个键的行动时间
+
+        Args:
+            key: 行动所属的键
+
+        Returns:
+            float: 行动时间，未调度时返回None
+        """
+        entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    def peek_time(self):
+        """获取最早的行动时间
+
+        Returns:
+            float: 最早的行动时间，队列为空时返回None
+        """
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now):
+        """弹出一个已到期的行动
+
+        Args:
+            now: 当前时间（秒）
+
+        Returns:
+            tuple: (行动时间, 键)，没有到期行动时返回None
+        """
+        # 每次行动都会调用，丢弃失效条目的循环直接写在这里
+        heap = self._heap
+        entries = self._entries
+        while heap:
+            time, seq, key = heap[0]
+            entry = entries.get(key)
+            if entry is None or entry[0] != seq:
+                heapq.heappop(heap)
+                continue
+            if time > now:
+                return None
+            heapq.heappop(heap)
+            del entries[key]
+            return time, key
+        return None
+
+    def items(self):
+        """遍历所有有效条目
+
+        Returns:
+            list: (键, 行动时间) 列表
+        """
+        return [(key, entry[1]) for key, entry in self._entries.items()]
+
+    def ordered_items(self):
+        """按出队顺序列出所有有效条目
+
+        按这个顺序重新调度，同一时间的行动仍然保持原来的先后顺序。
+
+        Returns:
+            list: (键, 行动时间) 列表
+        """
+        entries = sorted(self._entries.items(), key=lambda item: (item[1][1], item[1][0]))
+        return [(key, entry[1]) for key, entry in entries]
+
+    def _discard_stale(self):
+        """丢弃堆顶已失效的条目"""
+        heap = self._heap
+        entries = self._entries
+        while heap:
+            time, seq, key = heap[0]
+            entry = entries.get(key)
+            if entry is not None and entry[0] == seq:
+                return
+            heapq.heappop(heap)
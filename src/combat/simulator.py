@@ -0,0 +1,344 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+无界面战斗模拟器
+在虚拟时间中批量运行战斗，用于数值平衡（不依赖Pygame）
+"""
+
+import argparse
+import time
+
+from src.combat.battle_manager import BattleManager
+from src.combat.character import Character
+from src.combat.events import EventCounter, discard_event
+from src.combat.rng import make_rng
+from src.combat.skills import SUMMON_SKILL, get_loadout, summon_skill
+
+# 默认角色数值（与战斗场景保持一致）：名称, 最大HP, 最大MP, 攻击, 防御, 速度；
+# 召唤的盟友数值和消耗来自技能数据中的召唤技能
+PLAYER_STATS = ("玩家", 100, 50, 10, 5, 5)
+ENEMY_STATS = ("敌人", 80, 0, 8, 4, 4)
+
+# 模拟模式
+MODE_EVENT = "event"   # 事件驱动：直接跳到下一次行动时间
+MODE_FIXED = "fixed"   # 固定步长：按帧推进虚拟时间
+
+# 战斗结果
+WIN = "win"
+LOSS = "loss"
+TIMEOUT = "timeout"
+
+
+def make_character(stats):
+    """根据数值创建角色
+
+    Args:
+        stats: 角色数值，可以是元组 (name, max_hp, max_mp, attack, defense, speed)、
+            同名键的字典，或已有的角色对象（会复制一份满状态的新角色）
+
+    Returns:
+        Character: 新的角色对象
+    """
+    if isinstance(stats, Character):
+        return Character(stats.name, stats.max_hp, stats.max_mp,
+                         stats.attack, stats.defense, stats.speed)
+    if isinstance(stats, dict):
+        return Character(**stats)
+    return Character(*stats)
+
+
+def _percentile(sorted_values, p):
+    """计算已排序数据的百分位数（最近秩法）
+
+    Args:
+        sorted_values: 已排序的数值列表
+        p: 百分位（0-100）
+
+    Returns:
+        float: 百分位数，列表为空时返回0
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(p / 100.0 * (len(sorted_values) - 1)))))
+    return float(sorted_values[index])
+
+
+def _distribution(values):
+    """汇总数值分布
+
+    Args:
+        values: 数值列表
+
+    Returns:
+        dict: 包含均值、最小值、最大值和常用百分位数
+    """
+    ordered = sorted(values)
+    count = len(ordered)
+    return {
+        "count": count,
+        "mean": sum(ordered) / count if count else 0.0,
+        "min": float(ordered[0]) if count else 0.0,
+        "p50": _percentile(ordered, 50),
+        "p90": _percentile(ordered, 90),
+        "p99": _percentile(ordered, 99),
+        "max": float(ordered[-1]) if count else 0.0,
+    }
+
+
+class SimulationResult:
+    """批量模拟结果类"""
+
+    def __init__(self):
+        """初始化模拟结果"""
+        self.battles = 0
+        self.wins = 0
+        self.losses = 0
+        self.timeouts = 0
+
+        # 每场战斗的数据
+        self.durations = []     # 战斗用时（虚拟秒）
+        self.kill_times = []    # 胜利时击杀敌人所用时间（虚拟秒）
+        self.damage_dealt = []  # 玩家方造成的总伤害
+        self.damage_taken = []  # 玩家方受到的总伤害
+
+        # 所有战斗的事件计数
+        self.events = EventCounter()
+
+        # 实际耗时（秒）
+        self.wall_time = 0.0
+
+    @property
+    def win_rate(self):
+        """胜率"""
+        return self.wins / self.battles if self.battles else 0.0
+
+    @property
+    def battles_per_second(self):
+        """每秒模拟的战斗场数"""
+        return self.battles / self.wall_time if self.wall_time > 0 else 0.0
+
+    def record(self, outcome, duration, dealt, taken):
+        """记录一场战斗
+
+        Args:
+            outcome: 战斗结果（WIN/LOSS/TIMEOUT）
+            duration: 战斗用时（虚拟秒）
+            dealt: 玩家方造成的总伤害
+            taken: 玩家方受到的总伤害
+        """
+        self.battles += 1
+        if outcome == WIN:
+            self.wins += 1
+            self.kill_times.append(duration)
+        elif outcome == LOSS:
+            self.losses += 1
+        else:
+            self.timeouts += 1
+
+        self.durations.append(duration)
+        self.damage_dealt.append(dealt)
+        self.damage_taken.append(taken)
+
+    def summary(self):
+        """生成结果摘要
+
+        Returns:
+            dict: 胜率、击杀时间和伤害分布
+        """
+        return {
+            "battles": self.battles,
+            "wins": self.wins,
+            "losses": self.losses,
+            "timeouts": self.timeouts,
+            "win_rate": self.win_rate,
+            "time_to_kill": _distribution(self.kill_times),
+            "duration": _distribution(self.durations),
+            "damage_dealt": _distribution(self.damage_dealt),
+            "damage_taken": _distribution(self.damage_taken),
+            "events": self.events.summary(),
+            "battles_per_second": self.battles_per_second,
+        }
+
+
+class BattleSimulator:
+    """无界面战斗模拟器类"""
+
+    def __init__(self, player_stats=PLAYER_STATS, enemy_stats=ENEMY_STATS, summon=False,
+                 mode=MODE_EVENT, step=1.0 / 60, max_time=300.0, use_skill=False, seed=None,
+                 auto_battle=None, ally_stats=None):
+        """初始化模拟器
+
+        Args:
+            player_stats: 玩家数值
+            enemy_stats: 敌人数值
+            summon: 玩家是否在开场释放召唤技能
+            mode: 模拟模式（MODE_EVENT 或 MODE_FIXED）
+            step: 固定步长模式下每步的虚拟时间（秒）
+            max_time: 单场战斗的最长虚拟时间（秒），超过判为超时
+            use_skill: 玩家是否在冷却和魔法值允许时自动释放技能
+            seed: 随机种子，为None时每次运行使用不同的随机数
+            auto_battle: 自动战斗控制器（src/combat/auto_battle.py 的 AutoBattle），
+                提供时由它决定技能和召唤，忽略 summon、use_skill 和 mode
+            ally_stats: 召唤技能召唤的盟友数值，为None时使用技能数据中的数值
+                （自动战斗的前瞻模拟从状态恢复技能，总是使用技能数据中的数值）
+        """
+        if mode not in (MODE_EVENT, MODE_FIXED):
+            raise ValueError(f"未知的模拟模式: {mode}")
+
+        self.player_stats = player_stats
+        self.enemy_stats = enemy_stats
+        self.summon = summon
+        self.ally_stats = ally_stats
+        self.mode = mode
+        self.step = step
+        self.max_time = max_time
+        self.use_skill = use_skill
+        self.seed = seed
+        self.auto_battle = auto_battle
+
+        # 玩家的技能栏：替换盟友数值时换用召唤指定盟友的技能
+        self.player_skills = None
+        if ally_stats is not None:
+            ally_skill = summon_skill(ally_stats)
+            self.player_skills = tuple(ally_skill if skill.name == SUMMON_SKILL else skill
+                                       for skill in get_loadout("player"))
+
+    def run(self, battles):
+        """批量运行战斗
+
+        Args:
+            battles: 战斗场数
+
+        Returns:
+            SimulationResult: 模拟结果
+        """
+        # 所有战斗共用一个随机数流
+        rng = make_rng(self.seed)
+
+        result = SimulationResult()
+        start = time.perf_counter()
+        for _ in range(battles):
+            result.record(*self.run_battle(rng, result.events))
+        result.wall_time = time.perf_counter() - start
+        return result
+
+    def run_battle(self, rng=None, event_sink=None):
+        """运行一场战斗
+
+        Args:
+            rng: 随机数生成器，为None时按模拟器的种子新建
+            event_sink: 事件接收器（如 EventCounter），为None时丢弃所有事件
+
+        Returns:
+            tuple: (战斗结果, 战斗用时, 玩家方造成的总伤害, 玩家方受到的总伤害)
+        """
+        player = make_character(self.player_stats)
+        enemy = make_character(self.enemy_stats)
+        if rng is None:
+            rng = make_rng(self.seed)
+        battle = BattleManager(player, enemy, rng=rng, event_sink=event_sink or discard_event,
+                               player_skills=self.player_skills)
+
+        if self.auto_battle is not None:
+            duration = self.auto_battle.play(battle, self.max_time)
+        else:
+            if self.summon:
+                battle.cast(player, player.skills.slot(SUMMON_SKILL))
+
+            if self.mode == MODE_EVENT:
+                duration = self._run_events(battle)
+            else:
+                duration = self._run_fixed_steps(battle)
+
+        if not enemy.is_alive():
+            outcome = WIN
+        elif battle.is_battle_over():
+            outcome = LOSS
+        else:
+            outcome = TIMEOUT
+
+        dealt = enemy.max_hp - enemy.current_hp
+        taken = player.max_hp - player.current_hp
+        for ally in battle.allies:
+            taken += ally.max_hp - ally.current_hp
+
+        return outcome, duration, dealt, taken
+
+    def _run_events(self, battle):
+        """事件驱动地推进战斗
+
+        调度器会按时间顺序结算所有攻击，只需在技能就绪时停下来释放技能。
+
+        Args:
+            battle: 战斗管理器
+
+        Returns:
+            float: 战斗用时（虚拟秒）
+        """
+        player = battle.player
+        while battle.battle_active and battle.time < self.max_time:
+            stop_time = self.max_time
+            if self.use_skill:
+                battle.player_use_skill()
+                if player.skills and player.current_mp >= player.skills.skills[0].mp_cost:
+                    # 主技能就绪也是一次行动机会
+                    ready_time = player.skills.ready_time(0)
+                    if battle.time < ready_time < stop_time:
+                        stop_time = ready_time
+            battle.advance_to(stop_time)
+
+        return battle.time
+
+    def _run_fixed_steps(self, battle):
+        """按固定步长推进战斗
+
+        Args:
+            battle: 战斗管理器
+
+        Returns:
+            float: 战斗用时（虚拟秒，步长的整数倍）
+        """
+        elapsed = 0.0
+        while battle.battle_active and elapsed < self.max_time:
+            if self.use_skill:
+                battle.player_use_skill()
+            elapsed += self.step
+            battle.update(self.step)
+
+        return elapsed
+
+
+def main(argv=None):
+    """命令行入口
+
+    Args:
+        argv: 命令行参数列表，为None时读取sys.argv
+    """
+    parser = argparse.ArgumentParser(description="无界面批量战斗模拟")
+    parser.add_argument("-n", "--battles", type=int, default=10000, help="战斗场数")
+    parser.add_argument("--mode", choices=(MODE_EVENT, MODE_FIXED), default=MODE_EVENT, help="模拟模式")
+    parser.add_argument("--step", type=float, default=1.0 / 60, help="固定步长（秒）")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子")
+    parser.add_argument("--ally", action="store_true", help="开场召唤盟友")
+    parser.add_argument("--skill", action="store_true", help="自动释放技能")
+    args = parser.parse_args(argv)
+
+    simulator = BattleSimulator(
+        summon=args.ally,
+        mode=args.mode,
+        step=args.step,
+        use_skill=args.skill,
+        seed=args.seed
+    )
+    summary = simulator.run(args.battles).summary()
+
+    print(f"战斗场数: {summary['battles']}  胜率: {summary['win_rate']:.2%}  超时: {summary['timeouts']}")
+    print(f"击杀时间: 平均 {summary['time_to_kill']['mean']:.2f}s  p50 {summary['time_to_kill']['p50']:.2f}s  "
+          f"p90 {summary['time_to_kill']['p90']:.2f}s")
+    print(f"造成伤害: 平均 {summary['damage_dealt']['mean']:.1f}  受到伤害: 平均 {summary['damage_taken']['mean']:.1f}")
+    print(f"吞吐量: {summary['battles_per_second']:.0f} 场/秒")
+
+
+if __name__ == "__main__":
+    main()
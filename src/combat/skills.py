@@ -0,0 +1,510 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+技能系统
+从数据文件（data/skills/*.json）读取技能的消耗、冷却、目标和效果链，
+加载时校验并编译为操作列表（绑定好参数的函数），释放技能时不再查字典或解析数据；
+每个角色的技能冷却保存在紧凑的数组中
+"""
+
+import argparse
+import json
+import os
+from array import array
+
+from src.combat.character import Character
+from src.combat.status_effects import get_effect
+
+# 默认的技能数据目录
+SKILLS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                          "data", "skills")
+
+# 技能目标
+TARGET_ENEMY = 0        # 己方目标选择策略选出的一个敌人（与自动攻击相同）
+TARGET_ALL_ENEMIES = 1  # 所有存活的敌人
+TARGET_SELF = 2         # 施法者自己
+TARGET_ALLIES = 3       # 己方所有存活单位（包括自己）
+TARGET_NONE = 4         # 没有目标（如召唤）
+
+TARGET_NAMES = {
+    "enemy": TARGET_ENEMY,
+    "all_enemies": TARGET_ALL_ENEMIES,
+    "self": TARGET_SELF,
+    "allies": TARGET_ALLIES,
+    "none": TARGET_NONE,
+}
+
+# 召唤盟友的技能（战斗场景的召唤按钮、自动战斗和模拟器使用）
+SUMMON_SKILL = "summon_ally"
+
+# 释放技能的检查结果
+CAST_OK = 0
+CAST_COOLDOWN = 1   # 技能或公共冷却中
+CAST_STUNNED = 2    # 施法者被眩晕
+CAST_NO_TARGET = 3  # 没有可选的目标
+CAST_LIMIT = 4      # 盟友数量已达上限
+CAST_NO_MP = 5      # 魔法值不足
+
+# 源文件中允许的字段
+SKILL_FIELDS = {"label", "mp_cost", "cooldown", "gcd", "target", "max_allies", "ops"}
+OP_FIELDS = {
+    "damage": {"op", "scale", "variation"},
+    "effect": {"op", "effect"},
+    "summon": {"op", "unit"},
+}
+UNIT_FIELDS = ("name", "max_hp", "max_mp", "attack", "defense", "speed")
+
+# 各操作允许的目标：伤害和状态效果需要作用于单位，召唤对每个目标执行一次，只能有一个目标
+OP_TARGETS = {
+    "damage": {"enemy", "all_enemies", "self", "allies"},
+    "effect": {"enemy", "all_enemies", "self", "allies"},
+    "summon": {"self", "none"},
+}
+
+
+class SkillError(ValueError):
+    """技能数据错误"""
+
+    def __init__(self, errors):
+        """初始化错误
+
+        Args:
+            errors: 错误描述列表
+        """
+        super().__init__("技能校验失败:\n" + "\n".join(errors))
+        self.errors = errors
+
+
+class Skill:
+    """编译后的技能类
+
+    ops 中的每个操作都是 op(battle, caster, target) 形式的函数，参数在编译时已经绑定，
+    对每个目标依次执行，返回造成的伤害。
+    """
+
+    __slots__ = ("name", "label", "mp_cost", "cooldown", "gcd", "target", "max_allies", "ops", "summons")
+
+    def __init__(self, name, label, mp_cost, cooldown, gcd, target, max_allies, ops, summons=None):
+        """初始化技能
+
+        Args:
+            name: 技能名称（唯一，用于存档和回放）
+            label: 显示名称
+            mp_cost: 消耗的魔法值
+            cooldown: 冷却时间（秒）
+            gcd: 是否触发并受公共冷却限制
+            target: 目标类型（TARGET_*）
+            max_allies: 盟友数量达到该值时不能释放，为None时不限制
+            ops: 操作列表
+            summons: 召唤的单位数值 (name, max_hp, max_mp, attack, defense, speed)，不召唤时为None
+        """
+        self.name = name
+        self.label = label
+        self.mp_cost = mp_cost
+        self.cooldown = cooldown
+        self.gcd = gcd
+        self.target = target
+        self.max_allies = max_allies
+        self.ops = tuple(ops)
+        self.summons = summons
+
+    def __repr__(self):
+        return f"Skill({self.name!r})"
+
+
+class SkillBook:
+    """角色技能栏类
+
+    技能按栏位排列，每个栏位的就绪时间（战斗虚拟秒）保存在一个 array('d') 中，
+    公共冷却的就绪时间单独保存；释放技能时按栏位下标访问。
+    """
+
+    __slots__ = ("skills", "ready", "gcd_ready")
+
+    def __init__(self, skills):
+        """初始化技能栏
+
+        Args:
+            skills: 技能列表（编译后的技能或技能名称）
+        """
+        self.skills = tuple(map(get_skill, skills))
+        self.ready = array("d", [0.0]) * len(self.skills)  # 各栏位的就绪时间
+        self.gcd_ready = 0.0                               # 公共冷却的就绪时间
+
+    def __len__(self):
+        """技能数量"""
+        return len(self.skills)
+
+    def slot(self, name):
+        """技能所在的栏位
+
+        Args:
+            name: 技能名称
+
+        Returns:
+            int: 栏位下标
+
+        Raises:
+            KeyError: 技能栏中没有该技能
+        """
+        for index, skill in enumerate(self.skills):
+            if skill.name == name:
+                return index
+        raise KeyError(f"技能栏中没有技能: {name}")
+
+    def ready_time(self, slot):
+        """技能可以释放的时间
+
+        Args:
+            slot: 栏位下标
+
+        Returns:
+            float: 虚拟时间（秒），同时考虑技能冷却和公共冷却
+        """
+        ready = self.ready[slot]
+        if self.skills[slot].gcd and self.gcd_ready > ready:
+            return self.gcd_ready
+        return ready
+
+    def get_state(self):
+        """获取技能栏状态
+
+        Returns:
+            tuple: (技能名称元组, 各栏位就绪时间元组, 公共冷却就绪时间)
+        """
+        return tuple(skill.name for skill in self.skills), tuple(self.ready), self.gcd_ready
+
+    @classmethod
+    def from_state(cls, state):
+        """根据 get_state 返回的状态恢复技能栏
+
+        Args:
+            state: 技能栏状态元组
+
+        Returns:
+            SkillBook: 技能栏
+        """
+        names, ready, gcd_ready = state
+        book = cls(names)
+        book.ready = array("d", ready)
+        book.gcd_ready = gcd_ready
+        return book
+
+
+def _compile_damage(spec):
+    """编译伤害操作：施法者攻击力 × 倍率 × 随机浮动
+
+    Args:
+        spec: 操作数据
+
+    Returns:
+        callable: 操作函数
+    """
+    scale = float(spec.get("scale", 1.0))
+    low, high = (float(value) for value in spec.get("variation", (1.0, 1.0)))
+
+    def damage(battle, caster, target):
+        if not target.is_alive():
+            return 0
+        amount = int(caster.attack * scale * battle.rng.uniform(low, high))
+        return battle.skill_hit(caster, target, amount)
+    return damage
+
+
+def _compile_effect(spec):
+    """编译施加状态效果的操作
+
+    Args:
+        spec: 操作数据
+
+    Returns:
+        callable: 操作函数
+    """
+    effect = get_effect(spec["effect"])
+
+    def apply(battle, caster, target):
+        battle.apply_effect(target, effect, caster)
+        return 0
+    return apply
+
+
+def _unit_stats(spec):
+    """召唤操作中的单位数值
+
+    Args:
+        spec: 操作数据
+
+    Returns:
+        tuple: (name, max_hp, max_mp, attack, defense, speed)
+    """
+    return tuple(spec["unit"][field] for field in UNIT_FIELDS)
+
+
+def _compile_summon(spec):
+    """编译召唤盟友的操作
+
+    Args:
+        spec: 操作数据
+
+    Returns:
+        callable: 操作函数
+    """
+    stats = _unit_stats(spec)
+
+    def summon(battle, caster, target):
+        battle.skill_summon(caster, Character(*stats))
+        return 0
+    return summon
+
+
+OP_COMPILERS = {
+    "damage": _compile_damage,
+    "effect": _compile_effect,
+    "summon": _compile_summon,
+}
+
+
+def _is_number(value):
+    """是否为数值（不包括布尔值）"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _validate_op(where, spec, target, errors):
+    """校验单个操作
+
+    Args:
+        where: 错误描述的位置
+        spec: 操作数据
+        target: 技能的目标名称，目标本身无效时为None
+        errors: 错误列表（追加）
+    """
+    if not isinstance(spec, dict):
+        errors.append(f"{where}: 操作必须是对象")
+        return
+    kind = spec.get("op")
+    if kind not in OP_FIELDS:
+        errors.append(f"{where}: 未知操作 {kind}")
+        return
+    unknown = set(spec) - OP_FIELDS[kind]
+    if unknown:
+        errors.append(f"{where}: 未知字段 {sorted(unknown)}")
+    if target is not None and target not in OP_TARGETS[kind]:
+        errors.append(f"{where}: {kind} 操作不能用于目标 {target}")
+    if kind == "damage":
+        if not _is_number(spec.get("scale", 1.0)):
+            errors.append(f"{where}: 伤害倍率必须是数值")
+        variation = spec.get("variation", (1.0, 1.0))
+        if (not isinstance(variation, (list, tuple)) or len(variation) != 2
+                or not all(_is_number(value) for value in variation)
+                or not 0 < variation[0] <= variation[1]):
+            errors.append(f"{where}: 伤害浮动必须是 [下限, 上限]")
+    elif kind == "effect":
+        try:
+            get_effect(spec.get("effect"))
+        except KeyError:
+            errors.append(f"{where}: 未知的状态效果 {spec.get('effect')}")
+    elif kind == "summon":
+        unit = spec.get("unit")
+        if not isinstance(unit, dict) or set(unit) != set(UNIT_FIELDS):
+            errors.append(f"{where}: 召唤的单位必须包含 {list(UNIT_FIELDS)}")
+
+
+def compile_skill(name, source, errors):
+    """校验并编译单个技能
+
+    Args:
+        name: 技能名称
+        source: 源文件中的技能数据
+        errors: 错误列表（追加）
+
+    Returns:
+        Skill: 编译后的技能，有错误时返回None
+    """
+    count = len(errors)
+    where = f"技能 {name}"
+    if not isinstance(source, dict) or not isinstance(source.get("ops"), list):
+        errors.append(f"{where}: 技能必须是对象，ops 必须是列表")
+        return None
+    unknown = set(source) - SKILL_FIELDS
+    if unknown:
+        errors.append(f"{where}: 未知字段 {sorted(unknown)}")
+    if not source.get("label"):
+        errors.append(f"{where}: 缺少显示名称")
+    # 魔法值是整数，消耗也必须是整数
+    mp_cost = source.get("mp_cost", 0)
+    if not _is_number(mp_cost) or mp_cost != int(mp_cost) or mp_cost < 0:
+        errors.append(f"{where}: mp_cost 必须是非负整数")
+    cooldown = source.get("cooldown", 0)
+    if not _is_number(cooldown) or cooldown < 0:
+        errors.append(f"{where}: cooldown 必须是非负数")
+    if not isinstance(source.get("gcd", True), bool):
+        errors.append(f"{where}: gcd 必须是布尔值")
+    max_allies = source.get("max_allies")
+    if max_allies is not None and (not _is_number(max_allies) or not isinstance(max_allies, int)
+                                   or max_allies < 0):
+        errors.append(f"{where}: max_allies 必须是非负整数")
+    target = source.get("target", "enemy")
+    if not isinstance(target, str) or target not in TARGET_NAMES:
+        errors.append(f"{where}: 未知目标 {target}")
+        target = None
+    if not source.get("ops"):
+        errors.append(f"{where}: 没有任何操作")
+    for i, spec in enumerate(source.get("ops", [])):
+        _validate_op(f"{where} 操作 {i + 1}", spec, target, errors)
+    if len(errors) > count:
+        return None
+
+    ops = [OP_COMPILERS[spec["op"]](spec) for spec in source["ops"]]
+    summons = next((_unit_stats(spec) for spec in source["ops"] if spec["op"] == "summon"), None)
+    return Skill(name, source["label"], int(source.get("mp_cost", 0)), float(source.get("cooldown", 0)),
+                 source.get("gcd", True), TARGET_NAMES[source.get("target", "enemy")],
+                 source.get("max_allies"), ops, summons)
+
+
+def summon_skill(stats, name=SUMMON_SKILL):
+    """创建召唤指定数值盟友的技能（用于数值扫描）
+
+    名称、消耗、冷却和盟友上限沿用默认目录中的同名技能；存档和回放只记录技能名称，
+    恢复时会换回数据中的技能。
+
+    Args:
+        stats: 盟友数值 (name, max_hp, max_mp, attack, defense, speed)
+        name: 作为模板的召唤技能名称
+
+    Returns:
+        Skill: 技能
+    """
+    base = get_skill(name)
+    stats = tuple(stats)
+    op = _compile_summon({"op": "summon", "unit": dict(zip(UNIT_FIELDS, stats))})
+    return Skill(base.name, base.label, base.mp_cost, base.cooldown, base.gcd, base.target,
+                 base.max_allies, (op,), stats)
+
+
+def load_skills(source_dir):
+    """读取并编译目录中的全部技能源文件
+
+    Args:
+        source_dir: 技能源文件目录
+
+    Returns:
+        tuple: ({技能名称: 技能}, {技能栏名称: 技能元组})
+
+    Raises:
+        SkillError: 源文件校验失败
+    """
+    sources = {}
+    loadouts = {}
+    errors = []
+    for name in sorted(os.listdir(source_dir)):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(source_dir, name), encoding="utf-8") as f:
+                source = json.load(f)
+        except ValueError as e:
+            errors.append(f"{name}: JSON格式错误: {e}")
+            continue
+        for skill_name, skill in source.get("skills", {}).items():
+            if skill_name in sources:
+                errors.append(f"{name}: 技能 {skill_name} 重复定义")
+            sources[skill_name] = skill
+        for loadout_name, skill_names in source.get("loadouts", {}).items():
+            if loadout_name in loadouts:
+                errors.append(f"{name}: 技能栏 {loadout_name} 重复定义")
+            loadouts[loadout_name] = tuple(skill_names)
+
+    skills = {}
+    for skill_name, source in sources.items():
+        skill = compile_skill(skill_name, source, errors)
+        if skill is not None:
+            skills[skill_name] = skill
+    for loadout_name, skill_names in loadouts.items():
+        for skill_name in skill_names:
+            if skill_name not in sources:
+                errors.append(f"技能栏 {loadout_name}: 技能 {skill_name} 不存在")
+    if errors:
+        raise SkillError(errors)
+    # 技能栏也在加载时解析为编译好的技能
+    return skills, {name: tuple(skills[skill] for skill in names) for name, names in loadouts.items()}
+
+
+# 从默认目录加载的技能和技能栏，第一次使用时才读取
+_library = None
+
+
+def _default_library():
+    """默认目录中的技能和技能栏
+
+    Returns:
+        tuple: ({技能名称: 技能}, {技能栏名称: 技能元组})
+    """
+    global _library
+    if _library is None:
+        _library = load_skills(SKILLS_DIR)
+    return _library
+
+
+def get_skill(skill):
+    """获取技能
+
+    Args:
+        skill: 编译后的技能或默认目录中的技能名称
+
+    Returns:
+        Skill: 技能
+
+    Raises:
+        KeyError: 名称不存在
+    """
+    if isinstance(skill, Skill):
+        return skill
+    try:
+        return _default_library()[0][skill]
+    except KeyError:
+        raise KeyError(f"未知的技能: {skill}") from None
+
+
+def get_loadout(name):
+    """获取默认目录中定义的技能栏
+
+    Args:
+        name: 技能栏名称
+
+    Returns:
+        tuple: 技能元组
+
+    Raises:
+        KeyError: 名称不存在
+    """
+    try:
+        return _default_library()[1][name]
+    except KeyError:
+        raise KeyError(f"未知的技能栏: {name}") from None
+
+
+def main(argv=None):
+    """命令行入口：校验技能数据并列出所有技能
+
+    Args:
+        argv: 命令行参数列表，为None时读取sys.argv
+    """
+    parser = argparse.ArgumentParser(description="校验技能数据")
+    parser.add_argument("source", nargs="?", default=SKILLS_DIR, help="技能源文件目录")
+    args = parser.parse_args(argv)
+
+    try:
+        skills, loadouts = load_skills(args.source)
+    except SkillError as e:
+        print(e)
+        raise SystemExit(1)
+
+    for skill in skills.values():
+        print(f"{skill.name}: {skill.label}  MP {skill.mp_cost}  冷却 {skill.cooldown:g}s  操作 {len(skill.ops)}")
+    for name, loadout in loadouts.items():
+        print(f"技能栏 {name}: {', '.join(skill.name for skill in loadout)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+状态效果
+增益、减益、持续伤害、眩晕和护盾的定义，以及每个角色身上生效的效果集合。
+效果的结束和持续伤害的跳数由战斗管理器的时间轮驱动
+"""
+
+# 可以被效果修改的属性
+STATS = ("attack", "defense", "speed")
+
+# 属性下限（速度至少为1，攻击间隔才有意义）
+STAT_MINIMUMS = {"attack": 0, "defense": 0, "speed": 1}
+
+
+class StatusEffect:
+    """状态效果定义类
+
+    同一个角色身上同名的效果只有一个实例，再次施加时叠加层数（不超过 max_stacks）并刷新持续时间；
+    属性修正和持续伤害按层数成倍计算，护盾每层增加一份吸收量。
+    """
+
+    def __init__(self, name, label, duration=None, modifiers=None, tick_interval=None,
+                 tick_damage=0, stun=False, shield=0, max_stacks=1):
+        """初始化状态效果
+
+        Args:
+            name: 效果名称（唯一，用于存档）
+            label: 显示名称
+            duration: 持续时间（秒），为None时一直持续到被移除
+            modifiers: 属性修正 {属性: (加值, 乘数)}，每层的实际属性为 (基础 + 加值) × (1 + 乘数)
+            tick_interval: 持续伤害的间隔（秒）
+            tick_damage: 每层每跳的伤害
+            stun: 是否眩晕（无法行动）
+            shield: 每层护盾的吸收量
+            max_stacks: 最大层数
+        """
+        for stat in modifiers or ():
+            if stat not in STATS:
+                raise ValueError(f"效果 {name} 修改了未知的属性: {stat}")
+        if tick_damage and not tick_interval:
+            raise ValueError(f"效果 {name} 有持续伤害但没有间隔")
+
+        self.name = name
+        self.label = label
+        self.duration = duration
+        self.modifiers = dict(modifiers or {})
+        self.tick_interval = tick_interval
+        self.tick_damage = tick_damage
+        self.stun = stun
+        self.shield = shield
+        self.max_stacks = max_stacks
+
+    def __repr__(self):
+        return f"StatusEffect({self.name!r})"
+
+
+# 内置效果；只有登记过的效果可以存档和读档
+EFFECTS = {}
+
+
+def register_effect(effect):
+    """登记状态效果
+
+    Args:
+        effect: 状态效果定义
+
+    Returns:
+        StatusEffect: 登记的效果
+    """
+    EFFECTS[effect.name] = effect
+    return effect
+
+
+def get_effect(effect):
+    """获取状态效果定义
+
+    Args:
+        effect: 效果定义或已登记的效果名称
+
+    Returns:
+        StatusEffect: 效果定义
+
+    Raises:
+        KeyError: 名称未登记
+    """
+    if isinstance(effect, StatusEffect):
+        return effect
+    try:
+        return EFFECTS[effect]
+    except KeyError:
+        raise KeyError(f"未知的状态效果: {effect}") from None
+
+
+register_effect(StatusEffect("burn", "燃烧", duration=6.0, tick_interval=1.0, tick_damage=3, max_stacks=3))
+register_effect(StatusEffect("poison", "中毒", duration=10.0, tick_interval=2.0, tick_damage=2, max_stacks=5))
+register_effect(StatusEffect("stun", "眩晕", duration=2.0, stun=True))
+register_effect(StatusEffect("shield", "护盾", duration=8.0, shield=15, max_stacks=2))
+register_effect(StatusEffect("attack_up", "攻击提升", duration=10.0, modifiers={"attack": (0, 0.25)}, max_stacks=2))
+register_effect(StatusEffect("armor_break", "破甲", duration=8.0, modifiers={"defense": (-2, 0)}, max_stacks=3))
+register_effect(StatusEffect("haste", "加速", duration=6.0, modifiers={"speed": (3, 0)}))
+register_effect(StatusEffect("slow", "减速", duration=6.0, modifiers={"speed": (-3, 0)}))
+
+
+class ActiveEffect:
+    """生效中的状态效果类"""
+
+    __slots__ = ("effect", "unit", "source", "stacks", "expire_time", "next_tick",
+                 "shield", "expire_timer", "tick_timer")
+
+    def __init__(self, effect, unit, source):
+        """初始化生效中的效果
+
+        Args:
+            effect: 效果定义
+            unit: 效果所在的角色
+            source: 施加者（可能为None）
+        """
+        self.effect = effect
+        self.unit = unit
+        self.source = source
+        self.stacks = 0
+        self.expire_time = None   # 结束时间（虚拟秒），一直持续时为None
+        self.next_tick = None     # 下一跳持续伤害的时间
+        self.shield = 0           # 剩余护盾吸收量
+        self.expire_timer = None  # 时间轮句柄
+        self.tick_timer = None
+
+
+class UnitStatus:
+    """角色状态效果集合类
+
+    角色第一次获得效果时创建，记下基础属性；效果变化时才重新计算实际属性，
+    结果直接写回角色的 attack / defense / speed，战斗中读取属性没有额外开销。
+    眩晕层数和护盾总量也随效果变化增量维护。
+    """
+
+    __slots__ = ("base", "effects", "stunned", "shield")
+
+    def __init__(self, unit):
+        """初始化状态效果集合
+
+        Args:
+            unit: 角色
+        """
+        self.base = tuple(getattr(unit, stat) for stat in STATS)  # 基础属性
+        self.effects = {}   # 效果名称 -> ActiveEffect（按施加顺序）
+        self.stunned = 0    # 眩晕效果数
+        self.shield = 0     # 护盾总量
+
+    def add(self, effect, unit, source):
+        """施加效果（已有同名效果时叠加一层）
+
+        Args:
+            effect: 效果定义
+            unit: 角色
+            source: 施加者
+
+        Returns:
+            ActiveEffect: 生效中的效果
+        """
+        active = self.effects.get(effect.name)
+        if active is None:
+            active = self.effects[effect.name] = ActiveEffect(effect, unit, source)
+            if effect.stun:
+                self.stunned += 1
+        if active.stacks < effect.max_stacks:
+            active.stacks += 1
+            if effect.shield:
+                active.shield += effect.shield
+                self.shield += effect.shield
+            if effect.modifiers:
+                self.recalculate(unit)
+        return active
+
+    def restore(self, effect, unit, source, stacks, shield):
+        """按存档的层数和护盾恢复效果（用于读档）
+
+        Args:
+            effect: 效果定义
+            unit: 角色
+            source: 施加者
+            stacks: 层数
+            shield: 剩余护盾吸收量
+
+        Returns:
+            ActiveEffect: 生效中的效果
+        """
+        active = self.effects[effect.name] = ActiveEffect(effect, unit, source)
+        active.stacks = stacks
+        active.shield = shield
+        self.shield += shield
+        if effect.stun:
+            self.stunned += 1
+        if effect.modifiers:
+            self.recalculate(unit)
+        return active
+
+    def remove(self, name, unit):
+        """移除效果
+
+        Args:
+            name: 效果名称
+            unit: 角色
+
+        Returns:
+            ActiveEffect: 移除的效果，没有该效果时返回None
+        """
+        active = self.effects.pop(name, None)
+        if active is None:
+            return None
+        effect = active.effect
+        if effect.stun:
+            self.stunned -= 1
+        self.shield -= active.shield
+        active.shield = 0
+        if effect.modifiers:
+            self.recalculate(unit)
+        return active
+
+    def absorb(self, damage):
+        """用护盾吸收伤害（先施加的护盾先消耗）
+
+        Args:
+            damage: 伤害值
+
+        Returns:
+            int: 护盾吸收后剩余的伤害
+        """
+        for active in self.effects.values():
+            if damage <= 0:
+                break
+            if active.shield:
+                absorbed = min(active.shield, damage)
+                active.shield -= absorbed
+                self.shield -= absorbed
+                damage -= absorbed
+        return damage
+
+    def recalculate(self, unit):
+        """按基础属性和所有效果的修正重新计算实际属性
+
+        只有存在修正的属性才取整并限制最小值；没有效果修正的属性原样恢复为基础属性。
+
+        Args:
+            unit: 角色
+        """
+        for index, stat in enumerate(STATS):
+            add = 0
+            mul = 0.0
+            modified = False
+            for active in self.effects.values():
+                modifier = active.effect.modifiers.get(stat)
+                if modifier is not None:
+                    add += modifier[0] * active.stacks
+                    mul += modifier[1] * active.stacks
+                    modified = True
+            if not modified:
+                setattr(unit, stat, self.base[index])
+                continue
+            value = int(round((self.base[index] + add) * (1.0 + mul)))
+            setattr(unit, stat, max(STAT_MINIMUMS[stat], value))
+
+    def restore_base(self, unit):
+        """把角色的属性恢复为基础属性
+
+        Args:
+            unit: 角色
+        """
+        for stat, value in zip(STATS, self.base):
+            setattr(unit, stat, value)
@@ -0,0 +1,412 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+数值平衡扫描
+在多进程中并行评估角色属性网格，结果流式写入CSV并支持断点续跑
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.combat.simulator import BattleSimulator, PLAYER_STATS, ENEMY_STATS
+from src.combat.skills import SUMMON_SKILL, get_skill
+
+# 可扫描的角色与属性
+ROLES = ("player", "enemy", "ally")
+STAT_FIELDS = ("max_hp", "max_mp", "attack", "defense", "speed")
+
+# 每个网格点输出的统计指标
+METRIC_FIELDS = (
+    "battles", "win_rate", "timeouts",
+    "ttk_mean", "ttk_p50", "ttk_p90",
+    "damage_dealt_mean", "damage_taken_mean",
+)
+
+
+def derive_seed(base_seed, index):
+    """为网格点生成确定的随机种子
+
+    种子只取决于基础种子和网格点下标，与由哪个进程计算无关。
+
+    Args:
+        base_seed: 基础种子
+        index: 网格点下标
+
+    Returns:
+        int: 随机种子
+    """
+    return (base_seed * 1000003 + index * 7919) & 0x7FFFFFFF
+
+
+def parse_param(text):
+    """解析命令行中的扫描参数
+
+    Args:
+        text: 形如 "player.attack=8,10,12" 的字符串
+
+    Returns:
+        tuple: (参数名, 取值列表)
+    """
+    name, _, values = text.partition("=")
+    role, _, field = name.partition(".")
+    if role not in ROLES or field not in STAT_FIELDS or not values:
+        raise ValueError(f"无效的扫描参数: {text}")
+    return name, [int(value) for value in values.split(",")]
+
+
+def _apply_overrides(stats, role, params):
+    """将网格点参数应用到基础数值上
+
+    Args:
+        stats: 基础数值元组 (name, max_hp, max_mp, attack, defense, speed)
+        role: 角色（player/enemy/ally）
+        params: 网格点参数字典
+
+    Returns:
+        tuple: 新的数值元组
+    """
+    values = list(stats)
+    for i, field in enumerate(STAT_FIELDS):
+        key = f"{role}.{field}"
+        if key in params:
+            values[i + 1] = params[key]
+    return tuple(values)
+
+
+def evaluate_point(index, params, battles, base_seed, use_skill=False, with_ally=False):
+    """评估一个网格点
+
+    Args:
+        index: 网格点下标
+        params: 网格点参数字典
+        battles: 模拟的战斗场数
+        base_seed: 基础种子
+        use_skill: 玩家是否自动释放技能
+        with_ally: 是否召唤盟友
+
+    Returns:
+        dict: 结果行（下标、参数和统计指标）
+    """
+    # 盟友的基础数值来自技能数据中的召唤技能
+    ally_stats = None
+    if any(name.startswith("ally.") for name in params):
+        ally_stats = _apply_overrides(get_skill(SUMMON_SKILL).summons, "ally", params)
+
+    simulator = BattleSimulator(
+        player_stats=_apply_overrides(PLAYER_STATS, "player", params),
+        enemy_stats=_apply_overrides(ENEMY_STATS, "enemy", params),
+        summon=with_ally or ally_stats is not None,
+        ally_stats=ally_stats,
+        use_skill=use_skill,
+        seed=derive_seed(base_seed, index)
+    )
+    summary = simulator.run(battles).summary()
+
+    row = {"index": index}
+    row.update(params)
+    row.update({
+        "battles": summary["battles"],
+        "win_rate": round(summary["win_rate"], 6),
+        "timeouts": summary["timeouts"],
+        "ttk_mean": round(summary["time_to_kill"]["mean"], 4),
+        "ttk_p50": round(summary["time_to_kill"]["p50"], 4),
+        "ttk_p90": round(summary["time_to_kill"]["p90"], 4),
+        "damage_dealt_mean": round(summary["damage_dealt"]["mean"], 3),
+        "damage_taken_mean": round(summary["damage_taken"]["mean"], 3),
+    })
+    return row
+
+
+def _evaluate_chunk(chunk, battles, base_seed, use_skill, with_ally):
+    """在工作进程中评估一批网格点
+
+    Args:
+        chunk: (下标, 参数字典) 列表
+        battles: 每个网格点的战斗场数
+        base_seed: 基础种子
+        use_skill: 玩家是否自动释放技能
+        with_ally: 是否召唤盟友
+
+    Returns:
+        list: 结果行列表
+    """
+    return [evaluate_point(index, params, battles, base_seed, use_skill, with_ally)
+            for index, params in chunk]
+
+
+class SweepRunner:
+    """并行数值扫描类"""
+
+    def __init__(self, grid, battles=1000, seed=0, workers=None, chunk_size=None,
+                 use_skill=False, with_ally=False):
+        """初始化扫描
+
+        Args:
+            grid: 参数网格，{"player.attack": [8, 10, 12], ...}
+            battles: 每个网格点模拟的战斗场数
+            seed: 基础随机种子
+            workers: 工作进程数，为None时使用CPU核心数
+            chunk_size: 每个任务包含的网格点数，为None时自动计算
+            use_skill: 玩家是否自动释放技能
+            with_ally: 是否召唤盟友
+        """
+        for name in grid:
+            role, _, field = name.partition(".")
+            if role not in ROLES or field not in STAT_FIELDS:
+                raise ValueError(f"无效的扫描参数: {name}")
+
+        self.param_names = sorted(grid)
+        self.grid = {name: list(grid[name]) for name in self.param_names}
+        self.battles = battles
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.use_skill = use_skill
+        self.with_ally = with_ally
+
+    @property
+    def config(self):
+        """决定扫描结果的参数，续跑时必须与结果文件记录的一致"""
+        return {
+            "grid": self.grid,
+            "battles": self.battles,
+            "seed": self.seed,
+            "use_skill": self.use_skill,
+            "with_ally": self.with_ally,
+        }
+
+    @property
+    def fieldnames(self):
+        """结果表的列名"""
+        return ["index"] + self.param_names + list(METRIC_FIELDS)
+
+    def __len__(self):
+        """网格点总数"""
+        total = 1
+        for values in self.grid.values():
+            total *= len(values)
+        return total
+
+    def points(self):
+        """遍历所有网格点
+
+        Returns:
+            generator: (下标, 参数字典)
+        """
+        value_lists = [self.grid[name] for name in self.param_names]
+        for index, values in enumerate(itertools.product(*value_lists)):
+            yield index, dict(zip(self.param_names, values))
+
+    def iter_results(self, skip=()):
+        """并行评估网格点，按完成顺序逐批返回结果
+
+        Args:
+            skip: 已完成的网格点下标集合
+
+        Returns:
+            generator: 结果行列表（每个完成的任务一批）；提前关闭时取消未开始的任务
+        """
+        pending = [point for point in self.points() if point[0] not in skip]
+        if not pending:
+            return
+
+        # 每个进程分到多个任务，兼顾负载均衡和进程间通信开销
+        chunk_size = self.chunk_size or max(1, len(pending) // (self.workers * 4))
+        chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+
+        # 调用方提前结束迭代（关闭生成器、出错或中断）时取消还没开始的任务，
+        # 不要等所有网格点都算完才退出
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            futures = [
+                executor.submit(_evaluate_chunk, chunk, self.battles, self.seed,
+                                self.use_skill, self.with_ally)
+                for chunk in chunks
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def run(self, output_path, on_progress=None):
+        """运行扫描并将结果流式写入CSV，已有结果文件时从中断处继续
+
+        扫描参数记录在结果文件旁的 JSON 文件中（见 config_path），续跑时参数不一致会报错。
+
+        Args:
+            output_path: CSV结果文件路径
+            on_progress: 进度回调函数，参数为 (已完成数, 总数)
+
+        Returns:
+            int: 本次新计算的网格点数
+        """
+        write_header = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+        if write_header:
+            save_config(output_path, self.config)
+            done = set()
+        else:
+            check_config(output_path, self.config)
+            done = load_completed(output_path, self.fieldnames)
+        total = len(self)
+        computed = 0
+
+        with open(output_path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=self.fieldnames)
+            if write_header:
+                writer.writeheader()
+                f.flush()
+
+            for rows in self.iter_results(skip=done):
+                writer.writerows(rows)
+                f.flush()  # 每批结果立即落盘，中断后可续跑
+                computed += len(rows)
+                if on_progress:
+                    on_progress(len(done) + computed, total)
+
+        return computed
+
+
+def config_path(path):
+    """结果文件对应的扫描参数文件路径
+
+    Args:
+        path: CSV结果文件路径
+
+    Returns:
+        str: 参数文件路径
+    """
+    return path + ".json"
+
+
+def save_config(path, config):
+    """在结果文件旁记录扫描参数
+
+    Args:
+        path: CSV结果文件路径
+        config: 扫描参数（SweepRunner.config）
+    """
+    with open(config_path(path), "w", encoding="utf-8") as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+
+
+def check_config(path, config):
+    """检查已有结果文件是否由相同的扫描参数生成
+
+    Args:
+        path: CSV结果文件路径
+        config: 当前的扫描参数（SweepRunner.config）
+    """
+    try:
+        with open(config_path(path), encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        raise ValueError(f"结果文件 {path} 缺少可读的扫描参数文件 {config_path(path)}，无法续跑") from None
+
+    changed = sorted(key for key in set(saved) | set(config) if saved.get(key) != config.get(key))
+    if changed:
+        raise ValueError(f"结果文件 {path} 的扫描参数与当前不一致: {', '.join(changed)}")
+
+
+def load_completed(path, fieldnames):
+    """读取已有结果文件中已完成的网格点
+
+    被中断时最后一行可能只写了一半，这样的行会被截掉。
+
+    Args:
+        path: CSV结果文件路径
+        fieldnames: 期望的列名
+
+    Returns:
+        set: 已完成的网格点下标
+    """
+    if not os.path.exists(path):
+        return set()
+
+    with open(path, newline="", encoding="utf-8") as f:
+        lines = f.read().splitlines(keepends=True)
+    if not lines:
+        return set()
+
+    header = next(csv.reader([lines[0]]))
+    if header != list(fieldnames):
+        raise ValueError(f"结果文件 {path} 的列与当前扫描参数不一致")
+
+    done = set()
+    good_lines = [lines[0]]
+    for line in lines[1:]:
+        row = next(csv.reader([line]), [])
+        if len(row) != len(fieldnames) or not line.endswith("\n"):
+            break
+        done.add(int(row[0]))
+        good_lines.append(line)
+
+    # 截掉损坏的尾部
+    if len(good_lines) != len(lines):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            f.writelines(good_lines)
+
+    return done
+
+
+def export_npz(csv_path, npz_path):
+    """将CSV结果表转换为按下标排序的NPZ列式文件
+
+    Args:
+        csv_path: CSV结果文件路径
+        npz_path: 输出的NPZ文件路径
+    """
+    import numpy as np  # NumPy 是可选依赖，只在导出NPZ时需要
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        rows = sorted(reader, key=lambda row: int(row["index"]))
+        columns = reader.fieldnames
+
+    arrays = {}
+    for name in columns:
+        values = [float(row[name]) for row in rows]
+        dtype = np.int64 if all(value.is_integer() for value in values) else np.float64
+        arrays[name] = np.array(values, dtype=dtype)
+    np.savez_compressed(npz_path, **arrays)
+
+
+def main(argv=None):
+    """命令行入口
+
+    Args:
+        argv: 命令行参数列表，为None时读取sys.argv
+    """
+    parser = argparse.ArgumentParser(description="并行数值平衡扫描")
+    parser.add_argument("--param", action="append", required=True,
+                        help="扫描参数，如 player.attack=8,10,12（可重复）")
+    parser.add_argument("-n", "--battles", type=int, default=1000, help="每个网格点的战斗场数")
+    parser.add_argument("--seed", type=int, default=0, help="基础随机种子")
+    parser.add_argument("--workers", type=int, default=None, help="工作进程数")
+    parser.add_argument("--out", default="sweep.csv", help="CSV结果文件（已存在时续跑）")
+    parser.add_argument("--npz", default=None, help="扫描完成后导出的NPZ文件")
+    parser.add_argument("--ally", action="store_true", help="开场召唤盟友")
+    parser.add_argument("--skill", action="store_true", help="自动释放技能")
+    args = parser.parse_args(argv)
+
+    grid = dict(parse_param(text) for text in args.param)
+    runner = SweepRunner(grid, battles=args.battles, seed=args.seed, workers=args.workers,
+                         use_skill=args.skill, with_ally=args.ally)
+
+    def report(done, total):
+        print(f"\r进度: {done}/{total}", end="", flush=True)
+
+    computed = runner.run(args.out, on_progress=report)
+    print(f"\n本次计算 {computed} 个网格点，结果写入 {args.out}")
+
+    if args.npz:
+        export_npz(args.out, args.npz)
+        print(f"已导出 {args.npz}")
+
+
+if __name__ == "__main__":
+    main()
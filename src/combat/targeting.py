@@ -0,0 +1,599 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+目标选择
+维护每一方的存活单位集合，并提供可替换的目标选择策略；
+单位阵亡、受伤时增量更新，选择目标不需要遍历整个阵营
+"""
+
+import heapq
+
+
+class UnitSet:
+    """单位集合类
+
+    列表加下标字典，添加、删除（与末尾交换）和随机选取都是 O(1)。
+    """
+
+    def __init__(self):
+        """初始化集合"""
+        self.items = []
+        self._index = {}
+
+    def __len__(self):
+        """单位数量"""
+        return len(self.items)
+
+    def __contains__(self, unit):
+        """单位是否在集合中"""
+        return unit in self._index
+
+    def __iter__(self):
+        """遍历单位"""
+        return iter(self.items)
+
+    def add(self, unit):
+        """添加单位
+
+        Args:
+            unit: 角色
+        """
+        if unit not in self._index:
+            self._index[unit] = len(self.items)
+            self.items.append(unit)
+
+    def discard(self, unit):
+        """删除单位（不存在时忽略）
+
+        Args:
+            unit: 角色
+        """
+        index = self._index.pop(unit, None)
+        if index is None:
+            return
+        last = self.items.pop()
+        if index < len(self.items):
+            self.items[index] = last
+            self._index[last] = index
+
+    def choice(self, rng):
+        """随机选取一个单位
+
+        Args:
+            rng: 随机数生成器
+
+        Returns:
+            Character: 单位，集合为空时返回None
+        """
+        return rng.choice(self.items) if self.items else None
+
+
+class BattleSide:
+    """战斗阵营类
+
+    units 按加入顺序保存所有单位（第一个为首领，如玩家或首领敌人），
+    alive 只包含存活的单位；以本方为目标的策略会收到加入、受伤、造成伤害和阵亡的通知。
+    """
+
+    def __init__(self, units=()):
+        """初始化阵营
+
+        Args:
+            units: 开场单位列表
+        """
+        self.units = []
+        self.alive = UnitSet()
+        self.policies = []   # 以本方为目标的选择策略
+        # 需要受伤、造成伤害通知的策略（每次攻击都会通知，跳过没有重写对应方法的策略）
+        self._hp_policies = []
+        self._dealt_policies = []
+        self.policy = None   # 本方选择目标的策略
+        self.opponents = None
+        for unit in units:
+            self.join(unit)
+
+    @property
+    def leader(self):
+        """首领（第一个加入的单位）"""
+        return self.units[0] if self.units else None
+
+    @property
+    def alive_count(self):
+        """存活单位数量"""
+        return len(self.alive)
+
+    def engage(self, opponents, policy):
+        """设置对手阵营和选择目标的策略
+
+        Args:
+            opponents: 对手阵营
+            policy: 目标选择策略，作用于对手阵营
+        """
+        self.opponents = opponents
+        self.policy = policy
+        opponents.policies.append(policy)
+        if type(policy).on_hp_changed is not TargetPolicy.on_hp_changed:
+            opponents._hp_policies.append(policy)
+        if type(policy).on_dealt is not TargetPolicy.on_dealt:
+            opponents._dealt_policies.append(policy)
+        policy.rebuild(opponents)
+
+    def join(self, unit):
+        """单位加入本方
+
+        Args:
+            unit: 角色
+        """
+        self.units.append(unit)
+        if unit.is_alive():
+            self.alive.add(unit)
+            for policy in self.policies:
+                policy.on_join(unit)
+
+    def check(self, unit):
+        """确认单位仍然存活；生命值已在外部归零时补记阵亡
+
+        Args:
+            unit: 角色
+
+        Returns:
+            bool: 单位存活且在存活集合中时返回True
+        """
+        if unit not in self.alive:
+            return False
+        if unit.is_alive():
+            return True
+        self.mark_dead(unit)
+        return False
+
+    def mark_dead(self, unit):
+        """记录单位阵亡
+
+        Args:
+            unit: 角色
+        """
+        if unit in self.alive:
+            self.alive.discard(unit)
+            for policy in self.policies:
+                policy.on_death(unit)
+
+    def hp_changed(self, unit):
+        """单位生命值变化（受伤或治疗）
+
+        Args:
+            unit: 角色
+        """
+        for policy in self._hp_policies:
+            policy.on_hp_changed(unit)
+
+    def dealt(self, unit, amount):
+        """单位造成了伤害
+
+        Args:
+            unit: 角色
+            amount: 伤害值
+        """
+        for policy in self._dealt_policies:
+            policy.on_dealt(unit, amount)
+
+    def has_alive(self):
+        """本方是否还有存活单位
+
+        先从存活集合末尾补记生命值已在外部归零的单位，找到一个存活单位即可返回（通常只检查一个）；
+        集合看起来已经为空时再按生命值检查所有单位，在外部复活的单位也能被发现。
+
+        Returns:
+            bool: 有存活单位时返回True
+        """
+        items = self.alive.items
+        while items:
+            if items[-1].is_alive():
+                return True
+            self.mark_dead(items[-1])
+        for unit in self.units:
+            if unit.is_alive():
+                self.refresh()
+                return True
+        return False
+
+    def refresh(self):
+        """按当前生命值重建存活集合（在战斗管理器之外修改生命值后调用）"""
+        self.alive = UnitSet()
+        for unit in self.units:
+            if unit.is_alive():
+                self.alive.add(unit)
+        for policy in self.policies:
+            policy.rebuild(self)
+
+
+class TargetPolicy:
+    """目标选择策略基类
+
+    每个策略实例只作用于一个阵营（由 BattleSide.engage 绑定）。
+    """
+
+    side = None
+
+    def rebuild(self, side):
+        """绑定阵营并根据存活单位重建内部结构
+
+        Args:
+            side: 目标阵营
+        """
+        self.side = side
+
+    def on_join(self, unit):
+        """单位加入目标阵营"""
+
+    def on_death(self, unit):
+        """目标阵营的单位阵亡"""
+
+    def on_hp_changed(self, unit):
+        """目标阵营的单位生命值变化"""
+
+    def on_dealt(self, unit, amount):
+        """目标阵营的单位造成了伤害"""
+
+    def get_state(self, index):
+        """获取策略的内部状态（用于存档）
+
+        Args:
+            index: {单位: 单位下标}
+
+        Returns:
+            tuple: 状态元组，只含数值和单位下标
+        """
+        return ()
+
+    def set_state(self, state, units):
+        """恢复 get_state 返回的内部状态（在 rebuild 之后调用）
+
+        Args:
+            state: 状态元组
+            units: 按下标排列的单位列表
+        """
+
+    def select(self, rng):
+        """选择目标
+
+        Args:
+            rng: 随机数生成器
+
+        Returns:
+            Character: 目标，没有存活单位时返回None
+        """
+        raise NotImplementedError
+
+
+class RandomTarget(TargetPolicy):
+    """随机目标策略类"""
+
+    def select(self, rng):
+        """从存活单位中随机选择目标
+
+        Args:
+            rng: 随机数生成器
+
+        Returns:
+            Character: 目标，没有存活单位时返回None
+        """
+        side = self.side
+        while side.alive:
+            unit = side.alive.choice(rng)
+            if side.check(unit):
+                return unit
+        return None
+
+
+class LeaderTarget(TargetPolicy):
+    """首领优先策略类
+
+    有其他单位时按一定几率随机攻击其中存活的一个，否则攻击首领；
+    首领阵亡后仍然只按这个几率攻击其他单位，没有选中时这次没有目标
+    （敌人的默认策略，与原来的敌人目标选择一致：玩家和盟友）。
+    """
+
+    def __init__(self, follower_chance=0.5):
+        """初始化策略
+
+        Args:
+            follower_chance: 攻击首领以外单位的几率
+        """
+        self.follower_chance = follower_chance
+        self.followers = UnitSet()
+
+    def rebuild(self, side):
+        """绑定阵营并重建首领以外的存活单位集合
+
+        Args:
+            side: 目标阵营
+        """
+        self.side = side
+        self.followers = UnitSet()
+        for unit in side.alive:
+            self.on_join(unit)
+
+    def on_join(self, unit):
+        """单位加入目标阵营"""
+        if unit is not self.side.leader:
+            self.followers.add(unit)
+
+    def on_death(self, unit):
+        """目标阵营的单位阵亡"""
+        self.followers.discard(unit)
+
+    def get_state(self, index):
+        """获取几率和非首领单位集合的顺序（随机选择的结果取决于顺序）
+
+        Args:
+            index: {单位: 单位下标}
+
+        Returns:
+            tuple: (攻击首领以外单位的几率, 非首领单位下标)
+        """
+        return (self.follower_chance, tuple(index[unit] for unit in self.followers.items))
+
+    def set_state(self, state, units):
+        """恢复几率和非首领单位集合的顺序
+
+        Args:
+            state: 状态元组
+            units: 按下标排列的单位列表
+        """
+        self.follower_chance, followers = state
+        self.followers = UnitSet()
+        for i in followers:
+            self.followers.add(units[i])
+
+    def select(self, rng):
+        """选择目标
+
+        Args:
+            rng: 随机数生成器
+
+        Returns:
+            Character: 目标，没有存活单位时返回None
+        """
+        side = self.side
+        if len(side.units) > 1 and rng.random() < self.follower_chance:
+            unit = self._random_follower(rng)
+            if unit is not None:
+                return unit
+
+        if side.check(side.leader):
+            return side.leader
+        return None
+
+    def _random_follower(self, rng):
+        """随机选择一个存活的非首领单位
+
+        Args:
+            rng: 随机数生成器
+
+        Returns:
+            Character: 目标，没有时返回None
+        """
+        while self.followers:
+            unit = self.followers.choice(rng)
+            if self.side.check(unit):
+                return unit
+        return None
+
+
+class HeapTarget(TargetPolicy):
+    """按优先级选择目标的策略基类
+
+    存活单位按 (优先级, 序号) 保存在最小堆中；优先级变化时压入新条目，
+    旧条目在弹出时按序号惰性丢弃（与 ActionScheduler 相同）。
+    """
+
+    def __init__(self):
+        """初始化策略"""
+        self._heap = []      # (优先级, 序号, 单位)
+        self._entries = {}   # 单位 -> 有效条目的序号
+        self._counter = 0
+
+    def priority(self, unit):
+        """单位的优先级，越小越先被选中
+
+        Args:
+            unit: 角色
+
+        Returns:
+            优先级
+        """
+        raise NotImplementedError
+
+    def rebuild(self, side):
+        """绑定阵营并重建堆
+
+        Args:
+            side: 目标阵营
+        """
+        self.side = side
+        self._heap = []
+        self._entries = {}
+        for unit in side.alive:
+            self._push(unit)
+
+    def _push(self, unit):
+        """压入单位的当前优先级
+
+        Args:
+            unit: 角色
+        """
+        seq = self._counter
+        self._counter += 1
+        self._entries[unit] = seq
+        heapq.heappush(self._heap, (self.priority(unit), seq, unit))
+
+        # 失效条目过多时重建堆
+        if len(self._heap) > 2 * len(self._entries) + 32:
+            self._heap = [entry for entry in self._heap if self._entries.get(entry[2]) == entry[1]]
+            heapq.heapify(self._heap)
+
+    def on_join(self, unit):
+        """单位加入目标阵营"""
+        self._push(unit)
+
+    def on_death(self, unit):
+        """目标阵营的单位阵亡"""
+        self._entries.pop(unit, None)
+
+    def get_state(self, index):
+        """获取有效条目的压入顺序（优先级相同时先压入的先被选中）
+
+        Args:
+            index: {单位: 单位下标}
+
+        Returns:
+            tuple: (按压入顺序的单位下标,)
+        """
+        order = sorted(self._entries.items(), key=lambda item: item[1])
+        return (tuple(index[unit] for unit, _ in order),)
+
+    def set_state(self, state, units):
+        """按原来的压入顺序重建堆
+
+        Args:
+            state: 状态元组
+            units: 按下标排列的单位列表
+        """
+        self._heap = []
+        self._entries = {}
+        for i in state[0]:
+            self._push(units[i])
+
+    def select(self, rng):
+        """选择优先级最小的存活单位
+
+        Args:
+            rng: 随机数生成器（不使用）
+
+        Returns:
+            Character: 目标，没有存活单位时返回None
+        """
+        heap = self._heap
+        entries = self._entries
+        while heap:
+            priority, seq, unit = heap[0]
+            if entries.get(unit) == seq and self.side.check(unit):
+                return unit
+            heapq.heappop(heap)
+        return None
+
+
+class FrontTarget(HeapTarget):
+    """最前排目标策略类：攻击最早加入的存活单位（玩家方的默认策略）"""
+
+    def __init__(self):
+        """初始化策略"""
+        super().__init__()
+        self._order = {}
+
+    def priority(self, unit):
+        """加入顺序"""
+        return self._order.setdefault(unit, len(self._order))
+
+    def rebuild(self, side):
+        """绑定阵营并按加入顺序重建堆
+
+        Args:
+            side: 目标阵营
+        """
+        self._order = {unit: index for index, unit in enumerate(side.units)}
+        super().rebuild(side)
+
+
+class LowestHPTarget(HeapTarget):
+    """最低生命值目标策略类：集中攻击最虚弱的单位"""
+
+    def priority(self, unit):
+        """当前生命值"""
+        return unit.current_hp
+
+    def on_hp_changed(self, unit):
+        """生命值变化时更新优先级"""
+        if unit in self._entries:
+            self._push(unit)
+
+
+class HighestThreatTarget(HeapTarget):
+    """最高威胁目标策略类：攻击累计造成伤害最多的单位"""
+
+    def __init__(self):
+        """初始化策略"""
+        super().__init__()
+        self.threat = {}
+
+    def priority(self, unit):
+        """累计伤害取负（最小堆中威胁最高的在堆顶）"""
+        return -self.threat.get(unit, 0)
+
+    def on_dealt(self, unit, amount):
+        """造成伤害时增加威胁"""
+        self.threat[unit] = self.threat.get(unit, 0) + amount
+        if unit in self._entries:
+            self._push(unit)
+
+    def get_state(self, index):
+        """获取压入顺序和威胁表
+
+        Args:
+            index: {单位: 单位下标}
+
+        Returns:
+            tuple: (按压入顺序的单位下标, (单位下标, 累计伤害))
+        """
+        threat = tuple(sorted((index[unit], amount) for unit, amount in self.threat.items()))
+        return super().get_state(index) + (threat,)
+
+    def set_state(self, state, units):
+        """恢复威胁表后按原来的压入顺序重建堆
+
+        Args:
+            state: 状态元组
+            units: 按下标排列的单位列表
+        """
+        self.threat = {units[i]: amount for i, amount in state[1]}
+        super().set_state(state, units)
+
+
+# 命令行和数据中使用的策略名称
+POLICIES = {
+    "front": FrontTarget,
+    "leader": LeaderTarget,
+    "random": RandomTarget,
+    "lowest_hp": LowestHPTarget,
+    "highest_threat": HighestThreatTarget,
+}
+
+
+def policy_name(policy):
+    """获取策略的名称
+
+    Args:
+        policy: 策略对象
+
+    Returns:
+        str: POLICIES 中的名称，自定义的策略类返回None
+    """
+    for name, cls in POLICIES.items():
+        if type(policy) is cls:
+            return name
+    return None
+
+
+def make_policy(policy):
+    """创建目标选择策略
+
+    Args:
+        policy: 策略对象、策略名称或None
+
+    Returns:
+        TargetPolicy: 策略对象，为None时返回None
+    """
+    if policy is None or isinstance(policy, TargetPolicy):
+        return policy
+    return POLICIES[policy]()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+分层时间轮
+按到期时间触发大量定时器（状态效果的结束、持续伤害的跳数），
+添加、取消和触发都是均摊 O(1)，不需要在每次更新时遍历所有定时器
+"""
+
+import math
+
+
+class TimerWheel:
+    """分层时间轮类
+
+    时间被量化为 resolution 秒一格（到期时间向上取整到格）。第0层每格对应一个时刻，
+    第 n 层每格对应 slots**n 个时刻；较远的定时器放在高层，当前时刻走到高层某格的起点时，
+    把该格的定时器重新分配到低层（级联）。超出所有层范围的定时器放在溢出列表中，
+    最高层转完一圈时再重新分配。
+
+    第0层用位图记录非空的格，推进时直接跳到下一个非空格或级联点，空闲的时刻不需要逐格经过。
+    取消定时器时不从格中删除，而是在触发时惰性丢弃。
+    """
+
+    def __init__(self, resolution=0.05, slot_bits=6, levels=4, start_time=0.0):
+        """初始化时间轮
+
+        Args:
+            resolution: 每格的时间（秒）
+            slot_bits: 每层格数的二进制位数（每层 2**slot_bits 格）
+            levels: 层数
+            start_time: 起始时间（秒）
+        """
+        self.resolution = resolution
+        self._bits = slot_bits
+        self._mask = (1 << slot_bits) - 1
+        self._level_count = levels
+        self._levels = None  # 各层的格，第一次添加定时器时才创建（大多数战斗没有状态效果）
+        self._overflow = []
+        self._occupied = 0   # 第0层非空格的位图
+        self._ready = []     # 当前时刻已到期、尚未弹出的条目
+        self._ready_pos = 0
+        self.count = 0       # 有效定时器数量
+        self.tick = self._floor_tick(start_time)  # 已经推进到的时刻（格）
+
+    def __len__(self):
+        """有效定时器数量（热路径中直接读取 count 属性）"""
+        return self.count
+
+    def _floor_tick(self, time):
+        """时间所在的格（向下取整）"""
+        return int(math.floor(time / self.resolution + 1e-9))
+
+    def reset(self, time):
+        """清空所有定时器并从指定时间重新开始
+
+        Args:
+            time: 起始时间（秒）
+        """
+        self._levels = None
+        self._overflow = []
+        self._occupied = 0
+        self._ready = []
+        self._ready_pos = 0
+        self.count = 0
+        self.tick = self._floor_tick(time)
+
+    def schedule(self, time, item, now=None):
+        """添加定时器
+
+        Args:
+            time: 到期时间（秒），早于当前时刻时在下一次 pop_due 时立即触发
+            item: 到期时返回的对象
+            now: 当前时间（秒）；时间轮为空时直接跳到这一时刻，之后推进不需要经过空闲的时间
+
+        Returns:
+            list: 定时器句柄，用于 cancel
+        """
+        if now is not None and self.count == 0:
+            self.tick = max(self.tick, self._floor_tick(now))
+        if self._levels is None:
+            size = self._mask + 1
+            self._levels = [[[] for _ in range(size)] for _ in range(self._level_count)]
+        tick = int(math.ceil(time / self.resolution - 1e-9))
+        entry = [tick, item]
+        self.count += 1
+        self._insert(entry)
+        return entry
+
+    def cancel(self, handle):
+        """取消定时器
+
+        Args:
+            handle: schedule 返回的句柄
+        """
+        if handle[1] is not None:
+            handle[1] = None
+            self.count -= 1
+
+    def _insert(self, entry):
+        """把条目放入对应的层和格
+
+        Args:
+            entry: [到期时刻, 对象]
+        """
+        tick = entry[0]
+        delta = tick - self.tick
+        if delta <= 0:
+            self._ready.append(entry)
+            return
+
+        bits = self._bits
+        for index, level in enumerate(self._levels):
+            if delta < 1 << (bits * (index + 1)):
+                slot = (tick >> (bits * index)) & self._mask
+                level[slot].append(entry)
+                if index == 0:
+                    self._occupied |= 1 << slot
+                return
+        self._overflow.append(entry)
+
+    def _cascade(self, tick):
+        """当前时刻走到高层格的起点时，把这些格中的条目重新分配到低层
+
+        Args:
+            tick: 当前时刻（第0层格号为0）
+        """
+        bits = self._bits
+        levels = self._levels
+        for index in range(1, len(levels)):
+            slot = (tick >> (bits * index)) & self._mask
+            entries = levels[index][slot]
+            if entries:
+                levels[index][slot] = []
+                for entry in entries:
+                    if entry[1] is not None:
+                        self._insert(entry)
+            if slot != 0:
+                return
+
+        # 最高层也转完一圈：重新分配溢出的条目
+        overflow = self._overflow
+        self._overflow = []
+        for entry in overflow:
+            if entry[1] is not None:
+                self._insert(entry)
+
+    def _advance(self, target):
+        """推进到下一个有条目的时刻（不超过目标时刻）
+
+        Args:
+            target: 目标时刻（格）
+        """
+        if self.count == 0:
+            # 没有定时器（各层可能还没有创建）：直接跳到目标时刻
+            self.tick = target
+            return
+
+        mask = self._mask
+        level0 = self._levels[0]
+        while self.tick < target:
+            if self.count == 0:
+                self.tick = target
+                return
+
+            # 本圈剩余部分中下一个非空格
+            tick = self.tick
+            position = (tick & mask) + 1
+            ahead = self._occupied >> position
+            if ahead:
+                next_tick = tick + 1 + ((ahead & -ahead).bit_length() - 1)
+                if next_tick <= target:
+                    self._take_slot(next_tick)
+                    return
+                self.tick = target
+                return
+
+            # 本圈已空：走到下一圈的起点并级联
+            boundary = (tick | mask) + 1
+            if boundary > target:
+                self.tick = target
+                return
+            self.tick = boundary
+            self._cascade(boundary)
+            if level0[0] or self._ready:
+                self._take_slot(boundary)
+                return
+
+    def _take_slot(self, tick):
+        """走到指定时刻，取出第0层对应格中的条目
+
+        Args:
+            tick: 时刻（格）
+        """
+        self.tick = tick
+        slot = tick & self._mask
+        entries = self._levels[0][slot]
+        self._levels[0][slot] = []
+        self._occupied &= ~(1 << slot)
+        # 级联时正好在这一时刻到期的条目已经放入待弹出列表
+        if self._ready:
+            self._ready.extend(entries)
+        else:
+            self._ready = entries
+            self._ready_pos = 0
+
+    def pop_due(self, now):
+        """弹出一个已到期的定时器
+
+        Args:
+            now: 当前时间（秒）
+
+        Returns:
+            tuple: (到期时间, 对象)，到期时间为格的起点；没有到期定时器时返回None
+        """
+        target = self._floor_tick(now)
+        while True:
+            ready = self._ready
+            while self._ready_pos < len(ready):
+                entry = ready[self._ready_pos]
+                self._ready_pos += 1
+                item = entry[1]
+                if item is not None:
+                    entry[1] = None
+                    self.count -= 1
+                    return max(entry[0], self.tick) * self.resolution, item
+            self._ready = []
+            self._ready_pos = 0
+
+            if self.tick >= target:
+                return None
+            self._advance(target)
+            if not self._ready:
+                return None
@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+向量化战斗引擎
+用NumPy数组（结构数组）批量结算大规模多单位战斗
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 是可选依赖，只有向量化引擎需要
+    np = None
+
+from src.combat.character import Character
+
+# 阵营编号
+SIDE_PLAYER = 0
+SIDE_ENEMY = 1
+
+
+class VectorBattle:
+    """向量化战斗类
+
+    所有单位的属性和三种冷却（攻击、技能、公共冷却）分别保存在数组中，冷却衰减、到期攻击、
+    伤害浮动和防御减伤都按数组批量计算，结果与 BattleManager 的公式一致：
+    伤害 = int(攻击力 × 0.8~1.2)，实际伤害 = max(1, 伤害 - 防御力 // 2)。
+
+    同一时刻到期的攻击同时结算：目标从该时刻开始时仍存活的敌方单位中随机选取。
+
+    技能冷却是 单位数 × 技能栏位数 的二维数组，由各单位 SkillBook 的就绪时间减去起始时间换算为剩余秒数，
+    技能少的单位多出的栏位为0。本战斗的虚拟时间从起始时间继续计算，写回的就绪时间与技能栏在同一时间轴上。
+    """
+
+    def __init__(self, player_side, enemy_side, seed=None, origin=0.0):
+        """初始化向量化战斗
+
+        Args:
+            player_side: 玩家方单位列表（角色对象或 (name, max_hp, max_mp, attack, defense, speed) 元组）
+            enemy_side: 敌方单位列表
+            seed: 随机种子
+            origin: 起始时间，即单位技能栏就绪时间所在战斗的当前虚拟时间（秒）；
+                单位的攻击冷却和公共冷却字段必须是该时刻的剩余秒数
+        """
+        if np is None:
+            raise ImportError("向量化战斗引擎需要安装NumPy")
+
+        units = [self._as_character(unit) for unit in list(player_side) + list(enemy_side)]
+        self.characters = units
+        self.names = [unit.name for unit in units]
+
+        # 单位属性（结构数组）
+        self.max_hp = np.array([unit.max_hp for unit in units], dtype=np.int64)
+        self.hp = np.array([unit.current_hp for unit in units], dtype=np.int64)
+        self.mp = np.array([unit.current_mp for unit in units], dtype=np.int64)
+        self.attack = np.array([unit.attack for unit in units], dtype=np.int64)
+        self.defense = np.array([unit.defense for unit in units], dtype=np.int64)
+        self.speed = np.array([unit.speed for unit in units], dtype=np.float64)
+
+        # 三种冷却（秒）：技能冷却每个技能栏位一列
+        self.attack_cooldown = np.array([unit.attack_cooldown for unit in units], dtype=np.float64)
+        self.skill_cooldown = self._skill_cooldowns(units, origin)
+        self.gcd = np.array([unit.gcd for unit in units], dtype=np.float64)
+
+        # 阵营与统计
+        self.side = np.array([SIDE_PLAYER] * len(player_side) + [SIDE_ENEMY] * len(enemy_side), dtype=np.int8)
+        self.damage_dealt = np.zeros(len(units), dtype=np.int64)
+
+        self.rng = np.random.default_rng(seed)
+        self.time = origin
+        self.battle_active = not self.is_battle_over()
+
+    @classmethod
+    def from_battle(cls, battle, seed=None):
+        """从进行中的战斗管理器创建向量化战斗
+
+        先把调度器中的行动时间同步到各单位的冷却字段，再以战斗的当前时间为起始时间。
+
+        Args:
+            battle: BattleManager 对象
+            seed: 随机种子
+
+        Returns:
+            VectorBattle: 向量化战斗
+        """
+        battle.sync_cooldowns()
+        return cls([battle.player] + battle.allies, battle.enemies, seed, origin=battle.time)
+
+    @staticmethod
+    def _as_character(unit):
+        """将单位数据转换为角色对象
+
+        Args:
+            unit: 角色对象或数值元组
+
+        Returns:
+            Character: 角色对象
+        """
+        if isinstance(unit, Character):
+            return unit
+        return Character(*unit)
+
+    @staticmethod
+    def _skill_cooldowns(units, origin):
+        """把各单位技能栏的就绪时间换算为技能冷却数组
+
+        Args:
+            units: 角色列表
+            origin: 起始时间（秒）
+
+        Returns:
+            ndarray: 单位数 × 最大技能栏位数 的剩余冷却（秒）
+        """
+        slots = max((len(unit.skills) for unit in units if unit.skills), default=0)
+        cooldown = np.zeros((len(units), slots), dtype=np.float64)
+        for i, unit in enumerate(units):
+            if unit.skills:
+                cooldown[i, :len(unit.skills)] = unit.skills.ready
+        cooldown -= origin
+        np.maximum(cooldown, 0.0, out=cooldown)
+        return cooldown
+
+    def __len__(self):
+        """单位总数"""
+        return len(self.names)
+
+    def alive_mask(self):
+        """获取存活单位掩码
+
+        Returns:
+            ndarray: 布尔数组
+        """
+        return self.hp > 0
+
+    def alive_count(self, side):
+        """获取某一阵营的存活单位数
+
+        Args:
+            side: 阵营编号
+
+        Returns:
+            int: 存活单位数
+        """
+        return int(np.count_nonzero((self.hp > 0) & (self.side == side)))
+
+    def is_battle_over(self):
+        """检查战斗是否结束
+
+        Returns:
+            bool: 任一阵营全部阵亡时为True
+        """
+        return self.alive_count(SIDE_PLAYER) == 0 or self.alive_count(SIDE_ENEMY) == 0
+
+    def attack_intervals(self, indices):
+        """计算单位的攻击间隔
+
+        Args:
+            indices: 单位下标数组
+
+        Returns:
+            ndarray: 攻击间隔（秒），与 Character.get_attack_interval 一致
+        """
+        return np.maximum(0.5, 2.0 - self.speed[indices] * 0.1)
+
+    def update(self, elapsed_time):
+        """推进战斗
+
+        在时间段内按冷却到期的先后分批结算，跨越多个攻击间隔时会补齐所有攻击。
+
+        Args:
+            elapsed_time: 经过的时间（秒）
+
+        Returns:
+            int: 本次结算的攻击次数
+        """
+        if not self.battle_active:
+            return 0
+
+        attacks = 0
+        remaining = elapsed_time
+        while True:
+            alive = self.hp > 0
+            pending = self.attack_cooldown[alive]
+            next_due = float(pending.min()) if pending.size else remaining
+            step = min(next_due, remaining)
+
+            self._decay_cooldowns(step)
+            remaining -= step
+            self.time += step
+
+            if next_due > step:
+                break
+
+            attacks += self._resolve_due_attacks(alive)
+            if self.is_battle_over():
+                self.battle_active = False
+                self.time += remaining
+                break
+
+        return attacks
+
+    def _decay_cooldowns(self, step):
+        """批量减少所有单位的冷却
+
+        Args:
+            step: 经过的时间（秒）
+        """
+        if step <= 0:
+            return
+        for cooldown in (self.attack_cooldown, self.skill_cooldown, self.gcd):
+            cooldown -= step
+            np.maximum(cooldown, 0.0, out=cooldown)
+
+    def _resolve_due_attacks(self, alive):
+        """结算所有冷却到期的攻击
+
+        Args:
+            alive: 本时刻开始时的存活掩码
+
+        Returns:
+            int: 结算的攻击次数
+        """
+        due = alive & (self.attack_cooldown <= 0)
+        attackers = np.flatnonzero(due)
+        if attackers.size == 0:
+            return 0
+
+        # 为每个攻击者从对方存活单位中随机选择目标
+        targets = np.empty(attackers.size, dtype=np.int64)
+        valid = np.zeros(attackers.size, dtype=bool)
+        attacker_side = self.side[attackers]
+        for side in (SIDE_PLAYER, SIDE_ENEMY):
+            mine = attacker_side == side
+            candidates = np.flatnonzero(alive & (self.side != side))
+            if candidates.size == 0 or not mine.any():
+                continue
+            targets[mine] = candidates[self.rng.integers(candidates.size, size=int(mine.sum()))]
+            valid[mine] = True
+
+        attackers = attackers[valid]
+        targets = targets[valid]
+        if attackers.size == 0:
+            return 0
+
+        # 伤害浮动与防御减伤
+        variation = self.rng.uniform(0.8, 1.2, size=attackers.size)
+        damage = (self.attack[attackers] * variation).astype(np.int64)
+        actual = np.maximum(1, damage - self.defense[targets] // 2)
+
+        # 同一目标可能被多次命中，使用无缓冲的累加
+        np.subtract.at(self.hp, targets, actual)
+        np.maximum(self.hp, 0, out=self.hp)
+        np.add.at(self.damage_dealt, attackers, actual)
+
+        # 重置攻击冷却
+        self.attack_cooldown[attackers] = self.attack_intervals(attackers)
+        return int(attackers.size)
+
+    def sync_characters(self):
+        """将数组中的状态写回角色对象"""
+        for i, unit in enumerate(self.characters):
+            unit.current_hp = int(self.hp[i])
+            unit.current_mp = int(self.mp[i])
+            unit.attack_cooldown = float(self.attack_cooldown[i])
+            unit.gcd = float(self.gcd[i])
+            if unit.skills:
+                # 剩余冷却换算回本战斗虚拟时间下的就绪时间
+                for slot in range(len(unit.skills)):
+                    unit.skills.ready[slot] = self.time + float(self.skill_cooldown[i, slot])
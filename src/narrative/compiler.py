@@ -0,0 +1,368 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+剧情编译器
+校验剧情源文件（JSON）中的节点和链接，并编译为紧凑的节点数据和按偏移的索引，
+运行时只读取索引，节点在需要时才从数据文件中读取
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+
+# 编译结果文件
+INDEX_FILE = "story.idx"
+DATA_FILE = "story.dat"
+
+# 索引格式
+MAGIC = b"NIDX"
+VERSION = 2
+_HEADER = struct.Struct("<4sHI32s")  # 标识, 版本, 节点数, 源文件摘要
+_ID_LENGTH = struct.Struct("<H")
+_ENTRY = struct.Struct("<II")     # 节点数据的偏移, 长度
+
+# 源文件中允许的字段
+NODE_FIELDS = {"text", "image", "background", "choices"}
+CHOICE_FIELDS = {"text", "next", "combat", "end", "if", "if_not", "set"}
+
+
+class StoryError(ValueError):
+    """剧情源文件错误"""
+
+    def __init__(self, errors):
+        """初始化错误
+
+        Args:
+            errors: 错误描述列表
+        """
+        super().__init__("剧情校验失败:\n" + "\n".join(errors))
+        self.errors = errors
+
+
+def source_files(source_dir):
+    """列出剧情源文件
+
+    Args:
+        source_dir: 剧情源文件目录
+
+    Returns:
+        list: 按文件名排序的 .json 文件路径
+    """
+    return sorted(
+        os.path.join(source_dir, name) for name in os.listdir(source_dir) if name.endswith(".json")
+    )
+
+
+def source_digest(source_dir):
+    """计算剧情源文件的摘要
+
+    摘要包含每个源文件的文件名和内容，增删、重命名或修改源文件都会改变摘要。
+
+    Args:
+        source_dir: 剧情源文件目录
+
+    Returns:
+        bytes: SHA-256摘要
+    """
+    digest = hashlib.sha256()
+    for path in source_files(source_dir):
+        with open(path, "rb") as f:
+            content = f.read()
+        name = os.path.basename(path).encode("utf-8")
+        digest.update(_ID_LENGTH.pack(len(name)) + name)
+        digest.update(struct.pack("<Q", len(content)) + content)
+    return digest.digest()
+
+
+def load_sources(source_dir):
+    """读取目录中的全部剧情源文件
+
+    Args:
+        source_dir: 剧情源文件目录
+
+    Returns:
+        tuple: (起始节点, {节点ID: 节点}, 错误列表)
+    """
+    start = None
+    nodes = {}
+    errors = []
+    for path in source_files(source_dir):
+        name = os.path.basename(path)
+        try:
+            with open(path, encoding="utf-8") as f:
+                source = json.load(f)
+        except ValueError as e:
+            errors.append(f"{name}: JSON格式错误: {e}")
+            continue
+        if not isinstance(source, dict) or not isinstance(source.get("nodes", {}), dict):
+            errors.append(f"{name}: 源文件和其中的 nodes 必须是对象")
+            continue
+
+        if "start" in source:
+            if start is not None:
+                errors.append(f"{name}: 起始节点重复定义")
+            start = source["start"]
+        for node_id, node in source.get("nodes", {}).items():
+            if node_id in nodes:
+                errors.append(f"{name}: 节点 {node_id} 重复定义")
+            nodes[node_id] = node
+    return start, nodes, errors
+
+
+def validate(start, nodes):
+    """校验节点和链接
+
+    Args:
+        start: 起始节点ID
+        nodes: {节点ID: 节点}
+
+    Returns:
+        tuple: (错误列表, 警告列表)；警告包括不可达的节点和从未设置的条件标记
+    """
+    errors = []
+    warnings = []
+    if start is None:
+        errors.append("没有定义起始节点")
+    elif start not in nodes:
+        errors.append(f"起始节点 {start} 不存在")
+
+    flags_set = set()
+    flags_used = {}
+    for node_id, node in nodes.items():
+        if not isinstance(node, dict):
+            errors.append(f"节点 {node_id}: 节点必须是对象")
+            continue
+        unknown = set(node) - NODE_FIELDS
+        if unknown:
+            errors.append(f"节点 {node_id}: 未知字段 {sorted(unknown)}")
+        if not isinstance(node.get("text"), str):
+            errors.append(f"节点 {node_id}: 缺少文本")
+        if not node.get("choices"):
+            errors.append(f"节点 {node_id}: 没有任何选项")
+
+        for i, choice in enumerate(node.get("choices", [])):
+            where = f"节点 {node_id} 选项 {i + 1}"
+            if not isinstance(choice, dict):
+                errors.append(f"{where}: 选项必须是对象")
+                continue
+            unknown = set(choice) - CHOICE_FIELDS
+            if unknown:
+                errors.append(f"{where}: 未知字段 {sorted(unknown)}")
+            if not choice.get("text"):
+                errors.append(f"{where}: 缺少文本")
+            if choice.get("end"):
+                if "next" in choice:
+                    errors.append(f"{where}: 结束选项不能再有后续节点")
+            elif "next" not in choice:
+                errors.append(f"{where}: 缺少后续节点")
+            elif choice["next"] not in nodes:
+                errors.append(f"{where}: 后续节点 {choice['next']} 不存在")
+            flags_set.update(choice.get("set", ()))
+            for flag in list(choice.get("if", ())) + list(choice.get("if_not", ())):
+                flags_used.setdefault(flag, where)
+
+    for flag, where in flags_used.items():
+        if flag not in flags_set:
+            warnings.append(f"{where}: 条件标记 {flag} 从未被设置")
+
+    if not errors:
+        # 从起始节点出发检查可达性
+        reachable = {start}
+        pending = [start]
+        while pending:
+            for choice in nodes[pending.pop()]["choices"]:
+                next_id = choice.get("next")
+                if next_id is not None and next_id not in reachable:
+                    reachable.add(next_id)
+                    pending.append(next_id)
+        for node_id in nodes:
+            if node_id not in reachable:
+                warnings.append(f"节点 {node_id} 无法从起始节点到达")
+
+    return errors, warnings
+
+
+def encode_node(node):
+    """编码单个节点
+
+    Args:
+        node: 源文件中的节点
+
+    Returns:
+        bytes: 紧凑的UTF-8 JSON
+    """
+    return json.dumps(node, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def compile_story(source_dir):
+    """编译剧情
+
+    Args:
+        source_dir: 剧情源文件目录
+
+    Returns:
+        tuple: (索引数据, 节点数据, 警告列表)
+
+    Raises:
+        StoryError: 源文件校验失败
+    """
+    start, nodes, errors = load_sources(source_dir)
+    if not errors:
+        validation_errors, warnings = validate(start, nodes)
+        errors.extend(validation_errors)
+    if errors:
+        raise StoryError(errors)
+
+    data = []
+    entries = []
+    offset = 0
+    for node_id in sorted(nodes):
+        record = encode_node(nodes[node_id])
+        entries.append((node_id, offset, len(record)))
+        data.append(record)
+        offset += len(record)
+
+    index = [_HEADER.pack(MAGIC, VERSION, len(entries), source_digest(source_dir)), _pack_id(start)]
+    for node_id, offset, length in entries:
+        index.append(_pack_id(node_id))
+        index.append(_ENTRY.pack(offset, length))
+    return b"".join(index), b"".join(data), warnings
+
+
+def _pack_id(node_id):
+    """编码节点ID
+
+    Args:
+        node_id: 节点ID
+
+    Returns:
+        bytes: 长度前缀加UTF-8字节
+    """
+    raw = node_id.encode("utf-8")
+    return _ID_LENGTH.pack(len(raw)) + raw
+
+
+def _unpack_id(data, offset):
+    """解码节点ID
+
+    Args:
+        data: 索引数据
+        offset: 起始偏移
+
+    Returns:
+        tuple: (节点ID, 新的偏移)
+    """
+    length, = _ID_LENGTH.unpack_from(data, offset)
+    offset += _ID_LENGTH.size
+    return data[offset:offset + length].decode("utf-8"), offset + length
+
+
+def _read_header(data):
+    """读取并检查索引头
+
+    Args:
+        data: 索引数据
+
+    Returns:
+        tuple: (标识, 版本, 节点数, 源文件摘要)
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("不支持的剧情索引格式")
+    header = _HEADER.unpack_from(data, 0)
+    if header[0] != MAGIC or header[1] != VERSION:
+        raise ValueError("不支持的剧情索引格式")
+    return header
+
+
+def parse_index(data):
+    """解析索引
+
+    Args:
+        data: 索引数据
+
+    Returns:
+        tuple: (起始节点ID, {节点ID: (偏移, 长度)})
+    """
+    magic, version, count, _ = _read_header(data)
+    start, offset = _unpack_id(data, _HEADER.size)
+    entries = {}
+    for _ in range(count):
+        node_id, offset = _unpack_id(data, offset)
+        entries[node_id] = _ENTRY.unpack_from(data, offset)
+        offset += _ENTRY.size
+    return start, entries
+
+
+def is_stale(source_dir, output_dir):
+    """编译结果是否需要更新
+
+    Args:
+        source_dir: 剧情源文件目录
+        output_dir: 编译结果目录
+
+    Returns:
+        bool: 编译结果不存在、格式过旧，或记录的源文件摘要与当前源文件不一致时返回True
+    """
+    index_path = os.path.join(output_dir, INDEX_FILE)
+    data_path = os.path.join(output_dir, DATA_FILE)
+    if not (os.path.exists(index_path) and os.path.exists(data_path)):
+        return True
+    with open(index_path, "rb") as f:
+        header = f.read(_HEADER.size)
+    try:
+        _, _, _, digest = _read_header(header)
+    except ValueError:
+        return True
+    return digest != source_digest(source_dir)
+
+
+def write_story(source_dir, output_dir):
+    """编译剧情并写入编译结果目录
+
+    Args:
+        source_dir: 剧情源文件目录
+        output_dir: 编译结果目录
+
+    Returns:
+        list: 警告列表
+    """
+    index, data, warnings = compile_story(source_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    # 先写数据再写索引，索引总是指向完整的数据
+    for name, content in ((DATA_FILE, data), (INDEX_FILE, index)):
+        path = os.path.join(output_dir, name)
+        with open(path + ".tmp", "wb") as f:
+            f.write(content)
+        os.replace(path + ".tmp", path)
+    return warnings
+
+
+def main(argv=None):
+    """命令行入口
+
+    Args:
+        argv: 命令行参数列表，为None时读取sys.argv
+    """
+    parser = argparse.ArgumentParser(description="校验并编译剧情")
+    parser.add_argument("source", nargs="?", default=os.path.join("data", "story"), help="剧情源文件目录")
+    parser.add_argument("-o", "--out", default=os.path.join("cache", "story"), help="编译结果目录")
+    args = parser.parse_args(argv)
+
+    try:
+        warnings = write_story(args.source, args.out)
+    except StoryError as e:
+        print(e)
+        raise SystemExit(1)
+
+    for warning in warnings:
+        print(f"警告: {warning}")
+    with open(os.path.join(args.out, INDEX_FILE), "rb") as f:
+        _, entries = parse_index(f.read())
+    print(f"已编译 {len(entries)} 个节点到 {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+剧情图
+按索引从编译后的数据中按需读取节点，并记录玩家的剧情进度
+"""
+
+import io
+import json
+import os
+from collections import OrderedDict, namedtuple
+
+from src.narrative.compiler import DATA_FILE, INDEX_FILE, compile_story, is_stale, parse_index, write_story
+
+# 默认的剧情源文件目录
+STORY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                         "data", "story")
+
+# 剧情节点：ID, 文本, 立绘, 背景, 选项
+NarrativeNode = namedtuple("NarrativeNode", ("id", "text", "image", "background", "choices"))
+
+# 选项：文本, 后续节点, 是否触发战斗, 是否结束剧情, 需要的标记, 排斥的标记, 设置的标记
+Choice = namedtuple("Choice", ("text", "next", "combat", "end", "requires", "excludes", "sets"))
+
+
+def _decode_node(node_id, record):
+    """解码节点数据
+
+    Args:
+        node_id: 节点ID
+        record: 节点的JSON字节
+
+    Returns:
+        NarrativeNode: 剧情节点
+    """
+    data = json.loads(record)
+    choices = tuple(
+        Choice(
+            choice["text"],
+            choice.get("next"),
+            bool(choice.get("combat")),
+            bool(choice.get("end")),
+            tuple(choice.get("if", ())),
+            tuple(choice.get("if_not", ())),
+            tuple(choice.get("set", ())),
+        )
+        for choice in data["choices"]
+    )
+    return NarrativeNode(node_id, data["text"], data.get("image"),
+                         data.get("background", "default_background"), choices)
+
+
+class NarrativeGraph:
+    """剧情图类
+
+    启动时只解析索引（节点ID到数据偏移的映射），节点在第一次访问时才读取和解码，
+    最近访问的节点保存在有上限的缓存中。剧情图持有打开的节点数据文件，用完后调用 close
+    或在 with 语句中使用。
+    """
+
+    def __init__(self, index_data, data_file, cache_size=64):
+        """初始化剧情图
+
+        Args:
+            index_data: 索引数据
+            data_file: 以二进制方式打开的节点数据文件
+            cache_size: 缓存的节点数
+        """
+        self.start, self._entries = parse_index(index_data)
+        self._data_file = data_file
+        self._cache = OrderedDict()
+        self.cache_size = cache_size
+
+    @classmethod
+    def open(cls, directory, cache_size=64):
+        """打开编译结果目录
+
+        Args:
+            directory: 编译结果目录
+            cache_size: 缓存的节点数
+
+        Returns:
+            NarrativeGraph: 剧情图
+        """
+        with open(os.path.join(directory, INDEX_FILE), "rb") as f:
+            index_data = f.read()
+        return cls(index_data, open(os.path.join(directory, DATA_FILE), "rb"), cache_size)
+
+    @classmethod
+    def load(cls, source_dir=STORY_DIR, cache_dir=None):
+        """加载剧情，源文件有变化时重新编译
+
+        Args:
+            source_dir: 剧情源文件目录
+            cache_dir: 编译结果目录，为None时在内存中编译
+
+        Returns:
+            NarrativeGraph: 剧情图
+        """
+        if cache_dir is None:
+            index_data, node_data, _ = compile_story(source_dir)
+            return cls(index_data, io.BytesIO(node_data))
+
+        if is_stale(source_dir, cache_dir):
+            write_story(source_dir, cache_dir)
+        return cls.open(cache_dir)
+
+    def __len__(self):
+        """节点数"""
+        return len(self._entries)
+
+    def __contains__(self, node_id):
+        """是否存在节点"""
+        return node_id in self._entries
+
+    def get_node(self, node_id):
+        """获取节点
+
+        Args:
+            node_id: 节点ID
+
+        Returns:
+            NarrativeNode: 剧情节点
+        """
+        node = self._cache.get(node_id)
+        if node is not None:
+            self._cache.move_to_end(node_id)
+            return node
+
+        offset, length = self._entries[node_id]
+        self._data_file.seek(offset)
+        node = _decode_node(node_id, self._data_file.read(length))
+
+        self._cache[node_id] = node
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return node
+
+    def close(self):
+        """关闭节点数据文件"""
+        self._data_file.close()
+
+    def __enter__(self):
+        """进入 with 语句
+
+        Returns:
+            NarrativeGraph: 剧情图本身
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """离开 with 语句时关闭节点数据文件"""
+        self.close()
+
+
+class StoryState:
+    """剧情进度类"""
+
+    def __init__(self, node_id, flags=(), pending=None):
+        """初始化剧情进度
+
+        Args:
+            node_id: 当前节点ID
+            flags: 已设置的标记
+            pending: 战斗胜利后前往的节点ID，没有进行中的战斗时为None
+        """
+        self.node_id = node_id
+        self.flags = set(flags)
+        self.pending = pending
+
+    def is_available(self, choice):
+        """选项当前是否可用
+
+        Args:
+            choice: 选项
+
+        Returns:
+            bool: 满足选项条件时返回True
+        """
+        return (all(flag in self.flags for flag in choice.requires)
+                and not any(flag in self.flags for flag in choice.excludes))
+
+    def available_choices(self, node):
+        """筛选节点中当前可用的选项
+
+        Args:
+            node: 剧情节点
+
+        Returns:
+            list: 可用的选项
+        """
+        return [choice for choice in node.choices if self.is_available(choice)]
+
+    def choose(self, choice):
+        """选择选项：设置标记并前进到后续节点
+
+        触发战斗的选项只记下后续节点，战斗结束后由 resolve_combat 决定是否前进。
+
+        Args:
+            choice: 选项
+        """
+        self.flags.update(choice.sets)
+        if choice.combat:
+            self.pending = choice.next
+        elif choice.next is not None:
+            self.node_id = choice.next
+
+    def resolve_combat(self, won):
+        """战斗结束：胜利时前进到战斗选项的后续节点，失败时停留在战斗前的节点
+
+        Args:
+            won: 是否胜利
+        """
+        if won and self.pending is not None:
+            self.node_id = self.pending
+        self.pending = None
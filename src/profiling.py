@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+帧耗时分析
+记录每帧中事件处理、更新和绘制各阶段的耗时，按场景统计滚动百分位数，
+并可以导出为 Chrome 跟踪事件格式（chrome://tracing 或 Perfetto 中打开）
+"""
+
+import json
+import time
+from array import array
+from collections import deque
+
+# 每帧的阶段
+PHASE_EVENT = "handle_event"
+PHASE_UPDATE = "update"
+PHASE_DRAW = "draw"
+PHASE_FRAME = "frame"  # 三个阶段的合计（不包括空闲等待）
+PHASES = (PHASE_EVENT, PHASE_UPDATE, PHASE_DRAW, PHASE_FRAME)
+
+# 统计的百分位数
+PERCENTILES = (50, 95, 99)
+
+
+class RollingStats:
+    """滚动统计类
+
+    最近 capacity 个数值保存在定长的环形缓冲区中，不会随运行时间增长。
+    """
+
+    def __init__(self, capacity=240):
+        """初始化统计
+
+        Args:
+            capacity: 保留的数值个数
+        """
+        self.capacity = capacity
+        self._values = array("d", bytes(8 * capacity))
+        self._next = 0
+        self.count = 0  # 累计记录的数值个数
+
+    def __len__(self):
+        """缓冲区中的数值个数"""
+        return min(self.count, self.capacity)
+
+    def add(self, value):
+        """记录一个数值
+
+        Args:
+            value: 数值
+        """
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self.count += 1
+
+    def values(self):
+        """缓冲区中的数值（从旧到新）
+
+        Returns:
+            list: 数值列表
+        """
+        if self.count < self.capacity:
+            return list(self._values[:self.count])
+        return list(self._values[self._next:]) + list(self._values[:self._next])
+
+    def percentiles(self, ps=PERCENTILES):
+        """计算百分位数（最近邻法）
+
+        Args:
+            ps: 百分位数列表
+
+        Returns:
+            dict: {百分位数: 数值}，没有数据时全部为0
+        """
+        values = sorted(self.values())
+        if not values:
+            return dict.fromkeys(ps, 0.0)
+        last = len(values) - 1
+        return {p: values[min(last, int(round(p / 100 * last)))] for p in ps}
+
+
+class FrameProfiler:
+    """帧耗时分析器类
+
+    场景管理器在启用分析时用 time 包裹每个阶段，用 end_frame 结束一帧。
+    统计按 (场景, 阶段) 分开保存；跟踪事件保存在有上限的队列中，只保留最近的部分。
+    """
+
+    def __init__(self, capacity=240, trace_limit=100000, clock=time.perf_counter):
+        """初始化分析器
+
+        Args:
+            capacity: 每项统计保留的帧数
+            trace_limit: 最多保留的跟踪事件数
+            clock: 计时函数（秒）
+        """
+        self.capacity = capacity
+        self.clock = clock
+        self.stats = {}  # (场景, 阶段) -> RollingStats
+        self.trace = deque(maxlen=trace_limit)
+        self.frames = 0
+        self._origin = clock()
+        self._frame = dict.fromkeys(PHASES, 0.0)
+
+    def time(self, phase, scene, func, *args):
+        """计时执行一个阶段
+
+        Args:
+            phase: 阶段名称
+            scene: 场景名称
+            func: 要执行的函数
+            *args: 函数参数
+
+        Returns:
+            函数的返回值
+        """
+        start = self.clock()
+        result = func(*args)
+        self.record(phase, scene, start, self.clock())
+        return result
+
+    def record(self, phase, scene, start, end):
+        """记录一段耗时
+
+        同一帧中同一阶段的多段耗时（例如多个事件）累加。
+
+        Args:
+            phase: 阶段名称
+            scene: 场景名称
+            start: 开始时间（秒）
+            end: 结束时间（秒）
+        """
+        self._frame[phase] += end - start
+        self.trace.append((phase, scene, start, end))
+
+    def end_frame(self, scene):
+        """结束一帧，把各阶段的耗时计入场景的统计
+
+        Args:
+            scene: 场景名称
+        """
+        frame = self._frame
+        frame[PHASE_FRAME] = frame[PHASE_EVENT] + frame[PHASE_UPDATE] + frame[PHASE_DRAW]
+        for phase, seconds in frame.items():
+            stats = self.stats.get((scene, phase))
+            if stats is None:
+                stats = self.stats[(scene, phase)] = RollingStats(self.capacity)
+            stats.add(seconds * 1000.0)
+            frame[phase] = 0.0
+        self.frames += 1
+
+    def summary(self, scene):
+        """获取场景各阶段的百分位数
+
+        Args:
+            scene: 场景名称
+
+        Returns:
+            dict: {阶段: {百分位数: 毫秒}}，只包含有记录的阶段
+        """
+        return {
+            phase: self.stats[(scene, phase)].percentiles()
+            for phase in PHASES if (scene, phase) in self.stats
+        }
+
+    def chrome_trace(self):
+        """生成 Chrome 跟踪事件数据
+
+        Returns:
+            dict: 可以直接保存为JSON的跟踪数据
+        """
+        origin = self._origin
+        events = [
+            {
+                "name": phase,
+                "cat": scene,
+                "ph": "X",
+                "ts": (start - origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": 1,
+                "tid": 1,
+                "args": {"scene": scene},
+            }
+            for phase, scene, start, end in self.trace
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, path):
+        """导出 Chrome 跟踪事件JSON
+
+        Args:
+            path: 输出文件路径
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
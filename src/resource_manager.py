@@ -6,72 +6,482 @@
 负责加载和管理游戏资源
 """
 
+import hashlib
+import io
+import json
 import os
+import struct
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import pygame
+from src.ui.text_renderer import TextRenderer, set_text_renderer
+
+# 程序生成图像的版本号，修改绘制代码后递增，使磁盘缓存失效
+PROCEDURAL_VERSION = 1
+
+# 资源文件
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tga")
+FONT_EXTENSIONS = (".ttf", ".otf", ".ttc")
+
+# 内存中图像的默认字节预算
+DEFAULT_IMAGE_BUDGET = 32 * 1024 * 1024
+
+# 预转换图像的磁盘缓存格式
+_BLOB_MAGIC = b"SURF"
+_BLOB_HEADER = struct.Struct("<4sIIB")  # 标识, 宽, 高, 是否带透明通道
 
 class ResourceManager:
-    """资源管理器类"""
-    
-    def __init__(self):
-        """初始化资源管理器"""
-        self.images = {}
+    """资源管理器类
+
+    图像按以下顺序获取：内存 -> 资源目录中的文件 -> 程序生成的默认图像。
+    资源文件解码并转换为显示格式后，按文件内容的哈希缓存到磁盘，之后直接读取像素数据；
+    内存中的图像按最近使用排序，总字节数超过预算时卸载最久未使用且未被固定的图像。
+    preload 在后台线程中读取和解码图像，主线程每帧只做最后的显示格式转换。
+    """
+
+    def __init__(self, cache_dir=None, asset_dir=None, image_budget=DEFAULT_IMAGE_BUDGET,
+                 preload_workers=2):
+        """初始化资源管理器
+
+        Args:
+            cache_dir: 磁盘缓存目录，为None时不使用磁盘缓存（每次启动都重新生成）
+            asset_dir: 资源目录（包含 images/ 和 fonts/），为None时只使用程序生成的图像
+            image_budget: 内存中图像的字节预算
+            preload_workers: 后台预加载的线程数
+        """
+        self.images = OrderedDict()
+        self.image_sizes = {}  # 图像名称 -> 占用字节数
+        self.image_bytes = 0
+        self.image_budget = image_budget
+        self.pins = {}  # 图像名称 -> 固定计数
         self.fonts = {}
-        
+        self.font_paths = {}  # 字体名称 -> 字体文件路径（None 表示使用默认字体）
+        self.cache_dir = cache_dir
+        self.asset_dir = asset_dir
+        self.cache_hits = set()  # 从磁盘缓存加载的图像名称
+
+        # 后台预加载：图像名称 -> 解码任务
+        self.preload_workers = preload_workers
+        self._executor = None
+        self._preloads = OrderedDict()
+
+        # 程序生成的默认图像
+        self.painters = {
+            "default_background": self._paint_background,
+            "player": self._paint_player,
+            "enemy": self._paint_enemy,
+            "ally": self._paint_ally,
+        }
+
+        if cache_dir:
+            os.makedirs(os.path.join(cache_dir, "assets"), exist_ok=True)
+            self._load_font_paths()
+
+        # 所有界面组件共用的文本渲染服务，字体从这里获取
+        self.text_renderer = TextRenderer(self.get_font)
+        set_text_renderer(self.text_renderer)
+
         # 创建默认资源
         self._create_default_resources()
-    
+
     def _create_default_resources(self):
         """创建默认资源"""
-        # 创建默认背景图
+        for name in self.painters:
+            self.get_image(name)
+
+    def _decode_image(self, name):
+        """读取并解码图像（资源文件优先，其次是程序生成的默认图像）
+
+        不涉及显示表面，可以在后台线程中调用。
+
+        Args:
+            name: 图像名称
+
+        Returns:
+            Surface: 尚未转换显示格式的图像，找不到时返回None
+        """
+        path = self._find_asset("images", name, IMAGE_EXTENSIONS)
+        if path is not None:
+            return self._decode_asset_file(name, path)
+
+        painter = self.painters.get(name)
+        if painter is None:
+            return None
+        surface = self._load_cached_image(name)
+        if surface is None:
+            surface = painter()
+            self._save_cached_image(name, surface)
+        return surface
+
+    def _find_asset(self, kind, name, extensions):
+        """在资源目录中查找文件
+
+        Args:
+            kind: 子目录（images 或 fonts）
+            name: 资源名称（不含扩展名）
+            extensions: 可接受的扩展名
+
+        Returns:
+            str: 文件路径，找不到时返回None
+        """
+        if not self.asset_dir:
+            return None
+        for ext in extensions:
+            path = os.path.join(self.asset_dir, kind, name + ext)
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def _decode_asset_file(self, name, path):
+        """读取并解码资源目录中的图像文件
+
+        Args:
+            name: 图像名称
+            path: 文件路径
+
+        Returns:
+            Surface: 尚未转换显示格式的图像
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+
+        blob_path = None
+        if self.cache_dir:
+            digest = hashlib.sha1(data).hexdigest()
+            blob_path = os.path.join(self.cache_dir, "assets", digest + ".surf")
+            surface = self._read_blob(blob_path)
+            if surface is not None:
+                self.cache_hits.add(name)
+                return surface
+
+        surface = pygame.image.load(io.BytesIO(data), os.path.basename(path))
+        if blob_path is not None:
+            self._write_blob(blob_path, surface)
+        return surface
+
+    def _convert(self, surface):
+        """转换为显示格式（尚未创建窗口时原样返回）
+
+        Args:
+            surface: 图像
+
+        Returns:
+            Surface: 转换后的图像
+        """
+        if pygame.display.get_surface() is None:
+            return surface
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
+
+    def _read_blob(self, path):
+        """读取预转换的像素数据
+
+        Args:
+            path: 缓存文件路径
+
+        Returns:
+            Surface: 图像，缓存不存在或损坏时返回None
+        """
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            magic, width, height, has_alpha = _BLOB_HEADER.unpack_from(data, 0)
+            if magic != _BLOB_MAGIC:
+                return None
+            return pygame.image.frombytes(data[_BLOB_HEADER.size:], (width, height),
+                                          "RGBA" if has_alpha else "RGB")
+        except (OSError, struct.error, ValueError):
+            return None
+
+    def _write_blob(self, path, surface):
+        """写入预转换的像素数据
+
+        Args:
+            path: 缓存文件路径
+            surface: 图像
+        """
+        has_alpha = bool(surface.get_flags() & pygame.SRCALPHA)
+        pixels = pygame.image.tobytes(surface, "RGBA" if has_alpha else "RGB")
+        # 先写临时文件再改名，中断时不会留下不完整的缓存
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_BLOB_HEADER.pack(_BLOB_MAGIC, surface.get_width(), surface.get_height(), has_alpha))
+            f.write(pixels)
+        os.replace(tmp_path, path)
+
+    def _paint_background(self):
+        """绘制默认背景图
+
+        Returns:
+            Surface: 背景图
+        """
         bg_surface = pygame.Surface((800, 600))
         bg_surface.fill((80, 60, 80))  # 紫色背景
         for i in range(0, 800, 20):
             for j in range(0, 600, 20):
                 if (i + j) % 40 == 0:
-                    pygame.draw.rect(bg_surface, (90, 70, 90), (i, j, 20, 20))
-        self.images["default_background"] = bg_surface
-        
-        # 创建默认角色立绘
+                    bg_surface.fill((90, 70, 90), (i, j, 20, 20))
+        return bg_surface
+
+    def _paint_player(self):
+        """绘制默认玩家立绘
+
+        Returns:
+            Surface: 玩家立绘
+        """
         player_surface = pygame.Surface((100, 150))
         player_surface.fill((100, 100, 200))
         pygame.draw.circle(player_surface, (150, 150, 250), (50, 40), 30)
         pygame.draw.rect(player_surface, (100, 100, 180), (30, 80, 40, 70))
-        self.images["player"] = player_surface
-        
+        return player_surface
+
+    def _paint_enemy(self):
+        """绘制默认敌人立绘
+
+        Returns:
+            Surface: 敌人立绘
+        """
         enemy_surface = pygame.Surface((100, 150))
         enemy_surface.fill((200, 100, 100))
         pygame.draw.circle(enemy_surface, (250, 150, 150), (50, 40), 30)
         pygame.draw.rect(enemy_surface, (180, 100, 100), (30, 80, 40, 70))
-        self.images["enemy"] = enemy_surface
-        
+        return enemy_surface
+
+    def _paint_ally(self):
+        """绘制默认盟友立绘
+
+        Returns:
+            Surface: 盟友立绘
+        """
         ally_surface = pygame.Surface((80, 120))
         ally_surface.fill((100, 200, 100))
         pygame.draw.circle(ally_surface, (150, 250, 150), (40, 30), 25)
         pygame.draw.rect(ally_surface, (100, 180, 100), (25, 60, 30, 60))
-        self.images["ally"] = ally_surface
-    
+        return ally_surface
+
+    def _cached_image_path(self, name):
+        """程序生成图像的缓存文件路径
+
+        Args:
+            name: 图像名称
+
+        Returns:
+            str: 文件路径
+        """
+        return os.path.join(self.cache_dir, f"{name}.v{PROCEDURAL_VERSION}.bmp")
+
+    def _load_cached_image(self, name):
+        """从磁盘缓存加载程序生成的图像
+
+        Args:
+            name: 图像名称
+
+        Returns:
+            Surface: 图像，没有缓存时返回None
+        """
+        if not self.cache_dir:
+            return None
+        path = self._cached_image_path(name)
+        if not os.path.exists(path):
+            return None
+        try:
+            surface = pygame.image.load(path)
+        except pygame.error:
+            return None
+        self.cache_hits.add(name)
+        return surface
+
+    def _save_cached_image(self, name, surface):
+        """把程序生成的图像写入磁盘缓存（未压缩的BMP，加载时无需解码）
+
+        Args:
+            name: 图像名称
+            surface: 图像
+        """
+        if self.cache_dir:
+            pygame.image.save(surface, self._cached_image_path(name))
+
+    def _load_font_paths(self):
+        """读取上次启动解析出的字体路径，跳过系统字体枚举"""
+        path = os.path.join(self.cache_dir, "fonts.json")
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, encoding="utf-8") as f:
+                font_paths = json.load(f)
+        except (OSError, ValueError):
+            return
+        # 字体文件已经不存在的条目重新解析
+        self.font_paths = {
+            name: font_path for name, font_path in font_paths.items()
+            if font_path is None or os.path.exists(font_path)
+        }
+
+    def _save_font_paths(self):
+        """保存已解析的字体路径"""
+        with open(os.path.join(self.cache_dir, "fonts.json"), "w", encoding="utf-8") as f:
+            json.dump(self.font_paths, f, ensure_ascii=False)
+
+    def resolve_font_path(self, name):
+        """解析字体文件路径（每个字体名称只查找一次系统字体）
+
+        Args:
+            name: 字体名称
+
+        Returns:
+            str: 字体文件路径，找不到时返回None（使用Pygame默认字体）
+        """
+        if name not in self.font_paths:
+            # 资源目录中的字体优先于系统字体
+            self.font_paths[name] = (self._find_asset("fonts", name, FONT_EXTENSIONS)
+                                     or pygame.font.match_font(name))
+            if self.cache_dir:
+                self._save_font_paths()
+        return self.font_paths[name]
+
     def get_image(self, name):
-        """获取图像
-        
+        """获取图像（不在内存中时加载）
+
         Args:
             name: 图像名称
-            
+
         Returns:
-            Surface: Pygame表面对象
+            Surface: Pygame表面对象，找不到时返回None
         """
-        return self.images.get(name)
-    
+        surface = self.images.get(name)
+        if surface is not None:
+            self.images.move_to_end(name)
+            return surface
+
+        # 正在后台解码的图像直接等待结果，不重复解码
+        future = self._preloads.pop(name, None)
+        surface = future.result() if future is not None else self._decode_image(name)
+        return self._store_image(name, surface)
+
+    def _store_image(self, name, surface):
+        """转换显示格式并放入内存（只能在主线程调用）
+
+        Args:
+            name: 图像名称
+            surface: 解码后的图像，可以为None
+
+        Returns:
+            Surface: 转换后的图像
+        """
+        if surface is None:
+            return None
+        surface = self._convert(surface)
+        self.images[name] = surface
+        self.image_sizes[name] = surface.get_pitch() * surface.get_height()
+        self.image_bytes += self.image_sizes[name]
+        self._evict_images()
+        return surface
+
+    def preload(self, names):
+        """在后台线程中预先读取和解码图像
+
+        解码结果由 process_preloads 在主线程中转换并放入内存。
+
+        Args:
+            names: 图像名称列表
+        """
+        for name in names:
+            if name in self.images or name in self._preloads:
+                continue
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.preload_workers, thread_name_prefix="preload")
+            self._preloads[name] = self._executor.submit(self._decode_image, name)
+
+    def has_pending_preloads(self):
+        """是否有尚未放入内存的预加载图像
+
+        Returns:
+            bool: 有未完成的预加载时返回True
+        """
+        return bool(self._preloads)
+
+    def process_preloads(self, time_budget=0.004):
+        """把已经解码完成的预加载图像转换后放入内存（每帧在主线程调用）
+
+        Args:
+            time_budget: 本帧最多使用的时间（秒），至少处理一个图像
+
+        Returns:
+            int: 本帧处理的图像数
+        """
+        start = time.perf_counter()
+        processed = 0
+        for name in list(self._preloads):
+            future = self._preloads[name]
+            if not future.done():
+                continue
+            del self._preloads[name]
+            try:
+                self._store_image(name, future.result())
+            except (OSError, pygame.error):
+                # 解码失败时丢弃，之后 get_image 会同步重试并报告错误
+                pass
+            processed += 1
+            if time.perf_counter() - start >= time_budget:
+                break
+        return processed
+
+    def shutdown(self):
+        """停止后台预加载线程"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._preloads.clear()
+
+    def pin(self, names):
+        """固定图像，使其不会因超出预算被卸载（通常是当前场景用到的图像）
+
+        Args:
+            names: 图像名称列表
+        """
+        for name in names:
+            self.pins[name] = self.pins.get(name, 0) + 1
+            self.get_image(name)
+
+    def unpin(self, names):
+        """取消固定图像
+
+        Args:
+            names: 图像名称列表
+        """
+        for name in names:
+            count = self.pins.get(name, 0) - 1
+            if count > 0:
+                self.pins[name] = count
+            else:
+                self.pins.pop(name, None)
+        self._evict_images()
+
+    def _evict_images(self):
+        """卸载最久未使用且未被固定的图像，直到总字节数不超过预算"""
+        if self.image_bytes <= self.image_budget:
+            return
+        for name in list(self.images):
+            if self.image_bytes <= self.image_budget:
+                break
+            if name not in self.pins:
+                del self.images[name]
+                self.image_bytes -= self.image_sizes.pop(name)
+
     def get_font(self, name, size):
         """获取字体
-        
+
         Args:
             name: 字体名称
             size: 字体大小
-            
+
         Returns:
             Font: Pygame字体对象
         """
         key = f"{name}_{size}"
         if key not in self.fonts:
-            self.fonts[key] = pygame.font.SysFont(name, size)
+            self.fonts[key] = pygame.font.Font(self.resolve_font_path(name), size)
         return self.fonts[key]
@@ -0,0 +1,393 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+存档系统
+把场景管理器的状态（当前场景、剧情进度、进行中的战斗）保存为紧凑的分段二进制存档；
+自动存档只重新编码发生变化的分段，编码和写文件都在后台线程中完成
+"""
+
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+from src.combat.battle_manager import BattleManager
+from src.game_state import GameState
+from src.narrative.graph import StoryState
+
+# 存档格式
+MAGIC = b"PSAV"
+VERSION = 4
+_HEADER = struct.Struct("<4sHH")     # 标识, 版本, 分段数
+_SECTION = struct.Struct("<4sIII")   # 分段标识, 偏移, 长度, CRC32
+
+# 分段
+SECTION_META = b"META"     # 当前游戏状态
+SECTION_STORY = b"STRY"    # 剧情进度
+SECTION_BATTLE = b"BATL"   # 进行中的战斗
+SECTIONS = (SECTION_META, SECTION_STORY, SECTION_BATTLE)
+
+# 自动存档间隔（毫秒）
+AUTOSAVE_INTERVAL = 2000
+
+# 值编码的类型标记
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _BYTES, _TUPLE, _DICT = range(9)
+_FLOAT_STRUCT = struct.Struct("<d")
+
+# 尚未保存过的分段
+_MISSING = object()
+
+
+def _write_varint(out, value):
+    """写入无符号变长整数
+
+    Args:
+        out: 输出缓冲区
+        value: 非负整数
+    """
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, offset):
+    """读取无符号变长整数
+
+    Args:
+        data: 二进制数据
+        offset: 起始偏移
+
+    Returns:
+        tuple: (整数, 新的偏移)
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def encode_value(value, out=None):
+    """编码一个值
+
+    支持 None、布尔、整数（任意大小）、浮点数、字符串、字节串、元组/列表（解码为元组）和字典。
+
+    Args:
+        value: 要编码的值
+        out: 输出缓冲区，为None时新建
+
+    Returns:
+        bytearray: 输出缓冲区
+    """
+    if out is None:
+        out = bytearray()
+    if value is None:
+        out.append(_NONE)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif isinstance(value, int):
+        out.append(_INT)
+        _write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+    elif isinstance(value, float):
+        out.append(_FLOAT)
+        out += _FLOAT_STRUCT.pack(value)
+    elif isinstance(value, str):
+        raw = value.encode("utf-8")
+        out.append(_STR)
+        _write_varint(out, len(raw))
+        out += raw
+    elif isinstance(value, (bytes, bytearray)):
+        out.append(_BYTES)
+        _write_varint(out, len(value))
+        out += value
+    elif isinstance(value, (tuple, list)):
+        out.append(_TUPLE)
+        _write_varint(out, len(value))
+        for item in value:
+            encode_value(item, out)
+    elif isinstance(value, dict):
+        out.append(_DICT)
+        _write_varint(out, len(value))
+        for key, item in value.items():
+            encode_value(key, out)
+            encode_value(item, out)
+    else:
+        raise TypeError(f"无法存档的类型: {type(value).__name__}")
+    return out
+
+
+def decode_value(data, offset=0):
+    """解码一个值
+
+    Args:
+        data: 二进制数据
+        offset: 起始偏移
+
+    Returns:
+        tuple: (值, 新的偏移)
+    """
+    tag = data[offset]
+    offset += 1
+    if tag == _NONE:
+        return None, offset
+    if tag == _TRUE:
+        return True, offset
+    if tag == _FALSE:
+        return False, offset
+    if tag == _INT:
+        raw, offset = _read_varint(data, offset)
+        return (raw >> 1) if not raw & 1 else -((raw + 1) >> 1), offset
+    if tag == _FLOAT:
+        return _FLOAT_STRUCT.unpack_from(data, offset)[0], offset + _FLOAT_STRUCT.size
+    if tag in (_STR, _BYTES):
+        length, offset = _read_varint(data, offset)
+        raw = bytes(data[offset:offset + length])
+        return (raw.decode("utf-8") if tag == _STR else raw), offset + length
+    if tag == _TUPLE:
+        count, offset = _read_varint(data, offset)
+        items = []
+        for _ in range(count):
+            item, offset = decode_value(data, offset)
+            items.append(item)
+        return tuple(items), offset
+    if tag == _DICT:
+        count, offset = _read_varint(data, offset)
+        result = {}
+        for _ in range(count):
+            key, offset = decode_value(data, offset)
+            result[key], offset = decode_value(data, offset)
+        return result, offset
+    raise ValueError(f"存档中有未知的值类型: {tag}")
+
+
+def encode_save(sections):
+    """把已编码的分段组装为存档文件
+
+    Args:
+        sections: {分段标识: 分段数据}
+
+    Returns:
+        bytes: 存档数据
+    """
+    table = []
+    payload = []
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    for tag, data in sections.items():
+        table.append(_SECTION.pack(tag, offset, len(data), zlib.crc32(data)))
+        payload.append(data)
+        offset += len(data)
+    return b"".join([_HEADER.pack(MAGIC, VERSION, len(sections))] + table + payload)
+
+
+def decode_save(data):
+    """解析存档文件
+
+    Args:
+        data: 存档数据
+
+    Returns:
+        dict: {分段标识: 解码后的值}；不认识的分段被忽略
+
+    Raises:
+        ValueError: 格式或版本不符、数据损坏
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("存档文件不完整")
+    magic, version, count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("不支持的存档格式")
+
+    sections = {}
+    for i in range(count):
+        tag, offset, length, crc = _SECTION.unpack_from(data, _HEADER.size + i * _SECTION.size)
+        if tag not in SECTIONS:
+            continue
+        raw = data[offset:offset + length]
+        if len(raw) != length or zlib.crc32(raw) != crc:
+            raise ValueError(f"存档分段 {tag.decode()} 已损坏")
+        sections[tag], _ = decode_value(raw)
+    return sections
+
+
+def capture(scene_manager):
+    """在主线程中获取需要存档的状态
+
+    只复制数值（元组），不做编码，耗时很短；之后可以在后台线程中安全地编码。
+
+    Args:
+        scene_manager: 场景管理器
+
+    Returns:
+        dict: {分段标识: 状态元组}，主菜单中返回None（没有需要保存的进度）
+    """
+    state = scene_manager.current_state
+    if state == GameState.MAIN_MENU:
+        return None
+
+    story = scene_manager.story_state
+    battle = None
+    if state == GameState.COMBAT:
+        scene = scene_manager.scenes.get(state)
+        if scene is not None and scene.battle_active:
+            battle = scene.battle_manager.get_state()
+        elif scene is not None:
+            # 战斗已分出胜负，剧情进度已按结果更新，读档后回到叙事场景
+            state = GameState.NARRATIVE
+    elif state == GameState.GAME_OVER:
+        # 失败后剧情停留在战斗前的节点，读档后回到叙事场景重新选择
+        state = GameState.NARRATIVE
+
+    return {
+        SECTION_META: (state.name,),
+        SECTION_STORY: (story.node_id, tuple(sorted(story.flags)), story.pending) if story is not None else None,
+        SECTION_BATTLE: battle,
+    }
+
+
+class SaveSystem:
+    """存档系统类
+
+    自动存档时在主线程中获取状态，与上一次比较后只把变化的分段交给后台线程编码，
+    未变化的分段沿用上一次编码的结果；后台线程按顺序整体写入临时文件再替换存档，
+    中途退出也不会留下不完整的存档。读档只解码固定的几个分段，耗时与游戏进行了多久无关。
+    """
+
+    def __init__(self, path, autosave_interval=AUTOSAVE_INTERVAL):
+        """初始化存档系统
+
+        Args:
+            path: 存档文件路径
+            autosave_interval: 定时自动存档的间隔（毫秒）
+        """
+        self.path = path
+        self.autosave_interval = autosave_interval
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        self._pending = None         # 最近一次提交的后台任务
+        self._captured = {}          # 最近一次提交的状态（主线程使用）
+        self._encoded = {}           # 各分段最近一次编码的结果（只在后台线程中使用）
+        self._last_autosave = None
+        self.saves = 0               # 已写入的次数
+        self.encoded_sections = 0    # 累计重新编码的分段数
+
+    def has_save(self):
+        """是否存在存档
+
+        Returns:
+            bool: 存档文件存在时返回True
+        """
+        return os.path.exists(self.path)
+
+    def autosave(self, scene_manager):
+        """自动存档：只在状态有变化时提交后台写入
+
+        Args:
+            scene_manager: 场景管理器
+
+        Returns:
+            bool: 提交了写入时返回True
+        """
+        self._last_autosave = pygame.time.get_ticks()
+        snapshot = capture(scene_manager)
+        if snapshot is None:
+            return False
+
+        changed = {tag: value for tag, value in snapshot.items() if self._captured.get(tag, _MISSING) != value}
+        if not changed:
+            return False
+        self._captured = snapshot
+        self._pending = self._executor.submit(self._write, snapshot, changed)
+        return True
+
+    def tick(self, scene_manager):
+        """每帧调用，到了间隔时间时自动存档
+
+        Args:
+            scene_manager: 场景管理器
+        """
+        if (self._last_autosave is None
+                or pygame.time.get_ticks() - self._last_autosave >= self.autosave_interval):
+            self.autosave(scene_manager)
+
+    def save(self, scene_manager):
+        """立即存档并等待写入完成
+
+        Args:
+            scene_manager: 场景管理器
+        """
+        self.autosave(scene_manager)
+        self.wait()
+
+    def wait(self):
+        """等待后台写入完成（写入出错时在这里抛出）"""
+        if self._pending is not None:
+            self._pending.result()
+
+    def _write(self, snapshot, changed):
+        """在后台线程中编码变化的分段并写入存档
+
+        Args:
+            snapshot: 所有分段的状态
+            changed: 需要重新编码的分段
+        """
+        for tag, value in snapshot.items():
+            if tag in changed or tag not in self._encoded:
+                self._encoded[tag] = bytes(encode_value(value))
+                self.encoded_sections += 1
+        data = encode_save({tag: self._encoded[tag] for tag in snapshot})
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(self.path + ".tmp", self.path)
+        self.saves += 1
+
+    def load(self):
+        """读取存档
+
+        Returns:
+            dict: {分段标识: 状态}
+
+        Raises:
+            OSError: 无法读取存档文件
+            ValueError: 存档格式不符或已损坏
+        """
+        self.wait()
+        with open(self.path, "rb") as f:
+            return decode_save(f.read())
+
+    def apply(self, scene_manager, sections):
+        """把读取的存档应用到场景管理器，并切换到存档时的场景
+
+        Args:
+            scene_manager: 场景管理器
+            sections: load 返回的分段
+        """
+        story = sections.get(SECTION_STORY)
+        scene_manager.story_state = StoryState(*story) if story is not None else None
+
+        # 战斗场景创建时接管恢复的战斗；已经预先创建的战斗场景需要丢弃
+        battle = sections.get(SECTION_BATTLE)
+        scene_manager.restored_battle = BattleManager.from_state(battle) if battle is not None else None
+        scene_manager.evict(GameState.COMBAT)
+
+        # 读档后的状态与存档一致，不需要马上再写一次
+        self._captured = {tag: sections.get(tag) for tag in SECTIONS}
+        self._last_autosave = pygame.time.get_ticks()
+
+        meta = sections.get(SECTION_META)
+        scene_manager.change_state(GameState[meta[0]] if meta else GameState.NARRATIVE)
+
+    def shutdown(self):
+        """等待后台写入完成并关闭线程"""
+        self._executor.shutdown(wait=True)
@@ -6,36 +6,180 @@
 负责管理和切换不同的游戏场景
 """
 
+from collections import OrderedDict, deque
+
 import pygame
 from src.game_state import GameState
+from src.profiling import FrameProfiler, PHASE_DRAW, PHASE_EVENT, PHASE_UPDATE
 from src.resource_manager import ResourceManager
 from src.scenes.main_menu_scene import MainMenuScene
 from src.scenes.narrative_scene import NarrativeScene
 from src.scenes.combat_scene import CombatScene
 from src.scenes.game_over_scene import GameOverScene
+from src.ui.frame_overlay import FrameOverlay
 
 class SceneManager:
-    """场景管理器类"""
+    """场景管理器类
+
+    场景以工厂函数注册，第一次进入（或预热）时才创建。
+    常驻场景数超过上限时，最久未使用的场景会被卸载，之后需要时重新创建。
+    """
+
+    # 默认最多常驻的场景数
+    MAX_RESIDENT_SCENES = 3
 
-    def __init__(self, screen):
+    # 显示或隐藏帧耗时浮层的按键
+    OVERLAY_KEY = pygame.K_F3
+
+    def __init__(self, screen, max_resident=MAX_RESIDENT_SCENES, resource_manager=None, save_system=None):
         """初始化场景管理器
 
         Args:
             screen: Pygame显示表面
+            max_resident: 最多常驻的场景数，为None时不卸载
+            resource_manager: 资源管理器，为None时新建一个
+            save_system: 存档系统，为None时不自动存档
         """
         self.screen = screen
         self.current_state = GameState.MAIN_MENU
+        self.max_resident = max_resident
 
         # 初始化资源管理器
-        self.resource_manager = ResourceManager()
+        self.resource_manager = resource_manager or ResourceManager()
+
+        # 场景工厂和已创建的场景（按最近使用排序）
+        self.factories = {}
+        self.reset_on_enter = set()
+        self.scenes = OrderedDict()
+        self._prewarm_queue = deque()
+        self._active_scene = None  # 资源已固定的场景
+
+        # 剧情进度（由叙事场景创建，不随场景卸载而丢失）
+        self.story_state = None
+
+        # 存档系统和读档恢复的战斗（由下一个创建的战斗场景接管）
+        self.save_system = save_system
+        self.restored_battle = None
+
+        # 帧耗时分析（为None时不做任何计时）和浮层
+        self.profiler = None
+        self.overlay = None
+        self._overlay_owns_profiler = False
+
+        # 注册各个场景；战斗场景每次进入都重新创建，不会沿用结束的战斗
+        self.register_scene(GameState.MAIN_MENU, MainMenuScene)
+        self.register_scene(GameState.NARRATIVE, NarrativeScene)
+        self.register_scene(GameState.COMBAT, CombatScene, reset_on_enter=True)
+        self.register_scene(GameState.GAME_OVER, GameOverScene)
+
+    def register_scene(self, state, factory, reset_on_enter=False):
+        """注册场景工厂
+
+        Args:
+            state: 游戏状态
+            factory: 创建场景的函数，参数为场景管理器
+            reset_on_enter: 为True时离开场景即卸载，每次进入都是全新的场景
+        """
+        self.factories[state] = factory
+        if reset_on_enter:
+            self.reset_on_enter.add(state)
+        else:
+            self.reset_on_enter.discard(state)
+        self._unload(state)
+
+    def get_scene(self, state):
+        """获取场景，尚未创建时立即创建
+
+        Args:
+            state: 游戏状态
+
+        Returns:
+            BaseScene: 场景实例
+        """
+        scene = self.scenes.get(state)
+        if scene is None:
+            scene = self.factories[state](self)
+            self.scenes[state] = scene
+        return scene
+
+    @property
+    def current_scene(self):
+        """当前场景"""
+        scene = self.get_scene(self.current_state)
+        if scene is not self._active_scene:
+            self._activate(scene)
+        return scene
+
+    def _activate(self, scene):
+        """固定新场景用到的图像并释放上一个场景的固定，然后预加载后续场景
+
+        Args:
+            scene: 成为当前场景的场景
+        """
+        self.resource_manager.pin(scene.ASSETS)
+        if self._active_scene is not None:
+            self.resource_manager.unpin(self._active_scene.ASSETS)
+        self._active_scene = scene
+
+        # 后续场景的图像在后台线程解码，场景本身在之后的帧中逐个创建，切换时不会卡顿
+        for state in scene.NEXT_STATES:
+            self.resource_manager.preload(getattr(self.factories[state], "ASSETS", ()))
+        self.prewarm(scene.NEXT_STATES)
+
+    def prewarm(self, states):
+        """在后续帧中逐个预先创建场景
+
+        每次 update 最多创建一个，避免单帧卡顿。
+
+        Args:
+            states: 需要预热的游戏状态列表
+        """
+        for state in states:
+            if state not in self.scenes and state not in self._prewarm_queue:
+                self._prewarm_queue.append(state)
+
+    def _prewarm_step(self):
+        """创建预热队列中的下一个场景"""
+        while self._prewarm_queue:
+            state = self._prewarm_queue.popleft()
+            if state not in self.scenes:
+                self.get_scene(state)
+                # 预热的场景不挤掉当前场景和刚刚创建的场景
+                self._evict(keep=(self.current_state, state))
+                return
+
+    def evict(self, state):
+        """卸载场景（当前场景除外）
+
+        Args:
+            state: 游戏状态
+        """
+        if state != self.current_state:
+            self._unload(state)
+
+    def _unload(self, state):
+        """移除已创建的场景并让它释放资源
+
+        Args:
+            state: 游戏状态
+        """
+        scene = self.scenes.pop(state, None)
+        if scene is not None:
+            scene.unload()
 
-        # 初始化各个场景
-        self.scenes = {
-            GameState.MAIN_MENU: MainMenuScene(self),
-            GameState.NARRATIVE: NarrativeScene(self),
-            GameState.COMBAT: CombatScene(self),
-            GameState.GAME_OVER: GameOverScene(self)
-        }
+    def _evict(self, keep=()):
+        """按最久未使用的顺序卸载超出上限的场景
+
+        Args:
+            keep: 不卸载的游戏状态
+        """
+        if self.max_resident is None:
+            return
+        for state in list(self.scenes):
+            if len(self.scenes) <= self.max_resident:
+                break
+            if state not in keep:
+                self._unload(state)
 
     def change_state(self, new_state):
         """切换游戏状态
@@ -43,7 +187,68 @@ class SceneManager:
         Args:
             new_state: 新的游戏状态
         """
+        if new_state == self.current_state:
+            return
+
+        old_state = self.current_state
+        old_scene = self.scenes.get(old_state)
+        if old_scene is not None:
+            old_scene.on_exit()
+            if old_state in self.reset_on_enter:
+                self._unload(old_state)
+
         self.current_state = new_state
+        scene = self.current_scene
+        self.scenes.move_to_end(new_state)
+        scene.on_enter()
+        # 新场景需要完整绘制一次
+        scene.mark_dirty()
+        self._evict(keep=(new_state,))
+
+        if self.save_system is not None:
+            self.save_system.autosave(self)
+
+    def enable_profiling(self, capacity=240):
+        """开始记录每帧各阶段的耗时
+
+        Args:
+            capacity: 每项统计保留的帧数
+
+        Returns:
+            FrameProfiler: 帧耗时分析器
+        """
+        if self.profiler is None:
+            self.profiler = FrameProfiler(capacity)
+        self._overlay_owns_profiler = False
+        return self.profiler
+
+    def disable_profiling(self):
+        """停止记录耗时（同时隐藏浮层）"""
+        self.set_overlay_visible(False)
+        self.profiler = None
+
+    def set_overlay_visible(self, visible):
+        """显示或隐藏帧耗时浮层
+
+        只为浮层开启的分析在隐藏浮层时一起关闭。
+
+        Args:
+            visible: 是否显示
+        """
+        if visible == (self.overlay is not None):
+            return
+        if visible:
+            if self.profiler is None:
+                self.enable_profiling()
+                self._overlay_owns_profiler = True
+            self.overlay = FrameOverlay(self.profiler)
+        else:
+            # 恢复浮层下面的画面
+            self.current_scene.mark_dirty(self.overlay.rect)
+            self.overlay = None
+            if self._overlay_owns_profiler:
+                self.profiler = None
+                self._overlay_owns_profiler = False
 
     def handle_event(self, event):
         """处理事件
@@ -51,12 +256,92 @@ class SceneManager:
         Args:
             event: Pygame事件
         """
-        self.scenes[self.current_state].handle_event(event)
+        if event.type == pygame.KEYDOWN and event.key == self.OVERLAY_KEY:
+            self.set_overlay_visible(self.overlay is None)
+            return
+        if self.profiler is None:
+            self._handle_event(event)
+        else:
+            self.profiler.time(PHASE_EVENT, self.current_state.name, self._handle_event, event)
+
+    def _handle_event(self, event):
+        """把事件交给当前场景
+
+        Args:
+            event: Pygame事件
+        """
+        if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+            # 窗口内容被系统覆盖过，重绘整个画面
+            self.current_scene.mark_dirty()
+        self.current_scene.handle_event(event)
+
+    def needs_continuous_update(self):
+        """当前场景是否需要每帧持续更新（有待预热的场景或预加载的图像时也需要）
+
+        Returns:
+            bool: 需要持续更新时返回True
+        """
+        # 先取当前场景：第一次激活场景时会加入新的预热和预加载任务
+        scene = self.current_scene
+        return (scene.needs_continuous_update() or bool(self._prewarm_queue)
+                or self.resource_manager.has_pending_preloads())
 
     def update(self):
-        """更新当前场景"""
-        self.scenes[self.current_state].update()
+        """更新当前场景，并完成一部分后台加载"""
+        if self.profiler is None:
+            self._update()
+        else:
+            self.profiler.time(PHASE_UPDATE, self.current_state.name, self._update)
+
+    def _update(self):
+        """更新当前场景，并完成一部分后台加载"""
+        self.current_scene.update()
+        self.resource_manager.process_preloads()
+        if self._prewarm_queue:
+            self._prewarm_step()
+        if self.save_system is not None:
+            self.save_system.tick(self)
 
     def draw(self):
-        """绘制当前场景"""
-        self.scenes[self.current_state].draw(self.screen)
+        """绘制当前场景中发生变化的区域
+
+        Returns:
+            list: 需要更新到屏幕的矩形列表
+        """
+        profiler = self.profiler
+        if profiler is None:
+            return self.current_scene.draw_dirty(self.screen)
+
+        scene = self.current_state.name
+        rects = profiler.time(PHASE_DRAW, scene, self.current_scene.draw_dirty, self.screen)
+        profiler.end_frame(scene)
+        if self.overlay is not None:
+            rects = self._draw_overlay(scene, rects)
+        return rects
+
+    def _draw_overlay(self, scene, rects):
+        """在场景之上绘制帧耗时浮层
+
+        浮层的内容到了刷新时间，或者场景重绘的区域盖住了浮层时才重新绘制。
+
+        Args:
+            scene: 场景名称
+            rects: 场景本帧重绘的矩形列表
+
+        Returns:
+            list: 加上浮层区域后的矩形列表
+        """
+        overlay = self.overlay
+        refreshed = overlay.needs_refresh()
+        if refreshed:
+            overlay.refresh(scene)
+        if refreshed or overlay.rect.collidelist(rects) != -1:
+            overlay.draw(self.screen)
+            rects = rects + [overlay.rect.copy()]
+        return rects
+
+    def shutdown(self):
+        """卸载所有场景（退出游戏时调用）"""
+        for state in list(self.scenes):
+            self._unload(state)
+        self._active_scene = None
@@ -7,32 +7,138 @@
 """
 
 class BaseScene:
-    """场景基类"""
-    
+    """场景基类
+
+    场景按脏矩形重绘：控件通过 dirty 标记报告自己需要重绘，场景只在这些区域内
+    （设置裁剪区域后）重新绘制，并把区域列表交给 pygame.display.update。
+    画面没有变化时不绘制任何内容。
+    """
+
+    # 场景用到的图像名称，场景处于当前状态时固定在内存中
+    ASSETS = ()
+
+    # 可能紧接着进入的游戏状态，进入本场景后会在后台预加载它们的资源
+    NEXT_STATES = ()
+
     def __init__(self, scene_manager):
         """初始化场景
-        
+
         Args:
             scene_manager: 场景管理器实例
         """
         self.scene_manager = scene_manager
-    
+        self._dirty_rects = []
+        self._full_redraw = True
+
+    def on_enter(self):
+        """进入场景时调用"""
+        pass
+
+    def on_exit(self):
+        """离开场景时调用"""
+        pass
+
+    def unload(self):
+        """场景被场景管理器卸载时调用，释放场景持有的文件等资源"""
+        pass
+
     def handle_event(self, event):
         """处理事件
-        
+
         Args:
             event: Pygame事件
         """
         pass
-    
+
     def update(self):
         """更新场景状态"""
         pass
-    
+
+    def needs_continuous_update(self):
+        """场景是否需要每帧持续更新
+
+        不需要时主循环会阻塞等待输入事件，而不是以固定帧率空转。
+
+        Returns:
+            bool: 有动画或实时逻辑时返回True
+        """
+        return False
+
     def draw(self, screen):
         """绘制场景
-        
+
         Args:
             screen: Pygame显示表面
         """
         pass
+
+    def get_widgets(self):
+        """获取会报告脏区域的控件
+
+        Returns:
+            list: 带有 rect 和 dirty 属性的控件列表
+        """
+        return []
+
+    def mark_dirty(self, rect=None):
+        """标记需要重绘的区域
+
+        Args:
+            rect: 需要重绘的矩形，为None时重绘整个画面
+        """
+        if rect is None:
+            self._full_redraw = True
+        else:
+            self._dirty_rects.append(rect.copy())
+
+    def draw_dirty(self, screen):
+        """只重绘发生变化的区域
+
+        Args:
+            screen: Pygame显示表面
+
+        Returns:
+            list: 本帧重绘的矩形列表（没有变化时为空）
+        """
+        if self._full_redraw:
+            self._full_redraw = False
+            self._dirty_rects = []
+            screen.set_clip(None)
+            screen.fill((0, 0, 0))
+            self.draw(screen)
+            return [screen.get_rect()]
+
+        rects = self._dirty_rects
+        self._dirty_rects = []
+        for widget in self.get_widgets():
+            if widget.dirty:
+                rects.append(widget.rect.copy())
+        if not rects:
+            return rects
+
+        rects = _merge_rects(rects)
+        for rect in rects:
+            # 裁剪区域外的绘制会被直接跳过，区域内先画背景再画控件
+            screen.set_clip(rect)
+            self.draw(screen)
+        screen.set_clip(None)
+        return rects
+
+
+def _merge_rects(rects):
+    """合并相互重叠的矩形
+
+    Args:
+        rects: 矩形列表
+
+    Returns:
+        list: 互不重叠的矩形列表
+    """
+    merged = []
+    for rect in rects:
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect = rect.union(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
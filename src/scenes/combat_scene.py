@@ -12,12 +12,46 @@ from src.scenes.base_scene import BaseScene
 from src.ui.button import Button
 from src.ui.hp_bar import HPBar
 from src.ui.battle_log import BattleLog
+from src.combat.auto_battle import ACTION_SKILL, ACTION_SUMMON, AutoBattle
+from src.combat.battle_clock import BattleClock, speed_label
 from src.combat.battle_manager import BattleManager
 from src.combat.character import Character
+from src.combat.skills import (
+    CAST_OK, CAST_COOLDOWN, CAST_STUNNED, CAST_NO_TARGET, CAST_LIMIT, CAST_NO_MP, SUMMON_SKILL
+)
 
 class CombatScene(BaseScene):
     """战斗场景类"""
 
+    ASSETS = ("default_background", "player", "enemy", "ally")
+    NEXT_STATES = (GameState.GAME_OVER, GameState.NARRATIVE)
+
+    # 盟友立绘位置
+    ALLY_POS = (250, 150)
+
+    # 战斗模拟的固定步长（秒），与渲染帧率无关
+    SIM_STEP = 1 / 60
+
+    # 自动战斗每帧用于前瞻搜索的时间预算（秒）
+    AUTO_BUDGET = 0.002
+
+    # 保存和恢复检查点的按键
+    CHECKPOINT_KEY = pygame.K_F5
+    RESTORE_KEY = pygame.K_F9
+
+    # 召唤按钮释放技能数据中的召唤技能（SUMMON_SKILL）；数字键 1~9 释放技能栏中对应栏位的技能
+    SKILL_KEYS = (pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4, pygame.K_5,
+                  pygame.K_6, pygame.K_7, pygame.K_8, pygame.K_9)
+
+    # 不能释放技能时的提示
+    CAST_MESSAGES = {
+        CAST_COOLDOWN: "技能冷却中！",
+        CAST_STUNNED: "眩晕中，无法释放技能！",
+        CAST_NO_TARGET: "没有可攻击的目标！",
+        CAST_LIMIT: "已经召唤了盟友！",
+        CAST_NO_MP: "魔法值不足！",
+    }
+
     def __init__(self, scene_manager):
         """初始化战斗场景
 
@@ -30,14 +64,19 @@ class CombatScene(BaseScene):
         self.screen_width = self.scene_manager.screen.get_width()
         self.screen_height = self.scene_manager.screen.get_height()
 
-        # 创建角色
-        self.player = Character("玩家", 100, 50, 10, 5, 5)
-        self.enemy = Character("敌人", 80, 0, 8, 4, 4)
+        # 读档时接管恢复的战斗，否则创建角色和新的战斗
+        restored = self.scene_manager.restored_battle
+        self.scene_manager.restored_battle = None
+        if restored is not None:
+            self.battle_manager = restored
+            self.player = restored.player
+            self.enemy = restored.enemy
+        else:
+            self.player = Character("玩家", 100, 50, 10, 5, 5)
+            self.enemy = Character("敌人", 80, 0, 8, 4, 4)
+            self.battle_manager = BattleManager(self.player, self.enemy)
         self.ally = None  # 初始没有盟友
 
-        # 创建战斗管理器
-        self.battle_manager = BattleManager(self.player, self.enemy)
-
         # 创建HP条
         hp_bar_width = 200
         hp_bar_height = 20
@@ -77,7 +116,7 @@ class CombatScene(BaseScene):
         )
 
         # 添加初始战斗日志
-        self.battle_log.add_message("战斗开始！")
+        self.battle_log.add_message("战斗继续！" if restored is not None else "战斗开始！")
         self.battle_log.add_message(f"{self.player.name} vs {self.enemy.name}")
 
         # 创建技能按钮
@@ -86,12 +125,16 @@ class CombatScene(BaseScene):
         button_margin = 20
         button_y = log_y + log_height + 20
 
+        # 按钮文字来自技能数据：技能按钮为主技能（第一个栏位）
+        skills = self.player.skills
+        self.summon_slot = skills.slot(SUMMON_SKILL)
+
         self.skill_button = Button(
             self.screen_width // 2 - button_width - button_margin,
             button_y,
             button_width,
             button_height,
-            "火球术 (MP: 10)",
+            self._skill_text(0),
             self._on_skill_click
         )
 
@@ -100,10 +143,38 @@ class CombatScene(BaseScene):
             button_y,
             button_width,
             button_height,
-            "召唤盟友 (MP: 20)",
+            self._skill_text(self.summon_slot),
             self._on_summon_click
         )
 
+        # 战斗时钟：按倍速把真实时间换算为战斗虚拟时间
+        self.clock = BattleClock(self.battle_manager, self.SIM_STEP)
+        self.checkpoint = None  # 最近保存的检查点
+
+        self.speed_button = Button(
+            self.screen_width - 50 - 120,
+            button_y,
+            120,
+            button_height,
+            self._speed_text(),
+            self._on_speed_click
+        )
+
+        # 自动战斗（默认关闭）
+        self.auto_battle = None
+        self.auto_button = Button(
+            50,
+            button_y,
+            120,
+            button_height,
+            self._auto_text(),
+            self._on_auto_click
+        )
+
+        # 恢复的战斗中已经召唤过盟友
+        if self.battle_manager.allies:
+            self._show_ally(self.battle_manager.allies[0])
+
         # 战斗状态
         self.battle_active = True
         self.last_update_time = pygame.time.get_ticks()
@@ -117,6 +188,21 @@ class CombatScene(BaseScene):
         if self.battle_active:
             self.skill_button.handle_event(event)
             self.summon_button.handle_event(event)
+            self.speed_button.handle_event(event)
+            self.auto_button.handle_event(event)
+
+            if event.type == pygame.KEYDOWN:
+                if event.key == self.CHECKPOINT_KEY:
+                    self.save_checkpoint()
+                elif event.key == self.RESTORE_KEY:
+                    self.restore_checkpoint()
+                elif event.key in self.SKILL_KEYS:
+                    slot = self.SKILL_KEYS.index(event.key)
+                    if slot < len(self.player.skills):
+                        self.cast_skill(slot)
+
+        # 滚轮查看战斗日志历史
+        self.battle_log.handle_event(event)
 
         # 处理用户自定义事件
         if event.type == pygame.USEREVENT:
@@ -126,6 +212,31 @@ class CombatScene(BaseScene):
                 elif event.dict['action'] == 'back_to_narrative':
                     self.scene_manager.change_state(GameState.NARRATIVE)
 
+    def on_enter(self):
+        """进入场景时从当前时刻开始计时（场景可能是提前创建的）"""
+        self.last_update_time = pygame.time.get_ticks()
+        self.clock.reset()
+
+    def get_widgets(self):
+        """获取会报告脏区域的控件
+
+        Returns:
+            list: 控件列表
+        """
+        widgets = [self.player_hp_bar, self.enemy_hp_bar, self.battle_log,
+                   self.skill_button, self.summon_button, self.speed_button, self.auto_button]
+        if self.ally_hp_bar:
+            widgets.append(self.ally_hp_bar)
+        return widgets
+
+    def needs_continuous_update(self):
+        """战斗进行中需要每帧更新
+
+        Returns:
+            bool: 战斗是否进行中
+        """
+        return self.battle_active
+
     def update(self):
         """更新场景状态"""
         if not self.battle_active:
@@ -136,18 +247,33 @@ class CombatScene(BaseScene):
         elapsed_time = (current_time - self.last_update_time) / 1000.0  # 转换为秒
         self.last_update_time = current_time
 
-        # 更新战斗
-        battle_events = self.battle_manager.update(elapsed_time)
+        # 自动战斗在时间预算内搜索，决定好后像玩家一样点击按钮
+        if self.auto_battle is not None:
+            action = self.auto_battle.think(self.battle_manager)
+            if action == ACTION_SKILL:
+                self._on_skill_click()
+            elif action == ACTION_SUMMON:
+                self._on_summon_click()
+
+        # 按倍速和固定步长推进战斗：渲染帧率波动不会改变战斗时间，玩家输入也总是落在步长边界上；
+        # 瞬间结算时在这一帧内直接算出结果
+        battle_events = self.clock.tick(elapsed_time)
 
         # 处理战斗事件
         for event in battle_events:
-            self.battle_log.add_message(event)
+            self.battle_log.add_event(event)
 
         # 检查战斗是否结束
         if self.battle_manager.is_battle_over():
             self.battle_active = False
 
-            if self.player.current_hp <= 0:
+            # 胜利后剧情才前进到战斗选项的后续节点，失败时停留在战斗前的节点
+            won = self.player.current_hp > 0
+            story = self.scene_manager.story_state
+            if story is not None:
+                story.resolve_combat(won)
+
+            if not won:
                 self.battle_log.add_message("战斗失败！")
                 # 延迟一段时间后切换到游戏结束场景
                 pygame.time.set_timer(pygame.USEREVENT, 3000)
@@ -177,7 +303,7 @@ class CombatScene(BaseScene):
 
         if self.ally:
             ally_image = self.scene_manager.resource_manager.get_image("ally")
-            screen.blit(ally_image, (250, 150))  # 盟友
+            screen.blit(ally_image, self.ALLY_POS)  # 盟友
 
         # 绘制HP条
         self.player_hp_bar.draw(screen)
@@ -192,37 +318,115 @@ class CombatScene(BaseScene):
         # 绘制技能按钮
         self.skill_button.draw(screen)
         self.summon_button.draw(screen)
+        self.speed_button.draw(screen)
+        self.auto_button.draw(screen)
+
+    def _skill_text(self, slot):
+        """技能按钮的文字
+
+        Args:
+            slot: 技能栏位
+
+        Returns:
+            str: 技能名称和魔法值消耗
+        """
+        skill = self.player.skills.skills[slot]
+        return f"{skill.label} (MP: {skill.mp_cost})"
+
+    def cast_skill(self, slot):
+        """玩家释放技能栏中的技能，不能释放时在战斗日志中提示原因
+
+        Args:
+            slot: 技能栏位
+
+        Returns:
+            bool: 是否释放成功
+        """
+        reason = self.battle_manager.check_cast(self.player, slot)
+        if reason != CAST_OK or self.battle_manager.cast(self.player, slot) is None:
+            self.battle_log.add_message(self.CAST_MESSAGES.get(reason, "无法释放技能！"))
+            return False
+
+        # 召唤类技能带来的盟友
+        if self.ally is None and self.battle_manager.allies:
+            self._show_ally(self.battle_manager.allies[0])
+        return True
 
     def _on_skill_click(self):
-        """技能按钮点击事件处理"""
-        if self.player.current_mp >= 10:
-            damage = self.battle_manager.player_use_skill()
-            self.battle_log.add_message(f"{self.player.name}使用火球术，对{self.enemy.name}造成{damage}点伤害！")
+        """技能按钮点击事件处理：释放主技能"""
+        self.cast_skill(0)
+
+    def _speed_text(self):
+        """速度按钮的文字"""
+        return f"速度 {speed_label(self.clock.speed)}"
+
+    def _on_speed_click(self):
+        """速度按钮点击事件处理：切换到下一档速度"""
+        self.clock.cycle_speed()
+        self.speed_button.set_text(self._speed_text())
+
+    def _auto_text(self):
+        """自动战斗按钮的文字"""
+        return "自动 开" if self.auto_battle is not None else "自动 关"
+
+    def _on_auto_click(self):
+        """自动战斗按钮点击事件处理：开启或关闭自动战斗"""
+        if self.auto_battle is None:
+            self.auto_battle = AutoBattle(budget=self.AUTO_BUDGET)
         else:
-            self.battle_log.add_message("魔法值不足！")
+            self.auto_battle = None
+        self.auto_button.set_text(self._auto_text())
+
+    def save_checkpoint(self):
+        """保存检查点"""
+        self.checkpoint = self.clock.checkpoint()
+        self.battle_log.add_message("已保存检查点")
+
+    def restore_checkpoint(self):
+        """恢复最近保存的检查点"""
+        if self.checkpoint is None:
+            self.battle_log.add_message("没有可以恢复的检查点！")
+            return
 
-    def _on_summon_click(self):
-        """召唤按钮点击事件处理"""
+        battle = self.clock.restore(self.checkpoint)
+        self.battle_manager = battle
+        self.player = self.player_hp_bar.character = battle.player
+        self.enemy = self.enemy_hp_bar.character = battle.enemy
+
+        # 盟友按检查点时的状态显示或移除
         if self.ally:
-            self.battle_log.add_message("已经召唤了盟友！")
-            return
+            ally_image = self.scene_manager.resource_manager.get_image("ally")
+            self.mark_dirty(ally_image.get_rect(topleft=self.ALLY_POS))
+            self.mark_dirty(self.ally_hp_bar.rect)
+            self.ally = self.ally_hp_bar = None
+        if battle.allies:
+            self._show_ally(battle.allies[0])
 
-        if self.player.current_mp >= 20:
-            self.ally = Character("盟友", 60, 0, 7, 3, 6)
-            self.battle_manager.add_ally(self.ally)
-            self.player.current_mp -= 20
-
-            # 创建盟友HP条
-            ally_hp_bar_x = self.screen_width // 2 - 100
-            ally_hp_bar_y = 80
-            self.ally_hp_bar = HPBar(
-                ally_hp_bar_x,
-                ally_hp_bar_y,
-                200,
-                20,
-                self.ally
-            )
-
-            self.battle_log.add_message(f"{self.player.name}召唤了{self.ally.name}！")
-        else:
-            self.battle_log.add_message("魔法值不足！")
+        self.battle_log.add_message("已恢复检查点")
+
+    def _on_summon_click(self):
+        """召唤按钮点击事件处理：释放召唤技能"""
+        self.cast_skill(self.summon_slot)
+
+    def _show_ally(self, ally):
+        """显示盟友立绘和HP条
+
+        Args:
+            ally: 盟友角色
+        """
+        self.ally = ally
+
+        # 盟友立绘所在区域需要重绘
+        ally_image = self.scene_manager.resource_manager.get_image("ally")
+        self.mark_dirty(ally_image.get_rect(topleft=self.ALLY_POS))
+
+        # 创建盟友HP条
+        ally_hp_bar_x = self.screen_width // 2 - 100
+        ally_hp_bar_y = 80
+        self.ally_hp_bar = HPBar(
+            ally_hp_bar_x,
+            ally_hp_bar_y,
+            200,
+            20,
+            self.ally
+        )
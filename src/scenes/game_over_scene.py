@@ -10,10 +10,14 @@ import pygame
 from src.game_state import GameState
 from src.scenes.base_scene import BaseScene
 from src.ui.button import Button
+from src.ui.text_renderer import get_text_renderer
 
 class GameOverScene(BaseScene):
     """游戏结束场景类"""
 
+    ASSETS = ("default_background",)
+    NEXT_STATES = (GameState.MAIN_MENU,)
+
     def __init__(self, scene_manager):
         """初始化游戏结束场景
 
@@ -27,8 +31,7 @@ class GameOverScene(BaseScene):
         self.screen_height = self.scene_manager.screen.get_height()
 
         # 设置标题
-        self.title_font = pygame.font.SysFont("simhei", 48)
-        self.title_text = self.title_font.render("游戏结束", True, (255, 255, 255))
+        self.title_text = get_text_renderer().render("游戏结束", 48, (255, 255, 255))
         self.title_rect = self.title_text.get_rect(center=(self.screen_width // 2, self.screen_height // 3))
 
         # 创建按钮
@@ -64,6 +67,14 @@ class GameOverScene(BaseScene):
         self.restart_button.handle_event(event)
         self.quit_button.handle_event(event)
 
+    def get_widgets(self):
+        """获取会报告脏区域的控件
+
+        Returns:
+            list: 控件列表
+        """
+        return [self.restart_button, self.quit_button]
+
     def update(self):
         """更新场景状态"""
         pass
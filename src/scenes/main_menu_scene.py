@@ -10,10 +10,17 @@ import pygame
 from src.game_state import GameState
 from src.scenes.base_scene import BaseScene
 from src.ui.button import Button
+from src.ui.text_renderer import get_text_renderer
 
 class MainMenuScene(BaseScene):
     """主菜单场景类"""
 
+    ASSETS = ("default_background",)
+    NEXT_STATES = (GameState.NARRATIVE,)
+
+    # 提示信息的颜色
+    STATUS_COLOR = (255, 120, 120)
+
     def __init__(self, scene_manager):
         """初始化主菜单场景
 
@@ -31,6 +38,17 @@ class MainMenuScene(BaseScene):
         button_x = (screen_width - button_width) // 2
         button_y = screen_height // 2
 
+        # 有存档时在开始游戏上方显示
+        self.continue_button = Button(
+            button_x,
+            button_y - button_height - 20,
+            button_width,
+            button_height,
+            "继续游戏",
+            self._on_continue_click
+        )
+        self.buttons = []
+
         self.start_button = Button(
             button_x,
             button_y,
@@ -50,18 +68,57 @@ class MainMenuScene(BaseScene):
         )
 
         # 设置标题
-        self.title_font = pygame.font.SysFont("simhei", 48)
-        self.title_text = self.title_font.render("奇幻小说TRPG游戏原型", True, (255, 255, 255))
+        self.title_text = get_text_renderer().render("奇幻小说TRPG游戏原型", 48, (255, 255, 255))
         self.title_rect = self.title_text.get_rect(center=(screen_width // 2, screen_height // 4))
 
+        # 按钮下方的提示信息（例如读档失败的原因）
+        self.status_text = None
+        self.status_rect = None
+        self.status_center = (screen_width // 2, self.quit_button.rect.bottom + 40)
+
+        self._update_buttons()
+
+    def on_enter(self):
+        """回到主菜单时可能已经有了新的存档，之前的提示不再显示"""
+        self.status_text = None
+        self.status_rect = None
+        self._update_buttons()
+
+    def show_status(self, message):
+        """在按钮下方显示提示信息
+
+        Args:
+            message: 提示文本
+        """
+        if self.status_rect is not None:
+            self.mark_dirty(self.status_rect)
+        self.status_text = get_text_renderer().render(message, 18, self.STATUS_COLOR)
+        self.status_rect = self.status_text.get_rect(center=self.status_center)
+        self.mark_dirty(self.status_rect)
+
+    def _update_buttons(self):
+        """根据是否有存档决定显示的按钮"""
+        save_system = self.scene_manager.save_system
+        self.buttons = [self.start_button, self.quit_button]
+        if save_system is not None and save_system.has_save():
+            self.buttons.insert(0, self.continue_button)
+
     def handle_event(self, event):
         """处理事件
 
         Args:
             event: Pygame事件
         """
-        self.start_button.handle_event(event)
-        self.quit_button.handle_event(event)
+        for button in self.buttons:
+            button.handle_event(event)
+
+    def get_widgets(self):
+        """获取会报告脏区域的控件
+
+        Returns:
+            list: 控件列表
+        """
+        return self.buttons
 
     def update(self):
         """更新场景状态"""
@@ -81,13 +138,29 @@ class MainMenuScene(BaseScene):
         screen.blit(self.title_text, self.title_rect)
 
         # 绘制按钮
-        self.start_button.draw(screen)
-        self.quit_button.draw(screen)
+        for button in self.buttons:
+            button.draw(screen)
+
+        # 绘制提示信息
+        if self.status_text is not None:
+            screen.blit(self.status_text, self.status_rect)
 
     def _on_start_click(self):
         """开始游戏按钮点击事件处理"""
+        # 从剧情开头开始
+        self.scene_manager.story_state = None
         self.scene_manager.change_state(GameState.NARRATIVE)
 
+    def _on_continue_click(self):
+        """继续游戏按钮点击事件处理"""
+        save_system = self.scene_manager.save_system
+        try:
+            sections = save_system.load()
+        except (OSError, ValueError) as e:
+            self.show_status(f"读取存档失败: {e}")
+            return
+        save_system.apply(self.scene_manager, sections)
+
     def _on_quit_click(self):
         """退出游戏按钮点击事件处理"""
         pygame.quit()
@@ -6,14 +6,32 @@
 展示游戏剧情和对话
 """
 
+import os
+
 import pygame
 from src.game_state import GameState
+from src.narrative.graph import NarrativeGraph, StoryState
 from src.scenes.base_scene import BaseScene
 from src.ui.button import Button
 from src.ui.text_box import TextBox
 
 class NarrativeScene(BaseScene):
-    """叙事场景类"""
+    """叙事场景类
+
+    剧情内容来自 data/story 中的剧情图，场景只负责显示当前节点和选项；
+    剧情进度保存在场景管理器的 story_state 中，场景被卸载或重建后不会丢失。
+    """
+
+    ASSETS = ("default_background", "player")
+    NEXT_STATES = (GameState.COMBAT,)
+
+    # 选项按钮布局
+    BUTTON_WIDTH = 200
+    BUTTON_HEIGHT = 40
+    BUTTON_SPACING = 40
+
+    # 逐字显示速度（字/秒）
+    TEXT_SPEED = 60
 
     def __init__(self, scene_manager):
         """初始化叙事场景
@@ -27,8 +45,9 @@ class NarrativeScene(BaseScene):
         self.screen_width = self.scene_manager.screen.get_width()
         self.screen_height = self.scene_manager.screen.get_height()
 
-        # 加载背景图
-        self.background = self.scene_manager.resource_manager.get_image("default_background")
+        # 加载剧情图（只读取索引，节点按需读取）
+        cache_dir = self.scene_manager.resource_manager.cache_dir
+        self.story = NarrativeGraph.load(cache_dir=os.path.join(cache_dir, "story") if cache_dir else None)
 
         # 创建文本框
         text_box_width = self.screen_width - 100
@@ -41,38 +60,64 @@ class NarrativeScene(BaseScene):
             text_box_y,
             text_box_width,
             text_box_height,
-            "这是一个测试剧情。你是一名勇敢的冒险者，正在探索一座古老的遗迹。突然，你遇到了一个神秘的生物..."
+            chars_per_second=self.TEXT_SPEED
         )
 
-        # 创建选项按钮
-        button_width = 200
-        button_height = 40
-        button_margin = 20
-
-        self.option_buttons = [
-            Button(
-                self.screen_width // 2 - button_width - button_margin,
-                text_box_y + text_box_height + 20,
-                button_width,
-                button_height,
-                "与生物交谈",
-                self._on_talk_click
-            ),
-            Button(
-                self.screen_width // 2 + button_margin,
-                text_box_y + text_box_height + 20,
-                button_width,
-                button_height,
-                "准备战斗",
-                self._on_fight_click
-            )
-        ]
+        self.option_buttons = []
+        self.background = None
+        self.character_image = None
+        self.character_rect = None
+        self.shown = None  # 正在显示的 (剧情进度, 节点ID)
+
+        self._show_current_node()
+
+    def on_enter(self):
+        """进入场景时显示当前剧情节点（战斗结束或重新开始后可能已经变化）"""
+        self._show_current_node()
+
+    def unload(self):
+        """场景被卸载时关闭剧情图的节点数据文件"""
+        self.story.close()
+
+    def _show_current_node(self):
+        """显示剧情进度中的当前节点（没有进度时从头开始）"""
+        state = self.scene_manager.story_state
+        if state is None:
+            state = self.scene_manager.story_state = StoryState(self.story.start)
+        if self.shown == (state, state.node_id):
+            return
+        self.shown = (state, state.node_id)
+        node = self.story.get_node(state.node_id)
+
+        resource_manager = self.scene_manager.resource_manager
+        self.background = resource_manager.get_image(node.background)
+        self.text_box.set_text(node.text)
 
         # 加载角色立绘
-        self.character_image = self.scene_manager.resource_manager.get_image("player")
-        self.character_rect = self.character_image.get_rect()
-        self.character_rect.centerx = self.screen_width // 2
-        self.character_rect.y = 100
+        self.character_image = resource_manager.get_image(node.image) if node.image else None
+        if self.character_image is not None:
+            self.character_rect = self.character_image.get_rect()
+            self.character_rect.centerx = self.screen_width // 2
+            self.character_rect.y = 100
+
+        # 创建选项按钮，整行居中
+        choices = state.available_choices(node)
+        total_width = len(choices) * self.BUTTON_WIDTH + (len(choices) - 1) * self.BUTTON_SPACING
+        x = (self.screen_width - total_width) // 2
+        self.option_buttons = []
+        for choice in choices:
+            self.option_buttons.append(Button(
+                x,
+                self.text_box.rect.bottom + 20,
+                self.BUTTON_WIDTH,
+                self.BUTTON_HEIGHT,
+                choice.text,
+                lambda choice=choice: self._on_choice_click(choice)
+            ))
+            x += self.BUTTON_WIDTH + self.BUTTON_SPACING
+
+        # 节点切换时背景、立绘和按钮都可能变化，整体重绘
+        self.mark_dirty()
 
     def handle_event(self, event):
         """处理事件
@@ -80,12 +125,52 @@ class NarrativeScene(BaseScene):
         Args:
             event: Pygame事件
         """
-        for button in self.option_buttons:
+        # 文字全部显示完后才能选择
+        for button in self.visible_buttons():
             button.handle_event(event)
 
+        was_finished = self.text_box.is_finished()
+        self.text_box.handle_event(event)
+        self._check_finished(was_finished)
+
+    def visible_buttons(self):
+        """获取当前显示的选项按钮
+
+        Returns:
+            list: 文字全部显示完之前为空
+        """
+        return self.option_buttons if self.text_box.is_finished() else []
+
+    def get_widgets(self):
+        """获取会报告脏区域的控件
+
+        Returns:
+            list: 控件列表
+        """
+        return [self.text_box] + self.visible_buttons()
+
+    def needs_continuous_update(self):
+        """逐字显示时需要持续更新
+
+        Returns:
+            bool: 文本框正在逐字显示时返回True
+        """
+        return self.text_box.is_revealing()
+
     def update(self):
         """更新场景状态"""
-        pass
+        was_finished = self.text_box.is_finished()
+        self.text_box.update()
+        self._check_finished(was_finished)
+
+    def _check_finished(self, was_finished):
+        """文字刚好全部显示完时整体重绘（选项按钮出现）
+
+        Args:
+            was_finished: 之前是否已经显示完
+        """
+        if self.text_box.is_finished() != was_finished:
+            self.mark_dirty()
 
     def draw(self, screen):
         """绘制场景
@@ -97,50 +182,29 @@ class NarrativeScene(BaseScene):
         screen.blit(self.background, (0, 0))
 
         # 绘制角色立绘
-        screen.blit(self.character_image, self.character_rect)
+        if self.character_image is not None:
+            screen.blit(self.character_image, self.character_rect)
 
         # 绘制文本框
         self.text_box.draw(screen)
 
         # 绘制选项按钮
-        for button in self.option_buttons:
+        for button in self.visible_buttons():
             button.draw(screen)
 
-    def _on_talk_click(self):
-        """交谈选项点击事件处理"""
-        # 更新文本框内容
-        self.text_box.set_text("你决定与神秘生物交谈。它似乎很友好，告诉你关于这座遗迹的秘密...")
+    def _on_choice_click(self, choice):
+        """选项点击事件处理
 
-        # 更新选项按钮
-        self.option_buttons = [
-            Button(
-                self.screen_width // 2 - 100,
-                self.text_box.rect.bottom + 20,
-                200,
-                40,
-                "继续探索",
-                self._on_continue_click
-            )
-        ]
-
-    def _on_fight_click(self):
-        """战斗选项点击事件处理"""
-        # 切换到战斗场景
-        self.scene_manager.change_state(GameState.COMBAT)
-
-    def _on_continue_click(self):
-        """继续探索选项点击事件处理"""
-        # 更新文本框内容
-        self.text_box.set_text("你继续探索遗迹，发现了一个古老的宝箱。当你靠近时，一个守卫者出现了！")
-
-        # 更新选项按钮
-        self.option_buttons = [
-            Button(
-                self.screen_width // 2 - 100,
-                self.text_box.rect.bottom + 20,
-                200,
-                40,
-                "准备战斗",
-                self._on_fight_click
-            )
-        ]
+        Args:
+            choice: 被选择的剧情选项
+        """
+        self.scene_manager.story_state.choose(choice)
+
+        if choice.end:
+            # 剧情结束，回到主菜单
+            self.scene_manager.change_state(GameState.MAIN_MENU)
+        elif choice.combat:
+            # 切换到战斗场景，胜利后才前进到后续节点
+            self.scene_manager.change_state(GameState.COMBAT)
+        else:
+            self._show_current_node()
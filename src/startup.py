@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+启动过程
+启动阶段计时和快速启动所需的初始化
+"""
+
+import json
+import time
+from contextlib import contextmanager
+
+import pygame
+
+
+class StartupTrace:
+    """启动计时类
+
+    记录启动过程中每个阶段的开始时间和耗时，可以打印成表格或导出为JSON。
+    """
+
+    def __init__(self):
+        """初始化计时"""
+        self.origin = time.perf_counter()
+        self.phases = []  # (阶段名, 相对开始时间, 耗时)，单位秒
+
+    @contextmanager
+    def phase(self, name):
+        """记录一个阶段的耗时
+
+        Args:
+            name: 阶段名称
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.phases.append((name, start - self.origin, end - start))
+
+    def total(self):
+        """从开始计时到最后一个阶段结束的时间
+
+        Returns:
+            float: 总耗时（秒）
+        """
+        if not self.phases:
+            return 0.0
+        return max(start + duration for _, start, duration in self.phases)
+
+    def to_dict(self):
+        """转换为可序列化的字典
+
+        Returns:
+            dict: 各阶段的开始时间和耗时（毫秒）
+        """
+        return {
+            "total_ms": round(self.total() * 1000, 3),
+            "phases": [
+                {"name": name, "start_ms": round(start * 1000, 3), "duration_ms": round(duration * 1000, 3)}
+                for name, start, duration in self.phases
+            ],
+        }
+
+    def save(self, path):
+        """导出为JSON文件
+
+        Args:
+            path: 文件路径
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def report(self):
+        """生成文本表格
+
+        Returns:
+            str: 每个阶段一行的耗时表
+        """
+        width = max([len(name) for name, _, _ in self.phases] + [5])
+        lines = [f"{'phase':<{width}}  {'start':>9}  {'time':>9}"]
+        for name, start, duration in self.phases:
+            lines.append(f"{name:<{width}}  {start * 1000:>7.1f}ms  {duration * 1000:>7.1f}ms")
+        lines.append(f"{'total':<{width}}  {'':>9}  {self.total() * 1000:>7.1f}ms")
+        return "\n".join(lines)
+
+
+def init_pygame(fast_boot=False):
+    """初始化Pygame
+
+    Args:
+        fast_boot: 为True时只初始化显示和字体模块，跳过音频、手柄等用不到的子系统
+    """
+    if fast_boot:
+        pygame.display.init()
+        pygame.font.init()
+    else:
+        pygame.init()
@@ -6,73 +6,142 @@
 用于显示战斗中的事件
 """
 
+from collections import deque
+
 import pygame
+from src.ui.event_text import format_event
+from src.ui.text_renderer import get_text_renderer
 
 class BattleLog:
-    """战斗日志类"""
-    
-    def __init__(self, x, y, width, height, max_messages=10):
+    """战斗日志类
+
+    静态的背景、边框和标题只渲染一次；每条消息的文字表面在第一次显示时渲染并缓存；
+    日志整体合成到一个常驻表面上，只有添加消息或滚动时才重新合成。
+    """
+
+    # 布局
+    LINE_HEIGHT = 25
+    TEXT_TOP = 40
+
+    def __init__(self, x, y, width, height, max_messages=10, history_size=200):
         """初始化战斗日志
-        
+
         Args:
             x: 日志左上角x坐标
             y: 日志左上角y坐标
             width: 日志宽度
             height: 日志高度
             max_messages: 最大显示消息数
+            history_size: 可向上滚动查看的历史消息数
         """
         self.rect = pygame.Rect(x, y, width, height)
         self.max_messages = max_messages
-        self.messages = []
-        
+        self.messages = deque(maxlen=max_messages)  # 最近的消息
+        self.history = deque(maxlen=max(history_size, max_messages))  # [消息, 文字表面]
+        self.scroll_offset = 0  # 向上滚动的行数
+
         # 日志颜色
         self.bg_color = (30, 30, 30, 200)  # 半透明背景
         self.border_color = (150, 150, 150)
         self.text_color = (220, 220, 220)
-        
-        # 创建字体
-        self.font = pygame.font.SysFont("simhei", 18)
-    
+
+        # 文本渲染服务（重复出现的消息共用缓存）
+        self.text_renderer = get_text_renderer()
+        self.font_size = 18
+
+        # 框内可容纳的行数
+        self.visible_lines = max(1, min(max_messages, (height - self.TEXT_TOP) // self.LINE_HEIGHT))
+
+        # 渲染缓存；dirty 表示内容变化、需要重新合成并重绘
+        self._frame_surface = self._render_frame()
+        self._surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.dirty = True
+
+    def _render_frame(self):
+        """渲染静态部分（背景、边框、标题和分隔线）
+
+        Returns:
+            Surface: 静态部分的表面
+        """
+        surface = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
+        local_rect = surface.get_rect()
+        pygame.draw.rect(surface, self.bg_color, local_rect, border_radius=5)
+        pygame.draw.rect(surface, self.border_color, local_rect, width=2, border_radius=5)
+
+        title_surface = self.text_renderer.render("战斗日志", self.font_size, (255, 255, 255))
+        surface.blit(title_surface, (10, 5))
+
+        pygame.draw.line(surface, self.border_color, (5, 30), (local_rect.width - 5, 30), 1)
+        return surface
+
     def add_message(self, message):
         """添加消息
-        
+
         Args:
             message: 消息文本
         """
         self.messages.append(message)
-        
-        # 限制消息数量
-        if len(self.messages) > self.max_messages:
-            self.messages = self.messages[-self.max_messages:]
-    
+        self.history.append([message, None])
+
+        # 正在查看历史时保持画面不动
+        if self.scroll_offset:
+            self.scroll_offset = min(self.scroll_offset + 1, self._max_scroll())
+        self.dirty = True
+
+    def add_event(self, event):
+        """添加战斗事件（在这里才格式化为文本）
+
+        Args:
+            event: 战斗事件（BattleEvent）
+        """
+        self.add_message(format_event(event))
+
+    def scroll(self, lines):
+        """滚动日志
+
+        Args:
+            lines: 向上滚动的行数，负数向下滚动
+        """
+        offset = max(0, min(self.scroll_offset + lines, self._max_scroll()))
+        if offset != self.scroll_offset:
+            self.scroll_offset = offset
+            self.dirty = True
+
+    def _max_scroll(self):
+        """最大滚动行数"""
+        return max(0, len(self.history) - self.visible_lines)
+
+    def handle_event(self, event):
+        """处理事件（鼠标滚轮滚动历史）
+
+        Args:
+            event: Pygame事件
+        """
+        if event.type == pygame.MOUSEWHEEL and self.rect.collidepoint(pygame.mouse.get_pos()):
+            self.scroll(event.y)
+
+    def _compose(self):
+        """将静态部分和可见消息合成到常驻表面"""
+        surface = self._surface
+        surface.fill((0, 0, 0, 0))
+        surface.blit(self._frame_surface, (0, 0))
+
+        end = len(self.history) - self.scroll_offset
+        start = max(0, end - self.visible_lines)
+        for i in range(start, end):
+            entry = self.history[i]
+            if entry[1] is None:
+                entry[1] = self.text_renderer.render(entry[0], self.font_size, self.text_color)
+            surface.blit(entry[1], (10, self.TEXT_TOP + (i - start) * self.LINE_HEIGHT))
+
+        self.dirty = False
+
     def draw(self, screen):
         """绘制战斗日志
-        
+
         Args:
             screen: Pygame显示表面
         """
-        # 创建半透明表面
-        surface = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(surface, self.bg_color, surface.get_rect(), border_radius=5)
-        screen.blit(surface, self.rect)
-        
-        # 绘制边框
-        pygame.draw.rect(screen, self.border_color, self.rect, width=2, border_radius=5)
-        
-        # 绘制标题
-        title_surface = self.font.render("战斗日志", True, (255, 255, 255))
-        screen.blit(title_surface, (self.rect.x + 10, self.rect.y + 5))
-        
-        # 绘制分隔线
-        pygame.draw.line(
-            screen,
-            self.border_color,
-            (self.rect.x + 5, self.rect.y + 30),
-            (self.rect.x + self.rect.width - 5, self.rect.y + 30),
-            1
-        )
-        
-        # 绘制消息
-        for i, message in enumerate(self.messages):
-            message_surface = self.font.render(message, True, self.text_color)
-            screen.blit(message_surface, (self.rect.x + 10, self.rect.y + 40 + i * 25))
+        if self.dirty:
+            self._compose()
+        screen.blit(self._surface, self.rect)
@@ -6,6 +6,7 @@
 """
 
 import pygame
+from src.ui.text_renderer import get_text_renderer
 
 class Button:
     """按钮类"""
@@ -27,17 +28,30 @@ class Button:
         
         # 按钮状态
         self.is_hovered = False
+        self.dirty = True  # 外观变化后需要重绘
         
         # 按钮颜色
         self.normal_color = (100, 100, 100)
         self.hover_color = (150, 150, 150)
         self.text_color = (255, 255, 255)
         
-        # 创建字体
-        self.font = pygame.font.SysFont("simhei", 24)
-        self.text_surface = self.font.render(self.text, True, self.text_color)
+        # 渲染文本（相同文字的按钮共用缓存）
+        self.text_surface = get_text_renderer().render(self.text, 24, self.text_color)
         self.text_rect = self.text_surface.get_rect(center=self.rect.center)
     
+    def set_text(self, text):
+        """更改按钮文本
+        
+        Args:
+            text: 新的按钮文本
+        """
+        if text == self.text:
+            return
+        self.text = text
+        self.text_surface = get_text_renderer().render(self.text, 24, self.text_color)
+        self.text_rect = self.text_surface.get_rect(center=self.rect.center)
+        self.dirty = True
+    
     def handle_event(self, event):
         """处理事件
         
@@ -46,7 +60,10 @@ class Button:
         """
         if event.type == pygame.MOUSEMOTION:
             # 检测鼠标悬停
-            self.is_hovered = self.rect.collidepoint(event.pos)
+            is_hovered = self.rect.collidepoint(event.pos)
+            if is_hovered != self.is_hovered:
+                self.is_hovered = is_hovered
+                self.dirty = True
         
         elif event.type == pygame.MOUSEBUTTONDOWN:
             # 检测鼠标点击
@@ -69,3 +86,4 @@ class Button:
         
         # 绘制按钮文本
         screen.blit(self.text_surface, self.text_rect)
+        self.dirty = False
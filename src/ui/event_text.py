@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+战斗事件文本
+将结构化的战斗事件格式化为日志文本（只在需要显示时调用）
+"""
+
+from src.combat.events import (
+    EVENT_ATTACK, EVENT_SKILL, EVENT_SUMMON, EVENT_DEATH, EVENT_EFFECT, EVENT_EXPIRE, EVENT_DOT, EVENT_CAST
+)
+
+def format_event(event):
+    """将战斗事件格式化为日志文本
+
+    Args:
+        event: 战斗事件（BattleEvent）
+
+    Returns:
+        str: 日志文本
+    """
+    kind = event.kind
+    if kind == EVENT_ATTACK:
+        return f"{event.source.name}攻击了{event.target.name}，造成{event.value}点伤害！"
+    if kind == EVENT_CAST:
+        return f"{event.source.name}使用了{event.value.label}！"
+    if kind == EVENT_SKILL:
+        return f"{event.source.name}的技能对{event.target.name}造成{event.value}点伤害！"
+    if kind == EVENT_SUMMON:
+        if event.source is None:
+            return f"{event.target.name}加入了战斗！"
+        return f"{event.source.name}召唤了{event.target.name}！"
+    if kind == EVENT_DEATH:
+        return f"{event.target.name}被击败了！"
+    if kind == EVENT_EFFECT:
+        return f"{event.target.name}获得了{event.value.label}效果！"
+    if kind == EVENT_EXPIRE:
+        return f"{event.target.name}的{event.value.label}效果消失了。"
+    if kind == EVENT_DOT:
+        return f"{event.target.name}受到持续伤害，损失{event.value}点生命值！"
+    return str(event)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+帧耗时浮层
+在画面左上角显示当前场景各阶段耗时的百分位数
+"""
+
+import pygame
+from src.profiling import PHASES
+from src.ui.text_renderer import get_text_renderer
+
+class FrameOverlay:
+    """帧耗时浮层类
+
+    内容每隔 refresh_interval 毫秒才重新计算一次；数字通过字形图集逐字绘制，
+    不会因为数值不断变化而占满文本渲染缓存。
+    """
+
+    # 布局
+    PADDING = 6
+    LINE_HEIGHT = 18
+    FONT_SIZE = 16
+
+    def __init__(self, profiler, x=8, y=8, width=330, refresh_interval=250):
+        """初始化浮层
+
+        Args:
+            profiler: 帧耗时分析器
+            x: 左上角x坐标
+            y: 左上角y坐标
+            width: 宽度
+            refresh_interval: 内容刷新间隔（毫秒）
+        """
+        self.profiler = profiler
+        height = self.PADDING * 2 + self.LINE_HEIGHT * (len(PHASES) + 1)
+        self.rect = pygame.Rect(x, y, width, height)
+        self.refresh_interval = refresh_interval
+        self.lines = []
+        self._refreshed_at = None
+
+        self.atlas = get_text_renderer().atlas(self.FONT_SIZE, (255, 255, 0))
+        # 不透明背景：下面的场景只重绘了一部分时，重新绘制浮层也不会叠加变暗
+        self.bg_surface = pygame.Surface(self.rect.size)
+        self.bg_surface.fill((20, 20, 20))
+
+    def needs_refresh(self):
+        """内容是否到了刷新时间
+
+        Returns:
+            bool: 需要刷新时返回True
+        """
+        if self._refreshed_at is None:
+            return True
+        return pygame.time.get_ticks() - self._refreshed_at >= self.refresh_interval
+
+    def refresh(self, scene):
+        """按分析器的统计重新生成显示内容
+
+        Args:
+            scene: 场景名称
+        """
+        self._refreshed_at = pygame.time.get_ticks()
+        summary = self.profiler.summary(scene)
+        self.lines = [f"{scene}  p50/p95/p99 ms"]
+        for phase in PHASES:
+            p = summary.get(phase)
+            if p is not None:
+                self.lines.append(f"{phase:<13}{p[50]:6.2f}{p[95]:7.2f}{p[99]:7.2f}")
+
+    def draw(self, screen):
+        """绘制浮层
+
+        Args:
+            screen: Pygame显示表面
+        """
+        screen.blit(self.bg_surface, self.rect)
+        x = self.rect.x + self.PADDING
+        y = self.rect.y + self.PADDING
+        for line in self.lines:
+            self.atlas.draw(screen, line, (x, y))
+            y += self.LINE_HEIGHT
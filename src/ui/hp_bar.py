@@ -7,6 +7,7 @@ HP条UI组件
 """
 
 import pygame
+from src.ui.text_renderer import get_text_renderer
 
 class HPBar:
     """HP条类"""
@@ -30,8 +31,18 @@ class HPBar:
         self.hp_color = (50, 200, 50)
         self.text_color = (255, 255, 255)
         
-        # 创建字体
-        self.font = pygame.font.SysFont("simhei", 16)
+        # 文字由字形图集逐字绘制，数值变化时不需要重新渲染
+        self.atlas = get_text_renderer().atlas(16, self.text_color)
+
+        # 上次绘制时的生命值，用于判断是否需要重绘
+        self._drawn_hp = None
+        self._text = ""
+        self._text_pos = self.rect.topleft
+
+    @property
+    def dirty(self):
+        """生命值变化后需要重绘"""
+        return (self.character.current_hp, self.character.max_hp) != self._drawn_hp
     
     def draw(self, screen):
         """绘制HP条
@@ -53,8 +64,11 @@ class HPBar:
         # 绘制边框
         pygame.draw.rect(screen, self.border_color, self.rect, width=2, border_radius=3)
         
-        # 绘制文本
-        text = f"{self.character.name}: {self.character.current_hp}/{self.character.max_hp}"
-        text_surface = self.font.render(text, True, self.text_color)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        # 绘制文本（生命值不变时复用排版结果）
+        if self.dirty:
+            self._drawn_hp = (self.character.current_hp, self.character.max_hp)
+            self._text = f"{self.character.name}: {self.character.current_hp}/{self.character.max_hp}"
+            text_rect = pygame.Rect((0, 0), self.atlas.size(self._text))
+            text_rect.center = self.rect.center
+            self._text_pos = text_rect.topleft
+        self.atlas.draw(screen, self._text, self._text_pos)
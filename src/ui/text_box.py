@@ -7,80 +7,182 @@
 """
 
 import pygame
+from src.ui.text_layout import layout_cache
+from src.ui.text_renderer import DEFAULT_FONT, get_text_renderer
 
 class TextBox:
-    """文本框类"""
-    
-    def __init__(self, x, y, width, height, text=""):
+    """文本框类
+
+    文本按字形宽度断行（支持中文和禁则），超出文本框的部分分页显示。
+    可以逐字显示（打字机效果）：逐字显示只是裁剪已经渲染好的整行，不会重新渲染。
+    """
+
+    # 布局
+    PADDING = 10
+    LINE_HEIGHT = 30
+
+    def __init__(self, x, y, width, height, text="", chars_per_second=None):
         """初始化文本框
-        
+
         Args:
             x: 文本框左上角x坐标
             y: 文本框左上角y坐标
             width: 文本框宽度
             height: 文本框高度
             text: 文本内容
+            chars_per_second: 逐字显示的速度，为None时整页立即显示
         """
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
-        
+        self.chars_per_second = chars_per_second
+
         # 文本框颜色
         self.bg_color = (50, 50, 50, 200)  # 半透明背景
         self.border_color = (200, 200, 200)
         self.text_color = (255, 255, 255)
-        
-        # 创建字体
-        self.font = pygame.font.SysFont("simhei", 24)
-        
-        # 文本渲染
-        self.rendered_text = []
+
+        # 字体和文本渲染服务
+        self.text_renderer = get_text_renderer()
+        self.font_size = 24
+        self.font = self.text_renderer.get_font(self.font_size)
+        self.font_key = (DEFAULT_FONT, self.font_size)
+        self.metrics = layout_cache.metrics(self.font, self.font_key)
+
+        # 半透明背景只创建一次
+        self.bg_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.rect(self.bg_surface, self.bg_color, self.bg_surface.get_rect(), border_radius=10)
+
+        # 分页
+        self.lines_per_page = max(1, (height - 2 * self.PADDING) // self.LINE_HEIGHT)
+        self.pages = []
+        self.page = 0
+
+        # 当前页
+        self.page_lines = ()      # 每行的文本
+        self.rendered_text = []   # 每行的文字表面
+        self.page_chars = 0       # 当前页的字符数
+        self.revealed = 0         # 已显示的字符数
+        self._reveal_start = 0    # 开始逐字显示的时间（毫秒）
+
         self._render_text()
-    
+
     def set_text(self, text):
         """设置文本内容
-        
+
         Args:
             text: 新的文本内容
         """
         self.text = text
         self._render_text()
-    
+
     def _render_text(self):
-        """渲染文本"""
-        self.rendered_text = []
-        
-        # 计算每行最大字符数
-        max_chars_per_line = self.rect.width // (self.font.size("A")[0]) - 2
-        
-        # 分割文本为多行
-        words = self.text.split()
-        current_line = ""
-        
-        for word in words:
-            test_line = current_line + word + " "
-            if len(test_line) > max_chars_per_line:
-                self.rendered_text.append(self.font.render(current_line, True, self.text_color))
-                current_line = word + " "
-            else:
-                current_line = test_line
-        
-        if current_line:
-            self.rendered_text.append(self.font.render(current_line, True, self.text_color))
-    
+        """排版文本并显示第一页"""
+        lines = layout_cache.layout(self.text, self.rect.width - 2 * self.PADDING, self.font, self.font_key)
+        self.pages = [lines[i:i + self.lines_per_page] for i in range(0, len(lines), self.lines_per_page)]
+        self._show_page(0)
+
+    def _show_page(self, page):
+        """显示指定页
+
+        Args:
+            page: 页码
+        """
+        self.page = page
+        lines = self.pages[page] if self.pages else ()
+        self.rendered_text = [self.text_renderer.render(line, self.font_size, self.text_color) for line in lines]
+        self.page_lines = lines
+        self.page_chars = sum(len(line) for line in lines)
+        self.revealed = 0 if self.chars_per_second else self.page_chars
+        self._reveal_start = pygame.time.get_ticks()
+        self.dirty = True
+
+    def is_revealing(self):
+        """当前页是否仍在逐字显示
+
+        Returns:
+            bool: 还有未显示的字符时返回True
+        """
+        return self.revealed < self.page_chars
+
+    def has_next_page(self):
+        """是否还有下一页
+
+        Returns:
+            bool: 当前页不是最后一页时返回True
+        """
+        return self.page + 1 < len(self.pages)
+
+    def is_finished(self):
+        """全部文本是否已经显示完毕
+
+        Returns:
+            bool: 最后一页已完整显示时返回True
+        """
+        return not self.is_revealing() and not self.has_next_page()
+
+    def advance(self):
+        """继续：正在逐字显示时立即显示整页，否则翻到下一页
+
+        Returns:
+            bool: 有变化时返回True
+        """
+        if self.is_revealing():
+            self.revealed = self.page_chars
+            self.dirty = True
+            return True
+        if self.has_next_page():
+            self._show_page(self.page + 1)
+            return True
+        return False
+
+    def handle_event(self, event):
+        """处理事件（点击文本框继续）
+
+        Args:
+            event: Pygame事件
+        """
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.rect.collidepoint(event.pos):
+            self.advance()
+
+    def update(self):
+        """更新逐字显示的进度"""
+        if not self.is_revealing():
+            return
+        elapsed = (pygame.time.get_ticks() - self._reveal_start) / 1000.0
+        revealed = min(self.page_chars, int(elapsed * self.chars_per_second))
+        if revealed != self.revealed:
+            self.revealed = revealed
+            self.dirty = True
+
     def draw(self, screen):
         """绘制文本框
-        
+
         Args:
             screen: Pygame显示表面
         """
-        # 创建半透明表面
-        surface = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(surface, self.bg_color, surface.get_rect(), border_radius=10)
-        screen.blit(surface, self.rect)
-        
+        # 绘制半透明背景
+        screen.blit(self.bg_surface, self.rect)
+
         # 绘制边框
         pygame.draw.rect(screen, self.border_color, self.rect, width=2, border_radius=10)
-        
-        # 绘制文本
+
+        # 绘制文本，未完整显示的行只拷贝已显示的部分
+        remaining = self.revealed
         for i, line in enumerate(self.rendered_text):
-            screen.blit(line, (self.rect.x + 10, self.rect.y + 10 + i * 30))
+            if remaining <= 0:
+                break
+            pos = (self.rect.x + self.PADDING, self.rect.y + self.PADDING + i * self.LINE_HEIGHT)
+            chars = len(self.page_lines[i])
+            if remaining >= chars:
+                screen.blit(line, pos)
+            else:
+                width = self.metrics.prefix_widths(self.page_lines[i])[remaining]
+                screen.blit(line, pos, pygame.Rect(0, 0, width, line.get_height()))
+            remaining -= chars
+
+        # 还有下一页时在右下角显示提示
+        if self.has_next_page() and not self.is_revealing():
+            right = self.rect.right - 20
+            bottom = self.rect.bottom - 12
+            pygame.draw.polygon(screen, self.text_color, [(right - 6, bottom - 8), (right + 6, bottom - 8), (right, bottom)])
+        self.dirty = False
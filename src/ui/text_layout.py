@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+文本排版
+按字形宽度断行（支持中日文禁则），并缓存排版结果
+"""
+
+from collections import OrderedDict
+
+# 不能出现在行首的字符（标点、闭括号、小写假名等）
+NO_LINE_START = set(
+    "，。、．・：；？！）」』】〕〉》’”…‥ー々ゝゞぁぃぅぇぉっゃゅょゎァィゥェォッャュョヮヵヶ"
+    ",.:;?!)]}%"
+)
+
+# 不能出现在行尾的字符（开括号、引号）
+NO_LINE_END = set("（「『【〔〈《‘“([{")
+
+
+def _is_word_char(char):
+    """是否为拉丁单词的一部分（单词内部不断行）
+
+    Args:
+        char: 字符
+
+    Returns:
+        bool: ASCII字母、数字等返回True
+    """
+    return char.isascii() and (char.isalnum() or char in "'-_")
+
+
+def break_lines(text, width, measure):
+    """按宽度断行
+
+    中日文字符之间可以任意断行，拉丁单词整体换行；遵守行首、行尾禁则，
+    行首禁止的标点在放不下时悬挂在行尾（允许略微超出宽度）。
+
+    Args:
+        text: 文本，\\n 为强制换行
+        width: 最大行宽（像素）
+        measure: 测量单个字符宽度的函数
+
+    Returns:
+        list: 每行的文本
+    """
+    lines = []
+    for paragraph in text.split("\n"):
+        line = []
+        line_width = 0
+        for char in paragraph:
+            char_width = measure(char)
+            if not line or line_width + char_width <= width or char in NO_LINE_START:
+                # 放得下，或者是行首禁止的标点（悬挂在本行末尾）
+                line.append(char)
+                line_width += char_width
+                continue
+
+            # 需要换行，找到断开的位置
+            cut = len(line)
+            if _is_word_char(char):
+                # 不拆开拉丁单词
+                while cut > 0 and _is_word_char(line[cut - 1]):
+                    cut -= 1
+            # 行尾禁止的字符移到下一行
+            while cut > 0 and line[cut - 1] in NO_LINE_END:
+                cut -= 1
+            if cut == 0:
+                # 一整行都是同一个单词，只能硬断
+                cut = len(line)
+
+            lines.append("".join(line[:cut]).rstrip(" "))
+            line = line[cut:]
+            # 下一行不以空格开头
+            while line and line[0] == " ":
+                line.pop(0)
+            if line or char != " ":
+                line.append(char)
+            line_width = sum(measure(c) for c in line)
+
+        lines.append("".join(line).rstrip(" "))
+    return lines
+
+
+class GlyphMetrics:
+    """字形宽度缓存类"""
+
+    def __init__(self, font):
+        """初始化字形宽度缓存
+
+        Args:
+            font: Pygame字体对象
+        """
+        self.font = font
+        self.widths = {}
+
+    def measure(self, char):
+        """获取单个字符的宽度
+
+        Args:
+            char: 字符
+
+        Returns:
+            int: 宽度（像素）
+        """
+        width = self.widths.get(char)
+        if width is None:
+            width = self.widths[char] = self.font.size(char)[0]
+        return width
+
+    def prefix_widths(self, line):
+        """计算一行中每个前缀的宽度
+
+        Args:
+            line: 一行文本
+
+        Returns:
+            list: 第 i 项为前 i 个字符的宽度
+        """
+        widths = [0]
+        for char in line:
+            widths.append(widths[-1] + self.measure(char))
+        return widths
+
+
+class TextLayoutCache:
+    """排版结果缓存类
+
+    按 (文本, 宽度, 字体) 缓存断行结果，再次显示同一段文字时不需要重新测量。
+    """
+
+    def __init__(self, max_entries=256):
+        """初始化缓存
+
+        Args:
+            max_entries: 最多缓存的排版结果数
+        """
+        self.max_entries = max_entries
+        self._layouts = OrderedDict()
+        self._metrics = {}
+
+    def metrics(self, font, font_key):
+        """获取字体的字形宽度缓存
+
+        Args:
+            font: Pygame字体对象
+            font_key: 字体标识，如 (名称, 字号)
+
+        Returns:
+            GlyphMetrics: 字形宽度缓存
+        """
+        metrics = self._metrics.get(font_key)
+        if metrics is None:
+            metrics = self._metrics[font_key] = GlyphMetrics(font)
+        return metrics
+
+    def layout(self, text, width, font, font_key):
+        """排版文本
+
+        Args:
+            text: 文本
+            width: 最大行宽（像素）
+            font: Pygame字体对象
+            font_key: 字体标识，如 (名称, 字号)
+
+        Returns:
+            tuple: 每行的文本
+        """
+        key = (text, width, font_key)
+        lines = self._layouts.get(key)
+        if lines is not None:
+            self._layouts.move_to_end(key)
+            return lines
+
+        lines = tuple(break_lines(text, width, self.metrics(font, font_key).measure))
+        self._layouts[key] = lines
+        if len(self._layouts) > self.max_entries:
+            self._layouts.popitem(last=False)
+        return lines
+
+
+# 所有文本框共用的排版缓存
+layout_cache = TextLayoutCache()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+文本渲染服务
+所有界面组件共用的字体、已渲染字符串缓存和字形图集
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+DEFAULT_FONT = "simhei"
+
+# 字形图集每页的尺寸
+ATLAS_PAGE_SIZE = 512
+
+# 数值显示常用字符，创建图集时预先渲染
+NUMERIC_CHARSET = "0123456789/:-+%. "
+
+
+class GlyphAtlas:
+    """字形图集类
+
+    把单个字符渲染到少数几张大表面（页）上，绘制时逐字从图集中拷贝。
+    适合内容频繁变化的短文本（生命值、魔法值等数字）：每个字符只渲染一次，
+    之后每帧只需若干次拷贝，不再调用字体渲染。中日韩字符按需加入图集。
+    """
+
+    def __init__(self, font, color, page_size=ATLAS_PAGE_SIZE):
+        """初始化字形图集
+
+        Args:
+            font: Pygame字体对象
+            color: 文字颜色
+            page_size: 每页的边长（像素）
+        """
+        self.font = font
+        self.color = color
+        self.page_size = page_size
+        self.line_height = font.get_linesize()
+        self.pages = []
+        self.glyphs = {}  # 字符 -> (页下标, 图集中的矩形)
+
+        # 当前页的装箱位置（按行排列）
+        self._cursor_x = 0
+        self._cursor_y = 0
+        self._row_height = 0
+
+    def _new_page(self):
+        """新建一页"""
+        self.pages.append(pygame.Surface((self.page_size, self.page_size), pygame.SRCALPHA))
+        self._cursor_x = 0
+        self._cursor_y = 0
+        self._row_height = 0
+
+    def add(self, chars):
+        """把字符加入图集（已存在的字符跳过）
+
+        Args:
+            chars: 字符串
+        """
+        for char in chars:
+            if char not in self.glyphs:
+                self._add_glyph(char)
+
+    def _add_glyph(self, char):
+        """渲染单个字符并放入图集
+
+        Args:
+            char: 字符
+        """
+        surface = self.font.render(char, True, self.color)
+        width, height = surface.get_size()
+
+        if not self.pages:
+            self._new_page()
+        if self._cursor_x + width > self.page_size:
+            # 换行
+            self._cursor_x = 0
+            self._cursor_y += self._row_height
+            self._row_height = 0
+        if self._cursor_y + height > self.page_size:
+            self._new_page()
+
+        rect = pygame.Rect(self._cursor_x, self._cursor_y, width, height)
+        self.pages[-1].blit(surface, rect)
+        self.glyphs[char] = (len(self.pages) - 1, rect)
+
+        self._cursor_x += width
+        self._row_height = max(self._row_height, height)
+
+    def size(self, text):
+        """计算文本绘制后的尺寸
+
+        Args:
+            text: 文本
+
+        Returns:
+            tuple: (宽度, 高度)
+        """
+        self.add(text)
+        return sum(self.glyphs[char][1].width for char in text), self.line_height
+
+    def draw(self, screen, text, pos):
+        """从图集中逐字绘制文本
+
+        Args:
+            screen: 目标表面
+            text: 文本
+            pos: 左上角坐标
+
+        Returns:
+            Rect: 绘制的区域
+        """
+        self.add(text)
+        x, y = pos
+        start_x = x
+        pages = self.pages
+        for char in text:
+            page, rect = self.glyphs[char]
+            screen.blit(pages[page], (x, y), rect)
+            x += rect.width
+        return pygame.Rect(start_x, y, x - start_x, self.line_height)
+
+
+class TextRenderer:
+    """文本渲染服务类
+
+    字体通过资源管理器获取，渲染结果按 (字体, 字号, 颜色, 文本) 缓存在有上限的LRU中；
+    返回的表面会被多个组件共享，调用方不应修改它们。
+    """
+
+    def __init__(self, font_loader=None, max_entries=512):
+        """初始化文本渲染服务
+
+        Args:
+            font_loader: 字体加载函数 (名称, 字号) -> Font，通常为 ResourceManager.get_font
+            max_entries: 字符串缓存的最大条数
+        """
+        self.font_loader = font_loader
+        self.max_entries = max_entries
+        self._fonts = {}
+        self._cache = OrderedDict()
+        self._atlases = {}
+
+        # 缓存统计
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, size, name=DEFAULT_FONT):
+        """获取字体
+
+        Args:
+            size: 字号
+            name: 字体名称
+
+        Returns:
+            Font: Pygame字体对象
+        """
+        if self.font_loader is not None:
+            return self.font_loader(name, size)
+
+        key = (name, size)
+        if key not in self._fonts:
+            self._fonts[key] = pygame.font.SysFont(name, size)
+        return self._fonts[key]
+
+    def render(self, text, size, color, name=DEFAULT_FONT):
+        """渲染字符串（带缓存）
+
+        Args:
+            text: 文本
+            size: 字号
+            color: 文字颜色
+            name: 字体名称
+
+        Returns:
+            Surface: 渲染好的文字表面
+        """
+        key = (name, size, tuple(color), text)
+        surface = self._cache.get(key)
+        if surface is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.get_font(size, name).render(text, True, color)
+        self._cache[key] = surface
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return surface
+
+    def atlas(self, size, color, name=DEFAULT_FONT):
+        """获取某个字号和颜色的字形图集
+
+        Args:
+            size: 字号
+            color: 文字颜色
+            name: 字体名称
+
+        Returns:
+            GlyphAtlas: 字形图集
+        """
+        key = (name, size, tuple(color))
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            atlas = GlyphAtlas(self.get_font(size, name), color)
+            atlas.add(NUMERIC_CHARSET)
+            self._atlases[key] = atlas
+        return atlas
+
+    def clear(self):
+        """清空字符串缓存和字形图集"""
+        self._cache.clear()
+        self._atlases.clear()
+
+
+# 全局共享的文本渲染服务
+_shared_renderer = None
+
+
+def set_text_renderer(renderer):
+    """设置全局共享的文本渲染服务（由资源管理器调用）
+
+    Args:
+        renderer: 文本渲染服务
+    """
+    global _shared_renderer
+    _shared_renderer = renderer
+
+
+def get_text_renderer():
+    """获取全局共享的文本渲染服务，尚未设置时创建一个默认实例
+
+    Returns:
+        TextRenderer: 文本渲染服务
+    """
+    global _shared_renderer
+    if _shared_renderer is None:
+        _shared_renderer = TextRenderer()
+    return _shared_renderer
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+自动战斗单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 无窗口环境下使用虚拟显示驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from src.combat.auto_battle import ACTION_SKILL, ACTION_SUMMON, AutoBattle, available_actions
+from src.combat.battle_manager import BattleManager, INPUT_SKILL
+from src.combat.events import discard_event
+from src.combat.simulator import ENEMY_STATS, PLAYER_STATS, BattleSimulator, make_character
+from src.combat.skills import SUMMON_SKILL, compile_skill, get_skill
+from src.game_state import GameState
+from src.scene_manager import SceneManager
+
+# 不操作必败、需要合理使用技能和召唤的敌人
+HARD_ENEMY = ("敌人", 130, 0, 12, 4, 5)
+
+class FakeClock:
+    """每次调用前进固定时间的计时函数"""
+
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+def _battle(enemy_stats=ENEMY_STATS, seed=3):
+    """创建一场战斗"""
+    return BattleManager(make_character(PLAYER_STATS), make_character(enemy_stats),
+                         seed=seed, event_sink=discard_event)
+
+class TestAutoBattle(unittest.TestCase):
+    """自动战斗控制器测试"""
+
+    def test_rollouts_do_not_touch_battle(self):
+        """测试前瞻模拟在克隆上进行，不改变原战斗"""
+        battle = _battle()
+        state = battle.get_state()
+        controller = AutoBattle(budget=None, seed=1)
+        self.assertIn(controller.think(battle), (ACTION_SUMMON, ACTION_SKILL))
+        self.assertEqual(battle.get_state(), state)
+        self.assertEqual(controller.simulations, 3 * controller.rollouts)
+
+    def test_budget_spreads_search_over_frames(self):
+        """测试搜索按时间预算分摊到多次调用"""
+        battle = _battle()
+        controller = AutoBattle(rollouts=4, budget=0.001, seed=1, clock=FakeClock(0.001))
+        calls = 1
+        while controller.think(battle) is None:
+            calls += 1
+        # 每次调用只做一次模拟：3个候选行动 × 4次
+        self.assertEqual(calls, 12)
+        self.assertEqual(controller.decisions, 1)
+
+    def test_no_actions_after_battle_decided(self):
+        """测试战斗已分胜负或魔法值不足时没有可选行动"""
+        battle = _battle()
+        battle.player.current_mp = 5
+        self.assertEqual(available_actions(battle), [])
+        battle.player.current_mp = 50
+        battle.enemy.current_hp = 0
+        self.assertEqual(available_actions(battle), [])
+
+    def test_summon_follows_skill_data(self):
+        """测试召唤行动按技能数据中的召唤技能判断和执行"""
+        source = {"label": "召唤", "mp_cost": 60, "gcd": False, "target": "none", "max_allies": 1, "ops": [
+            {"op": "summon", "unit": {"name": "盟友", "max_hp": 60, "max_mp": 0, "attack": 7, "defense": 3, "speed": 6}},
+        ]}
+        expensive = compile_skill(SUMMON_SKILL, source, [])
+        battle = BattleManager(make_character(PLAYER_STATS), make_character(ENEMY_STATS), seed=3,
+                               player_skills=("fireball", expensive))
+        self.assertEqual(available_actions(battle), [ACTION_SKILL])
+
+        battle = _battle()
+        self.assertTrue(AutoBattle(seed=1).apply(battle, ACTION_SUMMON))
+        self.assertEqual(battle.allies[0].get_state()[:6], get_skill(SUMMON_SKILL).summons)
+        self.assertNotIn(ACTION_SUMMON, available_actions(battle))
+
+    def test_apply_counts_non_damage_skills(self):
+        """测试不造成伤害的技能（如护盾）成功释放也算行动成功"""
+        source = {"label": "守护", "mp_cost": 10, "target": "self", "ops": [{"op": "effect", "effect": "shield"}]}
+        guard = compile_skill("guard", source, [])
+        battle = BattleManager(make_character(PLAYER_STATS), make_character(ENEMY_STATS), seed=3,
+                               player_skills=(guard,))
+        self.assertTrue(AutoBattle(seed=1).apply(battle, ACTION_SKILL))
+        self.assertIn("shield", battle.player.status.effects)
+        self.assertFalse(AutoBattle(seed=1).apply(battle, ACTION_SKILL))
+
+    def test_play_resumes_after_stun(self):
+        """测试被眩晕时不会直接跳到最长时间，眩晕结束后继续决策"""
+        battle = BattleManager(make_character(("玩家", 1000, 50, 10, 5, 5)),
+                               make_character(("敌人", 1000, 0, 8, 4, 4)), seed=3, event_sink=discard_event)
+        battle.apply_effect(battle.player, "stun")
+        controller = AutoBattle(rollouts=2, horizon=5.0, budget=None, seed=1)
+        controller.play(battle, max_time=30.0)
+
+        skill_times = [entry[0] for entry in battle.input_log if entry[1] == INPUT_SKILL]
+        self.assertTrue(skill_times)
+        # 眩晕持续2秒，之后最多等待一个 wait_time 就能释放
+        self.assertLessEqual(skill_times[0], 2.0 + controller.wait_time)
+
+    def test_headless_win_rate(self):
+        """测试无界面测量胜率：自动战斗不差于开场召唤加自动技能"""
+        never = BattleSimulator(enemy_stats=HARD_ENEMY, seed=2).run(30)
+        greedy = BattleSimulator(enemy_stats=HARD_ENEMY, summon=True,
+                                 use_skill=True, seed=2).run(30)
+        controller = AutoBattle(budget=None, seed=2)
+        auto = BattleSimulator(enemy_stats=HARD_ENEMY, seed=2, auto_battle=controller).run(30)
+        self.assertEqual(never.win_rate, 0.0)
+        self.assertEqual(auto.timeouts, 0)
+        self.assertGreaterEqual(auto.win_rate, greedy.win_rate)
+        self.assertGreater(controller.decisions, 30)
+
+class TestCombatSceneAuto(unittest.TestCase):
+    """战斗场景的自动战斗测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        """初始化Pygame"""
+        pygame.init()
+        cls.screen = pygame.display.set_mode((800, 600))
+
+    def test_auto_button(self):
+        """测试开启自动战斗后由控制器释放技能或召唤"""
+        scene_manager = SceneManager(self.screen)
+        scene_manager.change_state(GameState.COMBAT)
+        scene = scene_manager.current_scene
+
+        scene._on_auto_click()
+        self.assertEqual(scene.auto_button.text, "自动 开")
+        scene.auto_battle.budget = None
+        scene.update()
+        self.assertLess(scene.player.current_mp, scene.player.max_mp)
+
+        scene._on_auto_click()
+        self.assertIsNone(scene.auto_battle)
+        self.assertEqual(scene.auto_button.text, "自动 关")
+
+if __name__ == '__main__':
+    unittest.main()
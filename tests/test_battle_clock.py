@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+战斗时钟单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 无窗口环境下使用虚拟显示驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from src.combat.battle_clock import BattleClock, SPEED_INSTANT
+from src.combat.battle_manager import BattleManager
+from src.combat.character import Character
+from src.game_state import GameState
+from src.scene_manager import SceneManager
+
+def _battle(seed=5):
+    """创建一场战斗"""
+    return BattleManager(Character("玩家", 300, 50, 10, 5, 5), Character("敌人", 400, 0, 8, 4, 4), seed=seed)
+
+def _units(battle):
+    """战斗中所有单位的状态"""
+    return [unit.get_state() for unit in [battle.player] + battle.enemies + battle.allies]
+
+class TestBattleClock(unittest.TestCase):
+    """战斗时钟测试"""
+
+    def test_slow_frame_catches_up(self):
+        """测试卡顿的一帧补齐期间的所有攻击"""
+        slow = BattleClock(_battle())
+        smooth = BattleClock(_battle())
+        # 比较点避开攻击时刻，逐帧累加的浮点误差不会影响结果
+        events = slow.tick(3.1)
+        for _ in range(186):
+            smooth.tick(1 / 60)
+        self.assertGreater(len(events), 2)
+        self.assertEqual(_units(slow.battle), _units(smooth.battle))
+        self.assertAlmostEqual(slow.battle.time, smooth.battle.time)
+
+    def test_speed_multiplier(self):
+        """测试倍速推进虚拟时间"""
+        clock = BattleClock(_battle(), speed=4)
+        clock.tick(0.5)
+        self.assertAlmostEqual(clock.battle.time, 2.0)
+        self.assertEqual(clock.cycle_speed(), SPEED_INSTANT)
+        self.assertEqual(clock.cycle_speed(), 1)
+        with self.assertRaises(ValueError):
+            clock.set_speed(3)
+
+    def test_instant_resolve(self):
+        """测试瞬间结算在一次调用中得出与正常速度相同的结果"""
+        instant = BattleClock(_battle(), speed=SPEED_INSTANT)
+        normal = BattleClock(_battle())
+        instant.tick(0.0)
+        self.assertTrue(instant.battle.is_battle_over())
+        while not normal.battle.is_battle_over():
+            normal.tick(0.5)
+        self.assertEqual(_units(instant.battle), _units(normal.battle))
+
+    def test_checkpoint_restore(self):
+        """测试恢复检查点后战斗按原样重演"""
+        clock = BattleClock(_battle())
+        clock.tick(2.0)
+        checkpoint = clock.checkpoint()
+        clock.tick(5.0)
+        expected = _units(clock.battle)
+
+        battle = clock.restore(checkpoint)
+        self.assertIs(clock.battle, battle)
+        self.assertAlmostEqual(battle.time, 2.0)
+        clock.tick(5.0)
+        self.assertEqual(_units(clock.battle), expected)
+
+class TestCombatSceneClock(unittest.TestCase):
+    """战斗场景的速度与检查点测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        """初始化Pygame"""
+        pygame.init()
+        cls.screen = pygame.display.set_mode((800, 600))
+
+    def setUp(self):
+        """测试前准备"""
+        self.scene_manager = SceneManager(self.screen)
+        self.scene_manager.change_state(GameState.COMBAT)
+        self.scene = self.scene_manager.current_scene
+
+    def _press(self, key):
+        """按下按键"""
+        self.scene.handle_event(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+    def test_speed_button(self):
+        """测试速度按钮切换速度并更新文字"""
+        self.scene._on_speed_click()
+        self.assertEqual(self.scene.clock.speed, 2)
+        self.assertEqual(self.scene.speed_button.text, "速度 2×")
+        self.assertTrue(self.scene.speed_button.dirty)
+
+    def test_instant_speed_ends_battle(self):
+        """测试瞬间结算在一帧内结束战斗"""
+        self.scene.clock.set_speed(SPEED_INSTANT)
+        self.scene.update()
+        self.assertFalse(self.scene.battle_active)
+        self.assertTrue(self.scene.battle_manager.is_battle_over())
+
+    def test_restore_checkpoint(self):
+        """测试恢复检查点后界面绑定到恢复的角色，之后召唤的盟友被移除"""
+        self._press(self.scene.RESTORE_KEY)
+        self.assertIsNone(self.scene.checkpoint)
+
+        self.scene.clock.tick(1.0)
+        self._press(self.scene.CHECKPOINT_KEY)
+        hp = self.scene.player.current_hp
+        self.scene._on_summon_click()
+        self.scene.clock.tick(3.0)
+
+        self._press(self.scene.RESTORE_KEY)
+        self.assertIs(self.scene.battle_manager, self.scene.clock.battle)
+        self.assertIs(self.scene.player_hp_bar.character, self.scene.battle_manager.player)
+        self.assertEqual(self.scene.player.current_hp, hp)
+        self.assertIsNone(self.scene.ally)
+        self.assertNotIn(None, self.scene.get_widgets())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+战斗日志单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 无窗口环境下使用虚拟显示驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from src.ui.battle_log import BattleLog
+
+class TestBattleLog(unittest.TestCase):
+    """战斗日志测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        """初始化Pygame"""
+        pygame.init()
+
+    def setUp(self):
+        """测试前准备"""
+        self.screen = pygame.Surface((800, 600))
+        self.battle_log = BattleLog(50, 350, 700, 150, max_messages=10, history_size=20)
+
+    def test_ring_buffer(self):
+        """测试消息数量受限且不复制列表"""
+        for i in range(30):
+            self.battle_log.add_message(f"消息{i}")
+
+        self.assertEqual(list(self.battle_log.messages), [f"消息{i}" for i in range(20, 30)])
+        self.assertEqual(len(self.battle_log.history), 20)
+        self.assertEqual(self.battle_log.history[0][0], "消息10")
+
+    def test_visible_lines_fit_box(self):
+        """测试可见行数不超出日志框"""
+        self.assertEqual(self.battle_log.visible_lines, 4)  # (150 - 40) // 25
+
+    def test_draw_uses_cache(self):
+        """测试没有新消息时不重新渲染"""
+        self.battle_log.add_message("玩家攻击了敌人，造成8点伤害！")
+        self.battle_log.draw(self.screen)
+        cached = self.battle_log.history[0][1]
+        self.assertIsNotNone(cached)
+        self.assertFalse(self.battle_log.dirty)
+
+        self.battle_log.draw(self.screen)
+        self.assertIs(self.battle_log.history[0][1], cached)
+
+        self.battle_log.add_message("敌人攻击了玩家，造成4点伤害！")
+        self.assertTrue(self.battle_log.dirty)
+        self.battle_log.draw(self.screen)
+        self.assertIs(self.battle_log.history[0][1], cached)
+
+    def test_scroll(self):
+        """测试滚动查看历史"""
+        for i in range(10):
+            self.battle_log.add_message(f"消息{i}")
+
+        self.battle_log.scroll(100)
+        self.assertEqual(self.battle_log.scroll_offset, 6)  # 10 条消息，可见 4 行
+
+        # 查看历史时添加消息，画面保持不动
+        self.battle_log.scroll(-3)
+        self.battle_log.add_message("消息10")
+        self.assertEqual(self.battle_log.scroll_offset, 4)
+
+        self.battle_log.scroll(-100)
+        self.assertEqual(self.battle_log.scroll_offset, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,6 +14,9 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.combat.character import Character
 from src.combat.battle_manager import BattleManager
+from src.combat.events import EVENT_ATTACK, EVENT_SKILL, EVENT_SUMMON, EVENT_DEATH, EVENT_CAST, EventCounter
+from src.combat.rng import BattleRNG
+from src.ui.event_text import format_event
 
 class TestBattleManager(unittest.TestCase):
     """战斗管理器测试"""
@@ -32,41 +35,40 @@ class TestBattleManager(unittest.TestCase):
         self.assertTrue(self.battle_manager.battle_active)
     
     def test_update_cooldowns(self):
-        """测试冷却时间更新"""
-        # 设置初始冷却时间
+        """测试推进时间后玩家的冷却字段随调度器刷新"""
         self.player.attack_cooldown = 2.0
-        self.player.skill_cooldown = 5.0
-        self.player.gcd = 1.5
+        battle = BattleManager(self.player, self.enemy)
         
-        # 更新冷却时间
-        self.battle_manager._update_cooldowns(self.player, 1.0)
+        battle.update(0.5)
+        self.assertAlmostEqual(self.player.attack_cooldown, 1.5)
+        self.assertEqual(self.player.gcd, 0)
         
-        # 检查冷却时间是否正确减少
-        self.assertEqual(self.player.attack_cooldown, 1.0)
-        self.assertEqual(self.player.skill_cooldown, 4.0)
-        self.assertEqual(self.player.gcd, 0.5)
-        
-        # 再次更新，使部分冷却时间归零
-        self.battle_manager._update_cooldowns(self.player, 1.0)
-        
-        # 检查冷却时间是否正确归零
-        self.assertEqual(self.player.attack_cooldown, 0.0)
-        self.assertEqual(self.player.skill_cooldown, 3.0)
-        self.assertEqual(self.player.gcd, 0.0)
+        battle.update(1.0)
+        self.assertAlmostEqual(self.player.attack_cooldown, 0.5)
     
     def test_process_attack(self):
         """测试攻击处理"""
-        # 模拟随机数，使伤害固定
-        import random
-        random.seed(42)
+        # 通过战斗的随机数种子使伤害固定
+        self.battle_manager = BattleManager(self.player, self.enemy, seed=42)
+        expected = max(1, int(10 * BattleRNG(42).uniform(0.8, 1.2)) - 4 // 2)
         
         # 处理攻击
-        message = self.battle_manager._process_attack(self.player, self.enemy)
+        damage = self.battle_manager._process_attack(self.player, self.enemy)
+        self.assertEqual(damage, expected)
         
         # 检查敌人生命值是否减少
         self.assertLess(self.enemy.current_hp, 80)
+        self.assertEqual(self.enemy.current_hp, 80 - damage)
+        
+        # 检查攻击事件是否正确
+        event, = self.battle_manager.update(0.0)[:1]
+        self.assertEqual(event.kind, EVENT_ATTACK)
+        self.assertIs(event.source, self.player)
+        self.assertIs(event.target, self.enemy)
+        self.assertEqual(event.value, damage)
         
         # 检查攻击消息是否正确
+        message = format_event(event)
         self.assertIn("玩家攻击了敌人", message)
         self.assertIn("造成", message)
         self.assertIn("点伤害", message)
@@ -89,7 +91,7 @@ class TestBattleManager(unittest.TestCase):
         self.assertEqual(self.player.current_mp, 40)
         
         # 检查技能冷却和GCD是否设置
-        self.assertEqual(self.player.skill_cooldown, self.battle_manager.SKILL_COOLDOWN)
+        self.assertEqual(self.player.skills.ready[0], self.player.skills.skills[0].cooldown)
         self.assertEqual(self.player.gcd, self.battle_manager.GCD)
         
         # 尝试在冷却中使用技能
@@ -133,5 +135,60 @@ class TestBattleManager(unittest.TestCase):
         ally.current_hp = 0
         self.assertTrue(self.battle_manager.is_battle_over())
 
+    def test_update_only_acts_when_due(self):
+        """测试只有行动时间到达的单位才会攻击"""
+        # 开场时所有单位立即攻击一次
+        events = self.battle_manager.update(0.0)
+        self.assertEqual(len(events), 2)
+        
+        # 玩家间隔1.5秒，敌人间隔1.6秒
+        self.assertEqual(self.battle_manager.update(1.0), [])
+        self.assertEqual(len(self.battle_manager.update(0.5)), 1)
+        self.assertAlmostEqual(self.battle_manager.time_until_next_action(), 0.1)
+    
+    def test_update_catches_up_long_frames(self):
+        """测试一次较长的更新会补齐期间的所有攻击"""
+        self.player.max_hp = self.player.current_hp = 10000
+        self.enemy.max_hp = self.enemy.current_hp = 10000
+        
+        # 6秒内：玩家在 0, 1.5, 3, 4.5, 6 攻击；敌人在 0, 1.6, 3.2, 4.8 攻击
+        events = self.battle_manager.update(6.0)
+        self.assertEqual(len(events), 9)
+        self.assertEqual(self.battle_manager.time, 6.0)
+    
+    def test_dead_unit_stops_acting(self):
+        """测试阵亡单位不再行动"""
+        ally = Character("盟友", 60, 0, 7, 3, 6)
+        self.battle_manager.add_ally(ally)
+        ally.current_hp = 0
+        
+        events = self.battle_manager.update(0.0)
+        self.assertFalse(any(event.source is ally for event in events))
+        self.assertNotIn(ally, self.battle_manager.scheduler)
+    
+    def test_skill_summon_and_death_events(self):
+        """测试技能、召唤和阵亡事件"""
+        ally = Character("盟友", 60, 0, 7, 3, 6)
+        self.battle_manager.summon_ally(ally, 20)
+        self.enemy.current_hp = 5
+        self.battle_manager.player_use_skill()
+        
+        kinds = [event.kind for event in self.battle_manager.update(0.0)]
+        self.assertEqual(kinds, [EVENT_SUMMON, EVENT_CAST, EVENT_SKILL, EVENT_DEATH])
+        self.assertFalse(self.battle_manager.battle_active)
+        self.assertEqual(self.battle_manager.update(1.0), [])
+    
+    def test_event_sink(self):
+        """测试事件直接交给计数器聚合"""
+        counter = EventCounter()
+        battle = BattleManager(self.player, self.enemy, seed=1, event_sink=counter)
+        while battle.battle_active:
+            self.assertEqual(battle.update(0.5), [])
+        
+        summary = counter.summary()
+        self.assertEqual(summary["counts"]["death"], 1)
+        self.assertGreater(summary["counts"]["attack"], 0)
+        self.assertEqual(sum(summary["hit_damage"].values()), summary["counts"]["attack"])
+    
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
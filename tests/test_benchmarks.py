@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+基准测试套件单元测试
+"""
+
+import unittest
+import unittest.mock
+import sys
+import os
+
+# 添加项目根目录和基准测试目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+# 无窗口环境下使用虚拟显示驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import bench_character
+import run_benchmarks
+
+class TestBenchmarks(unittest.TestCase):
+    """基准测试套件测试"""
+
+    def test_measure(self):
+        """测试测量结果的格式"""
+        result = run_benchmarks.measure(lambda: sum(range(100)), min_time=0.001, repeat=2)
+        self.assertGreater(result["best_us"], 0)
+        self.assertLessEqual(result["best_us"], result["median_us"])
+        self.assertEqual(result["repeat"], 2)
+
+    def test_run_filter(self):
+        """测试按名称筛选用例"""
+        report = run_benchmarks.run("combat.tick.1", min_time=0.001, repeat=1)
+        self.assertEqual(list(report["results"]), ["combat.tick.1", "combat.tick.10", "combat.tick.100"])
+        self.assertEqual(report["version"], run_benchmarks.FORMAT_VERSION)
+
+    def _report(self, calibration, **results):
+        """构造报告"""
+        return {
+            "version": run_benchmarks.FORMAT_VERSION,
+            "calibration": {"best_us": calibration},
+            "results": {name: {"best_us": value} for name, value in results.items()},
+        }
+
+    def test_compare(self):
+        """测试与基准结果比较"""
+        baseline = self._report(5.0, a=10.0, b=10.0)
+        report = self._report(5.0, a=12.0, b=20.0, c=1.0)
+        rows = run_benchmarks.compare(report, baseline, threshold=0.3)
+        self.assertEqual([(row[0], row[4]) for row in rows], [("a", False), ("b", True)])
+
+    def test_compare_scales_by_calibration(self):
+        """测试比较时按校准循环换算机器快慢"""
+        baseline = self._report(5.0, a=10.0, b=10.0)
+
+        # 整体慢一倍的机器上校准循环也慢一倍，不算退化
+        rows = run_benchmarks.compare(self._report(10.0, a=20.0, b=40.0), baseline, threshold=0.3)
+        self.assertEqual([(row[0], row[3], row[4]) for row in rows], [("a", 1.0, False), ("b", 2.0, True)])
+
+        # 旧格式的基准结果没有校准数据
+        with self.assertRaises(ValueError):
+            run_benchmarks.compare(self._report(5.0, a=10.0), {"version": 1, "results": {}})
+
+    def test_run_reports_calibration(self):
+        """测试报告包含校准循环的耗时"""
+        report = run_benchmarks.run("ui.hp_bar", min_time=0.001, repeat=1)
+        self.assertGreater(report["calibration"]["best_us"], 0)
+
+    def test_quick_requires_no_compare(self):
+        """测试快速运行不能与基准比较或保存为基准"""
+        with open(os.devnull, "w") as devnull, unittest.mock.patch("sys.stderr", devnull):
+            for argv in (["--quick"], ["--quick", "--no-compare", "--save-baseline"]):
+                with self.assertRaises(SystemExit):
+                    run_benchmarks.main(argv)
+
+    def test_bench_character(self):
+        """测试角色基准测试可以完整运行一次"""
+        results = bench_character.run(100)
+        self.assertEqual(list(results), ["dict", "slots", "roster"])
+        self.assertTrue(all(row["access_seconds"] > 0 for row in results.values()))
+
+if __name__ == '__main__':
+    unittest.main()
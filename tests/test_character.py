@@ -34,7 +34,7 @@ class TestCharacter(unittest.TestCase):
         self.assertEqual(self.player.current_hp, 100)
         self.assertEqual(self.player.current_mp, 50)
         self.assertEqual(self.player.attack_cooldown, 0)
-        self.assertEqual(self.player.skill_cooldown, 0)
+        self.assertIsNone(self.player.skills)
         self.assertEqual(self.player.gcd, 0)
 
     def test_is_alive(self):
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+脏矩形重绘单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 无窗口环境下使用虚拟显示驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from src.game_state import GameState
+from src.scene_manager import SceneManager
+from src.scenes.base_scene import _merge_rects
+
+class TestDirtyRects(unittest.TestCase):
+    """脏矩形重绘测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        """初始化Pygame"""
+        pygame.init()
+        cls.screen = pygame.display.set_mode((800, 600))
+
+    def setUp(self):
+        """测试前准备"""
+        self.scene_manager = SceneManager(self.screen)
+
+    def test_static_scene_draws_nothing(self):
+        """测试静止画面只在第一帧绘制"""
+        self.assertEqual(self.scene_manager.draw(), [self.screen.get_rect()])
+        self.assertEqual(self.scene_manager.draw(), [])
+
+    def test_hover_redraws_button_only(self):
+        """测试鼠标悬停只重绘按钮区域"""
+        scene = self.scene_manager.get_scene(GameState.MAIN_MENU)
+        self.scene_manager.draw()
+
+        pos = scene.start_button.rect.center
+        self.scene_manager.handle_event(pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0)))
+        self.assertEqual(self.scene_manager.draw(), [scene.start_button.rect])
+
+        # 鼠标在按钮内移动不需要重绘
+        self.scene_manager.handle_event(pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0)))
+        self.assertEqual(self.scene_manager.draw(), [])
+
+    def test_scene_change_redraws_everything(self):
+        """测试切换场景后完整重绘"""
+        self.scene_manager.draw()
+        self.scene_manager.change_state(GameState.NARRATIVE)
+        self.assertEqual(self.scene_manager.draw(), [self.screen.get_rect()])
+
+    def test_hp_change_redraws_hp_bar(self):
+        """测试生命值变化只重绘生命值条"""
+        self.scene_manager.change_state(GameState.COMBAT)
+        scene = self.scene_manager.get_scene(GameState.COMBAT)
+        self.scene_manager.draw()
+
+        scene.enemy.take_damage(10)
+        self.assertEqual(self.scene_manager.draw(), [scene.enemy_hp_bar.rect])
+
+    def test_merge_rects(self):
+        """测试重叠矩形合并"""
+        merged = _merge_rects([pygame.Rect(0, 0, 10, 10), pygame.Rect(50, 50, 10, 10), pygame.Rect(5, 5, 10, 10)])
+        self.assertEqual(sorted(merged), [pygame.Rect(0, 0, 15, 15), pygame.Rect(50, 50, 10, 10)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+帧率控制单元测试
+"""
+
+import unittest
+import sys
+import os
+import time
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 无窗口环境下使用虚拟显示驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from src.game_state import GameState
+from src.scene_manager import SceneManager
+
+class TestFramePacing(unittest.TestCase):
+    """帧率控制测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        """初始化Pygame"""
+        pygame.init()
+        cls.screen = pygame.display.set_mode((800, 600))
+
+    def setUp(self):
+        """测试前准备"""
+        self.scene_manager = SceneManager(self.screen)
+
+    def _finish_background_work(self):
+        """执行更新直到预热和预加载全部完成"""
+        for _ in range(200):
+            if not self.scene_manager.needs_continuous_update():
+                return
+            self.scene_manager.update()
+            time.sleep(0.005)
+
+    def test_static_scenes_are_idle(self):
+        """测试菜单和叙事场景不需要持续更新"""
+        for state in (GameState.MAIN_MENU, GameState.NARRATIVE, GameState.GAME_OVER):
+            self.scene_manager.change_state(state)
+            if state == GameState.NARRATIVE:
+                # 逐字显示时需要持续更新，显示完后进入空闲
+                text_box = self.scene_manager.current_scene.text_box
+                self.assertTrue(self.scene_manager.needs_continuous_update())
+                while not text_box.is_finished():
+                    text_box.advance()
+            # 后台预热完成后进入空闲
+            self._finish_background_work()
+            self.assertFalse(self.scene_manager.needs_continuous_update())
+
+        self.scene_manager.change_state(GameState.COMBAT)
+        self.assertTrue(self.scene_manager.needs_continuous_update())
+
+        # 战斗结束后不再需要持续更新
+        self.scene_manager.get_scene(GameState.COMBAT).battle_active = False
+        self.assertFalse(self.scene_manager.needs_continuous_update())
+
+    def test_combat_fixed_step(self):
+        """测试战斗按固定步长推进"""
+        scene = self.scene_manager.get_scene(GameState.COMBAT)
+        step = scene.SIM_STEP
+
+        # 不足一个步长时不推进
+        scene.last_update_time = pygame.time.get_ticks()
+        scene.clock.accumulator = step / 2
+        scene.update()
+        self.assertLess(scene.battle_manager.time, step)
+
+        # 剩余时间留到下一帧
+        scene.clock.accumulator = 2.5 * step
+        scene.update()
+        steps = scene.battle_manager.time / step
+        self.assertAlmostEqual(steps, round(steps))
+        self.assertLess(scene.clock.accumulator, step)
+
+if __name__ == '__main__':
+    unittest.main()
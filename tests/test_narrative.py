@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+剧情图单元测试
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 无窗口环境下使用虚拟显示驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from src.game_state import GameState
+from src.narrative.compiler import StoryError, compile_story, is_stale
+from src.narrative.graph import NarrativeGraph, StoryState
+from src.scene_manager import SceneManager
+
+class TestNarrativeCompiler(unittest.TestCase):
+    """剧情编译器测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source_dir = os.path.join(self.tmp.name, "story")
+        os.makedirs(self.source_dir)
+
+    def tearDown(self):
+        """测试后清理"""
+        self.tmp.cleanup()
+
+    def _write(self, name, source):
+        """写入剧情源文件"""
+        with open(os.path.join(self.source_dir, name), "w", encoding="utf-8") as f:
+            json.dump(source, f, ensure_ascii=False)
+
+    def test_broken_link(self):
+        """测试指向不存在节点的选项无法编译"""
+        self._write("a.json", {"start": "a", "nodes": {
+            "a": {"text": "开始", "choices": [{"text": "前进", "next": "missing"}]},
+        }})
+        with self.assertRaises(StoryError) as context:
+            compile_story(self.source_dir)
+        self.assertEqual(len(context.exception.errors), 1)
+        self.assertIn("missing", context.exception.errors[0])
+
+    def test_malformed_nodes_and_choices(self):
+        """测试不是对象的节点和选项报告为校验错误"""
+        self._write("a.json", {"start": "a", "nodes": {
+            "a": {"text": "开始", "choices": ["前进", {"text": "离开", "end": True}]},
+            "b": "结束",
+        }})
+        with self.assertRaises(StoryError) as context:
+            compile_story(self.source_dir)
+        self.assertEqual(len(context.exception.errors), 2)
+        self.assertIn("选项 1", context.exception.errors[0])
+        self.assertIn("节点 b", context.exception.errors[1])
+
+        self._write("a.json", ["不是对象"])
+        with self.assertRaises(StoryError):
+            compile_story(self.source_dir)
+
+    def test_multiple_files_and_warnings(self):
+        """测试跨文件链接，以及不可达节点和未设置标记的警告"""
+        self._write("a.json", {"start": "a", "nodes": {
+            "a": {"text": "开始", "choices": [{"text": "前进", "next": "b", "if": ["key"]}]},
+        }})
+        self._write("b.json", {"nodes": {
+            "b": {"text": "结束", "choices": [{"text": "离开", "end": True}]},
+            "orphan": {"text": "孤立", "choices": [{"text": "离开", "end": True}]},
+        }})
+        _, _, warnings = compile_story(self.source_dir)
+        self.assertEqual(len(warnings), 2)
+
+    def test_lazy_graph(self):
+        """测试节点按需读取并缓存"""
+        self._write("a.json", {"start": "a", "nodes": {
+            "a": {"text": "开始", "image": "player", "choices": [
+                {"text": "秘密", "next": "b", "if": ["key"]},
+                {"text": "前进", "next": "b", "set": ["key"]},
+            ]},
+            "b": {"text": "结束", "choices": [{"text": "离开", "end": True}]},
+        }})
+        output_dir = os.path.join(self.tmp.name, "compiled")
+        self.assertTrue(is_stale(self.source_dir, output_dir))
+
+        graph = NarrativeGraph.load(self.source_dir, output_dir)
+        self.assertFalse(is_stale(self.source_dir, output_dir))
+        self.assertEqual(len(graph), 2)
+        self.assertEqual(len(graph._cache), 0)
+
+        node = graph.get_node("a")
+        self.assertEqual(node.text, "开始")
+        self.assertEqual(node.background, "default_background")
+        self.assertIs(graph.get_node("a"), node)
+        self.assertEqual(len(graph._cache), 1)
+
+        # 条件选项在设置标记后才出现
+        state = StoryState(graph.start)
+        self.assertEqual([c.text for c in state.available_choices(node)], ["前进"])
+        state.choose(node.choices[1])
+        self.assertEqual(state.node_id, "b")
+        self.assertTrue(state.is_available(node.choices[0]))
+        graph.close()
+
+        # with 语句结束时关闭节点数据文件
+        with NarrativeGraph.load(self.source_dir, output_dir) as graph:
+            self.assertEqual(graph.get_node("b").text, "结束")
+        self.assertTrue(graph._data_file.closed)
+
+    def test_stale_when_sources_change(self):
+        """测试源文件内容或文件列表变化时需要重新编译，与修改时间无关"""
+        story = {"start": "a", "nodes": {
+            "a": {"text": "开始", "choices": [{"text": "离开", "end": True}]},
+        }}
+        self._write("a.json", story)
+        self._write("b.json", {"nodes": {
+            "b": {"text": "支线", "choices": [{"text": "离开", "end": True}]},
+        }})
+        output_dir = os.path.join(self.tmp.name, "compiled")
+        NarrativeGraph.load(self.source_dir, output_dir).close()
+        self.assertFalse(is_stale(self.source_dir, output_dir))
+
+        # 修改后的源文件带着比编译结果更早的修改时间（例如从备份中恢复）
+        path = os.path.join(self.source_dir, "a.json")
+        story["nodes"]["a"]["text"] = "新的开始"
+        self._write("a.json", story)
+        os.utime(path, (0, 0))
+        self.assertTrue(is_stale(self.source_dir, output_dir))
+
+        NarrativeGraph.load(self.source_dir, output_dir).close()
+        self.assertFalse(is_stale(self.source_dir, output_dir))
+
+        # 删除源文件时没有更新的文件，同样需要重新编译
+        os.remove(os.path.join(self.source_dir, "b.json"))
+        self.assertTrue(is_stale(self.source_dir, output_dir))
+
+class TestNarrativeScene(unittest.TestCase):
+    """叙事场景测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        """初始化Pygame"""
+        pygame.init()
+        cls.screen = pygame.display.set_mode((800, 600))
+
+    def test_story_flow(self):
+        """测试按剧情图切换节点和触发战斗"""
+        scene_manager = SceneManager(self.screen)
+        scene_manager.change_state(GameState.NARRATIVE)
+        scene = scene_manager.current_scene
+        self.assertEqual([b.text for b in scene.option_buttons], ["与生物交谈", "准备战斗"])
+
+        scene.option_buttons[0].on_click()  # 与生物交谈
+        self.assertEqual(scene_manager.story_state.node_id, "talk")
+        scene.option_buttons[0].on_click()  # 继续探索
+        self.assertIn("knows_secret", scene_manager.story_state.flags)
+        scene.option_buttons[0].on_click()  # 准备战斗
+        self.assertIs(scene_manager.current_state, GameState.COMBAT)
+        self.assertEqual(scene_manager.story_state.node_id, "explore")
+
+        # 战斗胜利后回到后续节点，条件选项可用
+        scene_manager.story_state.resolve_combat(True)
+        scene_manager.change_state(GameState.NARRATIVE)
+        self.assertEqual([b.text for b in scene.option_buttons], ["打开宝箱", "离开遗迹"])
+
+    def test_combat_loss_keeps_node(self):
+        """测试战斗失败时剧情停留在战斗前的节点"""
+        scene_manager = SceneManager(self.screen)
+        scene_manager.change_state(GameState.NARRATIVE)
+        scene_manager.current_scene.option_buttons[1].on_click()  # 准备战斗
+        self.assertEqual(scene_manager.story_state.pending, "victory")
+
+        combat = scene_manager.current_scene
+        combat.player.current_hp = 0
+        combat.update()
+        self.assertFalse(combat.battle_active)
+        self.assertEqual(scene_manager.story_state.node_id, "intro")
+        self.assertIsNone(scene_manager.story_state.pending)
+
+    def test_unload_closes_graph(self):
+        """测试叙事场景被卸载时关闭剧情图"""
+        scene_manager = SceneManager(self.screen)
+        scene_manager.change_state(GameState.NARRATIVE)
+        story = scene_manager.current_scene.story
+
+        scene_manager.change_state(GameState.MAIN_MENU)
+        scene_manager.evict(GameState.NARRATIVE)
+        self.assertTrue(story._data_file.closed)
+
+        scene_manager.change_state(GameState.NARRATIVE)
+        story = scene_manager.current_scene.story
+        scene_manager.shutdown()
+        self.assertTrue(story._data_file.closed)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+帧耗时分析单元测试
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 无窗口环境下使用虚拟显示驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from src.profiling import FrameProfiler, RollingStats, PHASE_DRAW, PHASE_EVENT, PHASE_FRAME, PHASE_UPDATE
+from src.scene_manager import SceneManager
+
+class FakeClock:
+    """每次调用前进固定时间的计时函数"""
+
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+class TestRollingStats(unittest.TestCase):
+    """滚动统计测试"""
+
+    def test_ring_buffer(self):
+        """测试只保留最近的数值"""
+        stats = RollingStats(capacity=4)
+        for value in range(10):
+            stats.add(value)
+        self.assertEqual(len(stats), 4)
+        self.assertEqual(stats.count, 10)
+        self.assertEqual(stats.values(), [6, 7, 8, 9])
+
+    def test_percentiles(self):
+        """测试百分位数"""
+        stats = RollingStats(capacity=100)
+        for value in range(1, 101):
+            stats.add(value)
+        p = stats.percentiles()
+        self.assertEqual(p[50], 51)
+        self.assertEqual(p[95], 95)
+        self.assertEqual(p[99], 99)
+        self.assertEqual(RollingStats().percentiles()[99], 0.0)
+
+class TestFrameProfiler(unittest.TestCase):
+    """帧耗时分析器测试"""
+
+    def test_frame_summary_and_trace(self):
+        """测试各阶段耗时按帧累计并导出跟踪事件"""
+        profiler = FrameProfiler(clock=FakeClock(0.001))
+        for _ in range(3):
+            profiler.time(PHASE_EVENT, "MENU", lambda: None)
+            profiler.time(PHASE_EVENT, "MENU", lambda: None)
+            profiler.time(PHASE_UPDATE, "MENU", lambda: None)
+            self.assertEqual(profiler.time(PHASE_DRAW, "MENU", lambda: [1]), [1])
+            profiler.end_frame("MENU")
+
+        summary = profiler.summary("MENU")
+        self.assertAlmostEqual(summary[PHASE_EVENT][50], 2.0)
+        self.assertAlmostEqual(summary[PHASE_FRAME][99], 4.0)
+        self.assertEqual(profiler.summary("COMBAT"), {})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            profiler.save_chrome_trace(path)
+            with open(path, encoding="utf-8") as f:
+                trace = json.load(f)
+        events = trace["traceEvents"]
+        self.assertEqual(len(events), 12)
+        self.assertEqual(events[0]["ph"], "X")
+        self.assertAlmostEqual(events[0]["dur"], 1000.0)
+
+class TestSceneManagerProfiling(unittest.TestCase):
+    """场景管理器的分析开关测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        """初始化Pygame"""
+        pygame.init()
+        cls.screen = pygame.display.set_mode((800, 600))
+
+    def setUp(self):
+        """测试前准备"""
+        self.scene_manager = SceneManager(self.screen)
+        self.scene_manager.draw()
+
+    def _press_overlay_key(self):
+        """按下浮层切换键"""
+        event = pygame.event.Event(pygame.KEYDOWN, key=SceneManager.OVERLAY_KEY)
+        self.scene_manager.handle_event(event)
+
+    def test_disabled_by_default(self):
+        """测试默认不做任何计时"""
+        self.assertIsNone(self.scene_manager.profiler)
+        self.scene_manager.update()
+        self.scene_manager.draw()
+        self.assertIsNone(self.scene_manager.profiler)
+
+    def test_overlay_toggle(self):
+        """测试按键切换浮层，浮层区域随画面一起更新"""
+        self._press_overlay_key()
+        profiler = self.scene_manager.profiler
+        self.assertIsNotNone(profiler)
+
+        self.scene_manager.update()
+        rects = self.scene_manager.draw()
+        self.assertIn(self.scene_manager.overlay.rect, rects)
+        self.assertEqual(profiler.frames, 1)
+        self.assertIn(("MAIN_MENU", PHASE_UPDATE), profiler.stats)
+
+        # 隐藏浮层后恢复下面的画面，只为浮层开启的分析一起关闭
+        overlay_rect = self.scene_manager.overlay.rect
+        self._press_overlay_key()
+        self.assertIsNone(self.scene_manager.overlay)
+        self.assertIsNone(self.scene_manager.profiler)
+        self.assertIn(overlay_rect, self.scene_manager.draw())
+
+    def test_explicit_profiling_survives_overlay(self):
+        """测试显式开启的分析在隐藏浮层后继续记录"""
+        profiler = self.scene_manager.enable_profiling()
+        self._press_overlay_key()
+        self._press_overlay_key()
+        self.assertIs(self.scene_manager.profiler, profiler)
+
+if __name__ == '__main__':
+    unittest.main()
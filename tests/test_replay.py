@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+战斗随机数与回放单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.combat.character import Character
+from src.combat.battle_manager import BattleManager, INPUT_SKILL, INPUT_SUMMON
+from src.combat.replay import BattleRecording, replay_battle
+from src.combat.rng import BattleRNG, make_rng
+
+def _play(seed, frames):
+    """用不规则的帧间隔进行一场带输入的战斗"""
+    player = Character("玩家", 100, 50, 10, 5, 5)
+    enemy = Character("敌人", 200, 0, 8, 4, 4)
+    battle = BattleManager(player, enemy, seed=seed)
+    recording = BattleRecording.start(battle)
+
+    for i, elapsed in enumerate(frames):
+        if i == 3:
+            battle.summon_ally(Character("盟友", 60, 0, 7, 3, 6), 20)
+        if i % 7 == 0:
+            battle.player_use_skill()
+        battle.update(elapsed)
+
+    recording.finish(battle)
+    return battle, recording
+
+def _battle_state(battle):
+    """战斗状态摘要"""
+    units = [battle.player, battle.enemy] + battle.allies
+    return battle.time, [unit.get_state() for unit in units]
+
+class TestBattleRNG(unittest.TestCase):
+    """战斗随机数测试"""
+
+    def test_same_seed_same_battle(self):
+        """测试相同种子得到相同的战斗"""
+        frames = [0.016] * 600
+        first, _ = _play(11, frames)
+        second, _ = _play(11, frames)
+
+        self.assertEqual(_battle_state(first), _battle_state(second))
+
+    def test_independent_streams(self):
+        """测试战斗之间不共享随机状态"""
+        rng = BattleRNG(5)
+        expected = [BattleRNG(5).random() for _ in range(1)]
+
+        BattleRNG(6).random()  # 其他战斗的随机数不影响本场
+        self.assertEqual([rng.random()], expected)
+
+    def test_unseeded_rng_records_seed(self):
+        """测试未指定种子时也会记录种子"""
+        rng = BattleRNG()
+        self.assertIsNotNone(rng.initial_seed)
+
+    def test_unknown_rng_kind(self):
+        """测试未知的随机数生成器类型"""
+        with self.assertRaises(ValueError):
+            make_rng(1, 1)
+
+class TestBattleReplay(unittest.TestCase):
+    """战斗回放测试"""
+
+    def test_input_log(self):
+        """测试输入记录"""
+        battle, recording = _play(1, [0.1] * 30)
+        kinds = [entry[1] for entry in battle.input_log]
+
+        self.assertIn(INPUT_SKILL, kinds)
+        self.assertIn(INPUT_SUMMON, kinds)
+        self.assertEqual(recording.inputs, battle.input_log)
+
+    def test_replay_is_exact(self):
+        """测试回放逐位重现原战斗（与原战斗的帧间隔无关）"""
+        frames = [0.016, 0.033, 0.25, 0.001, 0.5, 0.017] * 60
+        battle, recording = _play(42, frames)
+
+        replayed = replay_battle(recording)
+        self.assertEqual(_battle_state(replayed), _battle_state(battle))
+        self.assertEqual(replayed.input_log, battle.input_log)
+
+    def test_binary_round_trip(self):
+        """测试二进制编码"""
+        battle, recording = _play(42, [0.1] * 100)
+        data = recording.to_bytes()
+        decoded = BattleRecording.from_bytes(data)
+
+        self.assertEqual(decoded.seed, recording.seed)
+        self.assertEqual(decoded.units, recording.units)
+        self.assertEqual(decoded.inputs, recording.inputs)
+        self.assertEqual(_battle_state(replay_battle(decoded)), _battle_state(battle))
+
+        with self.assertRaises(ValueError):
+            BattleRecording.from_bytes(b"XXXX" + data[4:])
+
+    def test_recording_requires_seed(self):
+        """测试随机数生成器没有种子时无法记录"""
+        import random
+        battle = BattleManager(Character("玩家", 100, 50, 10, 5, 5),
+                               Character("敌人", 80, 0, 8, 4, 4), rng=random.Random(1))
+
+        with self.assertRaises(ValueError):
+            BattleRecording.start(battle)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+资源管理器单元测试
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 无窗口环境下使用虚拟显示驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from src.game_state import GameState
+from src.resource_manager import ResourceManager
+from src.scene_manager import SceneManager
+
+class TestResourceManager(unittest.TestCase):
+    """资源管理器测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        """初始化Pygame"""
+        pygame.init()
+        cls.screen = pygame.display.set_mode((800, 600))
+
+    def setUp(self):
+        """测试前准备"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.asset_dir = os.path.join(self.tmp.name, "assets")
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+        os.makedirs(os.path.join(self.asset_dir, "images"))
+
+        # 写入一张带透明通道的立绘
+        portrait = pygame.Surface((40, 60), pygame.SRCALPHA)
+        portrait.fill((10, 20, 30, 128))
+        pygame.image.save(portrait, os.path.join(self.asset_dir, "images", "boss.png"))
+
+    def tearDown(self):
+        """测试后清理"""
+        self.tmp.cleanup()
+
+    def test_load_from_asset_dir(self):
+        """测试从资源目录加载图像并缓存预转换的像素数据"""
+        first = ResourceManager(cache_dir=self.cache_dir, asset_dir=self.asset_dir)
+        boss = first.get_image("boss")
+        self.assertEqual(boss.get_size(), (40, 60))
+        self.assertNotIn("boss", first.cache_hits)
+        self.assertEqual(len(os.listdir(os.path.join(self.cache_dir, "assets"))), 1)
+
+        second = ResourceManager(cache_dir=self.cache_dir, asset_dir=self.asset_dir)
+        cached = second.get_image("boss")
+        self.assertIn("boss", second.cache_hits)
+        self.assertEqual(cached.get_at((5, 5)), boss.get_at((5, 5)))
+        self.assertIsNone(second.get_image("missing"))
+
+    def test_asset_overrides_default(self):
+        """测试资源文件优先于程序生成的默认图像"""
+        pygame.image.save(pygame.Surface((32, 32)), os.path.join(self.asset_dir, "images", "player.bmp"))
+        resource_manager = ResourceManager(asset_dir=self.asset_dir)
+        self.assertEqual(resource_manager.get_image("player").get_size(), (32, 32))
+
+    def test_budget_eviction_and_pinning(self):
+        """测试超出字节预算时卸载未固定的最久未使用图像"""
+        resource_manager = ResourceManager(asset_dir=self.asset_dir, image_budget=0)
+        self.assertEqual(len(resource_manager.images), 0)
+
+        resource_manager.pin(["player"])
+        resource_manager.get_image("enemy")
+        self.assertEqual(list(resource_manager.images), ["player"])
+        self.assertEqual(resource_manager.image_bytes, resource_manager.image_sizes["player"])
+
+        # 取消固定后被卸载，需要时重新加载
+        resource_manager.unpin(["player"])
+        self.assertEqual(len(resource_manager.images), 0)
+        self.assertIsNotNone(resource_manager.get_image("player"))
+
+    def test_background_preload(self):
+        """测试后台解码、主线程转换后放入内存"""
+        resource_manager = ResourceManager(asset_dir=self.asset_dir)
+        resource_manager.preload(["boss"])
+        self.assertTrue(resource_manager.has_pending_preloads())
+        self.assertNotIn("boss", resource_manager.images)
+
+        for _ in range(200):
+            if not resource_manager.has_pending_preloads():
+                break
+            resource_manager.process_preloads()
+            time.sleep(0.005)
+
+        self.assertIn("boss", resource_manager.images)
+        self.assertIs(resource_manager.get_image("boss"), resource_manager.images["boss"])
+        resource_manager.shutdown()
+
+    def test_get_image_waits_for_preload(self):
+        """测试预加载尚未完成时获取图像直接等待后台结果"""
+        resource_manager = ResourceManager(asset_dir=self.asset_dir)
+        resource_manager.preload(["boss"])
+        self.assertEqual(resource_manager.get_image("boss").get_size(), (40, 60))
+        self.assertFalse(resource_manager.has_pending_preloads())
+        resource_manager.shutdown()
+
+    def test_scene_preloads_next_states(self):
+        """测试叙事场景在后台准备战斗场景"""
+        scene_manager = SceneManager(self.screen)
+        scene_manager.change_state(GameState.NARRATIVE)
+        self.assertIn(GameState.COMBAT, scene_manager._prewarm_queue)
+
+    def test_scene_assets_pinned(self):
+        """测试当前场景用到的图像被固定"""
+        resource_manager = ResourceManager(image_budget=0)
+        scene_manager = SceneManager(self.screen, resource_manager=resource_manager)
+        scene_manager.draw()
+        self.assertEqual(set(resource_manager.pins), {"default_background"})
+
+        scene_manager.change_state(GameState.COMBAT)
+        self.assertEqual(set(resource_manager.pins), {"default_background", "player", "enemy", "ally"})
+        self.assertEqual(set(resource_manager.images), set(resource_manager.pins))
+
+        scene_manager.change_state(GameState.GAME_OVER)
+        self.assertEqual(set(resource_manager.pins), {"default_background"})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+角色名册单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.combat.character import Character
+from src.combat.battle_manager import BattleManager
+from src.combat.roster import CharacterRoster, CharacterView
+
+class TestCharacterRoster(unittest.TestCase):
+    """角色名册测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.roster = CharacterRoster()
+        self.player = self.roster.add("玩家", 100, 50, 10, 5, 5)
+        self.enemy = self.roster.add("敌人", 80, 0, 8, 4, 4)
+
+    def test_character_has_no_dict(self):
+        """测试角色类使用固定属性槽"""
+        character = Character("玩家", 100, 50, 10, 5, 5)
+
+        self.assertFalse(hasattr(character, "__dict__"))
+        with self.assertRaises(AttributeError):
+            character.level = 1
+
+    def test_view_reads_columns(self):
+        """测试视图读取名册中的列"""
+        self.assertEqual(len(self.roster), 2)
+        self.assertIsInstance(self.player, Character)
+        self.assertEqual(self.player.name, "玩家")
+        self.assertEqual(self.player.current_hp, 100)
+        self.assertEqual(self.roster.current_hp[1], 80)
+        self.assertEqual(self.roster[1], self.enemy)
+        self.assertEqual(self.roster[-1].name, "敌人")
+
+        with self.assertRaises(IndexError):
+            self.roster[2]
+
+    def test_view_methods_match_character(self):
+        """测试视图的方法与 Character 一致"""
+        reference = Character("玩家", 100, 50, 10, 5, 5)
+        for unit in (reference, self.player):
+            self.assertEqual(unit.take_damage(10), 8)
+            self.assertEqual(unit.heal(5), 5)
+            self.assertTrue(unit.use_mp(20))
+            self.assertEqual(unit.get_attack_interval(), 1.5)
+
+        self.assertEqual(self.player.get_state(), reference.get_state())
+        self.assertEqual(self.roster.current_hp[0], 97)
+
+    def test_view_writes_columns(self):
+        """测试通过视图修改属性会写入名册"""
+        self.enemy.current_hp = 0
+        self.enemy.attack_cooldown = 1.25
+
+        self.assertFalse(self.enemy.is_alive())
+        self.assertEqual(self.roster.current_hp[1], 0)
+        self.assertEqual(self.roster.attack_cooldown[1], 1.25)
+
+    def test_views_in_battle(self):
+        """测试视图可以直接参与战斗"""
+        battle = BattleManager(self.player, self.enemy, seed=1)
+        while battle.battle_active:
+            battle.update(0.1)
+
+        self.assertTrue(battle.is_battle_over())
+        self.assertEqual(min(self.roster.current_hp), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+存档系统单元测试
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 无窗口环境下使用虚拟显示驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from src.combat.battle_manager import BattleManager
+from src.combat.character import Character
+from src.game_state import GameState
+from src.narrative.graph import StoryState
+from src.save_system import (
+    SECTION_BATTLE, SECTION_STORY, SaveSystem, decode_save, decode_value, encode_save, encode_value
+)
+from src.scene_manager import SceneManager
+
+def _battle(seed=3):
+    """创建一场带盟友的战斗"""
+    battle = BattleManager(Character("玩家", 300, 50, 10, 5, 5), Character("敌人", 400, 0, 8, 4, 4), seed=seed)
+    battle.summon_ally(Character("盟友", 200, 0, 7, 3, 6), 20)
+    return battle
+
+def _units(battle):
+    """战斗中所有单位的状态"""
+    return [unit.get_state() for unit in [battle.player] + battle.enemies + battle.allies]
+
+class TestEncoding(unittest.TestCase):
+    """存档编码测试"""
+
+    def test_value_round_trip(self):
+        """测试各种值编码后还原"""
+        value = (None, True, False, 0, -1, 2 ** 100, -3.5, "剧情", b"\x00\xff",
+                 [1, (2, 3)], {"state": {"inc": 2 ** 64 + 1}, 1: None})
+        decoded, offset = decode_value(encode_value(value))
+        expected = value[:9] + ((1, (2, 3)), value[10])
+        self.assertEqual(decoded, expected)
+        self.assertEqual(offset, len(encode_value(value)))
+
+    def test_corrupted_section(self):
+        """测试损坏的分段被检测出来"""
+        data = bytearray(encode_save({SECTION_STORY: bytes(encode_value(("intro", ())))}))
+        self.assertEqual(decode_save(bytes(data))[SECTION_STORY], ("intro", ()))
+        data[-1] ^= 0xFF
+        with self.assertRaises(ValueError):
+            decode_save(bytes(data))
+        with self.assertRaises(ValueError):
+            decode_save(b"XXXX")
+
+class TestBattleSnapshot(unittest.TestCase):
+    """战斗快照测试"""
+
+    def test_restored_battle_continues_identically(self):
+        """测试恢复的战斗与原战斗的后续完全一致"""
+        battle = _battle()
+        battle.update(3.0)
+        battle.player_use_skill()
+        state = decode_value(encode_value(battle.get_state()))[0]
+        restored = BattleManager.from_state(state)
+        self.assertEqual(_units(restored), _units(battle))
+
+        for _ in range(40):
+            battle.update(0.25)
+            restored.update(0.25)
+        self.assertEqual(_units(restored), _units(battle))
+        self.assertEqual(restored.time, battle.time)
+
+    def test_snapshot_size_bounded(self):
+        """测试快照大小与战斗进行的时间无关"""
+        battle = _battle()
+        battle.player.max_hp = battle.player.current_hp = 10 ** 6
+        battle.enemy.max_hp = battle.enemy.current_hp = 10 ** 6
+        battle.update(10.0)
+        early = len(encode_value(battle.get_state()))
+        battle.update(1000.0)
+        late = len(encode_value(battle.get_state()))
+        self.assertLess(abs(late - early), 32)
+
+class TestSaveSystem(unittest.TestCase):
+    """存档系统测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        """初始化Pygame"""
+        pygame.init()
+        cls.screen = pygame.display.set_mode((800, 600))
+
+    def setUp(self):
+        """测试前准备"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "saves", "autosave.sav")
+        self.save_system = SaveSystem(self.path)
+        self.scene_manager = SceneManager(self.screen, save_system=self.save_system)
+
+    def tearDown(self):
+        """测试后清理"""
+        self.save_system.shutdown()
+        self.tmp.cleanup()
+
+    def test_main_menu_not_saved(self):
+        """测试主菜单中没有需要保存的进度"""
+        self.assertFalse(self.save_system.autosave(self.scene_manager))
+        self.assertFalse(self.save_system.has_save())
+
+    def test_incremental_autosave(self):
+        """测试自动存档只重新编码变化的分段"""
+        self.scene_manager.change_state(GameState.NARRATIVE)
+        self.save_system.wait()
+        self.assertEqual(self.save_system.saves, 1)
+        encoded = self.save_system.encoded_sections
+
+        # 没有变化时不写入
+        self.assertFalse(self.save_system.autosave(self.scene_manager))
+
+        # 只有剧情进度变化
+        self.scene_manager.story_state.flags.add("knows_secret")
+        self.assertTrue(self.save_system.autosave(self.scene_manager))
+        self.save_system.wait()
+        self.assertEqual(self.save_system.saves, 2)
+        self.assertEqual(self.save_system.encoded_sections, encoded + 1)
+        self.assertEqual(self.save_system.load()[SECTION_STORY][1], ("knows_secret",))
+
+    def test_resume_story(self):
+        """测试读档恢复剧情进度"""
+        self.scene_manager.story_state = StoryState("victory", {"knows_secret"})
+        self.scene_manager.change_state(GameState.NARRATIVE)
+        self.save_system.wait()
+
+        save_system = SaveSystem(self.path)
+        scene_manager = SceneManager(self.screen, save_system=save_system)
+        menu = scene_manager.current_scene
+        self.assertIn(menu.continue_button, menu.get_widgets())
+        save_system.apply(scene_manager, save_system.load())
+        self.assertEqual(scene_manager.current_state, GameState.NARRATIVE)
+        self.assertEqual(scene_manager.story_state.node_id, "victory")
+        self.assertEqual(scene_manager.story_state.flags, {"knows_secret"})
+        save_system.shutdown()
+
+    def test_load_error_shown_in_menu(self):
+        """测试存档损坏时在主菜单中显示读档失败的原因"""
+        self.scene_manager.change_state(GameState.NARRATIVE)
+        self.save_system.wait()
+        with open(self.path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([last[0] ^ 0xFF]))
+
+        save_system = SaveSystem(self.path)
+        scene_manager = SceneManager(self.screen, save_system=save_system)
+        menu = scene_manager.current_scene
+        menu.draw_dirty(self.screen)
+        self.assertIsNone(menu.status_text)
+
+        menu.continue_button.on_click()
+        self.assertEqual(scene_manager.current_state, GameState.MAIN_MENU)
+        self.assertIsNotNone(menu.status_text)
+        self.assertIn(menu.status_rect, menu.draw_dirty(self.screen))
+        save_system.shutdown()
+
+    def test_resume_battle(self):
+        """测试读档恢复进行中的战斗"""
+        self.scene_manager.change_state(GameState.COMBAT)
+        scene = self.scene_manager.current_scene
+        scene._on_summon_click()
+        scene.battle_manager.update(2.0)
+        self.save_system.save(self.scene_manager)
+        self.assertIsNotNone(self.save_system.load()[SECTION_BATTLE])
+
+        save_system = SaveSystem(self.path)
+        scene_manager = SceneManager(self.screen, save_system=save_system)
+        save_system.apply(scene_manager, save_system.load())
+        restored = scene_manager.current_scene
+        self.assertEqual(scene_manager.current_state, GameState.COMBAT)
+        self.assertEqual(_units(restored.battle_manager), _units(scene.battle_manager))
+        self.assertIs(restored.ally, restored.battle_manager.allies[0])
+        self.assertIsNone(scene_manager.restored_battle)
+        save_system.shutdown()
+
+    def test_resume_after_loss(self):
+        """测试战斗失败后读档回到战斗前的剧情节点，而不是游戏结束场景"""
+        self.scene_manager.change_state(GameState.NARRATIVE)
+        self.scene_manager.current_scene.option_buttons[1].on_click()  # 准备战斗
+        combat = self.scene_manager.current_scene
+        combat.player.current_hp = 0
+        combat.update()
+        self.save_system.save(self.scene_manager)
+        self.scene_manager.change_state(GameState.GAME_OVER)
+        self.save_system.save(self.scene_manager)
+
+        save_system = SaveSystem(self.path)
+        scene_manager = SceneManager(self.screen, save_system=save_system)
+        save_system.apply(scene_manager, save_system.load())
+        self.assertEqual(scene_manager.current_state, GameState.NARRATIVE)
+        self.assertEqual(scene_manager.story_state.node_id, "intro")
+        self.assertIsNone(scene_manager.story_state.pending)
+        save_system.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+场景管理器单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 无窗口环境下使用虚拟显示驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from src.game_state import GameState
+from src.scene_manager import SceneManager
+
+class TestSceneManager(unittest.TestCase):
+    """场景管理器测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        """初始化Pygame"""
+        pygame.init()
+        cls.screen = pygame.display.set_mode((800, 600))
+
+    def setUp(self):
+        """测试前准备"""
+        self.scene_manager = SceneManager(self.screen)
+
+    def test_lazy_construction(self):
+        """测试场景在第一次使用时才创建"""
+        self.assertEqual(len(self.scene_manager.scenes), 0)
+
+        self.scene_manager.draw()
+        self.assertEqual(list(self.scene_manager.scenes), [GameState.MAIN_MENU])
+
+        self.scene_manager.change_state(GameState.NARRATIVE)
+        self.assertIn(GameState.NARRATIVE, self.scene_manager.scenes)
+        self.assertNotIn(GameState.COMBAT, self.scene_manager.scenes)
+
+    def test_prewarm(self):
+        """测试预热每次更新只创建一个场景"""
+        self.scene_manager.prewarm([GameState.NARRATIVE, GameState.COMBAT])
+        self.assertTrue(self.scene_manager.needs_continuous_update())
+
+        self.scene_manager.update()
+        self.assertIn(GameState.NARRATIVE, self.scene_manager.scenes)
+        self.assertNotIn(GameState.COMBAT, self.scene_manager.scenes)
+
+        self.scene_manager.update()
+        self.assertIn(GameState.COMBAT, self.scene_manager.scenes)
+        self.assertFalse(self.scene_manager.needs_continuous_update())
+
+        # 进入时使用预热好的场景
+        combat_scene = self.scene_manager.scenes[GameState.COMBAT]
+        self.scene_manager.change_state(GameState.COMBAT)
+        self.assertIs(self.scene_manager.current_scene, combat_scene)
+
+    def test_combat_reset_on_enter(self):
+        """测试重新进入战斗时是全新的战斗"""
+        self.scene_manager.change_state(GameState.COMBAT)
+        first = self.scene_manager.current_scene
+        first.player.take_damage(1000)
+
+        self.scene_manager.change_state(GameState.GAME_OVER)
+        self.assertNotIn(GameState.COMBAT, self.scene_manager.scenes)
+        self.scene_manager.change_state(GameState.MAIN_MENU)
+        self.scene_manager.change_state(GameState.COMBAT)
+
+        second = self.scene_manager.current_scene
+        self.assertIsNot(second, first)
+        self.assertTrue(second.battle_active)
+        self.assertEqual(second.player.current_hp, second.player.max_hp)
+
+    def test_eviction(self):
+        """测试常驻场景数受限且不卸载当前场景"""
+        scene_manager = SceneManager(self.screen, max_resident=2)
+        scene_manager.draw()
+        scene_manager.change_state(GameState.NARRATIVE)
+        scene_manager.change_state(GameState.GAME_OVER)
+
+        self.assertEqual(list(scene_manager.scenes), [GameState.NARRATIVE, GameState.GAME_OVER])
+
+        # 被卸载的场景再次进入时重新创建
+        scene_manager.change_state(GameState.MAIN_MENU)
+        self.assertIs(scene_manager.current_state, GameState.MAIN_MENU)
+        self.assertEqual(len(scene_manager.scenes), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+行动调度器单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.combat.scheduler import ActionScheduler
+
+class TestActionScheduler(unittest.TestCase):
+    """行动调度器测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.scheduler = ActionScheduler()
+
+    def test_pop_due_in_time_order(self):
+        """测试按时间顺序弹出到期行动"""
+        self.scheduler.schedule("b", 2.0)
+        self.scheduler.schedule("a", 1.0)
+        self.scheduler.schedule("c", 3.0)
+
+        self.assertEqual(self.scheduler.pop_due(2.5), (1.0, "a"))
+        self.assertEqual(self.scheduler.pop_due(2.5), (2.0, "b"))
+        self.assertIsNone(self.scheduler.pop_due(2.5))  # c 尚未到期
+        self.assertEqual(len(self.scheduler), 1)
+
+    def test_same_time_keeps_schedule_order(self):
+        """测试同一时间按调度顺序出队"""
+        self.scheduler.schedule("first", 0.0)
+        self.scheduler.schedule("second", 0.0)
+
+        self.assertEqual(self.scheduler.pop_due(0.0)[1], "first")
+        self.assertEqual(self.scheduler.pop_due(0.0)[1], "second")
+
+    def test_reschedule_replaces_entry(self):
+        """测试重新调度会替换原有时间"""
+        self.scheduler.schedule("a", 1.0)
+        self.scheduler.schedule("a", 5.0)
+
+        self.assertEqual(len(self.scheduler), 1)
+        self.assertEqual(self.scheduler.time_of("a"), 5.0)
+        self.assertEqual(self.scheduler.peek_time(), 5.0)
+        self.assertIsNone(self.scheduler.pop_due(4.0))
+
+    def test_cancel(self):
+        """测试取消行动"""
+        self.scheduler.schedule("a", 1.0)
+        self.scheduler.schedule("b", 2.0)
+        self.scheduler.cancel("a")
+
+        self.assertNotIn("a", self.scheduler)
+        self.assertEqual(self.scheduler.peek_time(), 2.0)
+        self.assertEqual(self.scheduler.pop_due(10.0), (2.0, "b"))
+        self.assertIsNone(self.scheduler.peek_time())
+
+    def test_stale_entries_are_compacted(self):
+        """测试频繁重新调度不会让堆无限增长"""
+        for i in range(1000):
+            self.scheduler.schedule("a", float(i))
+
+        self.assertLess(len(self.scheduler._heap), 100)
+        self.assertEqual(self.scheduler.peek_time(), 999.0)
+
+if __name__ == '__main__':
+    unittest.main()
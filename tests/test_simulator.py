@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+无界面战斗模拟器单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.combat.character import Character
+from src.combat.simulator import (
+    BattleSimulator, SimulationResult, make_character,
+    MODE_FIXED, WIN, LOSS, TIMEOUT
+)
+
+class TestBattleSimulator(unittest.TestCase):
+    """战斗模拟器测试"""
+
+    def test_make_character(self):
+        """测试根据数值创建角色"""
+        from_tuple = make_character(("甲", 50, 10, 6, 2, 3))
+        from_dict = make_character({"name": "乙", "max_hp": 40, "max_mp": 0,
+                                    "attack": 5, "defense": 1, "speed": 2})
+        template = Character("丙", 30, 0, 4, 1, 1)
+        template.current_hp = 1
+        copied = make_character(template)
+
+        self.assertEqual(from_tuple.max_hp, 50)
+        self.assertEqual(from_dict.name, "乙")
+        self.assertIsNot(copied, template)
+        self.assertEqual(copied.current_hp, 30)  # 复制后为满状态
+
+    def test_run_counts(self):
+        """测试结果统计"""
+        result = BattleSimulator(seed=1).run(200)
+
+        self.assertEqual(result.battles, 200)
+        self.assertEqual(result.wins + result.losses + result.timeouts, 200)
+        self.assertEqual(len(result.durations), 200)
+        self.assertEqual(len(result.kill_times), result.wins)
+        self.assertGreaterEqual(result.win_rate, 0.0)
+        self.assertLessEqual(result.win_rate, 1.0)
+
+    def test_seed_is_reproducible(self):
+        """测试相同种子得到相同结果"""
+        first = BattleSimulator(seed=7).run(100)
+        second = BattleSimulator(seed=7).run(100)
+
+        self.assertEqual(first.durations, second.durations)
+        self.assertEqual(first.damage_taken, second.damage_taken)
+
+    def test_strong_enemy_wins(self):
+        """测试敌人远强于玩家时玩家失败"""
+        simulator = BattleSimulator(enemy_stats=("巨龙", 1000, 0, 50, 20, 10), seed=3)
+        result = simulator.run(20)
+
+        self.assertEqual(result.losses, 20)
+        self.assertEqual(result.win_rate, 0.0)
+
+    def test_timeout(self):
+        """测试超过最长时间的战斗判为超时"""
+        simulator = BattleSimulator(enemy_stats=("石像", 100000, 0, 1, 100, 0), max_time=10.0, seed=3)
+        outcome, duration, dealt, taken = simulator.run_battle()
+
+        self.assertEqual(outcome, TIMEOUT)
+        self.assertGreaterEqual(duration, 10.0)
+        self.assertGreater(dealt, 0)
+
+    def test_ally_and_skill_speed_up_kills(self):
+        """测试召唤盟友和释放技能能缩短击杀时间"""
+        alone = BattleSimulator(seed=5).run(200).summary()
+        helped = BattleSimulator(summon=True, use_skill=True, seed=5).run(200).summary()
+
+        self.assertLess(helped["time_to_kill"]["mean"], alone["time_to_kill"]["mean"])
+
+    def test_fixed_step_mode(self):
+        """测试固定步长模式"""
+        result = BattleSimulator(mode=MODE_FIXED, step=0.05, seed=2).run(20)
+
+        self.assertEqual(result.battles, 20)
+        # 固定步长下战斗用时是步长的整数倍
+        for duration in result.durations:
+            self.assertAlmostEqual(duration / 0.05, round(duration / 0.05), places=6)
+
+    def test_invalid_mode(self):
+        """测试未知模拟模式"""
+        with self.assertRaises(ValueError):
+            BattleSimulator(mode="realtime")
+
+    def test_summary(self):
+        """测试结果摘要"""
+        result = SimulationResult()
+        result.record(WIN, 10.0, 80, 30)
+        result.record(LOSS, 20.0, 40, 100)
+
+        summary = result.summary()
+        self.assertEqual(summary["win_rate"], 0.5)
+        self.assertEqual(summary["time_to_kill"]["count"], 1)
+        self.assertEqual(summary["damage_dealt"]["mean"], 60.0)
+        self.assertEqual(summary["duration"]["max"], 20.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+技能系统单元测试
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 无窗口环境下使用虚拟显示驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from src.combat.battle_manager import BattleManager, INPUT_SKILL
+from src.combat.character import Character
+from src.combat.events import EVENT_CAST, EVENT_SKILL
+from src.combat.replay import BattleRecording, replay_battle
+from src.combat.rng import BattleRNG
+from src.combat.skills import (
+    CAST_COOLDOWN, CAST_LIMIT, CAST_NO_MP, CAST_OK, CAST_STUNNED, SKILLS_DIR, SkillError, get_loadout, load_skills
+)
+from src.game_state import GameState
+from src.scene_manager import SceneManager
+
+def _battle(enemies=1, seed=5):
+    """创建一场战斗"""
+    player = Character("玩家", 300, 100, 10, 5, 5)
+    return BattleManager(player, [Character(f"敌人{i}", 400, 0, 8, 0, 4) for i in range(enemies)], seed=seed)
+
+def _slot(battle, name):
+    """玩家技能栏中技能的栏位"""
+    return battle.player.skills.slot(name)
+
+class TestSkillData(unittest.TestCase):
+    """技能数据加载测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """测试后清理"""
+        shutil.rmtree(self.directory)
+
+    def _write(self, source):
+        """写入技能源文件"""
+        with open(os.path.join(self.directory, "skills.json"), "w", encoding="utf-8") as f:
+            json.dump(source, f, ensure_ascii=False)
+
+    def test_default_data(self):
+        """测试默认技能数据可以编译，主技能为火球术"""
+        skills, loadouts = load_skills(SKILLS_DIR)
+        self.assertEqual(get_loadout("player")[0].name, "fireball")
+        self.assertEqual(skills["fireball"].mp_cost, 10)
+        self.assertTrue(all(callable(op) for skill in skills.values() for op in skill.ops))
+
+    def test_invalid_data(self):
+        """测试校验会收集所有错误"""
+        self._write({
+            "skills": {
+                "bad": {"label": "坏", "target": "moon", "ops": [{"op": "teleport"}]},
+                "worse": {"label": "更坏", "mp_cost": -1, "ops": [{"op": "effect", "effect": "missing"}]},
+            },
+            "loadouts": {"player": ["bad", "unknown"]},
+        })
+        with self.assertRaises(SkillError) as context:
+            load_skills(self.directory)
+        self.assertEqual(len(context.exception.errors), 5)
+
+    def _errors(self, skill):
+        """编译单个技能，返回校验错误"""
+        self._write({"skills": {"test": skill}})
+        with self.assertRaises(SkillError) as context:
+            load_skills(self.directory)
+        return context.exception.errors
+
+    def test_op_target_mismatch(self):
+        """测试操作与目标不匹配时在编译时报错"""
+        damage = {"op": "damage", "scale": 1.0}
+        effect = {"op": "effect", "effect": "burn"}
+        summon = {"op": "summon", "unit": {"name": "盟友", "max_hp": 60, "max_mp": 0,
+                                           "attack": 7, "defense": 3, "speed": 6}}
+        for target, op in (("none", damage), ("none", effect), ("all_enemies", summon),
+                           ("allies", summon), ("enemy", summon)):
+            errors = self._errors({"label": "测试", "target": target, "ops": [op]})
+            self.assertEqual(len(errors), 1, (target, op["op"]))
+            self.assertIn("不能用于目标", errors[0])
+
+    def test_field_types(self):
+        """测试 max_allies、gcd、mp_cost 的类型校验"""
+        op = {"op": "damage"}
+        for field, value in (("max_allies", True), ("max_allies", 1.0), ("gcd", 1), ("gcd", "yes"),
+                             ("mp_cost", 2.5), ("mp_cost", True), ("mp_cost", "10"), ("cooldown", False)):
+            errors = self._errors({"label": "测试", field: value, "ops": [op]})
+            self.assertEqual(len(errors), 1, (field, value))
+            self.assertIn(field, errors[0])
+
+        errors = self._errors({"label": "测试", "target": ["enemy"], "ops": [op]})
+        self.assertEqual(len(errors), 1)
+
+class TestSkills(unittest.TestCase):
+    """释放技能测试"""
+
+    def test_fireball_matches_formula(self):
+        """测试火球术伤害为攻击力 × 2 × 0.9~1.1"""
+        battle = _battle()
+        expected_rng = BattleRNG(5)
+        damage = battle.player_use_skill()
+        expected = max(1, int(10 * 2 * expected_rng.uniform(0.9, 1.1)))
+        self.assertEqual(damage, expected)
+        self.assertEqual(battle.player.current_mp, 90)
+
+    def test_per_skill_cooldowns(self):
+        """测试每个技能独立冷却，公共冷却只限制标记了 gcd 的技能"""
+        battle = _battle()
+        skills = battle.player.skills
+        flame = _slot(battle, "flame_strike")
+        self.assertTrue(battle.player_use_skill())
+        self.assertEqual(battle.check_cast(battle.player, 0), CAST_COOLDOWN)
+        self.assertEqual(battle.check_cast(battle.player, flame), CAST_COOLDOWN)
+        self.assertEqual(battle.check_cast(battle.player, _slot(battle, "summon_ally")), CAST_OK)
+
+        battle.advance_to(1.5)
+        self.assertEqual(battle.check_cast(battle.player, flame), CAST_OK)
+        self.assertEqual(battle.check_cast(battle.player, 0), CAST_COOLDOWN)
+        self.assertEqual(list(skills.ready[:3]), [5.0, 0.0, 0.0])
+        self.assertEqual(skills.ready_time(flame), 1.5)
+
+    def test_effect_chain(self):
+        """测试技能的效果链：伤害后施加状态效果"""
+        battle = _battle()
+        battle.cast(battle.player, _slot(battle, "flame_strike"))
+        self.assertIn("burn", battle.enemy.status.effects)
+        self.assertIs(battle.enemy.status.effects["burn"].source, battle.player)
+
+        battle.advance_to(2.0)
+        battle.cast(battle.player, _slot(battle, "barrier"))
+        self.assertEqual(battle.player.status.shield, 15)
+
+    def test_area_and_ally_targets(self):
+        """测试全体敌人和己方全体目标"""
+        battle = _battle(enemies=3)
+        battle.cast(battle.player, _slot(battle, "summon_ally"))
+        events = battle.update(0.0)
+        hits = [event.target for event in events if event.kind == EVENT_SKILL]
+        self.assertEqual(hits, [])
+
+        battle.cast(battle.player, _slot(battle, "quake"))
+        events = battle.update(0.0)
+        hits = [event.target for event in events if event.kind == EVENT_SKILL]
+        self.assertEqual(hits, battle.enemies)
+        self.assertTrue(all("armor_break" in enemy.status.effects for enemy in battle.enemies))
+
+        battle.advance_to(1.5)
+        battle.cast(battle.player, _slot(battle, "war_cry"))
+        self.assertEqual(battle.player.attack, 12)
+        self.assertIn("haste", battle.allies[0].status.effects)
+
+    def test_cast_failures(self):
+        """测试不能释放的原因"""
+        battle = _battle()
+        summon = _slot(battle, "summon_ally")
+        self.assertEqual(battle.cast(battle.player, summon), 0)
+        self.assertEqual(len(battle.allies), 1)
+        self.assertEqual(battle.check_cast(battle.player, summon), CAST_LIMIT)
+
+        battle.apply_effect(battle.player, "stun")
+        self.assertEqual(battle.check_cast(battle.player, 0), CAST_STUNNED)
+        self.assertIsNone(battle.cast(battle.player, 0))
+        battle.remove_effect(battle.player, "stun")
+
+        battle.player.current_mp = 5
+        self.assertEqual(battle.check_cast(battle.player, 0), CAST_NO_MP)
+        self.assertEqual(battle.player_use_skill(), 0)
+
+    def test_cast_without_live_targets(self):
+        """测试全体技能没有存活目标时不释放，不消耗魔法值也不进入冷却"""
+        battle = _battle(enemies=2)
+        quake = _slot(battle, "quake")
+        for enemy in battle.enemies:
+            enemy.current_hp = 0
+
+        self.assertIsNone(battle.cast(battle.player, quake))
+        self.assertEqual(battle.player.current_mp, 100)
+        self.assertEqual(battle.player.skills.ready[quake], 0.0)
+        self.assertEqual(battle.player.skills.gcd_ready, 0.0)
+
+    def test_cast_event(self):
+        """测试释放技能的事件带有技能定义"""
+        battle = _battle()
+        battle.cast(battle.player, _slot(battle, "thunder_bolt"))
+        cast, = [event for event in battle.update(0.0) if event.kind == EVENT_CAST]
+        self.assertEqual(cast.value.label, "雷击")
+        self.assertIs(cast.target, battle.enemy)
+
+    def test_state_round_trip(self):
+        """测试技能冷却随战斗状态保存和恢复"""
+        battle = _battle()
+        battle.player_use_skill()
+        battle.advance_to(2.0)
+        battle.cast(battle.player, _slot(battle, "flame_strike"))
+
+        state = battle.get_state()
+        clone = BattleManager.from_state(state)
+        self.assertEqual(clone.get_state(), state)
+        self.assertEqual(list(clone.player.skills.ready), list(battle.player.skills.ready))
+
+    def test_replay_skills(self):
+        """测试回放按技能栏位重现技能"""
+        battle = _battle()
+        recording = BattleRecording.start(battle)
+        for slot, time in ((0, 0.5), (_slot(battle, "flame_strike"), 2.5), (_slot(battle, "quake"), 4.0)):
+            battle.advance_to(time)
+            battle.cast(battle.player, slot)
+        battle.advance_to(12.0)
+        recording.finish(battle)
+        self.assertEqual([entry[1] for entry in recording.inputs], [INPUT_SKILL] * 3)
+
+        loaded = BattleRecording.from_bytes(recording.to_bytes())
+        self.assertEqual(loaded.skills, recording.skills)
+        replayed = replay_battle(loaded)
+        self.assertEqual(replayed.get_state(), battle.get_state())
+
+class TestCombatSceneSkills(unittest.TestCase):
+    """战斗场景的技能测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        """初始化Pygame"""
+        pygame.init()
+        cls.screen = pygame.display.set_mode((800, 600))
+
+    def setUp(self):
+        """测试前准备"""
+        self.scene_manager = SceneManager(self.screen)
+        self.scene_manager.change_state(GameState.COMBAT)
+        self.scene = self.scene_manager.current_scene
+
+    def test_buttons_from_data(self):
+        """测试按钮文字来自技能数据，召唤按钮释放召唤技能"""
+        self.assertEqual(self.scene.skill_button.text, "火球术 (MP: 10)")
+        self.scene._on_summon_click()
+        self.assertIsNotNone(self.scene.ally)
+        self.assertEqual(self.scene.player.current_mp, 30)
+
+    def test_number_keys(self):
+        """测试数字键释放对应栏位的技能"""
+        slot = self.scene.player.skills.slot("barrier")
+        self.scene.handle_event(pygame.event.Event(pygame.KEYDOWN, key=self.scene.SKILL_KEYS[slot]))
+        self.assertIsNotNone(self.scene.player.status)
+        self.scene.handle_event(pygame.event.Event(pygame.KEYDOWN, key=self.scene.SKILL_KEYS[slot]))
+        self.assertEqual(self.scene.player.current_mp, 42)
+
+if __name__ == '__main__':
+    unittest.main()
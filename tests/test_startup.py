@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+启动过程单元测试
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 无窗口环境下使用虚拟显示驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from src.resource_manager import ResourceManager
+from src.startup import StartupTrace
+
+class TestStartupTrace(unittest.TestCase):
+    """启动计时测试"""
+
+    def test_phases(self):
+        """测试记录各阶段并导出JSON"""
+        trace = StartupTrace()
+        with trace.phase("a"):
+            pass
+        with trace.phase("b"):
+            pass
+
+        self.assertEqual([name for name, _, _ in trace.phases], ["a", "b"])
+        self.assertGreaterEqual(trace.total(), trace.phases[1][1])
+        self.assertIn("total", trace.report())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            trace.save(path)
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        self.assertEqual([phase["name"] for phase in data["phases"]], ["a", "b"])
+
+class TestFastBootCache(unittest.TestCase):
+    """快速启动磁盘缓存测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        """初始化Pygame"""
+        pygame.init()
+
+    def test_procedural_images_cached(self):
+        """测试程序生成的图像第二次启动时从磁盘加载"""
+        with tempfile.TemporaryDirectory() as tmp:
+            first = ResourceManager(cache_dir=tmp)
+            self.assertEqual(first.cache_hits, set())
+
+            second = ResourceManager(cache_dir=tmp)
+            self.assertEqual(second.cache_hits, set(first.images))
+            for name, surface in first.images.items():
+                cached = second.get_image(name)
+                self.assertEqual(cached.get_size(), surface.get_size())
+                self.assertEqual(cached.get_at((10, 10)), surface.get_at((10, 10)))
+
+    def test_font_path_resolved_once(self):
+        """测试字体路径写入缓存后直接读取"""
+        with tempfile.TemporaryDirectory() as tmp:
+            first = ResourceManager(cache_dir=tmp)
+            first.get_font("simhei", 16)
+            first.get_font("simhei", 24)
+
+            second = ResourceManager(cache_dir=tmp)
+            self.assertIn("simhei", second.font_paths)
+            self.assertEqual(second.font_paths["simhei"], first.font_paths["simhei"])
+
+if __name__ == '__main__':
+    unittest.main()
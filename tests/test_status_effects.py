@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+状态效果与时间轮单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.combat.battle_manager import BattleManager
+from src.combat.character import Character
+from src.combat.events import EVENT_ATTACK, EVENT_DEATH, EVENT_DOT, EVENT_EXPIRE
+from src.combat.status_effects import StatusEffect, get_effect
+from src.combat.timer_wheel import TimerWheel
+
+def _battle(enemy_hp=400, enemy_defense=0, seed=5):
+    """创建一场战斗"""
+    player = Character("玩家", 300, 50, 10, 5, 5)
+    return BattleManager(player, Character("敌人", enemy_hp, 0, 8, enemy_defense, 4), seed=seed)
+
+def _events(events, kind, source=None):
+    """筛选指定类型（和来源）的事件"""
+    return [event for event in events if event.kind == kind and (source is None or event.source is source)]
+
+class TestTimerWheel(unittest.TestCase):
+    """分层时间轮测试"""
+
+    def test_fires_in_time_order(self):
+        """测试定时器按到期时间触发，包括级联和溢出的定时器"""
+        # 每层4格、共2层：超过0.8秒的定时器进入溢出列表
+        wheel = TimerWheel(resolution=0.05, slot_bits=2, levels=2)
+        for time, item in ((3.0, "c"), (0.12, "a"), (0.5, "b"), (12.34, "d")):
+            wheel.schedule(time, item)
+        self.assertIsNone(wheel.pop_due(0.1))
+
+        fired = []
+        due = wheel.pop_due(20.0)
+        while due is not None:
+            fired.append(due)
+            due = wheel.pop_due(20.0)
+        self.assertEqual([item for _, item in fired], ["a", "b", "c", "d"])
+        # 到期时间向上取整到格
+        self.assertAlmostEqual(fired[0][0], 0.15)
+        self.assertEqual(len(wheel), 0)
+
+    def test_cancel(self):
+        """测试取消的定时器不再触发"""
+        wheel = TimerWheel()
+        handle = wheel.schedule(1.0, "a")
+        wheel.schedule(2.0, "b")
+        wheel.cancel(handle)
+        wheel.cancel(handle)
+        self.assertEqual(len(wheel), 1)
+        self.assertEqual(wheel.pop_due(5.0)[1], "b")
+        self.assertIsNone(wheel.pop_due(5.0))
+
+class TestStatusEffects(unittest.TestCase):
+    """状态效果测试"""
+
+    def test_stacks_recalculate_stats(self):
+        """测试叠加层数按倍数修正属性，移除后恢复基础属性"""
+        battle = _battle()
+        player = battle.player
+        for _ in range(3):
+            battle.apply_effect(player, "attack_up")
+        self.assertEqual(player.status.effects["attack_up"].stacks, 2)
+        self.assertEqual(player.attack, 15)
+
+        battle.apply_effect(player, "slow")
+        self.assertEqual(player.speed, 2)
+        battle.remove_effect(player, "attack_up")
+        self.assertEqual(player.attack, 10)
+        battle.remove_effect(player, "slow")
+        self.assertIsNone(player.status)
+        self.assertEqual(player.speed, 5)
+        self.assertEqual(player.get_state(), Character("玩家", 300, 50, 10, 5, 5).get_state())
+
+    def test_buff_keeps_untouched_stats(self):
+        """测试攻击增益不改变没有修正的属性（包括不是整数或低于下限的速度）"""
+        for speed in (0, 5.5):
+            player = Character("玩家", 300, 50, 10, 5, speed)
+            battle = BattleManager(player, Character("敌人", 400, 0, 8, 0, 4), seed=5)
+            interval = player.get_attack_interval()
+
+            battle.apply_effect(player, "attack_up")
+            self.assertEqual(player.attack, 12)
+            self.assertEqual(player.speed, speed)
+            self.assertEqual(player.defense, 5)
+            self.assertEqual(player.get_attack_interval(), interval)
+
+    def test_expiry(self):
+        """测试效果到时间后结束"""
+        battle = _battle()
+        battle.apply_effect(battle.player, "haste")
+        self.assertEqual(battle.player.speed, 8)
+        events = battle.advance_to(6.1)
+        self.assertEqual(len(_events(events, EVENT_EXPIRE)), 1)
+        self.assertEqual(battle.player.speed, 5)
+        self.assertEqual(len(battle.timers), 0)
+
+    def test_damage_over_time(self):
+        """测试持续伤害每跳按层数结算，结束时刻的最后一跳也会结算"""
+        battle = _battle()
+        battle.apply_effect(battle.enemy, "burn", battle.player)
+        battle.apply_effect(battle.enemy, "burn", battle.player)
+        events = battle.advance_to(10.0)
+        dots = _events(events, EVENT_DOT, battle.player)
+        self.assertEqual([event.value for event in dots], [6] * 6)
+        self.assertIsNone(battle.enemy.status)
+
+    def test_damage_over_time_kills(self):
+        """测试持续伤害击杀最后一个敌人时结束战斗"""
+        battle = _battle(enemy_hp=18)
+        battle.player.attack = 1
+        battle.player.speed = 0
+        for _ in range(3):
+            battle.apply_effect(battle.enemy, "burn", battle.player)
+        events = battle.advance_to(10.0)
+        deaths = _events(events, EVENT_DEATH)
+        self.assertEqual(len(deaths), 1)
+        self.assertEqual(events[events.index(deaths[0]) - 1].kind, EVENT_DOT)
+        self.assertIs(deaths[0].source, battle.player)
+        self.assertFalse(battle.battle_active)
+        self.assertAlmostEqual(battle.time, 2.0)
+        self.assertEqual(len(battle.timers), 0)
+
+    def test_stun_skips_actions(self):
+        """测试眩晕的单位在眩晕期间不行动"""
+        battle = _battle()
+        battle.apply_effect(battle.enemy, "stun")
+        events = battle.advance_to(1.9)
+        self.assertEqual(_events(events, EVENT_ATTACK, battle.enemy), [])
+        events = battle.advance_to(6.0)
+        self.assertTrue(_events(events, EVENT_ATTACK, battle.enemy))
+
+    def test_shield_absorbs_damage(self):
+        """测试护盾在防御之后吸收伤害"""
+        battle = _battle()
+        player = battle.player
+        battle.apply_effect(player, "shield")
+        self.assertEqual(player.take_damage(10), 0)
+        self.assertEqual(player.status.shield, 7)
+        self.assertEqual(player.take_damage(20), 11)
+        self.assertEqual(player.current_hp, 289)
+
+    def test_invalid_effects(self):
+        """测试未知的效果和属性"""
+        with self.assertRaises(KeyError):
+            get_effect("missing")
+        with self.assertRaises(ValueError):
+            StatusEffect("bad", "坏", modifiers={"luck": (1, 0)})
+
+    def test_state_round_trip(self):
+        """测试带状态效果的战斗状态恢复后按原样继续"""
+        battle = _battle()
+        battle.apply_effect(battle.enemy, "poison", battle.player)
+        battle.apply_effect(battle.enemy, "armor_break", battle.player)
+        battle.apply_effect(battle.player, "attack_up")
+        battle.apply_effect(battle.player, "shield")
+        battle.advance_to(3.3)
+
+        state = battle.get_state()
+        clone = BattleManager.from_state(state)
+        self.assertEqual(clone.get_state(), state)
+        self.assertEqual(clone.player.attack, battle.player.attack)
+        battle.advance_to(30.0)
+        clone.advance_to(30.0)
+        self.assertEqual(clone.get_state(), battle.get_state())
+
+    def test_many_effects(self):
+        """测试大量单位的效果全部按时结束"""
+        player = Character("玩家", 10 ** 6, 50, 0, 5, 5)
+        enemies = [Character(f"敌人{i}", 10 ** 6, 0, 0, 0, 4) for i in range(200)]
+        battle = BattleManager(player, enemies, seed=1)
+        for i, enemy in enumerate(enemies):
+            battle.time = i * 0.01
+            battle.apply_effect(enemy, "poison", player)
+            battle.apply_effect(enemy, "haste")
+        events = battle.advance_to(20.0)
+        self.assertEqual(len(_events(events, EVENT_DOT)), 200 * 5)
+        self.assertEqual(len(_events(events, EVENT_EXPIRE)), 400)
+        self.assertTrue(all(enemy.status is None for enemy in enemies))
+        self.assertEqual(len(battle.timers), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+数值平衡扫描单元测试
+"""
+
+import unittest
+import sys
+import os
+import csv
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.combat import sweep
+from src.combat.sweep import SweepRunner, evaluate_point, load_completed, parse_param, derive_seed
+
+class TestSweep(unittest.TestCase):
+    """数值平衡扫描测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_path = os.path.join(self.temp_dir.name, "sweep.csv")
+        self.grid = {"player.attack": [8, 12], "enemy.defense": [2, 6]}
+
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+
+    def _read_rows(self):
+        """读取结果文件并按下标排序"""
+        with open(self.output_path, newline="", encoding="utf-8") as f:
+            return sorted(csv.DictReader(f), key=lambda row: int(row["index"]))
+
+    def test_parse_param(self):
+        """测试解析扫描参数"""
+        self.assertEqual(parse_param("player.attack=8,10"), ("player.attack", [8, 10]))
+        with self.assertRaises(ValueError):
+            parse_param("player.luck=1,2")
+
+    def test_points(self):
+        """测试网格点枚举"""
+        runner = SweepRunner(self.grid, battles=10, workers=1)
+        points = list(runner.points())
+
+        self.assertEqual(len(runner), 4)
+        self.assertEqual(points[0], (0, {"enemy.defense": 2, "player.attack": 8}))
+        self.assertEqual(points[3], (3, {"enemy.defense": 6, "player.attack": 12}))
+
+    def test_seed_depends_only_on_index(self):
+        """测试网格点结果与进程数和分块方式无关"""
+        self.assertNotEqual(derive_seed(0, 1), derive_seed(0, 2))
+
+        SweepRunner(self.grid, battles=50, seed=3, workers=2, chunk_size=1).run(self.output_path)
+        parallel = self._read_rows()
+
+        serial = [evaluate_point(int(row["index"]),
+                                 {"enemy.defense": int(row["enemy.defense"]),
+                                  "player.attack": int(row["player.attack"])},
+                                 50, 3)
+                  for row in parallel]
+        for row, expected in zip(parallel, serial):
+            self.assertEqual(float(row["ttk_mean"]), expected["ttk_mean"])
+
+    def test_resume_after_interrupt(self):
+        """测试从部分结果文件续跑"""
+        runner = SweepRunner(self.grid, battles=20, workers=2)
+        self.assertEqual(runner.run(self.output_path), 4)
+
+        # 模拟中断：保留表头和一行完整结果，外加半行
+        with open(self.output_path, encoding="utf-8", newline="") as f:
+            lines = f.readlines()
+        with open(self.output_path, "w", encoding="utf-8", newline="") as f:
+            f.writelines(lines[:2])
+            f.write(lines[2][:5])
+
+        self.assertEqual(len(load_completed(self.output_path, runner.fieldnames)), 1)
+        self.assertEqual(runner.run(self.output_path), 3)
+
+        rows = self._read_rows()
+        self.assertEqual([int(row["index"]) for row in rows], [0, 1, 2, 3])
+
+    def test_mismatched_results_file(self):
+        """测试结果文件列不一致时报错"""
+        SweepRunner(self.grid, battles=5, workers=1).run(self.output_path)
+
+        with self.assertRaises(ValueError):
+            SweepRunner({"player.speed": [1, 2]}, battles=5, workers=1).run(self.output_path)
+
+    def test_resume_with_different_settings(self):
+        """测试扫描参数与结果文件记录的不一致时拒绝续跑"""
+        SweepRunner(self.grid, battles=5, seed=1, workers=1).run(self.output_path)
+        self.assertTrue(os.path.exists(sweep.config_path(self.output_path)))
+
+        changes = [
+            {"battles": 6},
+            {"seed": 2},
+            {"use_skill": True},
+            {"with_ally": True},
+        ]
+        for change in changes:
+            options = {"battles": 5, "seed": 1, "workers": 1}
+            options.update(change)
+            with self.assertRaises(ValueError):
+                SweepRunner(self.grid, **options).run(self.output_path)
+        with self.assertRaises(ValueError):
+            SweepRunner({"player.attack": [8, 10], "enemy.defense": [2, 6]},
+                        battles=5, seed=1, workers=1).run(self.output_path)
+
+        # 相同参数可以续跑，没有需要重新计算的网格点
+        self.assertEqual(SweepRunner(self.grid, battles=5, seed=1, workers=1).run(self.output_path), 0)
+
+        # 缺少参数文件时无法确认结果来源
+        os.remove(sweep.config_path(self.output_path))
+        with self.assertRaises(ValueError):
+            SweepRunner(self.grid, battles=5, seed=1, workers=1).run(self.output_path)
+
+    def test_close_early_cancels_pending(self):
+        """测试提前关闭结果生成器时取消未开始的任务并关闭进程池"""
+        executors = []
+
+        class RecordingExecutor(ProcessPoolExecutor):
+            """记录提交的任务和关闭方式的进程池"""
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.futures = []
+                self.cancel_futures = None
+                executors.append(self)
+
+            def submit(self, *args, **kwargs):
+                future = super().submit(*args, **kwargs)
+                self.futures.append(future)
+                return future
+
+            def shutdown(self, wait=True, *, cancel_futures=False):
+                self.cancel_futures = cancel_futures
+                super().shutdown(wait=wait, cancel_futures=cancel_futures)
+
+        grid = {"player.attack": list(range(5, 25))}
+        runner = SweepRunner(grid, battles=20, workers=1, chunk_size=1)
+        with mock.patch.object(sweep, "ProcessPoolExecutor", RecordingExecutor):
+            results = runner.iter_results()
+            self.assertEqual(len(next(results)), 1)
+            results.close()
+
+        executor, = executors
+        self.assertTrue(executor.cancel_futures)
+        self.assertTrue(any(future.cancelled() for future in executor.futures))
+        self.assertTrue(all(future.done() for future in executor.futures))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+多单位战斗与目标选择单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.combat.character import Character
+from src.combat.battle_manager import BattleManager
+from src.combat.events import EVENT_DEATH
+from src.combat.replay import BattleRecording, replay_battle
+from src.combat.rng import BattleRNG
+from src.combat.targeting import (
+    BattleSide, HighestThreatTarget, LeaderTarget, LowestHPTarget, RandomTarget, UnitSet
+)
+
+def _units(prefix, count, hp=100):
+    """创建一组相同属性的单位"""
+    return [Character(f"{prefix}{i}", hp, 0, 10, 4, 5) for i in range(count)]
+
+class TestTargetPolicies(unittest.TestCase):
+    """目标选择策略测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.units = _units("单位", 5)
+        self.side = BattleSide(self.units)
+        self.rng = BattleRNG(3)
+
+    def _attach(self, policy):
+        """将策略绑定到测试阵营"""
+        BattleSide().engage(self.side, policy)
+        return policy
+
+    def test_unit_set(self):
+        """测试集合的添加、删除和随机选取"""
+        unit_set = UnitSet()
+        for unit in self.units:
+            unit_set.add(unit)
+        unit_set.discard(self.units[1])
+        unit_set.discard(self.units[1])
+        self.assertEqual(len(unit_set), 4)
+        self.assertNotIn(self.units[1], unit_set)
+        self.assertEqual(set(unit_set), set(self.units) - {self.units[1]})
+        for _ in range(20):
+            self.assertIn(unit_set.choice(self.rng), unit_set)
+
+    def test_lowest_hp(self):
+        """测试最低生命值策略跟随生命值变化"""
+        policy = self._attach(LowestHPTarget())
+        self.units[3].current_hp = 20
+        self.side.hp_changed(self.units[3])
+        self.assertIs(policy.select(self.rng), self.units[3])
+
+        # 阵亡后选择下一个最虚弱的单位
+        self.units[2].current_hp = 50
+        self.side.hp_changed(self.units[2])
+        self.units[3].current_hp = 0
+        self.side.mark_dead(self.units[3])
+        self.assertIs(policy.select(self.rng), self.units[2])
+
+    def test_highest_threat(self):
+        """测试最高威胁策略"""
+        policy = self._attach(HighestThreatTarget())
+        self.side.dealt(self.units[1], 30)
+        self.side.dealt(self.units[4], 20)
+        self.assertIs(policy.select(self.rng), self.units[1])
+        self.side.dealt(self.units[4], 20)
+        self.assertIs(policy.select(self.rng), self.units[4])
+
+    def test_leader_dead_keeps_follower_chance(self):
+        """测试首领阵亡后仍只按几率攻击其他单位，没有选中时没有目标"""
+        policy = self._attach(LeaderTarget())
+        self.units[0].current_hp = 0
+        targets = [policy.select(self.rng) for _ in range(200)]
+
+        self.assertNotIn(self.units[0], targets)
+        self.assertIn(None, targets)
+        followers = [target for target in targets if target is not None]
+        self.assertTrue(60 < len(followers) < 140)
+        self.assertTrue(all(target in self.units[1:] for target in followers))
+
+        # 几率为0时首领阵亡后不再有目标
+        policy = self._attach(LeaderTarget(follower_chance=0.0))
+        self.assertIsNone(policy.select(self.rng))
+
+    def test_external_death_detected(self):
+        """测试在外部被清空生命值的单位不会被选中"""
+        policy = self._attach(RandomTarget())
+        for unit in self.units[1:]:
+            unit.current_hp = 0
+        for _ in range(10):
+            self.assertIs(policy.select(self.rng), self.units[0])
+        self.assertEqual(self.side.alive_count, 1)
+
+class TestMultiUnitBattle(unittest.TestCase):
+    """多单位战斗测试"""
+
+    def test_single_enemy_compatible(self):
+        """测试单个敌人时保持原有接口"""
+        enemy = Character("敌人", 80, 0, 8, 4, 4)
+        battle = BattleManager(Character("玩家", 100, 50, 10, 5, 5), enemy)
+        self.assertIs(battle.enemy, enemy)
+        self.assertEqual(battle.enemies, [enemy])
+
+    def test_battle_ends_when_all_enemies_dead(self):
+        """测试所有敌人阵亡后战斗才结束"""
+        enemies = _units("敌人", 3, hp=30)
+        battle = BattleManager(Character("玩家", 1000, 50, 20, 5, 5), enemies, seed=1)
+        killed = []
+        while battle.battle_active:
+            killed.extend(event.target for event in battle.update(0.5) if event.kind == EVENT_DEATH)
+        self.assertEqual(killed, enemies)  # 默认按顺序攻击最前排的敌人
+        self.assertEqual(battle.enemy_side.alive_count, 0)
+
+    def test_large_battle(self):
+        """测试每方60个单位的战斗"""
+        for policy in ("random", "lowest_hp", "highest_threat"):
+            player, *allies = _units("我方", 60)
+            battle = BattleManager(player, _units("敌方", 60), seed=7,
+                                   player_policy=policy, enemy_policy=policy)
+            for ally in allies:
+                battle.add_ally(ally)
+            while battle.battle_active:
+                battle.update(1.0)
+
+            # 存活计数与实际生命值一致
+            for side in (battle.player_side, battle.enemy_side):
+                self.assertEqual(side.alive_count, sum(unit.is_alive() for unit in side.units))
+            self.assertTrue(battle.player_side.alive_count == 0 or battle.enemy_side.alive_count == 0)
+
+    def test_state_keeps_policies(self):
+        """测试恢复的战斗保留目标选择策略及其内部状态，之后按原样继续"""
+        for policy in ("random", "lowest_hp", "highest_threat"):
+            player, *allies = _units("我方", 8)
+            battle = BattleManager(player, _units("敌方", 8), seed=3,
+                                   player_policy=policy, enemy_policy=policy)
+            for ally in allies:
+                battle.add_ally(ally)
+            battle.advance_to(12.0)
+            self.assertLess(battle.enemy_side.alive_count, 8)
+
+            state = battle.get_state()
+            clone = BattleManager.from_state(state)
+            self.assertEqual(clone.get_state(), state)
+            self.assertEqual(type(clone.player_side.policy), type(battle.player_side.policy))
+            while battle.battle_active:
+                battle.update(1.0)
+                clone.update(1.0)
+            self.assertEqual(clone.get_state(), battle.get_state())
+
+    def test_replay_multiple_enemies(self):
+        """测试多个敌人的战斗可以回放"""
+        battle = BattleManager(Character("玩家", 300, 50, 10, 5, 5), _units("敌人", 4), seed=5)
+        recording = BattleRecording.start(battle)
+        while battle.battle_active:
+            battle.player_use_skill()
+            battle.update(0.3)
+        recording.finish(battle)
+
+        replayed = replay_battle(BattleRecording.from_bytes(recording.to_bytes()))
+        self.assertEqual([unit.get_state() for unit in replayed.enemies],
+                         [unit.get_state() for unit in battle.enemies])
+        self.assertEqual(replayed.time, battle.time)
+
+if __name__ == '__main__':
+    unittest.main()
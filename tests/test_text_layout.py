@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+文本排版和文本框单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 无窗口环境下使用虚拟显示驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from src.resource_manager import ResourceManager
+from src.ui.text_box import TextBox
+from src.ui.text_layout import NO_LINE_END, NO_LINE_START, TextLayoutCache, break_lines
+
+def measure(char):
+    """测试用的等宽测量：每个字符宽10像素"""
+    return 10
+
+class TestBreakLines(unittest.TestCase):
+    """断行测试"""
+
+    def test_cjk_without_spaces(self):
+        """测试没有空格的中文按宽度断行"""
+        lines = break_lines("一二三四五六七八九十", 40, measure)
+        self.assertEqual(lines, ["一二三四", "五六七八", "九十"])
+
+    def test_kinsoku(self):
+        """测试标点不在行首、开括号不在行尾"""
+        # 句号悬挂在行尾
+        lines = break_lines("一二三四。五六", 40, measure)
+        self.assertEqual(lines, ["一二三四。", "五六"])
+
+        # 开括号移到下一行
+        lines = break_lines("一二三「四五」", 40, measure)
+        self.assertEqual(lines, ["一二三", "「四五」"])
+
+        text = "你决定与神秘生物交谈。它似乎很友好，告诉你关于这座遗迹的秘密……「真的吗？」"
+        for width in range(30, 120, 10):
+            for line in break_lines(text, width, measure)[1:]:
+                self.assertNotIn(line[0], NO_LINE_START)
+            for line in break_lines(text, width, measure):
+                self.assertNotIn(line[-1], NO_LINE_END)
+
+    def test_latin_words_kept_whole(self):
+        """测试拉丁单词不被拆开"""
+        lines = break_lines("hello brave world", 80, measure)
+        self.assertEqual(lines, ["hello", "brave", "world"])
+
+        # 中英混排
+        lines = break_lines("遇到了Boss战", 60, measure)
+        self.assertEqual(lines, ["遇到了", "Boss战"])
+
+    def test_newlines(self):
+        """测试强制换行"""
+        self.assertEqual(break_lines("一二\n三", 100, measure), ["一二", "三"])
+
+class TestTextLayoutCache(unittest.TestCase):
+    """排版缓存测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        """测试类准备"""
+        pygame.init()
+
+    def test_layout_cached(self):
+        """测试相同文本只排版一次"""
+        cache = TextLayoutCache()
+        font = pygame.font.Font(None, 24)
+        key = ("default", 24)
+        lines = cache.layout("一段测试文字", 100, font, key)
+        self.assertIs(cache.layout("一段测试文字", 100, font, key), lines)
+        self.assertIsNot(cache.layout("一段测试文字", 50, font, key), lines)
+
+class TestTextBox(unittest.TestCase):
+    """文本框测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        """测试类准备"""
+        pygame.init()
+        cls.screen = pygame.display.set_mode((800, 600))
+        ResourceManager()
+
+    def test_pagination(self):
+        """测试超出文本框的文本分页显示"""
+        text_box = TextBox(0, 0, 200, 80, "测试" * 100)
+        self.assertEqual(text_box.lines_per_page, 2)
+        self.assertGreater(len(text_box.pages), 1)
+        self.assertLessEqual(len(text_box.rendered_text), 2)
+
+        pages = 1
+        while text_box.advance():
+            pages += 1
+            text_box.draw(self.screen)
+        self.assertEqual(pages, len(text_box.pages))
+        self.assertTrue(text_box.is_finished())
+
+    def test_typewriter_reuses_surfaces(self):
+        """测试逐字显示只裁剪已渲染的行"""
+        text_box = TextBox(0, 0, 300, 150, "一二三四五六七八九十", chars_per_second=10)
+        self.assertTrue(text_box.is_revealing())
+        self.assertEqual(text_box.revealed, 0)
+        surfaces = list(text_box.rendered_text)
+
+        # 模拟时间流逝
+        text_box._reveal_start -= 500
+        text_box.update()
+        self.assertEqual(text_box.revealed, 5)
+        self.assertTrue(text_box.dirty)
+        text_box.draw(self.screen)
+        self.assertEqual(text_box.rendered_text, surfaces)
+
+        # 点击后立即显示整页
+        text_box.advance()
+        self.assertFalse(text_box.is_revealing())
+        self.assertTrue(text_box.is_finished())
+
+if __name__ == '__main__':
+    unittest.main()
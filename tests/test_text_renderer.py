@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+文本渲染服务单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 无窗口环境下使用虚拟显示驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from src.resource_manager import ResourceManager
+from src.ui.text_renderer import TextRenderer, get_text_renderer
+
+class TestTextRenderer(unittest.TestCase):
+    """文本渲染服务测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        """初始化Pygame"""
+        pygame.init()
+
+    def setUp(self):
+        """测试前准备"""
+        self.renderer = TextRenderer(max_entries=2)
+
+    def test_render_cache(self):
+        """测试相同参数的字符串只渲染一次"""
+        first = self.renderer.render("战斗开始！", 18, (255, 255, 255))
+        second = self.renderer.render("战斗开始！", 18, (255, 255, 255))
+        self.assertIs(first, second)
+        self.assertEqual((self.renderer.hits, self.renderer.misses), (1, 1))
+
+        # 颜色不同是不同的缓存项
+        self.assertIsNot(self.renderer.render("战斗开始！", 18, (200, 200, 200)), first)
+
+    def test_lru_eviction(self):
+        """测试缓存超过上限时淘汰最久未使用的项"""
+        a = self.renderer.render("a", 18, (255, 255, 255))
+        self.renderer.render("b", 18, (255, 255, 255))
+        self.renderer.render("a", 18, (255, 255, 255))  # a 变为最近使用
+        self.renderer.render("c", 18, (255, 255, 255))  # 淘汰 b
+
+        self.assertIs(self.renderer.render("a", 18, (255, 255, 255)), a)
+        misses = self.renderer.misses
+        self.renderer.render("b", 18, (255, 255, 255))
+        self.assertEqual(self.renderer.misses, misses + 1)
+
+    def test_atlas(self):
+        """测试字形图集逐字绘制"""
+        atlas = self.renderer.atlas(16, (255, 255, 255))
+        self.assertIs(self.renderer.atlas(16, (255, 255, 255)), atlas)
+
+        # 数字预先加入图集，新字符按需加入
+        self.assertIn("7", atlas.glyphs)
+        glyph_count = len(atlas.glyphs)
+        screen = pygame.Surface((200, 50))
+        rect = atlas.draw(screen, "玩家: 95/100", (0, 0))
+        self.assertEqual(len(atlas.glyphs), glyph_count + 2)
+        self.assertEqual(rect.size, atlas.size("玩家: 95/100"))
+
+        # 数值变化不会增加新字形
+        atlas.draw(screen, "玩家: 87/100", (0, 0))
+        self.assertEqual(len(atlas.glyphs), glyph_count + 2)
+
+    def test_resource_manager_shares_renderer(self):
+        """测试资源管理器设置全局共享的渲染服务"""
+        resource_manager = ResourceManager()
+        self.assertIs(get_text_renderer(), resource_manager.text_renderer)
+        self.assertIs(resource_manager.text_renderer.get_font(24), resource_manager.get_font("simhei", 24))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+向量化战斗引擎单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.combat.battle_manager import BattleManager
+from src.combat.character import Character
+from src.combat.skills import SkillBook
+from src.combat.vector_engine import VectorBattle, np, SIDE_PLAYER, SIDE_ENEMY
+
+@unittest.skipIf(np is None, "需要安装NumPy")
+class TestVectorBattle(unittest.TestCase):
+    """向量化战斗测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.player = Character("玩家", 100, 50, 10, 5, 5)
+        self.player.skills = SkillBook(("fireball",))
+        self.enemy = Character("敌人", 80, 0, 8, 4, 4)
+        self.battle = VectorBattle([self.player], [self.enemy], seed=42)
+
+    def test_initialization(self):
+        """测试初始化"""
+        self.assertEqual(len(self.battle), 2)
+        self.assertEqual(list(self.battle.hp), [100, 80])
+        self.assertEqual(list(self.battle.side), [SIDE_PLAYER, SIDE_ENEMY])
+        self.assertTrue(self.battle.battle_active)
+
+    def test_damage_formula(self):
+        """测试伤害与 Character.take_damage 的公式一致"""
+        self.battle.update(0.0)
+
+        # 玩家：int(10 × 0.8~1.2) - 4 // 2 → 6~10
+        enemy_damage = 80 - int(self.battle.hp[1])
+        self.assertGreaterEqual(enemy_damage, 6)
+        self.assertLessEqual(enemy_damage, 10)
+
+        # 敌人：int(8 × 0.8~1.2) - 5 // 2 → 4~7
+        player_damage = 100 - int(self.battle.hp[0])
+        self.assertGreaterEqual(player_damage, 4)
+        self.assertLessEqual(player_damage, 7)
+
+    def test_minimum_damage(self):
+        """测试防御很高时至少造成1点伤害"""
+        battle = VectorBattle([("玩家", 100, 0, 1, 0, 0)], [("石像", 100, 0, 1, 100, 0)], seed=1)
+        battle.update(0.0)
+
+        self.assertEqual(int(battle.hp[1]), 99)
+
+    def test_cooldowns_decay_and_reset(self):
+        """测试冷却衰减和攻击后重置"""
+        self.battle.skill_cooldown[0, 0] = 5.0
+        self.battle.gcd[0] = 1.5
+        self.battle.update(0.0)
+
+        # 攻击间隔：玩家1.5秒，敌人1.6秒
+        self.assertAlmostEqual(self.battle.attack_cooldown[0], 1.5)
+        self.assertAlmostEqual(self.battle.attack_cooldown[1], 1.6)
+
+        self.battle.update(1.0)
+        self.assertAlmostEqual(self.battle.attack_cooldown[0], 0.5)
+        self.assertAlmostEqual(self.battle.skill_cooldown[0, 0], 4.0)
+        self.assertAlmostEqual(self.battle.gcd[0], 0.5)
+
+    def test_skill_cooldowns_from_skillbook(self):
+        """测试技能冷却来自技能栏的就绪时间并能写回"""
+        player = Character("玩家", 100, 50, 10, 5, 5)
+        player.skills = SkillBook(("fireball", "summon_ally"))
+        player.skills.ready[1] = 8.0
+        battle = VectorBattle([player], [Character("敌人", 80, 0, 8, 4, 4)], seed=1)
+
+        # 没有技能栏的敌人对应一行0
+        self.assertEqual(battle.skill_cooldown.shape, (2, 2))
+        self.assertEqual(list(battle.skill_cooldown[0]), [0.0, 8.0])
+        self.assertEqual(list(battle.skill_cooldown[1]), [0.0, 0.0])
+
+        battle.update(3.0)
+        self.assertAlmostEqual(battle.skill_cooldown[0, 1], 5.0)
+
+        battle.sync_characters()
+        self.assertAlmostEqual(player.skills.ready[1], 8.0)
+        self.assertAlmostEqual(player.skills.ready[0], 3.0)
+
+    def test_from_battle_in_progress(self):
+        """测试从进行中的战斗创建时冷却按当前时间换算"""
+        player = Character("玩家", 1000, 200, 10, 5, 5)
+        enemies = [Character("敌人1", 1000, 0, 8, 4, 4), Character("敌人2", 1000, 0, 8, 4, 2)]
+        manager = BattleManager(player, enemies, seed=1)
+        manager.update(2.0)
+        manager.cast(player, 0)
+        manager.update(1.2)
+
+        now = manager.time
+        ready = list(player.skills.ready)
+        actions = {unit: manager.scheduler.time_of(unit) for unit in enemies}
+        battle = VectorBattle.from_battle(manager, seed=1)
+
+        self.assertAlmostEqual(battle.time, now)
+        self.assertGreater(ready[0], now)
+        for slot, ready_time in enumerate(ready):
+            self.assertAlmostEqual(battle.skill_cooldown[0, slot], max(0.0, ready_time - now))
+        self.assertAlmostEqual(battle.gcd[0], player.skills.gcd_ready - now)
+        # 敌人的攻击冷却来自调度器，而不是角色对象上上一次行动时留下的值
+        for i, unit in enumerate(enemies, start=1):
+            self.assertAlmostEqual(battle.attack_cooldown[i], actions[unit] - now)
+
+        # 写回的就绪时间与技能栏在同一时间轴上
+        battle.update(0.5)
+        battle.sync_characters()
+        self.assertAlmostEqual(player.skills.ready[0], max(ready[0], now + 0.5))
+
+    def test_long_update_catches_up(self):
+        """测试一次较长的更新会补齐期间的所有攻击"""
+        battle = VectorBattle([("玩家", 10000, 0, 10, 5, 5)], [("敌人", 10000, 0, 8, 4, 4)], seed=1)
+
+        # 6秒内：玩家在 0, 1.5, 3, 4.5, 6 攻击；敌人在 0, 1.6, 3.2, 4.8 攻击
+        self.assertEqual(battle.update(6.0), 9)
+        self.assertAlmostEqual(battle.time, 6.0)
+
+    def test_large_battle_finishes(self):
+        """测试大规模战斗能够结束"""
+        player_side = [(f"玩家{i}", 100, 0, 10, 5, i % 10) for i in range(200)]
+        enemy_side = [(f"敌人{i}", 100, 0, 10, 5, i % 10) for i in range(200)]
+        battle = VectorBattle(player_side, enemy_side, seed=3)
+
+        while battle.battle_active:
+            battle.update(1.0 / 60)
+
+        self.assertTrue(battle.is_battle_over())
+        self.assertTrue((battle.hp >= 0).all())
+        # 统计的伤害包含溢出部分，不少于实际损失的生命值
+        self.assertGreaterEqual(int(battle.damage_dealt.sum()), int((battle.max_hp - battle.hp).sum()))
+
+    def test_sync_characters(self):
+        """测试将状态写回角色对象"""
+        self.battle.update(0.0)
+        self.battle.sync_characters()
+
+        self.assertEqual(self.player.current_hp, int(self.battle.hp[0]))
+        self.assertEqual(self.enemy.current_hp, int(self.battle.hp[1]))
+        self.assertAlmostEqual(self.player.attack_cooldown, 1.5)
+
+if __name__ == '__main__':
+    unittest.main()